@@ -31,6 +31,8 @@ from app.models.professional import Professional
 from app.models.observation import ProfessionalObservation
 from app.models.intervention_plan import InterventionPlan
 from app.models.socioemotional_indicator import SocialEmotionalIndicator
+from app.models.socioemotional_rollup import SocialEmotionalDailyRollup
+from app.models.student_progress_stats import StudentProgressStats
 
 # Alembic Config object
 config = context.config
@@ -0,0 +1,90 @@
+"""add socioemotional daily rollups table
+
+Revision ID: c4d5e6f7a8b9
+Revises: b7c8d9e0f1g2
+Create Date: 2025-12-10 10:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Import custom types
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+from app.db.types import GUID
+
+# revision identifiers, used by Alembic.
+revision = "c4d5e6f7a8b9"
+down_revision = "b7c8d9e0f1g2"
+branch_labels = None
+depends_on = None
+
+INDICATOR_TYPES = (
+    "EMOTIONAL_REGULATION",
+    "SOCIAL_INTERACTION",
+    "COMMUNICATION_SKILLS",
+    "ADAPTIVE_BEHAVIOR",
+    "SENSORY_PROCESSING",
+    "ATTENTION_FOCUS",
+    "ANXIETY_LEVEL",
+    "FRUSTRATION_TOLERANCE",
+    "SELF_REGULATION",
+    "PEER_RELATIONSHIP",
+    "EXECUTIVE_FUNCTION",
+    "FLEXIBILITY",
+)
+
+
+def upgrade() -> None:
+    """
+    Cria tabela de agregados diários de indicadores socioemocionais.
+
+    Uma linha por (student_id, indicator_type, day) com contagem, soma, soma
+    dos quadrados, min/max e primeira/última medição do dia. Mantida pelo
+    SocialEmotionalIndicatorService; o backfill das medições existentes é
+    feito por scripts/rebuild_socioemotional_rollups.py.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        # Tipo ENUM já criado pela tabela socioemotional_indicators
+        indicator_type = postgresql.ENUM(*INDICATOR_TYPES, name="indicator_type", create_type=False)
+    else:
+        indicator_type = sa.Enum(*INDICATOR_TYPES, name="indicator_type")
+
+    op.create_table(
+        "socioemotional_daily_rollups",
+        sa.Column("student_id", GUID(length=36), nullable=False),
+        sa.Column("indicator_type", indicator_type, nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("measurement_count", sa.Integer(), nullable=False),
+        sa.Column("score_sum", sa.Integer(), nullable=False),
+        sa.Column("score_sum_sq", sa.Integer(), nullable=False),
+        sa.Column("min_score", sa.Integer(), nullable=False),
+        sa.Column("max_score", sa.Integer(), nullable=False),
+        sa.Column("first_score", sa.Integer(), nullable=False),
+        sa.Column("first_measured_at", sa.DateTime(), nullable=False),
+        sa.Column("latest_score", sa.Integer(), nullable=False),
+        sa.Column("latest_measured_at", sa.DateTime(), nullable=False),
+        sa.Column("id", GUID(length=36), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["student_id"], ["students.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("student_id", "indicator_type", "day", name="uq_socioemotional_rollup_bucket"),
+    )
+    op.create_index(
+        "ix_socioemotional_daily_rollups_student_id",
+        "socioemotional_daily_rollups",
+        ["student_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Remove tabela de agregados diários."""
+    op.drop_index("ix_socioemotional_daily_rollups_student_id", table_name="socioemotional_daily_rollups")
+    op.drop_table("socioemotional_daily_rollups")
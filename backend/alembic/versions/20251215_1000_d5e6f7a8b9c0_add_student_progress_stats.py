@@ -0,0 +1,70 @@
+"""add student progress stats table
+
+Revision ID: d5e6f7a8b9c0
+Revises: c4d5e6f7a8b9
+Create Date: 2025-12-15 10:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Import custom types
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+from app.db.types import GUID
+
+# revision identifiers, used by Alembic.
+revision = "d5e6f7a8b9c0"
+down_revision = "c4d5e6f7a8b9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Cria tabela de estatísticas incrementais de progresso por estudante.
+
+    Uma linha por estudante com contadores, somas da regressão do engajamento
+    (Σy, Σxy) e as últimas avaliações. Mantida pelo AssessmentService; o
+    backfill das avaliações existentes é feito por
+    scripts/rebuild_progress_stats.py.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        json_type = postgresql.JSONB()
+    else:
+        json_type = sa.JSON()
+
+    op.create_table(
+        "student_progress_stats",
+        sa.Column("student_id", GUID(length=36), nullable=False),
+        sa.Column("assessment_count", sa.Integer(), nullable=False),
+        sa.Column("completed_count", sa.Integer(), nullable=False),
+        sa.Column("success_count", sa.Integer(), nullable=False),
+        sa.Column("difficulty_issue_count", sa.Integer(), nullable=False),
+        sa.Column("engagement_sum", sa.BigInteger(), nullable=False),
+        sa.Column("engagement_xy_sum", sa.BigInteger(), nullable=False),
+        sa.Column("last_assessment_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("recent_assessments", json_type, nullable=False),
+        sa.Column("id", GUID(length=36), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["student_id"], ["students.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_student_progress_stats_student_id",
+        "student_progress_stats",
+        ["student_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Remove tabela de estatísticas de progresso."""
+    op.drop_index("ix_student_progress_stats_student_id", table_name="student_progress_stats")
+    op.drop_table("student_progress_stats")
@@ -13,6 +13,7 @@ from app.api.routes import (
     export,
     health,
     intervention_plans,
+    ml,
     notifications,
     observations,
     professionals,
@@ -32,6 +33,7 @@ api_router.include_router(auth.router, tags=["authentication"])
 api_router.include_router(students.router, tags=["students"])
 api_router.include_router(activities.router, tags=["activities"])
 api_router.include_router(assessments.router, tags=["assessments"])
+api_router.include_router(ml.router, tags=["ml"])
 
 # Multiprofessional System routes
 api_router.include_router(professionals.router, tags=["professionals"])
@@ -4,28 +4,37 @@ Activity API routes.
 This module defines the FastAPI routes for activity operations.
 """
 
+import json
+from datetime import datetime
 from typing import Dict, List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 
 from app.api.dependencies.auth import get_current_user
 from app.core.database import get_db
+from app.core.exceptions import MissingConfigurationError, OpenAIError, ServiceOverloadedError
 from app.models.activity import Activity
 from app.models.student import Student
 from app.schemas.activity import (
     ActivityCreate,
     ActivityFilterParams,
     ActivityGenerate,
+    ActivityJobResponse,
     ActivityListResponse,
     ActivityResponse,
     ActivityUpdate,
 )
+from app.services.activity_jobs import GenerationJob, get_activity_job_queue
 from app.services.activity_service import ActivityService
+from app.services.activity_templates import TEMPLATE_MODEL, template_activity_fields
 from app.services.nlp_service import get_nlp_service
 from app.utils.constants import (
+    ActivityType,
+    DifficultyLevel,
     GradeLevel,
     PedagogicalActivityType,
     Subject,
@@ -75,71 +84,20 @@ def generate_activity(
     logger.info(f"Generating activity for student {student.id} by teacher {teacher_id}")
 
     # Build activity based on student profile and parameters
-    activity_type_names = {
-        "cognitive": "Cognitiva",
-        "social": "Social",
-        "motor": "Motora",
-        "sensory": "Sensorial",
-        "communication": "Comunicação",
-        "daily_living": "Vida Diária",
-        "academic": "Acadêmica",
-    }
-
-    difficulty_names = {
-        "very_easy": "Muito Fácil",
-        "easy": "Fácil",
-        "medium": "Médio",
-        "hard": "Difícil",
-        "very_hard": "Muito Difícil",
-    }
-
-    type_name = activity_type_names.get(activity_data.activity_type, activity_data.activity_type)
-    difficulty_name = difficulty_names.get(activity_data.difficulty, activity_data.difficulty)
-    theme_text = f" - {activity_data.theme}" if activity_data.theme else ""
+    content = template_activity_fields(
+        {"name": student.name, "diagnosis": student.diagnosis},
+        activity_data.activity_type,
+        activity_data.difficulty,
+        activity_data.duration_minutes,
+        activity_data.theme,
+    )
 
     # Create activity
     activity = Activity(
         student_id=activity_data.student_id,
-        title=f"Atividade {type_name}{theme_text}",
-        description=(
-            f"Atividade {type_name.lower()} personalizada para {student.name}, "
-            f"com nível de dificuldade {difficulty_name.lower()}. "
-            f"Esta atividade foi criada considerando o perfil de aprendizagem do aluno: {student.diagnosis}."
-        ),
         activity_type=activity_data.activity_type,
         difficulty=activity_data.difficulty,
-        duration_minutes=activity_data.duration_minutes,
-        objectives=[
-            f"Desenvolver habilidades de {type_name.lower()} adequadas ao nível do aluno",
-            "Promover engajamento através de atividades adaptadas",
-            "Respeitar o perfil sensorial e ritmo de aprendizagem",
-        ],
-        materials=["Material visual de apoio", "Recursos adaptados para TEA", "Ambiente estruturado e previsível"],
-        instructions=[
-            "1. Prepare o ambiente garantindo que esteja calmo e organizado",
-            "2. Apresente a atividade de forma clara e visual",
-            "3. Divida a tarefa em pequenos passos",
-            "4. Ofereça suporte quando necessário",
-            "5. Reforce positivamente cada conquista",
-            "6. Permita pausas sensoriais se o aluno demonstrar necessidade",
-        ],
-        adaptations=[
-            "Use apoios visuais (imagens, pictogramas)",
-            "Mantenha instruções curtas e diretas",
-            "Permita tempo extra para processamento",
-            "Reduza estímulos sensoriais desnecessários",
-        ],
-        visual_supports=[
-            "Sequência visual dos passos",
-            "Timer visual para duração",
-            "Imagens de apoio relacionadas ao tema",
-        ],
-        success_criteria=[
-            "Aluno consegue iniciar a atividade com suporte mínimo",
-            "Demonstra compreensão das instruções",
-            "Completa pelo menos 70% da atividade proposta",
-            "Mantém engajamento durante a maior parte do tempo",
-        ],
+        **content,
         theme=activity_data.theme,
         tags=[activity_data.activity_type, activity_data.difficulty],
         generated_by_ai=True,
@@ -157,7 +115,7 @@ def generate_activity(
                 "duration_minutes": activity_data.duration_minutes,
                 "theme": activity_data.theme,
             },
-            "model": "template-based",
+            "model": TEMPLATE_MODEL,
             "note": "Generated using simplified template (OpenAI integration pending)",
         },
         is_published=True,
@@ -174,6 +132,183 @@ def generate_activity(
     return activity
 
 
+def _sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+@router.post("/generate/stream")
+async def stream_generate_activity(
+    activity_data: ActivityGenerate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """
+    Generate personalized activity using AI, streaming fields as Server-Sent Events.
+
+    The completion is streamed from OpenAI and parsed incrementally, so the
+    first fields (title, description) reach the client long before the whole
+    activity is generated. The complete activity is validated and persisted at
+    the end.
+
+    **Events (text/event-stream):**
+    - `field`: `{"field": "title", "value": "..."}`, one per completed field
+    - `activity`: the persisted activity (same body as POST /activities/generate)
+    - `error`: `{"detail": "..."}` if generation or persistence fails
+
+    **Raises (before the stream starts):**
+    - 404: Student not found
+    - 403: Permission denied
+    - 503: OpenAI not configured
+    """
+    teacher_id = UUID(current_user["user_id"])
+
+    # Get student
+    student = db.query(Student).filter(Student.id == activity_data.student_id).first()
+
+    if not student:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Aluno não encontrado")
+
+    # Check permission
+    if student.teacher_id != teacher_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Você não tem permissão para criar atividades para este aluno"
+        )
+
+    try:
+        nlp_service = get_nlp_service()
+    except MissingConfigurationError as e:
+        raise e.to_http_exception()
+
+    student_profile = student.to_profile_dict()
+    # End the read transaction so no pool connection is held while generating
+    db.commit()
+
+    logger.info(f"Streaming activity generation for student {activity_data.student_id} by teacher {teacher_id}")
+
+    async def events():
+        generated = None
+        try:
+            async for event in nlp_service.stream_activity(
+                student_profile=student_profile,
+                activity_type=ActivityType(activity_data.activity_type),
+                difficulty=DifficultyLevel(activity_data.difficulty),
+                duration_minutes=activity_data.duration_minutes,
+                theme=activity_data.theme,
+            ):
+                if event.event == "field":
+                    yield _sse_event("field", event.data)
+                else:
+                    generated = event.data
+
+            activity = ActivityService.build_generated_activity(
+                activity_data, generated, student_profile, nlp_service.default_model, teacher_id
+            )
+            db.add(activity)
+            db.commit()
+            db.refresh(activity)
+
+            logger.info(f"Streamed activity generated: {activity.id}")
+            yield _sse_event("activity", ActivityResponse.model_validate(activity).model_dump(mode="json"))
+
+        except OpenAIError as e:
+            logger.error(f"AI streaming generation failed: {e}")
+            yield _sse_event("error", {"detail": e.message})
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error streaming activity: {e}")
+            yield _sse_event("error", {"detail": "Erro ao gerar atividade"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _job_response(job: GenerationJob) -> ActivityJobResponse:
+    """Convert a GenerationJob to its response schema."""
+
+    def timestamp(value: Optional[float]) -> Optional[datetime]:
+        return datetime.fromtimestamp(value) if value is not None else None
+
+    return ActivityJobResponse(
+        job_id=job.id,
+        status=job.status.value,
+        student_id=UUID(job.student_id),
+        activity_id=UUID(job.activity_id) if job.activity_id else None,
+        error=job.error,
+        created_at=timestamp(job.created_at),
+        started_at=timestamp(job.started_at),
+        finished_at=timestamp(job.finished_at),
+    )
+
+
+@router.post("/jobs", response_model=ActivityJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_activity_job(
+    activity_data: ActivityGenerate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)
+) -> ActivityJobResponse:
+    """
+    Queue a personalized activity generation and return immediately.
+
+    The OpenAI call runs in a background worker that holds no database
+    connection; the activity is persisted in a short transaction when the
+    generation finishes. Poll GET /activities/jobs/{job_id} for the result.
+
+    **Raises:**
+    - 404: Student not found
+    - 403: Permission denied
+    - 503: OpenAI not configured, or too many pending jobs (with Retry-After)
+    """
+    teacher_id = UUID(current_user["user_id"])
+
+    # Get student
+    student = db.query(Student).filter(Student.id == activity_data.student_id).first()
+
+    if not student:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Aluno não encontrado")
+
+    # Check permission
+    if student.teacher_id != teacher_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Você não tem permissão para criar atividades para este aluno"
+        )
+
+    student_profile = student.to_profile_dict()
+    # End the read transaction before queueing
+    db.commit()
+
+    try:
+        job = await get_activity_job_queue().submit(activity_data, student_profile, teacher_id)
+    except MissingConfigurationError as e:
+        raise e.to_http_exception()
+    except ServiceOverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=e.message,
+            headers={"Retry-After": str(e.details["retry_after"])},
+        )
+
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=ActivityJobResponse)
+async def get_activity_job(job_id: str, current_user: dict = Depends(get_current_user)) -> ActivityJobResponse:
+    """
+    Get the status of an activity generation job.
+
+    When `status` is `succeeded`, `activity_id` identifies the generated
+    activity; when `failed`, `error` describes the reason.
+
+    **Raises:**
+    - 404: Job not found, expired, or created by another teacher
+    """
+    job = await get_activity_job_queue().get(job_id)
+
+    if job is None or job.teacher_id != str(UUID(current_user["user_id"])):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job não encontrado")
+
+    return _job_response(job)
+
+
 @router.post("/", response_model=ActivityResponse, status_code=status.HTTP_201_CREATED)
 def create_activity(
     activity_data: ActivityCreate, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)
@@ -4,7 +4,7 @@ Assessment API routes (Sync Version).
 This module defines the FastAPI routes for assessment operations.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Union
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -17,8 +17,10 @@ from app.core.exceptions import (
     AssessmentNotFoundError,
     PermissionDeniedError,
     StudentNotFoundError,
+    ValidationError,
 )
 from app.schemas.assessment import AssessmentCreate, AssessmentResponse, AssessmentUpdate
+from app.schemas.common import CursorPaginatedResponse
 from app.services.assessment_service import AssessmentService
 
 router = APIRouter(prefix="/assessments", tags=["assessments"])
@@ -109,18 +111,26 @@ def list_assessments_by_student(
     return assessments
 
 
-@router.get("/", response_model=List[AssessmentResponse])
+@router.get("/", response_model=Union[List[AssessmentResponse], CursorPaginatedResponse[AssessmentResponse]])
 def list_assessments(
     student_id: Optional[UUID] = Query(None),
     activity_id: Optional[UUID] = Query(None),
     skip: int = 0,
     limit: int = 100,
+    pagination: str = Query("offset", pattern="^(offset|cursor)$", description="Modo de paginação: offset ou cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor (modo cursor)"),
+    include_total: bool = Query(False, description="Calcular total no modo cursor (COUNT adicional)"),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> List[AssessmentResponse]:
     """
     List assessments with pagination and filters.
 
+    **Paginação por cursor** (opcional):
+    - `pagination=cursor`: retorna `CursorPaginatedResponse` com `next_cursor`, sem OFFSET
+    - `cursor`: valor de `next_cursor` da página anterior
+    - `include_total`: calcula o total (COUNT adicional)
+
     Args:
         student_id: Optional filter by student
         activity_id: Optional filter by activity
@@ -133,6 +143,21 @@ def list_assessments(
         List of assessment objects
     """
     teacher_id = UUID(current_user["user_id"])
+    if pagination == "cursor" or cursor:
+        try:
+            assessments, next_cursor, total = AssessmentService.list_assessments_by_cursor(
+                db=db,
+                student_id=student_id,
+                activity_id=activity_id,
+                teacher_id=teacher_id,
+                cursor=cursor,
+                limit=limit,
+                include_total=include_total,
+            )
+        except ValidationError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+        return CursorPaginatedResponse[AssessmentResponse].create(assessments, next_cursor, limit=limit, total=total)
+
     assessments, _ = AssessmentService.list_assessments(
         db=db, student_id=student_id, activity_id=activity_id, teacher_id=teacher_id, skip=skip, limit=limit
     )
@@ -14,6 +14,8 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.services.ml_executor import get_ml_executor
+from app.services.nlp_circuit_breaker import get_openai_circuit_breaker
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -45,6 +47,8 @@ async def detailed_health_check(db: Session = Depends(get_db)) -> Dict[str, Any]
     Checks the status of:
     - API service
     - Database connection
+    - ML process pool
+    - OpenAI circuit breaker (state, error rate, latency)
     - External services (optional)
 
     Args:
@@ -82,14 +86,24 @@ async def detailed_health_check(db: Session = Depends(get_db)) -> Dict[str, Any]
         components["database"] = {"status": "down", "error": str(e)}
         overall_status = "degraded"
 
+    # ML process pool (queue depth and per-operation latency)
+    ml_stats = get_ml_executor().get_stats()
+    components["ml_executor"] = {
+        "status": "saturated" if ml_stats["pending"] >= ml_stats["max_pending"] else "up",
+        **ml_stats,
+    }
+
     # TODO: Check Redis
     components["redis"] = {"status": "not_configured", "message": "Redis health check not implemented yet"}
 
     # TODO: Check MongoDB
     components["mongodb"] = {"status": "not_configured", "message": "MongoDB health check not implemented yet"}
 
-    # TODO: Check OpenAI API
-    components["openai"] = {"status": "not_configured", "message": "OpenAI health check not implemented yet"}
+    # OpenAI circuit breaker (open = AI calls rejected, activities use the template)
+    circuit = get_openai_circuit_breaker().get_stats()
+    components["openai"] = {"status": "up" if circuit["state"] == "closed" else circuit["state"], "circuit": circuit}
+    if circuit["state"] == "open":
+        overall_status = "degraded"
 
     return {"status": overall_status, "timestamp": datetime.utcnow().isoformat(), "components": components}
 
@@ -5,7 +5,7 @@ Endpoints para criação e gerenciamento colaborativo de planos de intervenção
 """
 
 import logging
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -15,6 +15,7 @@ from app.api.dependencies.auth import get_current_user, get_professional_id
 from app.core.database import get_db
 from app.core.exceptions import ForbiddenException, NotFoundException, ValidationException
 from app.models.intervention_plan import PlanStatus
+from app.schemas.common import CursorPaginatedResponse
 from app.schemas.intervention_plan import (
     AddProfessionalRequest,
     InterventionPlanCreate,
@@ -324,10 +325,13 @@ def remove_professional_from_plan(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
 
 
-@router.get("/", response_model=InterventionPlanListResponse)
+@router.get("/", response_model=Union[InterventionPlanListResponse, CursorPaginatedResponse[InterventionPlanResponse]])
 def list_intervention_plans(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$", description="Modo de paginação: offset ou cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor (modo cursor)"),
+    include_total: bool = Query(False, description="Calcular total no modo cursor (COUNT adicional)"),
     student_id: Optional[UUID] = Query(None, description="Filtrar por estudante"),
     created_by_id: Optional[UUID] = Query(None, description="Filtrar por criador"),
     professional_id: Optional[UUID] = Query(None, description="Filtrar por profissional envolvido"),
@@ -351,6 +355,11 @@ def list_intervention_plans(
 
     **Ordenação**: Mais recentes primeiro
 
+    **Paginação por cursor** (opcional):
+    - `pagination=cursor`: retorna `CursorPaginatedResponse` com `next_cursor`, sem OFFSET
+    - `cursor`: valor de `next_cursor` da página anterior
+    - `include_total`: calcula o total (COUNT adicional)
+
     **Retorna**:
     - Lista paginada de planos
     - Total de registros
@@ -365,6 +374,15 @@ def list_intervention_plans(
     )
 
     service = InterventionPlanService(db)
+    if pagination == "cursor" or cursor:
+        try:
+            plans, next_cursor, total = service.list_by_cursor(
+                cursor=cursor, limit=limit, filters=filters, include_total=include_total
+            )
+        except ValidationException as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+        return CursorPaginatedResponse[InterventionPlanResponse].create(plans, next_cursor, limit=limit, total=total)
+
     plans, total = service.list(skip=skip, limit=limit, filters=filters)
 
     total_pages = (total + limit - 1) // limit
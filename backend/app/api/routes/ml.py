@@ -0,0 +1,139 @@
+"""
+ML prediction API routes.
+
+Risk and activity success scoring runs in the ML process pool
+(app/services/ml_executor.py), so a burst of predictions does not block the
+event loop. Feature loading (database, feature cache) runs in the thread
+pool; only the scoring goes to the worker processes.
+"""
+
+from typing import Any, Dict
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.api.dependencies.auth import get_current_user
+from app.core.database import get_db
+from app.core.exceptions import PermissionDeniedError, ServiceOverloadedError, StudentNotFoundError, TaskTimeoutError
+from app.models.student import Student
+from app.schemas.ml import ActivitySuccessRequest, ActivitySuccessResponse, RiskPredictionResponse
+from app.services.ml_executor import get_ml_executor
+from app.services.ml_service import get_ml_service
+
+router = APIRouter(prefix="/ml", tags=["ml"])
+
+
+def _check_student_access(db: Session, student_id: UUID, teacher_id: UUID) -> None:
+    """Raise if the student does not exist or belongs to another teacher."""
+    owner = db.query(Student.teacher_id).filter(Student.id == student_id).first()
+    if owner is None:
+        raise StudentNotFoundError(str(student_id))
+    if owner.teacher_id != teacher_id:
+        raise PermissionDeniedError(message="Você não tem permissão para acessar este aluno")
+
+
+def _load_student_features(db: Session, student_id: UUID, teacher_id: UUID) -> Dict[str, float]:
+    """Check access and load the student's (cached) ML features."""
+    _check_student_access(db, student_id, teacher_id)
+    return get_ml_service().get_student_features(db, student_id)
+
+
+async def _score(student_id: UUID, current_user: dict, db: Session, submit) -> Dict[str, Any]:
+    """Load features in the thread pool, then await `submit(features)` in the ML pool."""
+    try:
+        features = await run_in_threadpool(_load_student_features, db, student_id, UUID(current_user["user_id"]))
+        return await submit(features)
+    except StudentNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
+    except PermissionDeniedError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except ServiceOverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=e.message,
+            headers={"Retry-After": str(e.details["retry_after"])},
+        )
+    except TaskTimeoutError as e:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=e.message)
+
+
+@router.get("/students/{student_id}/risk", response_model=RiskPredictionResponse)
+async def predict_student_risk(
+    student_id: UUID, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Predict behavioral risk level of a student.
+
+    Args:
+        student_id: Student UUID
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Risk level, confidence and class probabilities
+
+    Raises:
+        HTTPException: 404/403 for student access, 503 if the ML queue is full, 504 on timeout
+    """
+    return await _score(student_id, current_user, db, get_ml_executor().predict_risk)
+
+
+@router.post("/students/{student_id}/activity-success", response_model=ActivitySuccessResponse)
+async def predict_activity_success(
+    student_id: UUID,
+    activity: ActivitySuccessRequest,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    """
+    Predict the likelihood that a student succeeds in an activity.
+
+    Args:
+        student_id: Student UUID
+        activity: Activity characteristics
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Success probability, confidence and recommendations
+
+    Raises:
+        HTTPException: 404/403 for student access, 503 if the ML queue is full, 504 on timeout
+    """
+    activity_data = activity.model_dump(mode="json")
+    executor = get_ml_executor()
+    return await _score(
+        student_id, current_user, db, lambda features: executor.predict_activity_success(features, activity_data)
+    )
+
+
+@router.get("/students/{student_id}/progress")
+def analyze_student_progress(
+    student_id: UUID, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Analyze a student's progress (engagement trend, completion, insights).
+
+    Reads the incremental statistics in student_progress_stats (one query),
+    so it is not sent to the ML pool.
+
+    Args:
+        student_id: Student UUID
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Progress analysis
+
+    Raises:
+        HTTPException: If student not found or access denied
+    """
+    try:
+        _check_student_access(db, student_id, UUID(current_user["user_id"]))
+        return get_ml_service().analyze_student_progress_for_student(db, student_id)
+    except StudentNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
+    except PermissionDeniedError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
@@ -9,7 +9,7 @@ Data: 2025-11-24
 """
 
 import logging
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -17,7 +17,9 @@ from sqlalchemy.orm import Session
 
 from app.api.dependencies.auth import get_current_user
 from app.core.database import get_db
+from app.core.exceptions import ValidationException
 from app.models.notification import NotificationPriority, NotificationType
+from app.schemas.common import CursorPaginatedResponse
 from app.schemas.notification import (
     NotificationListResponse,
     NotificationResponse,
@@ -31,10 +33,17 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 
-@router.get("/", response_model=NotificationListResponse, status_code=status.HTTP_200_OK)
+@router.get(
+    "/",
+    response_model=Union[NotificationListResponse, CursorPaginatedResponse[NotificationResponse]],
+    status_code=status.HTTP_200_OK,
+)
 async def list_notifications(
     skip: int = Query(0, ge=0, description="Número de registros a pular"),
     limit: int = Query(50, ge=1, le=100, description="Limite de registros"),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$", description="Modo de paginação: offset ou cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor (modo cursor)"),
+    include_total: bool = Query(False, description="Calcular total no modo cursor (COUNT adicional)"),
     unread_only: bool = Query(False, description="Retornar apenas não lidas"),
     type: Optional[NotificationType] = Query(None, description="Filtrar por tipo"),
     priority: Optional[NotificationPriority] = Query(None, description="Filtrar por prioridade"),
@@ -53,6 +62,11 @@ async def list_notifications(
     - skip: Offset
     - limit: Limite de resultados (máximo 100)
 
+    **Paginação por cursor** (opcional):
+    - `pagination=cursor`: retorna `CursorPaginatedResponse` com `next_cursor`, sem OFFSET
+    - `cursor`: valor de `next_cursor` da página anterior
+    - `include_total`: calcula o total (COUNT adicional)
+
     **Ordenação:**
     - Por prioridade (decrescente)
     - Por data de criação (mais recentes primeiro)
@@ -73,6 +87,24 @@ async def list_notifications(
 
     service = NotificationService(db)
 
+    if pagination == "cursor" or cursor:
+        # Modo cursor: ordenação apenas cronológica (created_at, id)
+        try:
+            notifications, next_cursor, total = service.get_user_notifications_by_cursor(
+                user_id=user_id,
+                cursor=cursor,
+                limit=limit,
+                unread_only=unread_only,
+                type_filter=type,
+                priority_filter=priority,
+                include_total=include_total,
+            )
+        except ValidationException as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+        return CursorPaginatedResponse[NotificationResponse].create(
+            notifications, next_cursor, limit=limit, total=total
+        )
+
     # Obter notificações
     notifications, total = service.get_user_notifications(
         user_id=user_id,
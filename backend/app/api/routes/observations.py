@@ -4,7 +4,7 @@ Observation API endpoints - Gestão de observações profissionais.
 Endpoints para registro e consulta de observações multiprofissionais sobre estudantes.
 """
 
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -12,7 +12,8 @@ from sqlalchemy.orm import Session
 
 from app.api.dependencies.auth import get_current_user
 from app.core.database import get_db
-from app.core.exceptions import ForbiddenException, NotFoundException
+from app.core.exceptions import ForbiddenException, NotFoundException, ValidationException
+from app.schemas.common import CursorPaginatedResponse
 from app.schemas.observation import (
     ObservationFilter,
     ObservationSummary,
@@ -157,10 +158,16 @@ def delete_observation(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
 
 
-@router.get("/", response_model=ProfessionalObservationListResponse)
+@router.get(
+    "/",
+    response_model=Union[ProfessionalObservationListResponse, CursorPaginatedResponse[ProfessionalObservationResponse]],
+)
 def list_observations(
     skip: int = Query(0, ge=0, description="Número de registros para pular"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros"),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$", description="Modo de paginação: offset ou cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor (modo cursor)"),
+    include_total: bool = Query(False, description="Calcular total no modo cursor (COUNT adicional)"),
     student_id: Optional[UUID] = Query(None, description="Filtrar por estudante"),
     professional_id: Optional[UUID] = Query(None, description="Filtrar por profissional"),
     observation_type: Optional[str] = Query(None, description="Filtrar por tipo de observação"),
@@ -192,6 +199,11 @@ def list_observations(
     - `skip`: Número de registros para pular
     - `limit`: Número máximo de registros (máximo: 1000)
 
+    **Paginação por cursor** (opcional):
+    - `pagination=cursor`: retorna `CursorPaginatedResponse` com `next_cursor`, sem OFFSET
+    - `cursor`: valor de `next_cursor` da página anterior
+    - `include_total`: calcula o total (COUNT adicional)
+
     **Ordenação**: Mais recentes primeiro (por `observed_at`)
 
     **Retorna**:
@@ -212,6 +224,21 @@ def list_observations(
 
     service = ObservationService(db)
     requesting_professional_id = UUID(current_user["user_id"])
+    if pagination == "cursor" or cursor:
+        try:
+            observations, next_cursor, total = service.list_by_cursor(
+                cursor=cursor,
+                limit=limit,
+                filters=filters,
+                requesting_professional_id=requesting_professional_id,
+                include_total=include_total,
+            )
+        except ValidationException as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+        return CursorPaginatedResponse[ProfessionalObservationResponse].create(
+            observations, next_cursor, limit=limit, total=total
+        )
+
     observations, total = service.list(
         skip=skip,
         limit=limit,
@@ -5,7 +5,7 @@ Endpoints para registro, análise e monitoramento de indicadores socioemocionais
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -14,6 +14,7 @@ from sqlalchemy.orm import Session
 from app.api.dependencies.auth import get_current_user, get_professional_id
 from app.core.database import get_db
 from app.core.exceptions import NotFoundException, ValidationException
+from app.schemas.common import CursorPaginatedResponse
 from app.schemas.socioemotional_indicator import (
     BulkIndicatorCreate,
     BulkIndicatorResponse,
@@ -124,12 +125,20 @@ def create_bulk_indicators(
     - Lista de erros (se houver)
 
     **Comportamento**:
-    - Operação parcial: alguns podem falhar, outros serem criados
+    - Uma única transação para todos os itens
+    - Operação parcial (padrão): itens inválidos são ignorados, os demais criados
     - Erros individuais são retornados na lista de erros
+    - `all_or_nothing: true`: qualquer item inválido cancela a operação (400);
+      estudante ou profissional inexistente retorna 404
     """
-    service = SocialEmotionalIndicatorService(db)
-    professional_id = professional_id_param if professional_id_param is not None else UUID(current_user["user_id"])
-    return service.create_bulk(bulk_data, professional_id)
+    try:
+        service = SocialEmotionalIndicatorService(db)
+        professional_id = professional_id_param if professional_id_param is not None else UUID(current_user["user_id"])
+        return service.create_bulk(bulk_data, professional_id)
+    except NotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/{indicator_id}", response_model=SocialEmotionalIndicatorResponse)
@@ -213,10 +222,18 @@ def delete_indicator(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.get("/", response_model=SocialEmotionalIndicatorListResponse)
+@router.get(
+    "/",
+    response_model=Union[
+        SocialEmotionalIndicatorListResponse, CursorPaginatedResponse[SocialEmotionalIndicatorResponse]
+    ],
+)
 def list_indicators(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$", description="Modo de paginação: offset ou cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor (modo cursor)"),
+    include_total: bool = Query(False, description="Calcular total no modo cursor (COUNT adicional)"),
     student_id: Optional[UUID] = Query(None, description="Filtrar por estudante"),
     professional_id: Optional[UUID] = Query(None, description="Filtrar por profissional"),
     indicator_type: Optional[str] = Query(None, description="Filtrar por tipo de indicador"),
@@ -242,6 +259,11 @@ def list_indicators(
     - `is_concerning`: Apenas indicadores preocupantes
     - `search`: Busca em observações e comportamentos
 
+    **Paginação por cursor** (opcional):
+    - `pagination=cursor`: retorna `CursorPaginatedResponse` com `next_cursor`, sem OFFSET
+    - `cursor`: valor de `next_cursor` da página anterior
+    - `include_total`: calcula o total (COUNT adicional)
+
     **Ordenação**: Mais recentes primeiro (por `measured_at`)
 
     **Retorna**:
@@ -260,6 +282,17 @@ def list_indicators(
     )
 
     service = SocialEmotionalIndicatorService(db)
+    if pagination == "cursor" or cursor:
+        try:
+            indicators, next_cursor, total = service.list_by_cursor(
+                cursor=cursor, limit=limit, filters=filters, include_total=include_total
+            )
+        except ValidationException as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+        return CursorPaginatedResponse[SocialEmotionalIndicatorResponse].create(
+            indicators, next_cursor, limit=limit, total=total
+        )
+
     indicators, total = service.list(skip=skip, limit=limit, filters=filters)
 
     total_pages = (total + limit - 1) // limit
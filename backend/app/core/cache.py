@@ -17,15 +17,39 @@ Uso:
     # Invalidar cache
     await cache_manager.delete("key")
 
+    # Invalidação por tags (sem SCAN)
+    await cache_manager.set("key", data, ttl=3600, tags=["student:123"])
+    await cache_manager.invalidate_tags(["student:123"])
+
+    # Operações em lote (MGET / pipeline)
+    values = await cache_manager.get_many(["a", "b"])
+    await cache_manager.set_many({"a": 1, "b": 2}, ttl=300, ttls={"b": 60})
+
+Cache em dois níveis:
+    L1 - LRU em processo (CACHE_L1_*), evita round trip e deserialização em
+         chaves quentes. Valores retornados devem ser tratados como
+         somente leitura.
+    L2 - Redis, compartilhado entre workers.
+
+    Escritas/remoções publicam mensagens no canal de invalidação do Redis;
+    cada worker remove as chaves correspondentes do seu L1.
+
 Autor: Claude Code
 Data: 2025-11-24
 """
 
+import asyncio
+import fnmatch
 import json
 import logging
-from typing import Any, Optional, Union
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Union
 from functools import wraps
 import hashlib
+import inspect
+from uuid import uuid4
 
 try:
     import redis.asyncio as aioredis
@@ -34,26 +58,121 @@ except ImportError:
     REDIS_AVAILABLE = False
     aioredis = None
 
+from app.core.cache_codec import CacheCodec
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Libera o lock apenas se ainda pertence a quem o adquiriu
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class LocalCache:
+    """
+    Cache L1 em processo: LRU limitado com TTL por entrada.
+
+    Thread-safe; valores são mantidos já deserializados.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: int = 30):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Obtém valor (None se ausente ou expirado) e o marca como recente."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Armazena valor com TTL = min(ttl, TTL do L1), removendo o LRU se cheio."""
+        ttl = min(ttl, self.ttl) if ttl else self.ttl
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> bool:
+        """Remove chave."""
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Remove várias chaves."""
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def delete_pattern(self, pattern: str) -> int:
+        """Remove chaves por padrão glob (mesma sintaxe do SCAN MATCH)."""
+        with self._lock:
+            keys = [key for key in self._data if fnmatch.fnmatchcase(key, pattern)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
 
 class CacheManager:
     """
     Gerenciador de cache Redis com suporte assíncrono.
 
     Fornece interface simples para operações de cache com:
-    - Serialização automática JSON
+    - Serialização plugável (msgpack/JSON + compressão, ver cache_codec)
     - TTL configurável
     - Invalidação por padrão
+    - Invalidação por tags (conjuntos Redis tag -> chaves)
+    - Cache L1 em processo opcional, invalidado entre workers via pub/sub
+    - Contadores de hit/miss por nível
     - Fallback graceful se Redis não disponível
     """
 
+    INVALIDATION_CHANNEL = "eduautismo:cache:invalidation"
+
     def __init__(self):
         self.redis: Optional[aioredis.Redis] = None
         self.enabled = REDIS_AVAILABLE and settings.ENVIRONMENT != "test"
         self._connected = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Invalidações agendadas por invalidate_tags_nowait no próprio event loop
+        self._pending_invalidations: Set[asyncio.Task] = set()
+        self.codec = CacheCodec(
+            format=settings.CACHE_CODEC,
+            compression=settings.CACHE_COMPRESSION,
+            compress_threshold=settings.CACHE_COMPRESSION_THRESHOLD,
+        )
+
+        # L1 em processo e coerência entre workers
+        self.local: Optional[LocalCache] = (
+            LocalCache(settings.CACHE_L1_MAX_SIZE, settings.CACHE_L1_TTL) if settings.CACHE_L1_ENABLED else None
+        )
+        self.instance_id = uuid4().hex
+        self._pubsub = None
+        self._listener_task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {"l1_hits": 0, "l1_misses": 0, "l2_hits": 0, "l2_misses": 0}
 
     async def connect(self):
         """Conecta ao Redis."""
@@ -68,7 +187,7 @@ class CacheManager:
             self.redis = await aioredis.from_url(
                 settings.REDIS_URL,
                 encoding="utf-8",
-                decode_responses=True,
+                decode_responses=False,  # valores binários (ver cache_codec)
                 socket_connect_timeout=5,
                 socket_timeout=5,
             )
@@ -76,8 +195,12 @@ class CacheManager:
             # Testar conexão
             await self.redis.ping()
             self._connected = True
+            self._loop = asyncio.get_running_loop()
             logger.info(f"Redis cache connected: {settings.REDIS_URL}")
 
+            if self.local is not None:
+                await self._start_invalidation_listener()
+
         except Exception as e:
             logger.warning(f"Failed to connect to Redis: {e}. Cache disabled.")
             self.enabled = False
@@ -85,18 +208,95 @@ class CacheManager:
 
     async def disconnect(self):
         """Desconecta do Redis."""
+        if self._listener_task:
+            self._listener_task.cancel()
+            self._listener_task = None
+
+        if self._pubsub:
+            try:
+                await self._pubsub.close()
+            except Exception as e:
+                logger.warning(f"Error closing cache invalidation subscription: {e}")
+            self._pubsub = None
+
+        if self.local is not None:
+            self.local.clear()
+
         if self.redis:
             await self.redis.close()
             self._connected = False
             logger.info("Redis cache disconnected")
 
-    def _serialize(self, value: Any) -> str:
-        """Serializa valor para JSON."""
-        return json.dumps(value, default=str)
+    async def _start_invalidation_listener(self):
+        """Assina o canal de invalidação para manter o L1 coerente entre workers."""
+        try:
+            self._pubsub = self.redis.pubsub()
+            await self._pubsub.subscribe(self.INVALIDATION_CHANNEL)
+            self._listener_task = asyncio.create_task(self._listen_invalidations())
+        except Exception as e:
+            # Sem pub/sub não há como garantir coerência: desabilita o L1
+            logger.warning(f"Cache invalidation subscription failed: {e}. L1 cache disabled.")
+            self.local = None
+            self._pubsub = None
+
+    async def _listen_invalidations(self):
+        """Loop de recebimento das mensagens de invalidação."""
+        try:
+            async for message in self._pubsub.listen():
+                if message.get("type") == "message":
+                    self._apply_invalidation(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Cache invalidation listener stopped: {e}. L1 cache disabled.")
+            self.local = None
 
-    def _deserialize(self, value: str) -> Any:
-        """Deserializa JSON para valor."""
-        return json.loads(value)
+    def _apply_invalidation(self, data: Union[bytes, str]) -> None:
+        """Aplica no L1 uma mensagem de invalidação publicada por outro worker."""
+        if self.local is None:
+            return
+
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid cache invalidation message: {data!r}")
+            return
+
+        if payload.get("origin") == self.instance_id:
+            return
+
+        if payload.get("keys"):
+            self.local.delete_many(payload["keys"])
+        if payload.get("pattern"):
+            self.local.delete_pattern(payload["pattern"])
+
+    async def _publish_invalidation(self, keys: Optional[Iterable[str]] = None, pattern: Optional[str] = None):
+        """Publica invalidação de chaves/padrão para o L1 dos demais workers."""
+        if self.local is None:
+            return
+
+        message = {"origin": self.instance_id}
+        if keys:
+            message["keys"] = list(keys)
+        if pattern:
+            message["pattern"] = pattern
+
+        try:
+            await self.redis.publish(self.INVALIDATION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            logger.error(f"Cache invalidation publish error: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Contadores de hit/miss por nível e tamanho atual do L1."""
+        return {**self.stats, "l1_size": len(self.local) if self.local is not None else 0}
+
+    def _serialize(self, value: Any) -> bytes:
+        """Serializa valor com o codec configurado."""
+        return self.codec.encode(value)
+
+    def _deserialize(self, value: Union[bytes, str]) -> Any:
+        """Deserializa valor (qualquer codec, incluindo JSON legado)."""
+        return self.codec.decode(value)
 
     def _generate_key(self, key: str, prefix: str = "eduautismo") -> str:
         """
@@ -111,6 +311,10 @@ class CacheManager:
         """
         return f"{prefix}:{key}"
 
+    def _tag_key(self, tag: str, prefix: str = "eduautismo") -> str:
+        """Chave do conjunto Redis que guarda as chaves marcadas com a tag."""
+        return f"{prefix}:tag:{tag}"
+
     async def get(self, key: str, prefix: str = "eduautismo") -> Optional[Any]:
         """
         Obtém valor do cache.
@@ -122,39 +326,71 @@ class CacheManager:
         Returns:
             Valor deserializado ou None se não encontrado
         """
+        value, _ = await self._get_with_tier(key, prefix)
+        return value
+
+    async def _get_with_tier(self, key: str, prefix: str = "eduautismo") -> Tuple[Optional[Any], Optional[str]]:
+        """
+        Obtém valor consultando L1 e depois Redis.
+
+        Returns:
+            Tupla (valor, nível) - nível é "l1", "l2" ou None em caso de miss
+        """
         if not self.enabled or not self._connected:
-            return None
+            return None, None
+
+        full_key = self._generate_key(key, prefix)
+
+        if self.local is not None:
+            value = self.local.get(full_key)
+            if value is not None:
+                self.stats["l1_hits"] += 1
+                return value, "l1"
+            self.stats["l1_misses"] += 1
 
         try:
-            full_key = self._generate_key(key, prefix)
-            value = await self.redis.get(full_key)
+            raw = await self.redis.get(full_key)
 
-            if value is None:
+            if raw is None:
+                self.stats["l2_misses"] += 1
                 logger.debug(f"Cache miss: {full_key}")
-                return None
+                return None, None
 
+            self.stats["l2_hits"] += 1
             logger.debug(f"Cache hit: {full_key}")
-            return self._deserialize(value)
+            value = self._deserialize(raw)
+
+            if self.local is not None:
+                self.local.set(full_key, value)
+
+            return value, "l2"
 
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {e}")
-            return None
+            return None, None
 
     async def set(
         self,
         key: str,
         value: Any,
         ttl: Optional[int] = None,
-        prefix: str = "eduautismo"
+        prefix: str = "eduautismo",
+        tags: Optional[Iterable[str]] = None,
     ) -> bool:
         """
         Define valor no cache.
 
+        Quando `tags` é informado, a chave é adicionada ao conjunto de cada
+        tag na mesma transação, permitindo invalidação seletiva via
+        invalidate_tags. O conjunto da tag vive pelo menos tanto quanto a
+        chave mais longa que contém (EXPIRE NX + EXPIRE GT, Redis >= 7).
+
         Args:
             key: Chave do cache
             value: Valor a ser armazenado (será serializado)
             ttl: Tempo de vida em segundos (default: REDIS_CACHE_TTL)
             prefix: Prefixo/namespace
+            tags: Tags das quais o valor depende (ex: "plan:<id>")
 
         Returns:
             True se sucesso, False caso contrário
@@ -167,7 +403,24 @@ class CacheManager:
             serialized = self._serialize(value)
             ttl = ttl or settings.REDIS_CACHE_TTL
 
-            await self.redis.setex(full_key, ttl, serialized)
+            if tags:
+                pipe = self.redis.pipeline()
+                pipe.setex(full_key, ttl, serialized)
+                for tag in tags:
+                    tag_key = self._tag_key(tag, prefix)
+                    pipe.sadd(tag_key, full_key)
+                    pipe.expire(tag_key, ttl, nx=True)
+                    pipe.expire(tag_key, ttl, gt=True)
+                await pipe.execute()
+            else:
+                await self.redis.setex(full_key, ttl, serialized)
+
+            if self.local is not None:
+                # Cópia deserializada: mesma forma de um hit no Redis e imune a
+                # mutações posteriores do objeto do chamador
+                self.local.set(full_key, self._deserialize(serialized), ttl)
+                await self._publish_invalidation(keys=[full_key])
+
             logger.debug(f"Cache set: {full_key} (TTL: {ttl}s)")
             return True
 
@@ -193,6 +446,10 @@ class CacheManager:
             full_key = self._generate_key(key, prefix)
             deleted = await self.redis.delete(full_key)
 
+            if self.local is not None:
+                self.local.delete(full_key)
+                await self._publish_invalidation(keys=[full_key])
+
             if deleted:
                 logger.debug(f"Cache deleted: {full_key}")
 
@@ -220,6 +477,10 @@ class CacheManager:
             full_pattern = self._generate_key(pattern, prefix)
             keys = []
 
+            if self.local is not None:
+                self.local.delete_pattern(full_pattern)
+                await self._publish_invalidation(pattern=full_pattern)
+
             # Usar scan ao invés de keys() para não bloquear
             async for key in self.redis.scan_iter(match=full_pattern, count=100):
                 keys.append(key)
@@ -235,6 +496,235 @@ class CacheManager:
             logger.error(f"Cache delete pattern error for {pattern}: {e}")
             return 0
 
+    async def invalidate_tags(self, tags: Iterable[str], prefix: str = "eduautismo") -> int:
+        """
+        Remove todas as chaves marcadas com qualquer uma das tags.
+
+        Custo proporcional ao número de chaves dependentes, ao contrário de
+        delete_pattern, que varre o keyspace com SCAN. Apenas os membros lidos
+        são removidos dos conjuntos (SREM), preservando chaves marcadas
+        concorrentemente.
+
+        Args:
+            tags: Tags a invalidar
+            prefix: Prefixo/namespace
+
+        Returns:
+            Número de chaves deletadas
+        """
+        if not self.enabled or not self._connected:
+            return 0
+
+        tag_keys = [self._tag_key(tag, prefix) for tag in tags]
+        if not tag_keys:
+            return 0
+
+        try:
+            members = [m.decode() if isinstance(m, bytes) else m for m in await self.redis.sunion(*tag_keys)]
+            if not members:
+                return 0
+
+            if self.local is not None:
+                self.local.delete_many(members)
+                await self._publish_invalidation(keys=members)
+
+            pipe = self.redis.pipeline()
+            pipe.delete(*members)
+            for tag_key in tag_keys:
+                pipe.srem(tag_key, *members)
+            results = await pipe.execute()
+
+            deleted = results[0]
+            logger.debug(f"Cache tags invalidated: {tag_keys} ({deleted} keys)")
+            return deleted
+
+        except Exception as e:
+            logger.error(f"Cache invalidate tags error for {tag_keys}: {e}")
+            return 0
+
+    def invalidate_tags_nowait(
+        self,
+        tags: Iterable[str],
+        prefix: str = "eduautismo",
+        timeout: float = 1.0,
+    ) -> None:
+        """
+        Invalida tags a partir de código síncrono (ex.: services com Session).
+
+        No event loop do Redis a invalidação é agendada como task; código
+        async que escreve no loop deve chamar `await flush_invalidations()`
+        antes de responder. Em outras threads (rotas sync no threadpool) a
+        chamada aguarda até `timeout` segundos, de modo que a próxima leitura
+        já não encontre o valor antigo.
+
+        Args:
+            tags: Tags a invalidar
+            prefix: Prefixo/namespace
+            timeout: Espera máxima em segundos quando chamado fora do loop
+        """
+        if not self.enabled or not self._connected or self._loop is None or self._loop.is_closed():
+            return
+
+        tags = list(tags)
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self._loop:
+            task = running_loop.create_task(self.invalidate_tags(tags, prefix))
+            self._pending_invalidations.add(task)
+            task.add_done_callback(self._pending_invalidations.discard)
+            return
+
+        future = asyncio.run_coroutine_threadsafe(self.invalidate_tags(tags, prefix), self._loop)
+        try:
+            future.result(timeout=timeout)
+        except Exception as e:
+            logger.error(f"Cache invalidate tags error for {tags}: {e}")
+
+    async def flush_invalidations(self) -> None:
+        """
+        Aguarda as invalidações agendadas por invalidate_tags_nowait no event loop.
+
+        Escritas síncronas executadas no próprio loop (código async) apenas
+        agendam a invalidação; aguardar aqui garante que leituras seguintes
+        não encontrem valores antigos.
+        """
+        if self._pending_invalidations:
+            await asyncio.gather(*list(self._pending_invalidations), return_exceptions=True)
+
+    async def get_many(self, keys: Iterable[str], prefix: str = "eduautismo") -> Dict[str, Any]:
+        """
+        Obtém vários valores em um único round trip (L1 e depois MGET).
+
+        Args:
+            keys: Chaves do cache
+            prefix: Prefixo/namespace
+
+        Returns:
+            Dict chave -> valor apenas com as chaves encontradas
+        """
+        if not self.enabled or not self._connected:
+            return {}
+
+        found: Dict[str, Any] = {}
+        pending: List[str] = []
+
+        for key in dict.fromkeys(keys):
+            if self.local is not None:
+                value = self.local.get(self._generate_key(key, prefix))
+                if value is not None:
+                    self.stats["l1_hits"] += 1
+                    found[key] = value
+                    continue
+                self.stats["l1_misses"] += 1
+            pending.append(key)
+
+        if not pending:
+            return found
+
+        try:
+            full_keys = [self._generate_key(key, prefix) for key in pending]
+            raw_values = await self.redis.mget(full_keys)
+
+            for key, full_key, raw in zip(pending, full_keys, raw_values):
+                if raw is None:
+                    self.stats["l2_misses"] += 1
+                    continue
+
+                self.stats["l2_hits"] += 1
+                value = self._deserialize(raw)
+                found[key] = value
+                if self.local is not None:
+                    self.local.set(full_key, value)
+
+        except Exception as e:
+            logger.error(f"Cache get_many error for {len(pending)} keys: {e}")
+
+        return found
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        prefix: str = "eduautismo",
+        ttls: Optional[Dict[str, int]] = None,
+    ) -> bool:
+        """
+        Define vários valores em um único pipeline.
+
+        Args:
+            items: Dict chave -> valor
+            ttl: TTL padrão em segundos (default: REDIS_CACHE_TTL)
+            prefix: Prefixo/namespace
+            ttls: TTL específico por chave (sobrepõe `ttl`)
+
+        Returns:
+            True se sucesso, False caso contrário
+        """
+        if not self.enabled or not self._connected or not items:
+            return False
+
+        try:
+            default_ttl = ttl or settings.REDIS_CACHE_TTL
+            ttls = ttls or {}
+            pipe = self.redis.pipeline()
+            serialized_items = []
+
+            for key, value in items.items():
+                full_key = self._generate_key(key, prefix)
+                serialized = self._serialize(value)
+                key_ttl = ttls.get(key, default_ttl)
+                pipe.setex(full_key, key_ttl, serialized)
+                serialized_items.append((full_key, serialized, key_ttl))
+
+            await pipe.execute()
+
+            if self.local is not None:
+                for full_key, serialized, key_ttl in serialized_items:
+                    self.local.set(full_key, self._deserialize(serialized), key_ttl)
+                await self._publish_invalidation(keys=[full_key for full_key, _, _ in serialized_items])
+
+            logger.debug(f"Cache set_many: {len(items)} keys")
+            return True
+
+        except Exception as e:
+            logger.error(f"Cache set_many error for {len(items)} keys: {e}")
+            return False
+
+    async def delete_many(self, keys: Iterable[str], prefix: str = "eduautismo") -> int:
+        """
+        Remove várias chaves em um único comando DEL.
+
+        Args:
+            keys: Chaves do cache
+            prefix: Prefixo/namespace
+
+        Returns:
+            Número de chaves deletadas
+        """
+        if not self.enabled or not self._connected:
+            return 0
+
+        full_keys = [self._generate_key(key, prefix) for key in keys]
+        if not full_keys:
+            return 0
+
+        try:
+            deleted = await self.redis.delete(*full_keys)
+
+            if self.local is not None:
+                self.local.delete_many(full_keys)
+                await self._publish_invalidation(keys=full_keys)
+
+            return deleted
+
+        except Exception as e:
+            logger.error(f"Cache delete_many error for {len(full_keys)} keys: {e}")
+            return 0
+
     async def exists(self, key: str, prefix: str = "eduautismo") -> bool:
         """
         Verifica se chave existe no cache.
@@ -302,6 +792,59 @@ class CacheManager:
             logger.error(f"Cache increment error for key {key}: {e}")
             return 0
 
+    @property
+    def is_available(self) -> bool:
+        """True se o Redis está habilitado e conectado."""
+        return self.enabled and self._connected
+
+    async def acquire_lock(self, key: str, ttl: float = 10.0, prefix: str = "eduautismo") -> Optional[str]:
+        """
+        Tenta adquirir lock distribuído curto (SET NX PX).
+
+        Args:
+            key: Chave protegida pelo lock
+            ttl: Tempo máximo do lock em segundos (expira se o dono falhar)
+            prefix: Prefixo/namespace
+
+        Returns:
+            Token do lock se adquirido, None caso contrário
+        """
+        if not self.is_available:
+            return None
+
+        try:
+            token = uuid4().hex
+            lock_key = self._generate_key(f"lock:{key}", prefix)
+            acquired = await self.redis.set(lock_key, token, nx=True, px=int(ttl * 1000))
+            return token if acquired else None
+
+        except Exception as e:
+            logger.error(f"Cache lock error for key {key}: {e}")
+            return None
+
+    async def release_lock(self, key: str, token: str, prefix: str = "eduautismo") -> bool:
+        """
+        Libera lock adquirido com acquire_lock.
+
+        Args:
+            key: Chave protegida pelo lock
+            token: Token retornado por acquire_lock
+            prefix: Prefixo/namespace
+
+        Returns:
+            True se o lock foi liberado
+        """
+        if not self.is_available:
+            return False
+
+        try:
+            lock_key = self._generate_key(f"lock:{key}", prefix)
+            return bool(await self.redis.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token))
+
+        except Exception as e:
+            logger.error(f"Cache unlock error for key {key}: {e}")
+            return False
+
     def generate_cache_key(self, *args, **kwargs) -> str:
         """
         Gera chave de cache baseada em argumentos.
@@ -323,26 +866,127 @@ class CacheManager:
 cache_manager = CacheManager()
 
 
+def _unwrap_swr(entry: Any) -> Tuple[Optional[Any], bool]:
+    """Extrai (valor, fresco?) de uma entrada gravada com stale-while-revalidate."""
+    if isinstance(entry, dict) and "fresh_until" in entry and "value" in entry:
+        return entry["value"], time.time() < entry["fresh_until"]
+    return entry, entry is not None
+
+
 def cached(
     ttl: Optional[int] = None,
     key_prefix: str = "cached",
-    key_builder: Optional[callable] = None
+    key_builder: Optional[callable] = None,
+    stale_ttl: int = 0,
+    lock_timeout: float = 10.0,
 ):
     """
     Decorator para cachear resultados de funções assíncronas.
 
+    Requisições concorrentes pela mesma chave são coalescidas (single-flight):
+    no processo, apenas uma executa a função e as demais aguardam o mesmo
+    resultado; entre processos, um lock curto no Redis garante que apenas um
+    worker recalcula enquanto os outros aguardam o valor ser gravado.
+
+    Com `stale_ttl` > 0 a entrada permanece no Redis por `ttl + stale_ttl`
+    segundos (stale-while-revalidate): após `ttl`, o worker que obtém o lock
+    recalcula e os demais continuam recebendo o valor anterior.
+
+    A função decorada expõe `cache_stats` com os contadores de hit por nível
+    (l1_hits, l2_hits), misses, stale_hits e coalesced.
+
     Args:
         ttl: Tempo de vida do cache em segundos
         key_prefix: Prefixo da chave de cache
         key_builder: Função customizada para gerar chave (recebe args e kwargs)
+        stale_ttl: Janela (segundos) em que o valor expirado ainda pode ser servido
+        lock_timeout: Tempo máximo (segundos) do lock de recálculo entre processos
 
     Uso:
-        @cached(ttl=300, key_prefix="pending_review")
+        @cached(ttl=300, key_prefix="pending_review", stale_ttl=60)
         async def get_pending_review_plans(skip, limit):
             # ... query database
             return results
     """
     def decorator(func):
+        stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0, "stale_hits": 0, "coalesced": 0}
+        inflight: Dict[str, asyncio.Future] = {}
+
+        async def store(cache_key: str, result: Any) -> None:
+            if not stale_ttl:
+                await cache_manager.set(cache_key, result, ttl=ttl, prefix=key_prefix)
+                return
+
+            fresh_ttl = ttl or settings.REDIS_CACHE_TTL
+            entry = {"value": result, "fresh_until": time.time() + fresh_ttl}
+            await cache_manager.set(cache_key, entry, ttl=fresh_ttl + stale_ttl, prefix=key_prefix)
+
+        async def wait_for_value(cache_key: str) -> Optional[Any]:
+            """Aguarda o worker que detém o lock gravar o valor (ou o lock expirar)."""
+            deadline = time.monotonic() + lock_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                entry, _ = await cache_manager._get_with_tier(cache_key, prefix=key_prefix)
+                value, fresh = _unwrap_swr(entry)
+                if fresh:
+                    return value
+                if not await cache_manager.exists(f"lock:{cache_key}", prefix=key_prefix):
+                    return None
+            return None
+
+        async def load(cache_key: str, args, kwargs, lock_token: Optional[str]) -> Any:
+            """Executa a função sob o lock distribuído e grava o resultado."""
+            if lock_token is None:
+                lock_token = await cache_manager.acquire_lock(cache_key, lock_timeout, prefix=key_prefix)
+                if lock_token is None and cache_manager.is_available:
+                    # Outro worker está calculando: aproveitar o resultado dele
+                    value = await wait_for_value(cache_key)
+                    if value is not None:
+                        stats["coalesced"] += 1
+                        return value
+
+            try:
+                result = await func(*args, **kwargs)
+                await store(cache_key, result)
+                return result
+            finally:
+                if lock_token is not None:
+                    await cache_manager.release_lock(cache_key, lock_token, prefix=key_prefix)
+
+        async def single_flight(cache_key: str, args, kwargs, lock_token: Optional[str] = None) -> Any:
+            """Garante uma única execução por chave no processo."""
+            while True:
+                future = inflight.get(cache_key)
+                if future is None:
+                    break
+                if lock_token is not None:
+                    # Recálculo já em andamento neste processo
+                    await cache_manager.release_lock(cache_key, lock_token, prefix=key_prefix)
+                    lock_token = None
+                try:
+                    stats["coalesced"] += 1
+                    return await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    # Execução líder cancelada: tentar novamente como líder
+                    if not future.cancelled():
+                        raise
+
+            future = asyncio.get_running_loop().create_future()
+            inflight[cache_key] = future
+            try:
+                result = await load(cache_key, args, kwargs, lock_token)
+                future.set_result(result)
+                return result
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                future.exception()  # Evita aviso de exceção não recuperada sem seguidores
+                raise
+            finally:
+                inflight.pop(cache_key, None)
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
             # Gerar chave de cache
@@ -351,19 +995,97 @@ def cached(
             else:
                 cache_key = f"{func.__name__}:{cache_manager.generate_cache_key(*args, **kwargs)}"
 
-            # Tentar obter do cache
-            cached_value = await cache_manager.get(cache_key, prefix=key_prefix)
-            if cached_value is not None:
-                logger.debug(f"Returning cached result for {func.__name__}")
-                return cached_value
+            # Tentar obter do cache (L1 e depois Redis)
+            entry, tier = await cache_manager._get_with_tier(cache_key, prefix=key_prefix)
+            value, fresh = _unwrap_swr(entry) if stale_ttl else (entry, entry is not None)
+
+            if fresh:
+                stats[f"{tier}_hits"] += 1
+                logger.debug(f"Returning cached result for {func.__name__} ({tier})")
+                return value
+
+            if value is not None:
+                # Stale-while-revalidate: apenas quem obtém o lock recalcula
+                lock_token = await cache_manager.acquire_lock(cache_key, lock_timeout, prefix=key_prefix)
+                if lock_token is None:
+                    stats["stale_hits"] += 1
+                    logger.debug(f"Returning stale result for {func.__name__} while another worker refreshes")
+                    return value
+                return await single_flight(cache_key, args, kwargs, lock_token)
+
+            stats["misses"] += 1
+            return await single_flight(cache_key, args, kwargs)
+
+        wrapper.cache_stats = stats
+        return wrapper
+    return decorator
+
+
+def cached_batch(
+    ttl: Optional[int] = None,
+    key_prefix: str = "cached",
+    key_builder: Optional[callable] = None,
+    ids_param: str = "ids",
+):
+    """
+    Decorator para funções assíncronas que calculam valores por id em lote.
+
+    A função decorada recebe uma lista de ids (parâmetro `ids_param`) e
+    retorna um dict id -> valor. O wrapper busca todos os ids no cache com
+    uma única chamada (get_many), executa a função apenas para os ids
+    ausentes e grava os novos valores em um único pipeline (set_many).
+
+    A chave de cache depende apenas do id; os demais argumentos (ex.: sessão
+    do banco) não fazem parte da chave. A função decorada expõe `cache_stats`
+    com hits e misses (contados por id).
+
+    Args:
+        ttl: Tempo de vida do cache em segundos
+        key_prefix: Prefixo da chave de cache
+        key_builder: Função que gera a chave a partir de um id
+            (default: "<nome da função>:<id>")
+        ids_param: Nome do parâmetro que recebe a lista de ids
+
+    Uso:
+        @cached_batch(ttl=600, key_prefix="profiles", ids_param="student_ids")
+        async def get_profiles(db, student_ids):
+            # ... uma query para todos os ids
+            return {student_id: profile, ...}
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        stats = {"hits": 0, "misses": 0}
+
+        def build_key(item_id: Hashable) -> str:
+            return key_builder(item_id) if key_builder else f"{func.__name__}:{item_id}"
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            ids = list(dict.fromkeys(bound.arguments[ids_param]))
+
+            keys = {item_id: build_key(item_id) for item_id in ids}
+            cached_values = await cache_manager.get_many(keys.values(), prefix=key_prefix)
+
+            results = {item_id: cached_values[key] for item_id, key in keys.items() if key in cached_values}
+            missing = [item_id for item_id in ids if item_id not in results]
+            stats["hits"] += len(results)
+            stats["misses"] += len(missing)
 
-            # Executar função
-            result = await func(*args, **kwargs)
+            if missing:
+                bound.arguments[ids_param] = missing
+                computed = await func(*bound.args, **bound.kwargs)
 
-            # Armazenar no cache
-            await cache_manager.set(cache_key, result, ttl=ttl, prefix=key_prefix)
+                await cache_manager.set_many(
+                    {keys[item_id]: value for item_id, value in computed.items() if item_id in keys},
+                    ttl=ttl,
+                    prefix=key_prefix,
+                )
+                results.update(computed)
 
-            return result
+            return {item_id: results[item_id] for item_id in ids if item_id in results}
 
+        wrapper.cache_stats = stats
         return wrapper
     return decorator
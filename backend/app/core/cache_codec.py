@@ -0,0 +1,172 @@
+"""
+Codecs de Serialização do Cache
+===============================
+
+Camada de serialização plugável usada pelo CacheManager.
+
+Formato armazenado: 1 byte de cabeçalho + payload.
+
+    0x01  JSON
+    0x02  msgpack
+    0x03  msgpack + zlib
+    0x04  msgpack + lz4
+
+Entradas antigas (JSON puro, sem cabeçalho) continuam legíveis: qualquer
+valor cujo primeiro byte não é um cabeçalho conhecido é lido como JSON.
+
+msgpack preserva UUID, date, datetime e Decimal via tipos de extensão; no
+codec JSON esses tipos continuam sendo convertidos para string. msgpack e
+lz4 são opcionais - sem eles o codec recai para JSON / zlib.
+
+Uso:
+    codec = CacheCodec(format="msgpack", compression="zlib", compress_threshold=1024)
+    data = codec.encode({"id": uuid4()})
+    value = codec.decode(data)
+"""
+
+import json
+import logging
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Union
+from uuid import UUID
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None
+
+try:
+    import lz4.frame as lz4_frame
+
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+    lz4_frame = None
+
+logger = logging.getLogger(__name__)
+
+# Cabeçalhos (fora da faixa de caracteres que iniciam um documento JSON)
+HEADER_JSON = 0x01
+HEADER_MSGPACK = 0x02
+HEADER_MSGPACK_ZLIB = 0x03
+HEADER_MSGPACK_LZ4 = 0x04
+
+# Tipos de extensão msgpack
+_EXT_UUID = 1
+_EXT_DATETIME = 2
+_EXT_DATE = 3
+_EXT_DECIMAL = 4
+
+
+# Despacho pelo tipo exato - caminho rápido para os tipos mais frequentes
+_EXACT_ENCODERS = {
+    UUID: lambda v: msgpack.ExtType(_EXT_UUID, v.bytes),
+    datetime: lambda v: msgpack.ExtType(_EXT_DATETIME, v.isoformat().encode()),
+    date: lambda v: msgpack.ExtType(_EXT_DATE, v.isoformat().encode()),
+    Decimal: lambda v: msgpack.ExtType(_EXT_DECIMAL, str(v).encode()),
+}
+
+
+def _msgpack_default(value: Any) -> Any:
+    """Converte tipos não nativos do msgpack em tipos de extensão."""
+    encoder = _EXACT_ENCODERS.get(type(value))
+    if encoder is not None:
+        return encoder(value)
+
+    # Subclasses (ordem importa: datetime é subclasse de date)
+    if isinstance(value, UUID):
+        return msgpack.ExtType(_EXT_UUID, value.bytes)
+    if isinstance(value, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, value.isoformat().encode())
+    if isinstance(value, date):
+        return msgpack.ExtType(_EXT_DATE, value.isoformat().encode())
+    if isinstance(value, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(value).encode())
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    """Reconstrói tipos de extensão gravados por _msgpack_default."""
+    if code == _EXT_UUID:
+        return UUID(bytes=data)
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode())
+    if code == _EXT_DECIMAL:
+        return Decimal(data.decode())
+    return msgpack.ExtType(code, data)
+
+
+class CacheCodec:
+    """
+    Codec de valores do cache com cabeçalho de formato.
+
+    Args:
+        format: "msgpack" ou "json" (msgpack recai para JSON se não instalado)
+        compression: "zlib", "lz4" ou "none" (lz4 recai para zlib se não instalado)
+        compress_threshold: Tamanho mínimo (bytes) do payload para comprimir
+    """
+
+    def __init__(self, format: str = "msgpack", compression: str = "zlib", compress_threshold: int = 1024):
+        if format == "msgpack" and not MSGPACK_AVAILABLE:
+            logger.warning("msgpack not installed, cache codec falling back to JSON")
+            format = "json"
+        if compression == "lz4" and not LZ4_AVAILABLE:
+            logger.warning("lz4 not installed, cache compression falling back to zlib")
+            compression = "zlib"
+
+        self.format = format
+        self.compression = compression
+        self.compress_threshold = compress_threshold
+
+    def encode(self, value: Any) -> bytes:
+        """Serializa valor com cabeçalho de formato."""
+        if self.format == "json":
+            return bytes([HEADER_JSON]) + json.dumps(value, default=str).encode()
+
+        payload = msgpack.packb(value, default=_msgpack_default, use_bin_type=True, datetime=False)
+
+        if self.compression != "none" and len(payload) >= self.compress_threshold:
+            if self.compression == "lz4":
+                return bytes([HEADER_MSGPACK_LZ4]) + lz4_frame.compress(payload)
+            return bytes([HEADER_MSGPACK_ZLIB]) + zlib.compress(payload)
+
+        return bytes([HEADER_MSGPACK]) + payload
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        """Deserializa valor gravado por encode (ou JSON legado sem cabeçalho)."""
+        if isinstance(data, str):
+            data = data.encode()
+
+        header, payload = (data[0], data[1:]) if data else (None, data)
+
+        if header == HEADER_MSGPACK:
+            return self._unpack(payload)
+        if header == HEADER_MSGPACK_ZLIB:
+            return self._unpack(zlib.decompress(payload))
+        if header == HEADER_MSGPACK_LZ4:
+            if not LZ4_AVAILABLE:
+                raise ValueError("Cache entry compressed with lz4, but lz4 is not installed")
+            return self._unpack(lz4_frame.decompress(payload))
+        if header == HEADER_JSON:
+            return json.loads(payload)
+
+        # Entrada legada: JSON sem cabeçalho
+        return json.loads(data)
+
+    @staticmethod
+    def _unpack(payload: bytes) -> Any:
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("Cache entry encoded with msgpack, but msgpack is not installed")
+        return msgpack.unpackb(payload, ext_hook=_msgpack_ext_hook, raw=False, strict_map_key=False)
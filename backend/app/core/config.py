@@ -36,6 +36,14 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_CACHE_TTL: int = 3600
+    # Cache L1 em processo (na frente do Redis, coerência via pub/sub)
+    CACHE_L1_ENABLED: bool = True
+    CACHE_L1_MAX_SIZE: int = 1024
+    CACHE_L1_TTL: int = 30
+    # Codec do cache: "msgpack" ou "json"; compressão "zlib", "lz4" ou "none"
+    CACHE_CODEC: str = "msgpack"
+    CACHE_COMPRESSION: str = "zlib"
+    CACHE_COMPRESSION_THRESHOLD: int = 1024
 
     # Security
     SECRET_KEY: str
@@ -49,9 +57,45 @@ class Settings(BaseSettings):
     AWS_REGION: str = "us-east-1"
     AWS_S3_BUCKET: str = ""
 
+    # OpenAI
+    OPENAI_API_KEY: str = ""
+    # Requisições simultâneas à OpenAI e novas tentativas em erro 429
+    # (ritmo: RATE_LIMIT_OPENAI_PER_MINUTE em app/utils/constants.py)
+    OPENAI_MAX_CONCURRENCY: int = 4
+    OPENAI_MAX_RETRIES: int = 3
+    # Circuit breaker das chamadas à OpenAI (janela móvel em segundos); aberto, a
+    # geração de atividades usa o template determinístico
+    OPENAI_CIRCUIT_WINDOW_SECONDS: float = 60.0
+    OPENAI_CIRCUIT_MIN_CALLS: int = 10
+    OPENAI_CIRCUIT_FAILURE_RATE: float = 0.5
+    OPENAI_CIRCUIT_SLOW_CALL_SECONDS: float = 20.0
+    OPENAI_CIRCUIT_SLOW_CALL_RATE: float = 0.8
+    OPENAI_CIRCUIT_OPEN_SECONDS: float = 30.0
+    # Hedging: repete a chamada que passar do quantil de latência (custa tokens extras)
+    OPENAI_HEDGE_ENABLED: bool = False
+    OPENAI_HEDGE_QUANTILE: float = 0.95
+    # Cache de respostas do NLPService (hash do prompt; TTL em segundos)
+    NLP_CACHE_ENABLED: bool = True
+    NLP_CACHE_TTL: int = 3600
+    NLP_CACHE_MAX_SIZE: int = 512
+    # Cacheia também gerações criativas (atividades); False = cada geração é uma nova variação
+    NLP_CACHE_CREATIVE: bool = False
+    # Jobs de geração de atividades (POST /activities/jobs)
+    # Armazenamento do estado: "memory", "redis" ou "auto" (Redis quando conectado)
+    ACTIVITY_JOB_STORE: str = "auto"
+    ACTIVITY_JOB_WORKERS: int = 4
+    ACTIVITY_JOB_MAX_PENDING: int = 100
+    ACTIVITY_JOB_TTL: int = 86400
+
     # ML
     ML_MODEL_PATH: str = "./ml-models/trained"
     CONFIDENCE_THRESHOLD: float = 0.75
+    # Pool de processos para inferência ML (0 = thread do próprio processo)
+    ML_EXECUTOR_WORKERS: int = 2
+    ML_EXECUTOR_MAX_PENDING: int = 32
+    ML_EXECUTOR_TASK_TIMEOUT: float = 10.0
+    # Inicia os processos (e carrega os modelos) no startup da aplicação
+    ML_EXECUTOR_WARMUP: bool = False
 
     # CORS
     CORS_ORIGINS: Union[List[str], str] = ["http://localhost:3000", "http://localhost:5173"]
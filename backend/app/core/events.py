@@ -0,0 +1,94 @@
+"""
+Eventos de Domínio - EduAutismo IA
+==================================
+
+Barramento de eventos em processo para desacoplar operações de escrita
+de efeitos colaterais (ex.: invalidação de cache).
+
+Os services publicam eventos após o commit; os assinantes são chamados
+de forma síncrona e falhas neles são apenas registradas em log, nunca
+propagadas para a operação de escrita.
+
+Eventos:
+    InterventionPlanChanged - escrita em InterventionPlanService
+    AssessmentChanged       - escrita em AssessmentService
+
+Uso:
+    from app.core.events import InterventionPlanChanged, event_bus
+
+    event_bus.subscribe(InterventionPlanChanged, handler)
+    event_bus.publish(InterventionPlanChanged(...))
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, List, Type
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class InterventionPlanChanged:
+    """
+    Plano de intervenção criado, alterado ou removido.
+
+    Attributes:
+        action: Operação realizada (create, update, delete, progress_note,
+            status, add_professional, remove_professional)
+        plan_id: ID do plano
+        student_id: ID do estudante do plano
+        professional_ids: Profissionais afetados (criador, envolvidos e
+            eventuais profissionais removidos)
+    """
+
+    action: str
+    plan_id: UUID
+    student_id: UUID
+    professional_ids: FrozenSet[UUID] = field(default_factory=frozenset)
+
+
+@dataclass(frozen=True)
+class AssessmentChanged:
+    """
+    Avaliação criada, alterada ou removida.
+
+    Attributes:
+        action: Operação realizada (create, update, delete)
+        assessment_id: ID da avaliação
+        student_id: ID do estudante avaliado
+    """
+
+    action: str
+    assessment_id: UUID
+    student_id: UUID
+
+
+class EventBus:
+    """Barramento de eventos síncrono, indexado pelo tipo do evento."""
+
+    def __init__(self):
+        self._handlers: Dict[Type, List[Callable]] = defaultdict(list)
+
+    def subscribe(self, event_type: Type, handler: Callable) -> None:
+        """Registra handler para um tipo de evento (idempotente)."""
+        if handler not in self._handlers[event_type]:
+            self._handlers[event_type].append(handler)
+
+    def unsubscribe(self, event_type: Type, handler: Callable) -> None:
+        """Remove handler registrado."""
+        if handler in self._handlers[event_type]:
+            self._handlers[event_type].remove(handler)
+
+    def publish(self, event: object) -> None:
+        """Entrega evento a todos os handlers registrados para seu tipo."""
+        for handler in list(self._handlers.get(type(event), ())):
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(f"Event handler {getattr(handler, '__name__', handler)} failed for {event}: {e}")
+
+
+# Singleton instance
+event_bus = EventBus()
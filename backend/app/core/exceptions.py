@@ -327,6 +327,14 @@ class OpenAIError(ExternalServiceError):
         )
 
 
+class CircuitOpenError(OpenAIError):
+    """OpenAI circuit breaker open - calls are rejected without reaching the API."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__(message="Serviço temporariamente indisponível (circuito aberto)")
+        self.details.update({"error_code": "CIRCUIT_OPEN", "retry_after": retry_after})
+
+
 class DatabaseError(ExternalServiceError):
     """Database error."""
 
@@ -431,6 +439,37 @@ class RateLimitExceededError(EduAutismoException):
         )
 
 
+class ServiceOverloadedError(EduAutismoException):
+    """Work queue full (backpressure) - the client should retry later."""
+
+    def __init__(self, resource: str, limit: int, retry_after: int = 1):
+        super().__init__(
+            message=f"Serviço sobrecarregado: fila de {resource} cheia ({limit} tarefas pendentes)",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            details={
+                "error_code": "SERVICE_OVERLOADED",
+                "resource": resource,
+                "limit": limit,
+                "retry_after": retry_after,
+            },
+        )
+
+
+class TaskTimeoutError(EduAutismoException):
+    """Background task did not finish in time."""
+
+    def __init__(self, resource: str, timeout: float):
+        super().__init__(
+            message=f"Tempo limite excedido na tarefa de {resource} ({timeout:g}s)",
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            details={
+                "error_code": "TASK_TIMEOUT",
+                "resource": resource,
+                "timeout": timeout,
+            },
+        )
+
+
 # ============================================================================
 # Data Integrity Exceptions
 # ============================================================================
@@ -0,0 +1,110 @@
+"""
+Keyset (Cursor) Pagination - EduAutismo IA
+
+Helpers for keyset pagination over (timestamp, id) ordered queries.
+
+Unlike OFFSET pagination, the cost of fetching a page does not grow with
+the page depth: each page filters on the last seen (timestamp, id) pair,
+which PostgreSQL and SQLite can resolve directly from an index.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.exceptions import ValidationError
+
+T = TypeVar("T")
+
+
+def encode_cursor(sort_value: datetime, item_id: UUID) -> str:
+    """
+    Encode an opaque cursor for the given (timestamp, id) position.
+
+    Args:
+        sort_value: Value of the sort column of the last item
+        item_id: ID of the last item
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps({"k": sort_value.isoformat(), "id": str(item_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string
+
+    Returns:
+        Tuple (sort_value, item_id)
+
+    Raises:
+        ValidationError: If cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["k"]), UUID(payload["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeDecodeError):
+        raise ValidationError("Cursor de paginação inválido", field="cursor", value=cursor)
+
+
+def apply_keyset(
+    query: Any,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    cursor: Optional[str],
+    limit: int,
+) -> Any:
+    """
+    Apply keyset filter, ordering (newest first) and limit to a query.
+
+    Works with both ORM ``Query`` objects and 2.0-style ``select()``
+    statements. One extra row is fetched so build_keyset_page can tell
+    whether there is a next page without a COUNT.
+
+    Args:
+        query: Query or Select without ORDER BY/OFFSET/LIMIT
+        sort_column: Timestamp column (created_at, observed_at, measured_at)
+        id_column: Primary key column used as tie-breaker
+        cursor: Cursor of the previous page (None for first page)
+        limit: Page size
+
+    Returns:
+        Query/Select ready to be executed
+    """
+    if cursor:
+        sort_value, item_id = decode_cursor(cursor)
+        query = query.where(tuple_(sort_column, id_column) < (sort_value, item_id))
+
+    return query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def build_keyset_page(rows: Sequence[T], sort_attr: str, limit: int) -> Tuple[List[T], Optional[str]]:
+    """
+    Trim the extra row fetched by apply_keyset and compute the next cursor.
+
+    Args:
+        rows: Rows returned by the query built with apply_keyset
+        sort_attr: Attribute name of the sort column on each row
+        limit: Page size
+
+    Returns:
+        Tuple (items, next_cursor) - next_cursor is None on the last page
+    """
+    items = list(rows[:limit])
+    if len(rows) <= limit or not items:
+        return items, None
+
+    last = items[-1]
+    return items, encode_cursor(getattr(last, sort_attr), last.id)
@@ -20,6 +20,10 @@ from app.core.cache import cache_manager
 from app.core.config import settings
 from app.core.database import engine
 from app.db.base import Base  # Use the Base where models are registered
+from app.services.activity_jobs import shutdown_activity_job_queue
+from app.services.intervention_plan_service_cached import register_cache_invalidation
+from app.services.ml_executor import get_ml_executor, shutdown_ml_executor
+from app.services.ml_feature_cache import register_feature_cache_invalidation
 
 # ============================================================================
 # Lifecycle Management
@@ -48,11 +52,15 @@ async def lifespan(app: FastAPI):
     # Connect to Redis cache
     try:
         await cache_manager.connect()
+        register_cache_invalidation()
         print("✅ Redis cache connected")
     except Exception as e:
         print(f"⚠️  Redis cache connection warning: {e}")
         print("ℹ️  Cache will be disabled")
 
+    # ML feature cache is in-process: invalidation does not depend on Redis
+    register_feature_cache_invalidation()
+
     # Import all models to ensure they're registered with Base
     try:
         from app.models import activity, assessment, student, user  # noqa
@@ -66,11 +74,22 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠️  Database initialization warning: {e}")
 
+    # Start ML worker processes (models loaded once per process)
+    if settings.ML_EXECUTOR_WARMUP:
+        try:
+            await get_ml_executor().warm_up()
+            print(f"✅ ML executor started ({settings.ML_EXECUTOR_WORKERS} workers)")
+        except Exception as e:
+            print(f"⚠️  ML executor warm-up warning: {e}")
+
     yield
 
     # Shutdown
     print("🛑 Shutting down EduAutismo IA API")
 
+    shutdown_ml_executor()
+    await shutdown_activity_job_queue()
+
     # Disconnect from Redis cache
     try:
         await cache_manager.disconnect()
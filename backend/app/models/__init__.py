@@ -11,7 +11,9 @@ from app.models.notification import Notification
 from app.models.observation import ProfessionalObservation
 from app.models.professional import Professional
 from app.models.socioemotional_indicator import SocialEmotionalIndicator
+from app.models.socioemotional_rollup import SocialEmotionalDailyRollup
 from app.models.student import Student
+from app.models.student_progress_stats import StudentProgressStats
 from app.models.user import User
 
 __all__ = [
@@ -23,5 +25,7 @@ __all__ = [
     "ProfessionalObservation",
     "InterventionPlan",
     "SocialEmotionalIndicator",
+    "SocialEmotionalDailyRollup",
+    "StudentProgressStats",
     "Notification",
 ]
@@ -53,6 +53,38 @@ class MeasurementContext(str, enum.Enum):
     OTHER = "other"  # Outro
 
 
+# Indicadores positivos: scores baixos são preocupantes (nos demais, scores altos)
+POSITIVE_INDICATORS = frozenset(
+    {
+        IndicatorType.EMOTIONAL_REGULATION,
+        IndicatorType.SOCIAL_INTERACTION,
+        IndicatorType.COMMUNICATION_SKILLS,
+        IndicatorType.ADAPTIVE_BEHAVIOR,
+        IndicatorType.ATTENTION_FOCUS,
+        IndicatorType.FRUSTRATION_TOLERANCE,
+        IndicatorType.SELF_REGULATION,
+        IndicatorType.PEER_RELATIONSHIP,
+        IndicatorType.FLEXIBILITY,
+    }
+)
+
+# Nomes legíveis dos indicadores
+INDICATOR_DISPLAY_NAMES = {
+    IndicatorType.EMOTIONAL_REGULATION: "Regulação Emocional",
+    IndicatorType.SOCIAL_INTERACTION: "Interação Social",
+    IndicatorType.COMMUNICATION_SKILLS: "Habilidades Comunicativas",
+    IndicatorType.ADAPTIVE_BEHAVIOR: "Comportamento Adaptativo",
+    IndicatorType.SENSORY_PROCESSING: "Processamento Sensorial",
+    IndicatorType.ATTENTION_FOCUS: "Atenção e Foco",
+    IndicatorType.ANXIETY_LEVEL: "Nível de Ansiedade",
+    IndicatorType.FRUSTRATION_TOLERANCE: "Tolerância à Frustração",
+    IndicatorType.SELF_REGULATION: "Autorregulação",
+    IndicatorType.PEER_RELATIONSHIP: "Relacionamento com Pares",
+    IndicatorType.EXECUTIVE_FUNCTION: "Função Executiva",
+    IndicatorType.FLEXIBILITY: "Flexibilidade",
+}
+
+
 class SocialEmotionalIndicator(BaseModel):
     """
     Indicador socioemocional medido para estudante.
@@ -146,19 +178,7 @@ class SocialEmotionalIndicator(BaseModel):
         Para indicadores positivos (como regulação emocional), scores baixos são preocupantes.
         Para indicadores negativos (como ansiedade), scores altos são preocupantes.
         """
-        positive_indicators = {
-            IndicatorType.EMOTIONAL_REGULATION,
-            IndicatorType.SOCIAL_INTERACTION,
-            IndicatorType.COMMUNICATION_SKILLS,
-            IndicatorType.ADAPTIVE_BEHAVIOR,
-            IndicatorType.ATTENTION_FOCUS,
-            IndicatorType.FRUSTRATION_TOLERANCE,
-            IndicatorType.SELF_REGULATION,
-            IndicatorType.PEER_RELATIONSHIP,
-            IndicatorType.FLEXIBILITY,
-        }
-
-        if self.indicator_type in positive_indicators:
+        if self.indicator_type in POSITIVE_INDICATORS:
             return self.score <= 4  # Score baixo é preocupante
         else:
             return self.score >= 7  # Score alto é preocupante
@@ -166,18 +186,4 @@ class SocialEmotionalIndicator(BaseModel):
     @property
     def indicator_display_name(self) -> str:
         """Retorna nome legível do indicador."""
-        names = {
-            IndicatorType.EMOTIONAL_REGULATION: "Regulação Emocional",
-            IndicatorType.SOCIAL_INTERACTION: "Interação Social",
-            IndicatorType.COMMUNICATION_SKILLS: "Habilidades Comunicativas",
-            IndicatorType.ADAPTIVE_BEHAVIOR: "Comportamento Adaptativo",
-            IndicatorType.SENSORY_PROCESSING: "Processamento Sensorial",
-            IndicatorType.ATTENTION_FOCUS: "Atenção e Foco",
-            IndicatorType.ANXIETY_LEVEL: "Nível de Ansiedade",
-            IndicatorType.FRUSTRATION_TOLERANCE: "Tolerância à Frustração",
-            IndicatorType.SELF_REGULATION: "Autorregulação",
-            IndicatorType.PEER_RELATIONSHIP: "Relacionamento com Pares",
-            IndicatorType.EXECUTIVE_FUNCTION: "Função Executiva",
-            IndicatorType.FLEXIBILITY: "Flexibilidade",
-        }
-        return names.get(self.indicator_type, str(self.indicator_type))
+        return INDICATOR_DISPLAY_NAMES.get(self.indicator_type, str(self.indicator_type))
@@ -0,0 +1,58 @@
+"""
+Social Emotional Daily Rollup model - Agregados diários de indicadores socioemocionais.
+
+Tabela materializada mantida incrementalmente pelo SocialEmotionalIndicatorService
+para que perfil e comparações não precisem varrer todo o histórico de medições.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import Date
+from sqlalchemy import Enum as SQLEnum
+from sqlalchemy import ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import BaseModel
+from app.db.types import GUID
+from app.models.socioemotional_indicator import IndicatorType
+
+
+class SocialEmotionalDailyRollup(BaseModel):
+    """
+    Agregado diário das medições de um tipo de indicador de um estudante.
+
+    Uma linha por (student_id, indicator_type, day). Guarda o necessário para
+    média, variância, extremos e primeira/última medição do dia.
+    """
+
+    __tablename__ = "socioemotional_daily_rollups"
+    __table_args__ = (UniqueConstraint("student_id", "indicator_type", "day", name="uq_socioemotional_rollup_bucket"),)
+
+    # Chave do agregado
+    student_id: Mapped[GUID] = mapped_column(ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
+    indicator_type: Mapped[IndicatorType] = mapped_column(SQLEnum(IndicatorType, name="indicator_type"), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+
+    # Estatísticas do dia
+    measurement_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    score_sum: Mapped[int] = mapped_column(Integer, nullable=False)
+    score_sum_sq: Mapped[int] = mapped_column(Integer, nullable=False)
+    min_score: Mapped[int] = mapped_column(Integer, nullable=False)
+    max_score: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Primeira e última medição do dia
+    first_score: Mapped[int] = mapped_column(Integer, nullable=False)
+    first_measured_at: Mapped[datetime] = mapped_column(nullable=False)
+    latest_score: Mapped[int] = mapped_column(Integer, nullable=False)
+    latest_measured_at: Mapped[datetime] = mapped_column(nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<SocialEmotionalDailyRollup(student_id={self.student_id}, "
+            f"type={self.indicator_type}, day={self.day}, count={self.measurement_count})>"
+        )
+
+    @property
+    def average_score(self) -> float:
+        """Média dos scores do dia."""
+        return self.score_sum / self.measurement_count
@@ -57,3 +57,14 @@ class Student(BaseModel):
     socioemotional_indicators: Mapped[List["SocialEmotionalIndicator"]] = relationship(
         "SocialEmotionalIndicator", back_populates="student", cascade="all, delete-orphan", lazy="selectin"
     )
+
+    def to_profile_dict(self) -> Dict[str, Any]:
+        """Convert to student profile dictionary for AI prompts."""
+        return {
+            "name": self.name,
+            "age": self.age,
+            "diagnosis": self.diagnosis,
+            "tea_level": self.tea_level.value if self.tea_level else None,
+            "interests": self.interests or [],
+            "learning_profile": self.learning_profile or {},
+        }
@@ -0,0 +1,52 @@
+"""
+Student Progress Stats Model - EduAutismo IA
+
+Running progress statistics per student (see app/services/ml_progress.py).
+
+Maintained incrementally by AssessmentService so that progress analysis does
+not need to load and scan the whole assessment history.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import BaseModel
+from app.db.types import GUID, PortableJSON
+
+
+class StudentProgressStats(BaseModel):
+    """
+    Progress statistics of one student's assessment history.
+
+    The regression x is the chronological index of the assessment (ordered by
+    created_at, id), so Σx and Σx² are derived from assessment_count.
+    """
+
+    __tablename__ = "student_progress_stats"
+
+    student_id: Mapped[GUID] = mapped_column(
+        ForeignKey("students.id", ondelete="CASCADE"), nullable=False, unique=True, index=True
+    )
+
+    # Counters
+    assessment_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    success_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    difficulty_issue_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Regression sums (Σy, Σxy)
+    engagement_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    engagement_xy_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    # Newest assessment folded in (appends after it are O(1))
+    last_assessment_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Ring buffer of the most recent assessments, oldest first
+    recent_assessments: Mapped[List[Dict[str, Any]]] = mapped_column(PortableJSON, nullable=False, default=list)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<StudentProgressStats(student_id={self.student_id}, count={self.assessment_count})>"
@@ -33,6 +33,8 @@ from app.schemas.common import (
     BulkDeleteResponse,
     ComponentHealth,
     CountResponse,
+    CursorPaginatedResponse,
+    CursorPaginationParams,
     DateRangeFilter,
     DetailedHealthCheckResponse,
     ErrorDetail,
@@ -130,7 +132,9 @@ __all__ = [
     "TimestampSchema",
     "UUIDSchema",
     "PaginationParams",
+    "CursorPaginationParams",
     "PaginatedResponse",
+    "CursorPaginatedResponse",
     "MessageResponse",
     "SuccessResponse",
     "ErrorDetail",
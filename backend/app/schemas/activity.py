@@ -4,6 +4,7 @@ Activity Schemas - EduAutismo IA
 Request and response schemas for activity-related endpoints.
 """
 
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
@@ -177,6 +178,19 @@ class ActivityListResponse(BaseResponseSchema):
     bncc_competencies: Optional[List[str]] = None
 
 
+class ActivityJobResponse(BaseSchema):
+    """Schema for an activity generation job (POST/GET /activities/jobs)."""
+
+    job_id: str = Field(..., description="Job identifier")
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    student_id: UUID
+    activity_id: Optional[UUID] = Field(default=None, description="Generated activity (when succeeded)")
+    error: Optional[str] = Field(default=None, description="Failure reason (when failed)")
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
 class ActivityFilterParams(BaseSchema):
     """Query parameters for filtering activities."""
 
@@ -71,6 +71,28 @@ class PaginationParams(BaseSchema):
 T = TypeVar("T")
 
 
+class CursorPaginationParams(BaseSchema):
+    """Query parameters for keyset (cursor) pagination."""
+
+    cursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor returned as next_cursor by the previous page",
+    )
+
+    limit: int = Field(
+        default=20,
+        ge=1,
+        le=100,
+        description="Maximum number of records to return",
+        examples=[10, 20, 50],
+    )
+
+    include_total: bool = Field(
+        default=False,
+        description="Also compute the total count (extra COUNT query)",
+    )
+
+
 class PaginatedResponse(BaseSchema, Generic[T]):
     """Generic paginated response."""
 
@@ -109,6 +131,51 @@ class PaginatedResponse(BaseSchema, Generic[T]):
         )
 
 
+class CursorPaginatedResponse(BaseSchema, Generic[T]):
+    """Generic keyset (cursor) paginated response."""
+
+    items: List[T] = Field(..., description="List of items")
+    limit: int = Field(..., ge=1, description="Maximum items per page")
+    has_more: bool = Field(..., description="Whether there are more items")
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor for the next page (None on the last page)",
+    )
+    total: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Total number of items (only when include_total=true)",
+    )
+
+    @classmethod
+    def create(
+        cls,
+        items: List[T],
+        next_cursor: Optional[str],
+        limit: int = 20,
+        total: Optional[int] = None,
+    ) -> "CursorPaginatedResponse[T]":
+        """
+        Create cursor paginated response.
+
+        Args:
+            items: List of items
+            next_cursor: Cursor for the next page (None on last page)
+            limit: Limit
+            total: Total count, if requested
+
+        Returns:
+            CursorPaginatedResponse instance
+        """
+        return cls(
+            items=items,
+            limit=limit,
+            has_more=next_cursor is not None,
+            next_cursor=next_cursor,
+            total=total,
+        )
+
+
 # ============================================================================
 # API Responses
 # ============================================================================
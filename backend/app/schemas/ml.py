@@ -0,0 +1,41 @@
+"""
+ML Schemas - EduAutismo IA
+
+Request and response schemas for ML prediction endpoints.
+"""
+
+from typing import Dict, List, Optional
+
+from pydantic import Field
+
+from app.schemas.common import BaseSchema
+from app.utils.constants import MAX_ACTIVITY_DURATION, MIN_ACTIVITY_DURATION, ActivityType
+
+
+class ActivitySuccessRequest(BaseSchema):
+    """Activity to score for a student (MLService.extract_activity_features)."""
+
+    difficulty: float = Field(default=5, ge=0, le=10, description="Difficulty on a 0-10 scale")
+    duration_minutes: int = Field(
+        default=30, ge=MIN_ACTIVITY_DURATION, le=MAX_ACTIVITY_DURATION, description="Duration in minutes"
+    )
+    activity_type: Optional[ActivityType] = Field(default=None, description="Type of activity (skill domain)")
+    adaptations: List[str] = Field(default=[], description="Planned adaptations")
+    visual_supports: bool = Field(default=False, description="Activity uses visual supports")
+
+
+class RiskPredictionResponse(BaseSchema):
+    """Behavioral risk prediction."""
+
+    risk_level: str = Field(..., description="baixo, medio, alto or muito_alto")
+    confidence: float
+    probabilities: Dict[str, float] = Field(default={})
+    method: str = Field(..., description="ml_model, rule_based or default")
+
+
+class ActivitySuccessResponse(BaseSchema):
+    """Activity success prediction."""
+
+    success_probability: float
+    confidence: str
+    recommendations: List[str] = Field(default=[])
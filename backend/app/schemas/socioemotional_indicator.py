@@ -209,6 +209,10 @@ class BulkIndicatorCreate(BaseModel):
         ...,
         description="Lista de indicadores com type, context, score, etc.",
     )
+    all_or_nothing: bool = Field(
+        False,
+        description="Se True, qualquer item inválido cancela toda a operação",
+    )
 
 
 class BulkIndicatorResponse(BaseModel):
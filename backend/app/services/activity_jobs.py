@@ -0,0 +1,378 @@
+"""
+Activity Generation Jobs - EduAutismo IA
+
+Job-based AI activity generation. The request only validates and enqueues;
+the OpenAI call runs in a worker that holds no database connection, and the
+Activity is persisted afterwards in a short transaction.
+
+Flow:
+    POST /activities/jobs      -> student checked (one short query), job stored
+                                  as "queued", 202 with the job id
+    worker                     -> "running"; NLPService.generate_activity; then
+                                  one INSERT transaction -> "succeeded"
+                                  (activity_id) or "failed" (error)
+    GET /activities/jobs/{id}  -> job status
+
+Job state lives in a pluggable JobStore:
+- InMemoryJobStore: process-local, bounded LRU with TTL (development, tests)
+- RedisJobStore: shared by all workers, so any of them answers the GET
+
+Dispatch is in-process: a job runs in the process that accepted it. At most
+``max_pending`` jobs are queued or running; further submissions raise
+ServiceOverloadedError (HTTP 503) instead of queueing without bound.
+
+Usage:
+    queue = get_activity_job_queue()
+    job = await queue.submit(activity_data, student_profile, teacher_id)
+    job = await queue.get(job.id)
+"""
+
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import LocalCache, cache_manager
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.exceptions import OpenAIError, ServiceOverloadedError
+from app.schemas.activity import ActivityGenerate
+from app.services.activity_service import ActivityService
+from app.services.nlp_service import GeneratedActivity, NLPService, get_nlp_service
+from app.utils.constants import ActivityType, DifficultyLevel
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a generation job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class GenerationJob:
+    """State of one activity generation job (JSON-serializable)."""
+
+    id: str
+    teacher_id: str
+    student_id: str
+    params: Dict[str, Any]
+    student_profile: Dict[str, Any]
+    status: JobStatus = JobStatus.QUEUED
+    activity_id: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["status"] = self.status.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GenerationJob":
+        return cls(**dict(data, status=JobStatus(data["status"])))
+
+
+# ========== Job Stores ==========
+
+
+class JobStore(ABC):
+    """Persistence of job state."""
+
+    @abstractmethod
+    async def save(self, job: GenerationJob) -> None:
+        """Create or replace a job."""
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[GenerationJob]:
+        """Job by id (None if unknown or expired)."""
+
+
+class InMemoryJobStore(JobStore):
+    """Process-local store: LRU of ``max_size`` jobs, each kept ``ttl`` seconds."""
+
+    def __init__(self, max_size: int = 10_000, ttl: int = 86400):
+        self._jobs = LocalCache(max_size=max_size, ttl=ttl)
+
+    async def save(self, job: GenerationJob) -> None:
+        # Stored as a dict: callers never share (and mutate) the stored job
+        self._jobs.set(job.id, job.to_dict())
+
+    async def get(self, job_id: str) -> Optional[GenerationJob]:
+        data = self._jobs.get(job_id)
+        return GenerationJob.from_dict(data) if data is not None else None
+
+
+class RedisJobStore(JobStore):
+    """
+    Redis store shared between workers: one JSON string per job, expiring after ``ttl``.
+
+    Args:
+        redis: redis.asyncio client (e.g. cache_manager.redis)
+        ttl: Seconds a job is kept after its last update
+        prefix: Key namespace
+    """
+
+    def __init__(self, redis: Any, ttl: int = 86400, prefix: str = "eduautismo:activity_job"):
+        self.redis = redis
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}:{job_id}"
+
+    async def save(self, job: GenerationJob) -> None:
+        await self.redis.set(self._key(job.id), json.dumps(job.to_dict()), ex=self.ttl)
+
+    async def get(self, job_id: str) -> Optional[GenerationJob]:
+        raw = await self.redis.get(self._key(job_id))
+        return GenerationJob.from_dict(json.loads(raw)) if raw is not None else None
+
+
+# ========== Queue ==========
+
+
+class ActivityJobQueue:
+    """
+    Bounded in-process queue of generation jobs served by asyncio workers.
+
+    Workers start on the first submission, in the running event loop.
+
+    Args:
+        store: Job state store
+        workers: Concurrent generations (OpenAI calls are further bounded by the rate limiter)
+        max_pending: Maximum jobs queued or running before rejecting with 503
+        session_factory: Creates the Session used for the short persist transaction
+        nlp_service: Service used for generation (default: get_nlp_service())
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int = 4,
+        max_pending: int = 100,
+        session_factory: Callable[[], Session] = SessionLocal,
+        nlp_service: Optional[NLPService] = None,
+    ):
+        self.store = store
+        self.workers = workers
+        self.max_pending = max_pending
+        self.session_factory = session_factory
+        self._nlp_service = nlp_service
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._pending = 0
+
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def nlp_service(self) -> NLPService:
+        if self._nlp_service is None:
+            self._nlp_service = get_nlp_service()
+        return self._nlp_service
+
+    async def submit(
+        self, activity_data: ActivityGenerate, student_profile: Dict[str, Any], teacher_id: UUID
+    ) -> GenerationJob:
+        """
+        Enqueue a generation; returns immediately with the queued job.
+
+        The caller has already checked that the teacher owns the student.
+
+        Raises:
+            MissingConfigurationError: If OpenAI is not configured
+            ServiceOverloadedError: If max_pending jobs are already queued or running
+        """
+        self.nlp_service  # configuration errors surface on submit, not in the worker
+
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise ServiceOverloadedError("geração de atividades", self.max_pending, retry_after=5)
+
+        job = GenerationJob(
+            id=uuid4().hex,
+            teacher_id=str(teacher_id),
+            student_id=str(activity_data.student_id),
+            params=activity_data.model_dump(mode="json"),
+            student_profile=student_profile,
+        )
+        await self.store.save(job)
+
+        self._ensure_workers()
+        self._pending += 1
+        self.submitted += 1
+        self._queue.put_nowait(job)
+
+        logger.info(f"Activity generation job queued: {job.id} for student {job.student_id}")
+        return job
+
+    async def get(self, job_id: str) -> Optional[GenerationJob]:
+        """Job state by id."""
+        return await self.store.get(job_id)
+
+    def _ensure_workers(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        # Replace workers that finished (e.g. cancelled with a previous event loop)
+        self._tasks = [task for task in self._tasks if not task.done()]
+        for i in range(len(self._tasks), self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(), name=f"activity-job-worker-{i}"))
+
+    async def _worker(self) -> None:
+        """Run queued jobs until cancelled; a failing job (or job store) never ends the worker."""
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Activity generation job could not be recorded: {job.id}: {e}")
+            finally:
+                self._pending -= 1
+                self._queue.task_done()
+
+    async def _run(self, job: GenerationJob) -> None:
+        """Generate (no DB connection held), then persist in a short transaction."""
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        await self.store.save(job)
+
+        try:
+            activity_data = ActivityGenerate(**job.params)
+            generated = await self.nlp_service.generate_activity(
+                student_profile=job.student_profile,
+                activity_type=ActivityType(activity_data.activity_type),
+                difficulty=DifficultyLevel(activity_data.difficulty),
+                duration_minutes=activity_data.duration_minutes,
+                theme=activity_data.theme,
+            )
+            activity_id = await asyncio.to_thread(self._persist, job, activity_data, generated)
+
+            job.status = JobStatus.SUCCEEDED
+            job.activity_id = str(activity_id)
+            self.succeeded += 1
+            logger.info(f"Activity generation job succeeded: {job.id} -> activity {activity_id}")
+
+        except asyncio.CancelledError:
+            job.status = JobStatus.FAILED
+            job.error = "Geração cancelada"
+            self.failed += 1
+            raise
+        except OpenAIError as e:
+            job.status = JobStatus.FAILED
+            job.error = e.message
+            self.failed += 1
+            logger.error(f"Activity generation job failed: {job.id}: {e}")
+        except Exception as e:
+            job.status = JobStatus.FAILED
+            job.error = "Erro ao gerar atividade"
+            self.failed += 1
+            logger.error(f"Activity generation job error: {job.id}: {e}")
+        finally:
+            job.finished_at = time.time()
+            await self.store.save(job)
+
+    def _persist(self, job: GenerationJob, activity_data: ActivityGenerate, generated: GeneratedActivity) -> UUID:
+        """Insert the Activity in its own short transaction (runs in a thread)."""
+        db = self.session_factory()
+        try:
+            activity = ActivityService.build_generated_activity(
+                activity_data, generated, job.student_profile, self.nlp_service.default_model, UUID(job.teacher_id)
+            )
+            activity.generation_metadata["job_id"] = job.id
+            db.add(activity)
+            db.commit()
+            return activity.id
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def shutdown(self) -> None:
+        """Cancel the workers; running jobs are marked failed."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queue = None
+        self._pending = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters and current load."""
+        return {
+            "store": type(self.store).__name__,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+
+# ========== Singleton Instance ==========
+
+_activity_job_queue: Optional[ActivityJobQueue] = None
+
+
+def create_job_store() -> JobStore:
+    """JobStore selected by ACTIVITY_JOB_STORE ("auto" = Redis when connected)."""
+    kind = settings.ACTIVITY_JOB_STORE
+    if kind == "redis" or (kind == "auto" and cache_manager.is_available):
+        if not cache_manager.is_available:
+            logger.warning("ACTIVITY_JOB_STORE=redis but Redis is not connected; using in-memory job store")
+        else:
+            return RedisJobStore(cache_manager.redis, ttl=settings.ACTIVITY_JOB_TTL)
+    return InMemoryJobStore(ttl=settings.ACTIVITY_JOB_TTL)
+
+
+def get_activity_job_queue() -> ActivityJobQueue:
+    """
+    Get singleton instance of the activity generation job queue.
+
+    Returns:
+        ActivityJobQueue configured from settings
+    """
+    global _activity_job_queue
+
+    if _activity_job_queue is None:
+        _activity_job_queue = ActivityJobQueue(
+            store=create_job_store(),
+            workers=settings.ACTIVITY_JOB_WORKERS,
+            max_pending=settings.ACTIVITY_JOB_MAX_PENDING,
+        )
+
+    return _activity_job_queue
+
+
+async def shutdown_activity_job_queue() -> None:
+    """Stop the workers of the singleton queue (application shutdown)."""
+    global _activity_job_queue
+
+    if _activity_job_queue is not None:
+        await _activity_job_queue.shutdown()
+        _activity_job_queue = None
@@ -4,17 +4,25 @@ Activity Service - EduAutismo IA
 Business logic for activity management and AI generation.
 """
 
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import ActivityNotFoundError, OpenAIError, PermissionDeniedError, StudentNotFoundError
+from app.db.pagination import apply_keyset, build_keyset_page
 from app.models.activity import Activity
 from app.models.student import Student
 from app.schemas.activity import ActivityCreate, ActivityGenerate, ActivityUpdate
-from app.services.nlp_service import get_nlp_service
+from app.services.activity_templates import TEMPLATE_MODEL
+from app.services.nlp_service import (
+    ActivityGenerationRequest,
+    BatchGenerationResult,
+    GeneratedActivity,
+    TemplateActivity,
+    get_nlp_service,
+)
 from app.utils.constants import ActivityType, DifficultyLevel
 from app.utils.logger import get_logger
 
@@ -72,26 +80,8 @@ class ActivityService:
             )
 
             # Create activity from generated content
-            activity = Activity(
-                title=generated.title,
-                description=generated.description,
-                activity_type=activity_data.activity_type,
-                difficulty=activity_data.difficulty,
-                duration_minutes=generated.duration_minutes,
-                objectives=generated.objectives,
-                materials=generated.materials,
-                instructions=generated.instructions,
-                adaptations=generated.adaptations,
-                visual_supports=generated.visual_supports,
-                success_criteria=generated.success_criteria,
-                theme=activity_data.theme,
-                generated_by_ai=True,
-                generation_metadata={
-                    "student_profile": student_profile,
-                    "model": nlp_service.default_model,
-                },
-                student_id=activity_data.student_id,
-                created_by_id=teacher_id,
+            activity = ActivityService.build_generated_activity(
+                activity_data, generated, student_profile, nlp_service.default_model, teacher_id
             )
 
             db.add(activity)
@@ -110,6 +100,112 @@ class ActivityService:
             logger.error(f"Error generating activity: {e}")
             raise
 
+    @staticmethod
+    async def generate_activities_batch(
+        db: AsyncSession,
+        items: List[ActivityGenerate],
+        teacher_id: UUID,
+    ) -> AsyncIterator[BatchGenerationResult]:
+        """
+        Generate many activities using AI concurrently.
+
+        Students are loaded and checked in one query before any generation
+        starts. Generations run through NLPService.generate_activities (bounded
+        by the OpenAI rate limiter) and each success is persisted as soon as it
+        completes, so callers can stream results instead of waiting for the
+        slowest item.
+
+        Args:
+            db: Database session
+            items: Generation parameters, one per activity
+            teacher_id: Teacher generating the activities
+
+        Yields:
+            BatchGenerationResult in completion order; result is the persisted
+            Activity, error the OpenAIError of a failed item
+
+        Raises:
+            StudentNotFoundError: If a student is not found
+            PermissionDeniedError: If teacher doesn't own a student
+        """
+        student_ids = {item.student_id for item in items}
+        result = await db.execute(select(Student).where(Student.id.in_(student_ids)))
+        students = {student.id: student for student in result.scalars().all()}
+
+        for student_id in student_ids:
+            student = students.get(student_id)
+            if not student:
+                raise StudentNotFoundError(str(student_id))
+            if student.teacher_id != teacher_id:
+                raise PermissionDeniedError(message="Você não tem permissão para criar atividades para este aluno")
+
+        profiles = {student_id: student.to_profile_dict() for student_id, student in students.items()}
+        nlp_service = get_nlp_service()
+        requests = [
+            ActivityGenerationRequest(
+                student_profile=profiles[item.student_id],
+                activity_type=item.activity_type,
+                difficulty=item.difficulty,
+                duration_minutes=item.duration_minutes,
+                theme=item.theme,
+            )
+            for item in items
+        ]
+
+        async for outcome in nlp_service.generate_activities(requests):
+            if not outcome.ok:
+                logger.error(f"AI generation failed for batch item {outcome.index}: {outcome.error}")
+                yield outcome
+                continue
+
+            item = items[outcome.index]
+            activity = ActivityService.build_generated_activity(
+                item, outcome.result, profiles[item.student_id], nlp_service.default_model, teacher_id
+            )
+            try:
+                db.add(activity)
+                await db.commit()
+                await db.refresh(activity)
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"Error saving generated activity: {e}")
+                raise
+
+            logger.info(f"Activity generated with AI: {activity.id} for student {item.student_id}")
+            yield BatchGenerationResult(index=outcome.index, result=activity)
+
+    @staticmethod
+    def build_generated_activity(
+        activity_data: ActivityGenerate,
+        generated: GeneratedActivity,
+        student_profile: dict,
+        model: str,
+        teacher_id: UUID,
+    ) -> Activity:
+        """Build an Activity from AI-generated content (or the template fallback, see TemplateActivity)."""
+        generation_metadata = {"student_profile": student_profile, "model": model}
+        if isinstance(generated, TemplateActivity):
+            generation_metadata.update(model=TEMPLATE_MODEL, fallback="circuit_open")
+
+        return Activity(
+            title=generated.title,
+            description=generated.description,
+            activity_type=activity_data.activity_type,
+            difficulty=activity_data.difficulty,
+            duration_minutes=generated.duration_minutes,
+            objectives=generated.objectives,
+            materials=generated.materials,
+            instructions=generated.instructions,
+            adaptations=generated.adaptations,
+            visual_supports=generated.visual_supports,
+            success_criteria=generated.success_criteria,
+            theme=activity_data.theme,
+            generated_by_ai=True,
+            generation_metadata=generation_metadata,
+            student_id=activity_data.student_id,
+            created_by_id=teacher_id,
+        )
+
     @staticmethod
     async def create_activity(
         db: AsyncSession,
@@ -219,6 +315,67 @@ class ActivityService:
         Returns:
             Tuple of (activities list, total count)
         """
+        query = ActivityService._build_list_query(student_id, teacher_id, activity_type, difficulty)
+
+        # Count
+        count_query = select(func.count()).select_from(query.subquery())
+        total_result = await db.execute(count_query)
+        total = total_result.scalar_one()
+
+        # Get results
+        query = query.offset(skip).limit(limit).order_by(Activity.created_at.desc())
+        result = await db.execute(query)
+        activities = result.scalars().all()
+
+        return list(activities), total
+
+    @staticmethod
+    async def list_activities_by_cursor(
+        db: AsyncSession,
+        student_id: Optional[UUID] = None,
+        teacher_id: Optional[UUID] = None,
+        activity_type: Optional[ActivityType] = None,
+        difficulty: Optional[DifficultyLevel] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        include_total: bool = False,
+    ) -> tuple[List[Activity], Optional[str], Optional[int]]:
+        """
+        List activities with keyset pagination on (created_at, id).
+
+        Args:
+            db: Database session
+            student_id: Filter by student
+            teacher_id: Filter by teacher's students
+            activity_type: Filter by type
+            difficulty: Filter by difficulty
+            cursor: Cursor of the previous page (None for first page)
+            limit: Max results
+            include_total: Also run COUNT (optional since it is expensive)
+
+        Returns:
+            Tuple of (activities list, next cursor, total count or None)
+        """
+        query = ActivityService._build_list_query(student_id, teacher_id, activity_type, difficulty)
+
+        total = None
+        if include_total:
+            total_result = await db.execute(select(func.count()).select_from(query.subquery()))
+            total = total_result.scalar_one()
+
+        result = await db.execute(apply_keyset(query, Activity.created_at, Activity.id, cursor, limit))
+        activities, next_cursor = build_keyset_page(result.scalars().all(), "created_at", limit)
+
+        return activities, next_cursor, total
+
+    @staticmethod
+    def _build_list_query(
+        student_id: Optional[UUID] = None,
+        teacher_id: Optional[UUID] = None,
+        activity_type: Optional[ActivityType] = None,
+        difficulty: Optional[DifficultyLevel] = None,
+    ):
+        """Build filtered select of published activities (without ordering/pagination)."""
         query = select(Activity)
 
         # Filters
@@ -238,17 +395,7 @@ class ActivityService:
         # Only published activities
         query = query.where(Activity.is_published.is_(True))
 
-        # Count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await db.execute(count_query)
-        total = total_result.scalar_one()
-
-        # Get results
-        query = query.offset(skip).limit(limit).order_by(Activity.created_at.desc())
-        result = await db.execute(query)
-        activities = result.scalars().all()
-
-        return list(activities), total
+        return query
 
     @staticmethod
     async def update_activity(
@@ -0,0 +1,105 @@
+"""
+Activity Templates - EduAutismo IA
+
+Deterministic activity content built from the student profile and the
+generation parameters, without calling OpenAI.
+
+Used by POST /activities/generate and, when the OpenAI circuit breaker is
+open, as the fallback of NLPService.generate_activity / stream_activity.
+
+Usage:
+    fields = template_activity_fields(student_profile, "cognitive", "easy", 30, theme="cores")
+"""
+
+from typing import Any, Dict, Optional
+
+# generation_metadata["model"] of template activities
+TEMPLATE_MODEL = "template-based"
+
+ACTIVITY_TYPE_NAMES = {
+    "cognitive": "Cognitiva",
+    "social": "Social",
+    "motor": "Motora",
+    "sensory": "Sensorial",
+    "communication": "Comunicação",
+    "daily_living": "Vida Diária",
+    "academic": "Acadêmica",
+}
+
+DIFFICULTY_NAMES = {
+    "very_easy": "Muito Fácil",
+    "easy": "Fácil",
+    "medium": "Médio",
+    "hard": "Difícil",
+    "very_hard": "Muito Difícil",
+}
+
+
+def template_activity_fields(
+    student_profile: Dict[str, Any],
+    activity_type: str,
+    difficulty: str,
+    duration_minutes: int,
+    theme: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Build template activity content.
+
+    Args:
+        student_profile: Student information (name and diagnosis are used)
+        activity_type: ActivityType value
+        difficulty: DifficultyLevel value
+        duration_minutes: Target duration
+        theme: Optional theme/topic
+
+    Returns:
+        Fields of a GeneratedActivity
+    """
+    activity_type = getattr(activity_type, "value", activity_type)
+    difficulty = getattr(difficulty, "value", difficulty)
+
+    type_name = ACTIVITY_TYPE_NAMES.get(activity_type, activity_type)
+    difficulty_name = DIFFICULTY_NAMES.get(difficulty, difficulty)
+    theme_text = f" - {theme}" if theme else ""
+
+    return {
+        "title": f"Atividade {type_name}{theme_text}",
+        "description": (
+            f"Atividade {type_name.lower()} personalizada para {student_profile.get('name')}, "
+            f"com nível de dificuldade {difficulty_name.lower()}. "
+            "Esta atividade foi criada considerando o perfil de aprendizagem do aluno: "
+            f"{student_profile.get('diagnosis')}."
+        ),
+        "duration_minutes": duration_minutes,
+        "objectives": [
+            f"Desenvolver habilidades de {type_name.lower()} adequadas ao nível do aluno",
+            "Promover engajamento através de atividades adaptadas",
+            "Respeitar o perfil sensorial e ritmo de aprendizagem",
+        ],
+        "materials": ["Material visual de apoio", "Recursos adaptados para TEA", "Ambiente estruturado e previsível"],
+        "instructions": [
+            "1. Prepare o ambiente garantindo que esteja calmo e organizado",
+            "2. Apresente a atividade de forma clara e visual",
+            "3. Divida a tarefa em pequenos passos",
+            "4. Ofereça suporte quando necessário",
+            "5. Reforce positivamente cada conquista",
+            "6. Permita pausas sensoriais se o aluno demonstrar necessidade",
+        ],
+        "adaptations": [
+            "Use apoios visuais (imagens, pictogramas)",
+            "Mantenha instruções curtas e diretas",
+            "Permita tempo extra para processamento",
+            "Reduza estímulos sensoriais desnecessários",
+        ],
+        "visual_supports": [
+            "Sequência visual dos passos",
+            "Timer visual para duração",
+            "Imagens de apoio relacionadas ao tema",
+        ],
+        "success_criteria": [
+            "Aluno consegue iniciar a atividade com suporte mínimo",
+            "Demonstra compreensão das instruções",
+            "Completa pelo menos 70% da atividade proposta",
+            "Mantém engajamento durante a maior parte do tempo",
+        ],
+    }
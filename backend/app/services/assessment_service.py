@@ -9,16 +9,20 @@ from uuid import UUID
 
 from sqlalchemy.orm import Session
 
+from app.core.events import AssessmentChanged, event_bus
 from app.core.exceptions import (
     ActivityNotFoundError,
     AssessmentNotFoundError,
     PermissionDeniedError,
     StudentNotFoundError,
 )
+from app.db.pagination import apply_keyset, build_keyset_page
 from app.models.activity import Activity
 from app.models.assessment import Assessment
 from app.models.student import Student
 from app.schemas.assessment import AssessmentCreate, AssessmentUpdate
+from app.services.ml_progress import progress_entry
+from app.services.progress_stats_service import ProgressStatsService
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -72,11 +76,15 @@ class AssessmentService:
         )
 
         db.add(assessment)
+        db.flush()
+        ProgressStatsService.record_create(db, assessment)
         db.commit()
         db.refresh(assessment)
 
         logger.info(f"Assessment created: {assessment.id} for activity {activity.id}")
 
+        event_bus.publish(AssessmentChanged("create", assessment.id, assessment.student_id))
+
         return assessment
 
     @staticmethod
@@ -136,6 +144,57 @@ class AssessmentService:
         Returns:
             Tuple of (assessments list, total count)
         """
+        query = AssessmentService._build_list_query(db, student_id, activity_id, teacher_id)
+
+        # Count
+        total = query.count()
+
+        # Get results - order_by MUST come before offset/limit
+        assessments = query.order_by(Assessment.created_at.desc()).offset(skip).limit(limit).all()
+
+        return assessments, total
+
+    @staticmethod
+    def list_assessments_by_cursor(
+        db: Session,
+        student_id: Optional[UUID] = None,
+        activity_id: Optional[UUID] = None,
+        teacher_id: Optional[UUID] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+        include_total: bool = False,
+    ) -> tuple[List[Assessment], Optional[str], Optional[int]]:
+        """
+        List assessments with keyset pagination on (created_at, id).
+
+        Args:
+            db: Database session
+            student_id: Filter by student
+            activity_id: Filter by activity
+            teacher_id: Filter by teacher's students
+            cursor: Cursor of the previous page (None for first page)
+            limit: Max results
+            include_total: Also run COUNT (optional since it is expensive)
+
+        Returns:
+            Tuple of (assessments list, next cursor, total count or None)
+        """
+        query = AssessmentService._build_list_query(db, student_id, activity_id, teacher_id)
+        total = query.count() if include_total else None
+
+        rows = apply_keyset(query, Assessment.created_at, Assessment.id, cursor, limit).all()
+        assessments, next_cursor = build_keyset_page(rows, "created_at", limit)
+
+        return assessments, next_cursor, total
+
+    @staticmethod
+    def _build_list_query(
+        db: Session,
+        student_id: Optional[UUID] = None,
+        activity_id: Optional[UUID] = None,
+        teacher_id: Optional[UUID] = None,
+    ):
+        """Build filtered assessment query (without ordering/pagination)."""
         query = db.query(Assessment)
 
         # Filters
@@ -148,13 +207,7 @@ class AssessmentService:
         if teacher_id:
             query = query.join(Student).filter(Student.teacher_id == teacher_id)
 
-        # Count
-        total = query.count()
-
-        # Get results - order_by MUST come before offset/limit
-        assessments = query.order_by(Assessment.created_at.desc()).offset(skip).limit(limit).all()
-
-        return assessments, total
+        return query
 
     @staticmethod
     def update_assessment(
@@ -190,15 +243,20 @@ class AssessmentService:
             raise PermissionDeniedError(message="Você não tem permissão para atualizar esta avaliação")
 
         # Update fields
+        previous = progress_entry(assessment)
         update_data = assessment_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(assessment, field, value)
 
+        db.flush()
+        ProgressStatsService.record_update(db, assessment, previous)
         db.commit()
         db.refresh(assessment)
 
         logger.info(f"Assessment updated: {assessment.id}")
 
+        event_bus.publish(AssessmentChanged("update", assessment.id, assessment.student_id))
+
         return assessment
 
     @staticmethod
@@ -232,9 +290,14 @@ class AssessmentService:
         if student and student.teacher_id != teacher_id:
             raise PermissionDeniedError(message="Você não tem permissão para deletar esta avaliação")
 
+        student_id = assessment.student_id
         db.delete(assessment)
+        db.flush()
+        ProgressStatsService.record_delete(db, student_id)
         db.commit()
 
         logger.info(f"Assessment deleted: {assessment_id}")
 
+        event_bus.publish(AssessmentChanged("delete", assessment_id, student_id))
+
         return True
@@ -4,15 +4,17 @@ Intervention Plan Service - Lógica de negócios para planos de intervenção.
 Gerenciamento de planos de intervenção multiprofissionais.
 """
 
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy import and_, func, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.orm import Session, lazyload
 
+from app.core.events import InterventionPlanChanged, event_bus
 from app.core.exceptions import ForbiddenException, NotFoundException, ValidationException
-from app.models.intervention_plan import InterventionPlan, PlanStatus, intervention_plan_professionals
+from app.db.pagination import apply_keyset, build_keyset_page
+from app.models.intervention_plan import InterventionPlan, PlanStatus, ReviewFrequency, intervention_plan_professionals
 from app.models.professional import Professional
 from app.models.student import Student
 from app.schemas.intervention_plan import (
@@ -24,6 +26,19 @@ from app.schemas.intervention_plan import (
     ProgressNoteCreate,
 )
 
+# Thresholds de frequência de revisão (em dias)
+REVIEW_FREQUENCY_THRESHOLDS = {
+    ReviewFrequency.DAILY: 1,
+    ReviewFrequency.WEEKLY: 7,
+    ReviewFrequency.BIWEEKLY: 14,
+    ReviewFrequency.MONTHLY: 30,
+    ReviewFrequency.QUARTERLY: 90,
+}
+
+# Ordem de prioridade (high→medium→low) e seu inverso
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+PRIORITIES = {rank: priority for priority, rank in PRIORITY_ORDER.items()}
+
 
 class InterventionPlanService:
     """Service para operações com planos de intervenção."""
@@ -86,6 +101,7 @@ class InterventionPlanService:
 
         self.db.commit()
         self.db.refresh(plan)
+        self._publish_change("create", plan)
 
         return plan
 
@@ -108,9 +124,13 @@ class InterventionPlanService:
             raise NotFoundException(f"Plano de intervenção {plan_id} não encontrado")
 
         # Atualizar needs_review automaticamente
+        previous_needs_review = plan.needs_review
         plan.update_needs_review()
         self.db.commit()
 
+        if plan.needs_review != previous_needs_review:
+            self._publish_change("needs_review", plan)
+
         return plan
 
     def update(
@@ -154,6 +174,7 @@ class InterventionPlanService:
 
         self.db.commit()
         self.db.refresh(plan)
+        self._publish_change("update", plan)
 
         return plan
 
@@ -178,8 +199,12 @@ class InterventionPlanService:
         if plan.created_by_id != professional_id:
             raise ForbiddenException("Apenas o profissional que criou o plano pode removê-lo")
 
+        # Evento montado antes da remoção (relacionamentos ainda acessíveis)
+        event = self._build_change_event("delete", plan)
+
         self.db.delete(plan)
         self.db.commit()
+        event_bus.publish(event)
 
         return True
 
@@ -235,6 +260,7 @@ class InterventionPlanService:
 
         self.db.commit()
         self.db.refresh(plan)
+        self._publish_change("progress_note", plan)
 
         return plan
 
@@ -253,6 +279,7 @@ class InterventionPlanService:
         plan.status = new_status
         self.db.commit()
         self.db.refresh(plan)
+        self._publish_change("status", plan)
 
         return plan
 
@@ -281,6 +308,7 @@ class InterventionPlanService:
         plan.professionals_involved.append(professional)
         self.db.commit()
         self.db.refresh(plan)
+        self._publish_change("add_professional", plan)
 
         return plan
 
@@ -309,6 +337,8 @@ class InterventionPlanService:
         plan.professionals_involved.remove(professional)
         self.db.commit()
         self.db.refresh(plan)
+        # Profissional removido também é afetado (suas listagens mudam)
+        self._publish_change("remove_professional", plan, extra_professional_ids=[professional_id_to_remove])
 
         return plan
 
@@ -329,6 +359,51 @@ class InterventionPlanService:
         Returns:
             Tupla (lista de planos, total)
         """
+        query = self._build_list_query(filters)
+
+        # Total de registros
+        total = query.count()
+
+        # Ordenação (mais recentes primeiro) e paginação
+        plans = query.order_by(InterventionPlan.created_at.desc()).offset(skip).limit(limit).all()
+
+        # OTIMIZAÇÃO: Removido loop que gerava N+1 queries (UPDATE para cada plano)
+        # O campo needs_review é atualizado:
+        # - Via @hybrid_property ao acessar o campo (cálculo em tempo real)
+        # - Via get_by_id() para planos individuais
+        # - Via script de manutenção periódica (scripts/intervention_plans_health_check.py)
+
+        return plans, total
+
+    def list_by_cursor(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[InterventionPlanFilter] = None,
+        include_total: bool = False,
+    ) -> tuple[List[InterventionPlan], Optional[str], Optional[int]]:
+        """
+        Lista planos com paginação keyset em (created_at, id).
+
+        Args:
+            cursor: Cursor da página anterior (None para a primeira página)
+            limit: Número máximo de registros
+            filters: Filtros opcionais
+            include_total: Se True, também executa COUNT (opcional por ser caro)
+
+        Returns:
+            Tupla (lista de planos, próximo cursor, total ou None)
+        """
+        query = self._build_list_query(filters)
+        total = query.count() if include_total else None
+
+        rows = apply_keyset(query, InterventionPlan.created_at, InterventionPlan.id, cursor, limit).all()
+        plans, next_cursor = build_keyset_page(rows, "created_at", limit)
+
+        return plans, next_cursor, total
+
+    def _build_list_query(self, filters: Optional[InterventionPlanFilter] = None):
+        """Query de listagem com filtros aplicados (sem ordenação/paginação)."""
         query = self.db.query(InterventionPlan)
 
         # Aplicar filtros
@@ -382,19 +457,7 @@ class InterventionPlanService:
                     )
                 )
 
-        # Total de registros
-        total = query.count()
-
-        # Ordenação (mais recentes primeiro) e paginação
-        plans = query.order_by(InterventionPlan.created_at.desc()).offset(skip).limit(limit).all()
-
-        # OTIMIZAÇÃO: Removido loop que gerava N+1 queries (UPDATE para cada plano)
-        # O campo needs_review é atualizado:
-        # - Via @hybrid_property ao acessar o campo (cálculo em tempo real)
-        # - Via get_by_id() para planos individuais
-        # - Via script de manutenção periódica (scripts/intervention_plans_health_check.py)
-
-        return plans, total
+        return query
 
     def get_by_student(
         self,
@@ -487,40 +550,156 @@ class InterventionPlanService:
         limit: int = 50,
         priority_filter: Optional[str] = None,
         professional_id: Optional[UUID] = None,
+        use_sql: bool = True,
     ) -> dict:
         """
         Lista planos de intervenção que precisam revisão com priorização.
 
-        OTIMIZADO: Aplica paginação no banco e calcula prioridade eficientemente.
-        Evita carregar todos os registros em memória.
+        Por padrão a prioridade, as contagens e a paginação são calculadas no
+        banco (CASE sobre review_frequency/last_reviewed_at + ORDER BY/OFFSET/LIMIT),
+        de modo que o custo por página não cresce com o número de planos ativos.
+        O modo em memória (use_sql=False) é mantido como referência e produz
+        exatamente a mesma ordenação.
 
         Args:
             skip: Número de registros para pular
             limit: Número máximo de registros
             priority_filter: Filtrar por prioridade (high/medium/low)
             professional_id: Filtrar por profissional envolvido (opcional)
+            use_sql: Se True, calcula prioridade e pagina no banco (default: True)
 
         Returns:
             Dict com items, total e contagens por prioridade
         """
-        from app.models.intervention_plan import ReviewFrequency
-
-        # Thresholds de frequência (em dias)
-        frequency_thresholds = {
-            ReviewFrequency.DAILY: 1,
-            ReviewFrequency.WEEKLY: 7,
-            ReviewFrequency.BIWEEKLY: 14,
-            ReviewFrequency.MONTHLY: 30,
-            ReviewFrequency.QUARTERLY: 90,
+        if use_sql:
+            return self._get_pending_review_plans_sql(skip, limit, priority_filter, professional_id)
+
+        return self._get_pending_review_plans_in_memory(skip, limit, priority_filter, professional_id)
+
+    def _pending_review_base_query(self, professional_id: Optional[UUID] = None):
+        """Query base - apenas planos ativos que precisam revisão, com o estudante."""
+        query = (
+            self.db.query(InterventionPlan, Student)
+            .join(Student, InterventionPlan.student_id == Student.id)
+            .filter(InterventionPlan.status == PlanStatus.ACTIVE, InterventionPlan.needs_review == True)  # noqa: E712
+        )
+
+        # Filtrar por profissional se especificado
+        if professional_id:
+            query = query.filter(
+                or_(
+                    InterventionPlan.created_by_id == professional_id,
+                    InterventionPlan.professionals_involved.any(Professional.id == professional_id),
+                )
+            )
+
+        return query
+
+    @staticmethod
+    def _priority_rank_expression(today: date):
+        """
+        Expressão SQL com o rank de prioridade (0=high, 1=medium, 2=low).
+
+        Equivalente a calculate_priority(): compara last_reviewed_at com as datas
+        de corte (hoje - threshold e hoje - 2x threshold) de cada frequência, o que
+        evita aritmética de datas específica de dialeto (PostgreSQL/SQLite).
+        """
+        default_threshold = REVIEW_FREQUENCY_THRESHOLDS[ReviewFrequency.WEEKLY]
+
+        def cutoff(multiplier: int):
+            # Comparação com a coluna garante o bind do Enum no formato persistido
+            return case(
+                *[
+                    (InterventionPlan.review_frequency == frequency, today - timedelta(days=threshold * multiplier))
+                    for frequency, threshold in REVIEW_FREQUENCY_THRESHOLDS.items()
+                ],
+                else_=today - timedelta(days=default_threshold * multiplier),
+            )
+
+        high_cutoff = cutoff(2)
+        medium_cutoff = cutoff(1)
+
+        return case(
+            (InterventionPlan.last_reviewed_at.is_(None), 0),  # Nunca revisado
+            (InterventionPlan.last_reviewed_at <= high_cutoff, 0),  # Atrasado >= 2x o período
+            (InterventionPlan.last_reviewed_at <= medium_cutoff, 1),  # Atrasado >= 1x o período
+            else_=2,  # Dentro do período
+        )
+
+    def _get_pending_review_plans_sql(
+        self,
+        skip: int,
+        limit: int,
+        priority_filter: Optional[str],
+        professional_id: Optional[UUID],
+    ) -> dict:
+        """Prioridade, contagens e paginação calculadas no banco."""
+        today = date.today()
+        priority_rank = self._priority_rank_expression(today)
+
+        base_query = self._pending_review_base_query(professional_id)
+        if priority_filter:
+            # Prioridade desconhecida não casa com nenhum plano (mesmo comportamento do modo em memória)
+            base_query = base_query.filter(priority_rank == PRIORITY_ORDER.get(priority_filter, -1))
+
+        # Contagens por prioridade em um único agregado agrupado.
+        # Subquery evita repetir a expressão CASE (com parâmetros) no GROUP BY.
+        ranks = base_query.with_entities(priority_rank.label("priority_rank")).subquery()
+        counts = dict(
+            self.db.query(ranks.c.priority_rank, func.count()).group_by(ranks.c.priority_rank).all()
+        )
+        high_count = counts.get(0, 0)
+        medium_count = counts.get(1, 0)
+        low_count = counts.get(2, 0)
+
+        # Ordenar por prioridade (high→medium→low) e dias atrasado (desc).
+        # Dias desde a revisão decrescente == last_reviewed_at crescente
+        # (nunca revisados primeiro); id desempata de forma determinística.
+        # Relacionamentos selectin (ex.: Student.intervention_plans) não são
+        # necessários para montar os itens e custariam O(N) por página.
+        rows = (
+            base_query.add_columns(priority_rank.label("priority_rank"))
+            .options(lazyload("*"))
+            .order_by(
+                priority_rank,
+                InterventionPlan.last_reviewed_at.is_(None).desc(),
+                InterventionPlan.last_reviewed_at.asc(),
+                InterventionPlan.id,
+            )
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+        response_items = []
+        for plan, student, rank in rows:
+            days_since_review = (today - plan.last_reviewed_at).days if plan.last_reviewed_at else None
+            response_items.append(self._build_pending_review_item(plan, student, days_since_review, PRIORITIES[rank]))
+
+        return {
+            "items": response_items,
+            "total": high_count + medium_count + low_count,
+            "high_priority": high_count,
+            "medium_priority": medium_count,
+            "low_priority": low_count,
         }
 
+    def _get_pending_review_plans_in_memory(
+        self,
+        skip: int,
+        limit: int,
+        priority_filter: Optional[str],
+        professional_id: Optional[UUID],
+    ) -> dict:
+        """Prioridade, contagens e paginação calculadas em Python (referência)."""
+
         def calculate_priority(plan) -> str:
             """Calcula prioridade baseado em dias desde última revisão."""
             if plan.last_reviewed_at is None:
                 return "high"  # Nunca revisado
 
             days_since_review = (date.today() - plan.last_reviewed_at).days
-            threshold = frequency_thresholds.get(plan.review_frequency, 7)
+            threshold = REVIEW_FREQUENCY_THRESHOLDS.get(plan.review_frequency, 7)
 
             if days_since_review >= threshold * 2:
                 return "high"  # Atrasado >= 2x o período
@@ -529,25 +708,8 @@ class InterventionPlanService:
             else:
                 return "low"  # Dentro do período
 
-        # Query base - apenas planos ativos que precisam revisão
-        base_query = (
-            self.db.query(InterventionPlan, Student)
-            .join(Student, InterventionPlan.student_id == Student.id)
-            .filter(InterventionPlan.status == PlanStatus.ACTIVE, InterventionPlan.needs_review == True)
-        )
-
-        # Filtrar por profissional se especificado
-        if professional_id:
-            base_query = base_query.filter(
-                or_(
-                    InterventionPlan.created_by_id == professional_id,
-                    InterventionPlan.professionals_involved.any(Professional.id == professional_id),
-                )
-            )
-
         # Buscar TODOS os planos (necessário para calcular prioridades e ordenar)
-        # OTIMIZAÇÃO: Usar lazy loading seletivo - carregar apenas campos necessários
-        all_plans_students = base_query.all()
+        all_plans_students = self._pending_review_base_query(professional_id).order_by(InterventionPlan.id).all()
 
         # Calcular prioridade e criar items estruturados
         items_with_metadata = []
@@ -576,40 +738,22 @@ class InterventionPlanService:
         low_count = sum(1 for item in items_with_metadata if item["priority"] == "low")
         total = len(items_with_metadata)
 
-        # Ordenar por prioridade (high→medium→low) e dias atrasado (desc)
-        priority_order = {"high": 0, "medium": 1, "low": 2}
+        # Ordenar por prioridade (high→medium→low) e dias atrasado (desc);
+        # nunca revisados primeiro, como no modo SQL
         items_with_metadata.sort(
             key=lambda x: (
-                priority_order[x["priority"]],
-                -(x["days_since_review"] if x["days_since_review"] is not None else 999),
+                PRIORITY_ORDER[x["priority"]],
+                -(x["days_since_review"] if x["days_since_review"] is not None else float("inf")),
             )
         )
 
-        # Aplicar paginação EM MEMÓRIA (já filtr ado e ordenado)
+        # Aplicar paginação EM MEMÓRIA (já filtrado e ordenado)
         paginated_items = items_with_metadata[skip : skip + limit]
 
-        # Construir items de resposta
-        response_items = []
-        for item in paginated_items:
-            plan = item["plan"]
-            student = item["student"]
-
-            response_items.append(
-                PendingReviewItem(
-                    id=plan.id,
-                    title=plan.title,
-                    student_id=student.id,
-                    student_name=student.name,
-                    review_frequency=plan.review_frequency,
-                    last_reviewed_at=plan.last_reviewed_at,
-                    days_since_review=item["days_since_review"],
-                    created_at=plan.created_at,
-                    end_date=plan.end_date,
-                    days_remaining=plan.days_remaining,
-                    priority=item["priority"],
-                    created_by_id=plan.created_by_id,
-                )
-            )
+        response_items = [
+            self._build_pending_review_item(item["plan"], item["student"], item["days_since_review"], item["priority"])
+            for item in paginated_items
+        ]
 
         return {
             "items": response_items,
@@ -619,6 +763,56 @@ class InterventionPlanService:
             "low_priority": low_count,
         }
 
+    @staticmethod
+    def _build_pending_review_item(
+        plan: InterventionPlan,
+        student: Student,
+        days_since_review: Optional[int],
+        priority: str,
+    ) -> PendingReviewItem:
+        """Constrói item de resposta da lista de revisões pendentes."""
+        return PendingReviewItem(
+            id=plan.id,
+            title=plan.title,
+            student_id=student.id,
+            student_name=student.name,
+            review_frequency=plan.review_frequency,
+            last_reviewed_at=plan.last_reviewed_at,
+            days_since_review=days_since_review,
+            created_at=plan.created_at,
+            end_date=plan.end_date,
+            days_remaining=plan.days_remaining,
+            priority=priority,
+            created_by_id=plan.created_by_id,
+        )
+
+    def _build_change_event(
+        self,
+        action: str,
+        plan: InterventionPlan,
+        extra_professional_ids: Optional[List[UUID]] = None,
+    ) -> InterventionPlanChanged:
+        """Monta evento de alteração com o plano, o estudante e os profissionais afetados."""
+        professional_ids = {plan.created_by_id}
+        professional_ids.update(p.id for p in plan.professionals_involved)
+        professional_ids.update(extra_professional_ids or [])
+
+        return InterventionPlanChanged(
+            action=action,
+            plan_id=plan.id,
+            student_id=plan.student_id,
+            professional_ids=frozenset(professional_ids),
+        )
+
+    def _publish_change(
+        self,
+        action: str,
+        plan: InterventionPlan,
+        extra_professional_ids: Optional[List[UUID]] = None,
+    ) -> None:
+        """Publica InterventionPlanChanged após o commit (ex.: invalidação de cache)."""
+        event_bus.publish(self._build_change_event(action, plan, extra_professional_ids))
+
     def _is_professional_involved(self, plan: InterventionPlan, professional_id: UUID) -> bool:
         """Verifica se profissional está envolvido no plano."""
         if plan.created_by_id == professional_id:
@@ -5,15 +5,28 @@ Extensão do Serviço de Planos de Intervenção com Cache
 Adiciona funcionalidades de cache Redis ao serviço de planos de intervenção
 para melhorar performance de consultas frequentes.
 
+Invalidação orientada a eventos: cada escrita em InterventionPlanService
+publica InterventionPlanChanged (plano, estudante e profissionais afetados)
+e apenas as entradas marcadas com essas tags são removidas. Entradas sem
+filtro de profissional dependem de todos os planos e usam a tag
+"pending_review:global". Escritas feitas no próprio event loop apenas agendam
+a invalidação; as leituras cacheadas aguardam essas invalidações antes de
+consultar o cache (cache_manager.flush_invalidations).
+
+As entradas de pending_review expiram no máximo no fim do dia, pois
+days_since_review e a prioridade são calculados a partir da data atual.
+
 Autor: Claude Code
 Data: 2025-11-24
 """
 
 import logging
-from typing import Optional
+from datetime import datetime, time, timedelta
+from typing import List, Optional
 from uuid import UUID
 
 from app.core.cache import cache_manager
+from app.core.events import InterventionPlanChanged, event_bus
 from app.services.intervention_plan_service import InterventionPlanService
 
 logger = logging.getLogger(__name__)
@@ -27,7 +40,13 @@ class CachedInterventionPlanService(InterventionPlanService):
     """
 
     CACHE_PREFIX = "intervention_plans"
-    PENDING_REVIEW_CACHE_TTL = 300  # 5 minutos
+    # Invalidação por eventos cobre as escritas; o TTL também termina no fim do
+    # dia, pois days_since_review e a prioridade dependem da data atual
+    PENDING_REVIEW_CACHE_TTL = 6 * 3600  # 6 horas
+
+    # Tags de invalidação
+    PENDING_REVIEW_TAG = "pending_review"
+    PENDING_REVIEW_GLOBAL_TAG = "pending_review:global"
 
     async def get_pending_review_plans_cached(
         self,
@@ -58,6 +77,9 @@ class CachedInterventionPlanService(InterventionPlanService):
                 professional_id=professional_id,
             )
 
+        # Escritas feitas neste event loop apenas agendam a invalidação
+        await cache_manager.flush_invalidations()
+
         # Gerar chave de cache baseada nos parâmetros
         cache_key = f"pending_review:{skip}:{limit}:{priority_filter}:{professional_id}"
 
@@ -97,78 +119,69 @@ class CachedInterventionPlanService(InterventionPlanService):
         # Serializar result para cache (converter objetos SQLAlchemy)
         serializable_result = self._serialize_pending_review_result(result)
 
-        # Armazenar no cache
+        # Armazenar no cache, marcado com as tags das quais depende
         await cache_manager.set(
             cache_key,
             serializable_result,
-            ttl=self.PENDING_REVIEW_CACHE_TTL,
+            ttl=self._pending_review_ttl(),
             prefix=self.CACHE_PREFIX,
+            tags=self._pending_review_tags(professional_id),
         )
 
         return result
 
-    def _serialize_pending_review_result(self, result: dict) -> dict:
+    @classmethod
+    def _pending_review_ttl(cls, now: Optional[datetime] = None) -> int:
         """
-        Serializa resultado de pending_review para cache.
+        TTL de uma entrada de pending_review: PENDING_REVIEW_CACHE_TTL, limitado
+        ao fim do dia corrente (days_since_review e prioridades mudam à meia-noite).
+
+        Args:
+            now: Momento atual (default: datetime.now())
 
-        Converte objetos SQLAlchemy para dicionários serializáveis.
+        Returns:
+            TTL em segundos (mínimo 1)
         """
-        serialized_items = []
-
-        for item in result["items"]:
-            plan = item["plan"]
-            student = item["student"]
-
-            serialized_item = {
-                "plan": {
-                    "id": str(plan.id),
-                    "title": plan.title,
-                    "description": plan.description,
-                    "status": plan.status.value if hasattr(plan.status, "value") else plan.status,
-                    "review_frequency": (
-                        plan.review_frequency.value
-                        if hasattr(plan.review_frequency, "value")
-                        else plan.review_frequency
-                    ),
-                    "needs_review": plan.needs_review,
-                    "last_reviewed_at": (
-                        plan.last_reviewed_at.isoformat() if plan.last_reviewed_at else None
-                    ),
-                    "created_at": plan.created_at.isoformat() if plan.created_at else None,
-                    "updated_at": plan.updated_at.isoformat() if plan.updated_at else None,
-                    "student_id": str(plan.student_id),
-                },
-                "student": {
-                    "id": str(student.id),
-                    "name": student.name if hasattr(student, "name") else None,
-                    "age": student.age if hasattr(student, "age") else None,
-                },
-                "days_since_review": item["days_since_review"],
-                "priority": item["priority"],
-            }
+        now = now or datetime.now()
+        end_of_day = datetime.combine(now.date() + timedelta(days=1), time.min)
+        return max(1, min(cls.PENDING_REVIEW_CACHE_TTL, int((end_of_day - now).total_seconds())))
 
-            serialized_items.append(serialized_item)
+    def _serialize_pending_review_result(self, result: dict) -> dict:
+        """
+        Serializa resultado de pending_review para cache.
 
+        Converte os PendingReviewItem para dicionários; UUID e datas são
+        preservados pelo codec do cache.
+        """
         return {
-            "items": serialized_items,
+            "items": [item.model_dump() for item in result["items"]],
             "total": result["total"],
             "high_priority": result["high_priority"],
             "medium_priority": result["medium_priority"],
             "low_priority": result["low_priority"],
         }
 
+    @classmethod
+    def _pending_review_tags(cls, professional_id: Optional[UUID] = None) -> List[str]:
+        """
+        Tags de uma entrada de pending_review.
+
+        Com filtro de profissional a entrada só depende dos planos em que ele
+        está envolvido; sem filtro depende de todos os planos.
+        """
+        scope_tag = f"professional:{professional_id}" if professional_id else cls.PENDING_REVIEW_GLOBAL_TAG
+        return [cls.PENDING_REVIEW_TAG, scope_tag]
+
     async def invalidate_pending_review_cache(self):
         """
         Invalida todo cache de pending_review.
 
-        Deve ser chamado quando:
-        - Um plano é criado
-        - Um plano é atualizado
-        - Um plano é revisado
-        - Status de plano é alterado
+        Escritas em planos já invalidam apenas as entradas afetadas via
+        eventos (ver invalidate_on_plan_change); use este método para
+        invalidação manual completa.
         """
-        count = await cache_manager.delete_pattern(
-            "pending_review:*", prefix=self.CACHE_PREFIX
+        count = await cache_manager.invalidate_tags(
+            [self.PENDING_REVIEW_TAG], prefix=self.CACHE_PREFIX
         )
 
         logger.info(
@@ -197,6 +210,40 @@ class CachedInterventionPlanService(InterventionPlanService):
         return deleted
 
 
+# Invalidação orientada a eventos
+
+def plan_change_tags(event: InterventionPlanChanged) -> List[str]:
+    """
+    Tags invalidadas por uma alteração de plano.
+
+    Args:
+        event: Evento publicado por InterventionPlanService
+
+    Returns:
+        Tags do plano, do estudante, dos profissionais afetados e das
+        listagens sem filtro de profissional
+    """
+    tags = [
+        CachedInterventionPlanService.PENDING_REVIEW_GLOBAL_TAG,
+        f"plan:{event.plan_id}",
+        f"student:{event.student_id}",
+    ]
+    tags.extend(f"professional:{professional_id}" for professional_id in sorted(event.professional_ids, key=str))
+    return tags
+
+
+def invalidate_on_plan_change(event: InterventionPlanChanged) -> None:
+    """Handler de InterventionPlanChanged - remove apenas entradas dependentes."""
+    tags = plan_change_tags(event)
+    cache_manager.invalidate_tags_nowait(tags, prefix=CachedInterventionPlanService.CACHE_PREFIX)
+    logger.debug(f"Plan {event.action} invalidated cache tags", extra={"plan_id": str(event.plan_id), "tags": tags})
+
+
+def register_cache_invalidation() -> None:
+    """Registra invalidação de cache nos eventos de planos (idempotente)."""
+    event_bus.subscribe(InterventionPlanChanged, invalidate_on_plan_change)
+
+
 # Métodos helper para integração com rotas
 
 async def get_cached_pending_review_plans(
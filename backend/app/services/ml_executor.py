@@ -0,0 +1,349 @@
+"""
+ML Executor - EduAutismo IA
+
+Process pool for CPU-bound ML scoring, awaited from async routes.
+
+Scoring a feature vector (scaling, forest traversal, recommendations) holds
+the GIL; run in the event loop or in the server's thread pool, a burst of
+predictions stalls unrelated requests (health checks, notifications). The
+executor runs it in a bounded ProcessPoolExecutor instead:
+
+- every child process builds its own MLService and loads the models once
+  (pool initializer), so tasks only ship feature dicts and results
+- backpressure: at most ``max_pending`` tasks queued or running; further
+  submissions raise ServiceOverloadedError (HTTP 503) instead of queueing
+  without bound
+- per-task timeout (TaskTimeoutError, HTTP 504)
+- per-operation timing metrics: queue wait and run time (p50/p95/p99)
+
+The parent process still loads features (database work, feature cache);
+only the scoring crosses the process boundary.
+
+With ``max_workers=0`` tasks run in a thread of the parent process with the
+shared MLService (development and tests).
+
+Usage:
+    executor = get_ml_executor()
+    result = await executor.predict_risk(features)
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.exceptions import ServiceOverloadedError, TaskTimeoutError
+from app.services.ml_service import MLService, get_ml_service
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Samples kept per operation for latency percentiles
+METRICS_WINDOW = 1000
+
+
+# ========== Child Process ==========
+
+_worker_service: Optional[MLService] = None
+
+
+def _init_worker(model_version: str) -> None:
+    """Pool initializer: build the child's MLService and load the models once."""
+    global _worker_service
+
+    service = MLService()
+    try:
+        service.load_behavioral_model(model_version)
+    except Exception as e:
+        logger.warning(f"ML worker {os.getpid()} could not load behavioral model: {e}")
+    service.load_success_predictor(model_version)
+    _worker_service = service
+
+
+def _service() -> MLService:
+    """MLService of this process (the shared one outside pool children)."""
+    return _worker_service if _worker_service is not None else get_ml_service()
+
+
+def _timed(func: Callable, args: Tuple) -> Tuple[Any, float]:
+    """Run func(*args) and return (result, run seconds)."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def _ping() -> int:
+    """No-op task used to start (and preload) the worker processes."""
+    return os.getpid()
+
+
+def _predict_risk(features: Dict[str, float]) -> Dict[str, Any]:
+    return _service().predict_risk_from_features(features)
+
+
+def _predict_risk_batch(features_list: List[Dict[str, float]]) -> List[Dict[str, Any]]:
+    return _service().predict_risk_from_features_batch(features_list)
+
+
+def _predict_activity_success(student_features: Dict[str, float], activity_data: Dict[str, Any]) -> Dict[str, Any]:
+    return _service().predict_activity_success_from_features(student_features, activity_data)
+
+
+# ========== Metrics ==========
+
+
+class TaskMetrics:
+    """Counters and latency samples of one operation."""
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.wait_ms: Deque[float] = deque(maxlen=window)
+        self.run_ms: Deque[float] = deque(maxlen=window)
+
+    def record(self, wait_ms: float, run_ms: float) -> None:
+        self.completed += 1
+        self.wait_ms.append(wait_ms)
+        self.run_ms.append(run_ms)
+
+    @staticmethod
+    def _percentiles(samples: Deque[float]) -> Dict[str, float]:
+        if not samples:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+        return {
+            "p50": round(ordered[int(last * 0.50)], 3),
+            "p95": round(ordered[int(last * 0.95)], 3),
+            "p99": round(ordered[int(last * 0.99)], 3),
+            "max": round(ordered[-1], 3),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "wait_ms": self._percentiles(self.wait_ms),
+            "run_ms": self._percentiles(self.run_ms),
+        }
+
+
+# ========== Executor ==========
+
+
+class MLExecutor:
+    """
+    Bounded process pool for ML scoring.
+
+    Args:
+        max_workers: Child processes (0 = run in a thread of this process)
+        max_pending: Maximum tasks queued or running before rejecting with 503
+        task_timeout: Seconds a caller waits for a task before 504
+        model_version: Registry version loaded by each child
+        start_method: multiprocessing start method ("spawn" is safe with
+            the server's threads; "fork"/"forkserver" start faster)
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: int = 32,
+        task_timeout: float = 10.0,
+        model_version: str = "production",
+        start_method: str = "spawn",
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.task_timeout = task_timeout
+        self.model_version = model_version
+        self.start_method = start_method
+
+        self._pool = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._metrics: Dict[str, TaskMetrics] = {}
+
+    # ========== Lifecycle ==========
+
+    def _get_pool(self):
+        """Pool, created on first use."""
+        with self._lock:
+            if self._pool is None:
+                if self.max_workers > 0:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context(self.start_method),
+                        initializer=_init_worker,
+                        initargs=(self.model_version,),
+                    )
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ml-executor")
+                logger.info(
+                    "ML executor started",
+                    extra={"workers": self.max_workers, "max_pending": self.max_pending},
+                )
+            return self._pool
+
+    async def warm_up(self) -> List[int]:
+        """Start the workers (the initializer loads the models) before the first request."""
+        return await asyncio.gather(*(self.run("ping", _ping) for _ in range(max(self.max_workers, 1))))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers; queued tasks are cancelled."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+            logger.info("ML executor stopped")
+
+    # ========== Tasks ==========
+
+    async def run(self, operation: str, func: Callable, *args: Any) -> Any:
+        """
+        Run func(*args) in the pool and await the result.
+
+        Args:
+            operation: Name under which timing metrics are recorded
+            func: Module-level (picklable) function
+            *args: Picklable arguments
+
+        Raises:
+            ServiceOverloadedError: If max_pending tasks are already queued or running
+            TaskTimeoutError: If the task does not finish within task_timeout
+        """
+        metrics = self._metrics.setdefault(operation, TaskMetrics())
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                metrics.rejected += 1
+                raise ServiceOverloadedError("ML", self.max_pending)
+            self._pending += 1
+
+        submitted = time.perf_counter()
+        try:
+            pool, future = self._submit(func, args)
+        except BaseException:
+            self._release()
+            raise
+        # Released when the task really ends, even if the caller stops waiting
+        future.add_done_callback(lambda _: self._release())
+
+        try:
+            result, run_seconds = await asyncio.wait_for(asyncio.wrap_future(future), self.task_timeout)
+        except asyncio.TimeoutError:
+            future.cancel()  # only effective while still queued
+            metrics.timeouts += 1
+            logger.warning(f"ML task timed out: {operation}", extra={"timeout": self.task_timeout})
+            raise TaskTimeoutError("ML", self.task_timeout)
+        except BrokenProcessPool:
+            metrics.failed += 1
+            self._reset_broken_pool(pool)
+            raise
+        except Exception:
+            metrics.failed += 1
+            raise
+
+        total_ms = (time.perf_counter() - submitted) * 1000
+        run_ms = run_seconds * 1000
+        metrics.record(wait_ms=max(total_ms - run_ms, 0.0), run_ms=run_ms)
+        return result
+
+    def _submit(self, func: Callable, args: Tuple) -> Tuple[Executor, Future]:
+        pool = self._get_pool()
+        try:
+            return pool, pool.submit(_timed, func, args)
+        except BrokenProcessPool:
+            self._reset_broken_pool(pool)
+            pool = self._get_pool()
+            return pool, pool.submit(_timed, func, args)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _reset_broken_pool(self, failed_pool: Executor) -> None:
+        """
+        Drop a pool whose child died (e.g. OOM kill); the next task starts a new one.
+
+        Only ``failed_pool`` is dropped: when several tasks see the same broken
+        pool, the first one resets it and the others leave its replacement alone.
+        """
+        with self._lock:
+            if self._pool is not failed_pool:
+                return
+            self._pool = None
+        logger.error("ML executor pool broken, restarting workers")
+        failed_pool.shutdown(wait=False, cancel_futures=True)
+
+    # ========== Operations ==========
+
+    async def predict_risk(self, features: Dict[str, float]) -> Dict[str, Any]:
+        """Risk level for one student's features (MLService.predict_risk_from_features)."""
+        return await self.run("predict_risk", _predict_risk, features)
+
+    async def predict_risk_batch(self, features_list: List[Dict[str, float]]) -> List[Dict[str, Any]]:
+        """Risk levels for many students' features in one task (one model call)."""
+        return await self.run("predict_risk_batch", _predict_risk_batch, features_list)
+
+    async def predict_activity_success(
+        self, student_features: Dict[str, float], activity_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Activity success prediction (MLService.predict_activity_success_from_features)."""
+        return await self.run("predict_activity_success", _predict_activity_success, student_features, activity_data)
+
+    # ========== Metrics ==========
+
+    @property
+    def pending(self) -> int:
+        """Tasks queued or running."""
+        return self._pending
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool configuration, current queue depth and per-operation metrics."""
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "running": self._pool is not None,
+            "operations": {name: metrics.snapshot() for name, metrics in self._metrics.items()},
+        }
+
+
+# ========== Singleton Instance ==========
+
+_ml_executor: Optional[MLExecutor] = None
+
+
+def get_ml_executor() -> MLExecutor:
+    """
+    Get singleton instance of the ML executor (pool starts on first task).
+
+    Returns:
+        MLExecutor configured from settings
+    """
+    global _ml_executor
+
+    if _ml_executor is None:
+        _ml_executor = MLExecutor(
+            max_workers=settings.ML_EXECUTOR_WORKERS,
+            max_pending=settings.ML_EXECUTOR_MAX_PENDING,
+            task_timeout=settings.ML_EXECUTOR_TASK_TIMEOUT,
+        )
+
+    return _ml_executor
+
+
+def shutdown_ml_executor() -> None:
+    """Stop the singleton executor's workers (application shutdown)."""
+    if _ml_executor is not None:
+        _ml_executor.shutdown(wait=False)
@@ -0,0 +1,126 @@
+"""
+ML Feature Cache - EduAutismo IA
+
+In-process cache of per-student ML inputs (feature vectors).
+
+Entries are validated against a watermark read with one aggregate query:
+
+    (student.updated_at, max(assessment.updated_at), assessment count)
+
+Any write to the student or to one of its assessments changes the watermark,
+so a stale entry is never returned, including writes made by other worker
+processes. Writes through AssessmentService also publish AssessmentChanged,
+which drops the student's entry in this process right away.
+
+A hit skips loading the assessment history and re-extracting features.
+
+Usage:
+    register_feature_cache_invalidation()  # once at startup
+    features = student_feature_cache.get(student_id, watermark, "features")
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.cache import LocalCache
+from app.core.events import AssessmentChanged, event_bus
+from app.models.assessment import Assessment
+from app.models.student import Student
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# (student.updated_at, max assessment updated_at, assessment count)
+Watermark = Tuple[Optional[datetime], Optional[datetime], int]
+
+
+def load_watermark(db: Session, student_id: UUID) -> Optional[Watermark]:
+    """
+    Read the cache watermark of a student (one query).
+
+    Returns:
+        Watermark, or None if the student does not exist
+    """
+    row = (
+        db.query(Student.updated_at, func.max(Assessment.updated_at), func.count(Assessment.id))
+        .outerjoin(Assessment, Assessment.student_id == Student.id)
+        .filter(Student.id == student_id)
+        .group_by(Student.id, Student.updated_at)
+        .first()
+    )
+    if row is None:
+        return None
+    return row[0], row[1], int(row[2])
+
+
+class StudentFeatureCache:
+    """
+    Per-student cache of derived ML inputs, keyed by watermark.
+
+    Each student has one entry holding the watermark and the values computed
+    for it, by kind ("features", ...). A new watermark replaces
+    the entry, so old versions do not accumulate.
+
+    Args:
+        max_size: Maximum number of students kept (LRU)
+        ttl: Entry lifetime in seconds (safety net; the watermark keeps entries correct)
+    """
+
+    def __init__(self, max_size: int = 4096, ttl: int = 3600):
+        self._entries = LocalCache(max_size=max_size, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, student_id: UUID, watermark: Watermark, kind: str) -> Optional[Any]:
+        """Cached value for this watermark (None if absent or stale)."""
+        entry = self._entries.get(str(student_id))
+        if entry is not None and entry[0] == watermark and kind in entry[1]:
+            self.hits += 1
+            return entry[1][kind]
+
+        self.misses += 1
+        return None
+
+    def set(self, student_id: UUID, watermark: Watermark, kind: str, value: Any) -> None:
+        """Store a value, keeping other kinds computed for the same watermark."""
+        key = str(student_id)
+        entry = self._entries.get(key)
+        values: Dict[str, Any] = dict(entry[1]) if entry is not None and entry[0] == watermark else {}
+        values[kind] = value
+        self._entries.set(key, (watermark, values))
+
+    def invalidate(self, student_id: UUID) -> bool:
+        """Drop the entry of a student."""
+        return self._entries.delete(str(student_id))
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+# Singleton instance
+student_feature_cache = StudentFeatureCache()
+
+
+def invalidate_on_assessment_change(event: AssessmentChanged) -> None:
+    """AssessmentChanged handler - drops the student's cached features."""
+    if student_feature_cache.invalidate(event.student_id):
+        logger.debug(
+            f"Assessment {event.action} invalidated ML features",
+            extra={"student_id": str(event.student_id), "assessment_id": str(event.assessment_id)},
+        )
+
+
+def register_feature_cache_invalidation() -> None:
+    """Subscribe the feature cache to assessment events (idempotent)."""
+    event_bus.subscribe(AssessmentChanged, invalidate_on_assessment_change)
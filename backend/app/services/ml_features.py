@@ -0,0 +1,270 @@
+"""
+ML Feature Engine - EduAutismo IA
+
+Columnar feature extraction for the behavioral risk model.
+
+Assessments of many students are encoded once into flat arrays (student
+index, status, engagement, difficulty, independence, timestamp) and every
+aggregate is computed with NumPy grouped reductions (bincount / lexsort).
+The result is a dense float32 matrix aligned to the model's feature_names.
+
+Produces the same values as MLService.extract_student_features, which is
+kept as the per-student (dict) reference implementation.
+
+Usage:
+    X = build_feature_matrix(students, assessments_by_student, feature_names)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence
+from uuid import UUID
+
+import numpy as np
+
+from app.models.assessment import Assessment
+from app.models.student import Student
+from app.utils.constants import CompletionStatus, DifficultyRating, EngagementLevel, TEALevel
+
+# ========== Encodings ==========
+
+TEA_LEVEL_SCORES = {
+    TEALevel.LEVEL_1: 1.0,
+    TEALevel.LEVEL_2: 2.0,
+    TEALevel.LEVEL_3: 3.0,
+    None: 0.0,
+}
+
+ENGAGEMENT_SCORES = {
+    EngagementLevel.NONE: 0,
+    EngagementLevel.LOW: 1,
+    EngagementLevel.MEDIUM: 2,
+    EngagementLevel.HIGH: 3,
+    EngagementLevel.VERY_HIGH: 4,
+}
+
+DIFFICULTY_SCORES = {
+    DifficultyRating.TOO_EASY: -2,
+    DifficultyRating.SLIGHTLY_EASY: -1,
+    DifficultyRating.APPROPRIATE: 0,
+    DifficultyRating.SLIGHTLY_HARD: 1,
+    DifficultyRating.TOO_HARD: 2,
+}
+
+INDEPENDENCE_SCORES = {
+    "full": 4,
+    "partial": 3,
+    "minimal": 2,
+    "dependent": 1,
+    None: 0,
+}
+
+# Status codes: 1 = completed, 0 = anything else
+STATUS_COMPLETED = 1
+
+# Engagement scores counted as "high" for success rate (HIGH, VERY_HIGH)
+HIGH_ENGAGEMENT_MIN = ENGAGEMENT_SCORES[EngagementLevel.HIGH]
+
+# Number of most recent assessments used for recent_completion_rate
+RECENT_WINDOW = 5
+
+# ========== Feature Layout ==========
+
+LEARNING_DOMAINS = ("visual", "auditory", "kinesthetic", "verbal", "logical", "social", "emotional")
+PROFILE_FEATURES = ("attention_span", "sensory_sensitivity", "communication_level", "social_skills")
+PROFILE_DEFAULT = 5.0
+
+STUDENT_FEATURE_NAMES = (
+    "age",
+    "tea_level",
+    *(f"learning_{domain}" for domain in LEARNING_DOMAINS),
+    *PROFILE_FEATURES,
+    "interest_count",
+)
+
+ASSESSMENT_FEATURE_NAMES = (
+    "completion_rate",
+    "avg_engagement",
+    "avg_difficulty_rating",
+    "avg_independence",
+    "success_rate",
+    "recent_completion_rate",
+)
+
+# Defaults for students without assessment history (same order as above)
+ASSESSMENT_FEATURE_DEFAULTS = (0.5, 2.0, 0.0, 2.0, 0.5, 0.5)
+
+FEATURE_NAMES = STUDENT_FEATURE_NAMES + ASSESSMENT_FEATURE_NAMES
+
+
+@dataclass
+class AssessmentColumns:
+    """
+    Assessments of many students as parallel arrays.
+
+    Attributes:
+        student_index: Row of the owning student in the feature matrix
+        status: STATUS_COMPLETED (1) or 0
+        engagement: Engagement score (ENGAGEMENT_SCORES, unknown = 0)
+        difficulty: Difficulty score (DIFFICULTY_SCORES, unknown = 0)
+        independence: Independence score (INDEPENDENCE_SCORES, unknown = 0)
+        timestamp: created_at as POSIX seconds (NaN if missing)
+    """
+
+    student_index: np.ndarray
+    status: np.ndarray
+    engagement: np.ndarray
+    difficulty: np.ndarray
+    independence: np.ndarray
+    timestamp: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.student_index)
+
+    @classmethod
+    def from_assessments(cls, assessments_per_student: Sequence[Optional[Sequence[Assessment]]]) -> "AssessmentColumns":
+        """
+        Encode assessments (one list per student, in matrix row order).
+
+        This is the only per-assessment Python loop of the pipeline.
+        """
+        student_index: List[int] = []
+        status: List[int] = []
+        engagement: List[int] = []
+        difficulty: List[int] = []
+        independence: List[int] = []
+        timestamp: List[float] = []
+
+        for index, assessments in enumerate(assessments_per_student):
+            for assessment in assessments or ():
+                student_index.append(index)
+                status.append(STATUS_COMPLETED if assessment.completion_status == CompletionStatus.COMPLETED else 0)
+                engagement.append(ENGAGEMENT_SCORES.get(assessment.engagement_level, 0))
+                difficulty.append(DIFFICULTY_SCORES.get(assessment.difficulty_rating, 0))
+                independence.append(INDEPENDENCE_SCORES.get(assessment.independence_level, 0))
+                created_at = assessment.created_at
+                timestamp.append(created_at.timestamp() if created_at is not None else np.nan)
+
+        return cls(
+            student_index=np.asarray(student_index, dtype=np.int64),
+            status=np.asarray(status, dtype=np.int8),
+            engagement=np.asarray(engagement, dtype=np.int8),
+            difficulty=np.asarray(difficulty, dtype=np.int8),
+            independence=np.asarray(independence, dtype=np.int8),
+            timestamp=np.asarray(timestamp, dtype=np.float64),
+        )
+
+
+def student_feature_matrix(students: Sequence[Student]) -> np.ndarray:
+    """
+    Profile features (STUDENT_FEATURE_NAMES order) for each student.
+
+    Returns:
+        float32 array of shape (len(students), len(STUDENT_FEATURE_NAMES))
+    """
+    rows = []
+    for student in students:
+        profile = student.learning_profile
+        if profile:
+            learning = [float(profile.get(domain, 0)) for domain in LEARNING_DOMAINS]
+            extra = [float(profile.get(name, PROFILE_DEFAULT)) for name in PROFILE_FEATURES]
+        else:
+            learning = [PROFILE_DEFAULT] * len(LEARNING_DOMAINS)
+            extra = [PROFILE_DEFAULT] * len(PROFILE_FEATURES)
+
+        rows.append(
+            [
+                float(student.age),
+                TEA_LEVEL_SCORES.get(student.tea_level, 0.0),
+                *learning,
+                *extra,
+                float(len(student.interests)),
+            ]
+        )
+
+    return np.array(rows, dtype=np.float32).reshape(len(students), len(STUDENT_FEATURE_NAMES))
+
+
+def assessment_feature_matrix(columns: AssessmentColumns, n_students: int) -> np.ndarray:
+    """
+    Assessment aggregates (ASSESSMENT_FEATURE_NAMES order) with grouped reductions.
+
+    Students without assessments get ASSESSMENT_FEATURE_DEFAULTS.
+
+    Returns:
+        float32 array of shape (n_students, len(ASSESSMENT_FEATURE_NAMES))
+    """
+    result = np.tile(np.asarray(ASSESSMENT_FEATURE_DEFAULTS, dtype=np.float32), (n_students, 1))
+    if not len(columns):
+        return result
+
+    index = columns.student_index
+    counts = np.bincount(index, minlength=n_students)
+    has_history = counts > 0
+    n = counts[has_history].astype(np.float64)
+
+    completed = columns.status == STATUS_COMPLETED
+    success = completed & (columns.engagement >= HIGH_ENGAGEMENT_MIN)
+
+    def group_mean(values: np.ndarray) -> np.ndarray:
+        return np.bincount(index, weights=values, minlength=n_students)[has_history] / n
+
+    # Recent window: order by student, then newest first (stable, like sorted(reverse=True))
+    order = np.lexsort((-columns.timestamp, index))
+    sorted_index = index[order]
+    group_start = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    rank = np.arange(len(order)) - group_start[sorted_index]
+    recent = rank < RECENT_WINDOW
+    recent_completed = np.bincount(sorted_index[recent], weights=completed[order][recent], minlength=n_students)[
+        has_history
+    ]
+
+    result[has_history] = np.column_stack(
+        (
+            group_mean(completed),
+            group_mean(columns.engagement),
+            group_mean(columns.difficulty),
+            group_mean(columns.independence),
+            group_mean(success),
+            recent_completed / np.minimum(n, RECENT_WINDOW),
+        )
+    )
+    return result
+
+
+def build_feature_matrix(
+    students: Sequence[Student],
+    assessments_by_student: Optional[Mapping[UUID, Sequence[Assessment]]] = None,
+    feature_names: Optional[Sequence[str]] = None,
+) -> np.ndarray:
+    """
+    Dense feature matrix for many students.
+
+    Args:
+        students: Students (one matrix row each, in order)
+        assessments_by_student: Assessment history keyed by student id
+        feature_names: Column order (default: FEATURE_NAMES). Unknown names are filled with 0.0
+
+    Returns:
+        float32 array of shape (len(students), len(feature_names))
+    """
+    assessments_by_student = assessments_by_student or {}
+    columns = AssessmentColumns.from_assessments([assessments_by_student.get(s.id) for s in students])
+
+    full = np.hstack((student_feature_matrix(students), assessment_feature_matrix(columns, len(students))))
+    if feature_names is None or tuple(feature_names) == FEATURE_NAMES:
+        return full
+
+    return select_features(full, feature_names)
+
+
+_FEATURE_INDEX: Dict[str, int] = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+
+def select_features(full: np.ndarray, feature_names: Sequence[str]) -> np.ndarray:
+    """Reorder FEATURE_NAMES columns to feature_names (unknown names become 0.0 columns)."""
+    X = np.zeros((full.shape[0], len(feature_names)), dtype=np.float32)
+    for column, name in enumerate(feature_names):
+        source = _FEATURE_INDEX.get(name)
+        if source is not None:
+            X[:, column] = full[:, source]
+    return X
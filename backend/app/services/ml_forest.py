@@ -0,0 +1,243 @@
+"""
+Flat Forest Engine - EduAutismo IA
+
+Array-backed inference for a fitted scikit-learn RandomForestClassifier.
+
+All trees are concatenated into flat node arrays (feature, threshold, left,
+right, missing_go_left) plus a leaf probability table. Evaluation walks every
+tree for every row of a batch together: each step gathers the current node
+of all unfinished (tree, row) paths, compares and moves to a child; paths
+that reach a leaf are dropped from the frontier, so the work is proportional
+to the total path length rather than n_trees x rows x max_depth.
+
+Probabilities are bit-for-bit equal to RandomForestClassifier.predict_proba
+with sequential n_jobs (a kept source forest is set to n_jobs=1 so the large
+batch fallback sums trees in the same order):
+- inputs are cast to float32 like sklearn's trees; thresholds are stored as
+  the largest float32 <= the float64 threshold, which gives the same
+  comparison result for every float32 input
+- leaf tables are the per-tree predict_proba rows
+- tree outputs are summed in estimator order and divided by the number of trees
+
+It skips sklearn's per-call validation and joblib dispatch, which dominate
+the latency for the small (about 20 feature) vectors MLService scores online.
+For large batches sklearn's compiled traversal is faster than NumPy gathers,
+so batches above ``large_batch_rows`` go to the source forest when it is kept
+(see scripts/benchmark_ml_forest.py for the crossover).
+
+Usage:
+    engine = FlatForestClassifier.from_sklearn(forest)
+    proba = engine.predict_proba(X)
+"""
+
+import copy
+from typing import Any, Optional
+
+import numpy as np
+
+# Default batch size above which the source forest (if kept) is used
+LARGE_BATCH_ROWS = 128
+
+
+def _leaf_values_are_probabilities() -> bool:
+    """scikit-learn >= 1.4 stores class fractions in tree_.value (older versions store counts)."""
+    import sklearn
+
+    major, minor = (int(part) for part in sklearn.__version__.split(".")[:2])
+    return (major, minor) >= (1, 4)
+
+
+def _float32_floor(values: np.ndarray) -> np.ndarray:
+    """Largest float32 <= each float64 value (x32 <= t  <=>  x32 <= floor32(t))."""
+    rounded = values.astype(np.float32)
+    over = rounded.astype(np.float64) > values
+    rounded[over] = np.nextafter(rounded[over], np.float32(-np.inf))
+    return rounded
+
+
+class FlatForestClassifier:
+    """
+    RandomForestClassifier compiled to flat NumPy arrays.
+
+    Exposes the subset of the estimator API used by MLService: predict_proba,
+    predict, classes_, n_features_in_ and feature_importances_.
+
+    Attributes:
+        feature: Split feature per node (0 for leaves)
+        threshold: Split threshold per node (float32 floor of sklearn's)
+        left / right: Global child node ids
+        is_leaf: Leaf flag per node
+        missing_go_left: NaN routing per node
+        value: Leaf probability table, shape (n_nodes, n_classes)
+        roots: Root node id of each tree
+        source: Original forest, used for batches above large_batch_rows (optional)
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        is_leaf: np.ndarray,
+        missing_go_left: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        classes: np.ndarray,
+        n_features: int,
+        feature_importances: Optional[np.ndarray] = None,
+        source: Any = None,
+        large_batch_rows: int = LARGE_BATCH_ROWS,
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.is_leaf = is_leaf
+        self.missing_go_left = missing_go_left
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.n_features_in_ = n_features
+        self.feature_importances_ = feature_importances
+        self.source = source
+        self.large_batch_rows = large_batch_rows
+
+    @classmethod
+    def from_sklearn(
+        cls, forest: Any, keep_source: bool = True, large_batch_rows: int = LARGE_BATCH_ROWS
+    ) -> "FlatForestClassifier":
+        """
+        Export a fitted single-output RandomForestClassifier.
+
+        Args:
+            forest: Fitted forest
+            keep_source: Keep the forest for batches above large_batch_rows
+                (drop it to save memory and always use the flat engine). The kept
+                copy predicts with n_jobs=1, since joblib's parallel reduction
+                changes the summation order and the last ulp of the result
+            large_batch_rows: Batch size above which the source forest is used
+
+        Raises:
+            ValueError: If the estimator is not a fitted single-output forest classifier
+        """
+        estimators = getattr(forest, "estimators_", None)
+        if not estimators or getattr(forest, "n_outputs_", 1) != 1 or not hasattr(forest, "classes_"):
+            raise ValueError("Expected a fitted single-output forest classifier")
+
+        n_classes = int(forest.n_classes_)
+        normalize = not _leaf_values_are_probabilities()
+
+        features, thresholds, lefts, rights, leaves, missing, values, roots = [], [], [], [], [], [], [], []
+        offset = 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            is_leaf = tree.children_left < 0
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(is_leaf, 0, tree.children_left + offset))
+            rights.append(np.where(is_leaf, 0, tree.children_right + offset))
+            leaves.append(is_leaf)
+            missing.append(getattr(tree, "missing_go_to_left", np.zeros(tree.node_count, dtype=bool)))
+
+            # Same rows DecisionTreeClassifier.predict_proba returns for each leaf
+            value = np.array(tree.value[:, 0, :n_classes], dtype=np.float64)
+            if normalize:
+                normalizer = value.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                value /= normalizer
+            values.append(value)
+
+            roots.append(offset)
+            offset += tree.node_count
+
+        importances = getattr(forest, "feature_importances_", None)
+
+        source = None
+        if keep_source:
+            # Shallow copy: shares the fitted trees, leaves the caller's n_jobs alone
+            source = copy.copy(forest)
+            source.n_jobs = 1
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=_float32_floor(np.concatenate(thresholds).astype(np.float64)),
+            left=np.concatenate(lefts).astype(np.int32),
+            right=np.concatenate(rights).astype(np.int32),
+            is_leaf=np.concatenate(leaves).astype(bool),
+            missing_go_left=np.concatenate(missing).astype(bool),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.int32),
+            classes=np.asarray(forest.classes_),
+            n_features=int(forest.n_features_in_),
+            feature_importances=None if importances is None else np.asarray(importances),
+            source=source,
+            large_batch_rows=large_batch_rows,
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """
+        Leaf node id reached in every tree.
+
+        Returns:
+            int32 array of shape (n_trees, n_rows)
+        """
+        X = self._check_input(X)
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        has_nan = bool(np.isnan(flat_X).any())
+
+        # Frontier of unfinished (tree, row) paths, tree-major
+        leaves = np.repeat(self.roots, n_rows)
+        position = np.arange(leaves.size)
+        nodes = leaves.copy()
+        row_offset = np.tile(np.arange(n_rows, dtype=np.int64) * n_features, self.n_trees)
+
+        finished = self.is_leaf[nodes]
+        while True:
+            if finished.any():
+                leaves[position[finished]] = nodes[finished]
+                pending = ~finished
+                position, nodes, row_offset = position[pending], nodes[pending], row_offset[pending]
+                if not nodes.size:
+                    break
+
+            x = flat_X[row_offset + self.feature[nodes]]
+            go_left = x <= self.threshold[nodes]
+            if has_nan:
+                go_left |= np.isnan(x) & self.missing_go_left[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+            finished = self.is_leaf[nodes]
+
+        return leaves.reshape(self.n_trees, n_rows)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities, shape (n_rows, n_classes), equal to the source forest's."""
+        X = self._check_input(X)
+        if self.source is not None and X.shape[0] > self.large_batch_rows:
+            return self.source.predict_proba(X)
+
+        leaves = self.apply(X)
+        proba = np.zeros((X.shape[0], self.value.shape[1]), dtype=np.float64)
+        for tree_leaves in leaves:  # estimator order, like sklearn's `out += tree.predict_proba(X)`
+            proba += self.value[tree_leaves]
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Class labels (argmax of predict_proba)."""
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def _check_input(self, X: np.ndarray) -> np.ndarray:
+        """2D float32 C-contiguous array (sklearn trees compare float32 inputs)."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has shape {X.shape}, expected (n_rows, {self.n_features_in_})")
+        return X
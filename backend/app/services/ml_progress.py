@@ -0,0 +1,172 @@
+"""
+ML Progress Statistics - EduAutismo IA
+
+Running statistics behind MLService.analyze_student_progress.
+
+A student's assessments, in chronological order, are folded into counters
+(total, completed, successes, difficulty issues), the sums needed for the
+least-squares slope of engagement over the assessment index, and a ring
+buffer of the last RECENT_WINDOW assessments. Appending an assessment is
+O(1) and the analysis reads only these values, so it does not depend on the
+length of the history.
+
+The regression uses x = 0..n-1 (the assessment index), so Σx and Σx² are
+functions of n; Σy and Σxy are integer sums of engagement scores, and the
+slope is computed exactly from integers before the final division.
+
+The statistics are persisted per student in student_progress_stats and kept
+up to date by AssessmentService (see app/services/progress_stats_service.py).
+
+Usage:
+    stats = ProgressStats.from_entries(progress_entry(a) for a in assessments)
+    stats.slope, stats.completion_rate, stats.recent_completed
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from app.services.ml_features import ENGAGEMENT_SCORES, HIGH_ENGAGEMENT_MIN, INDEPENDENCE_SCORES, RECENT_WINDOW
+from app.utils.constants import CompletionStatus, DifficultyRating
+
+# Difficulty ratings counted as "inadequate difficulty" in progress insights
+DIFFICULTY_ISSUES = (DifficultyRating.TOO_EASY, DifficultyRating.TOO_HARD)
+
+
+class ProgressEntry(NamedTuple):
+    """Values of one assessment used by the progress statistics."""
+
+    id: Optional[str]
+    completed: bool
+    success: bool
+    difficulty_issue: bool
+    engagement: int
+    independence: int
+
+
+def progress_entry(assessment: Any) -> ProgressEntry:
+    """Encode an assessment (or any object with the same attributes)."""
+    completed = assessment.completion_status == CompletionStatus.COMPLETED
+    engagement = ENGAGEMENT_SCORES.get(assessment.engagement_level, 0)
+    assessment_id = getattr(assessment, "id", None)
+    return ProgressEntry(
+        id=None if assessment_id is None else str(assessment_id),
+        completed=completed,
+        success=completed and engagement >= HIGH_ENGAGEMENT_MIN,
+        difficulty_issue=assessment.difficulty_rating in DIFFICULTY_ISSUES,
+        engagement=engagement,
+        independence=INDEPENDENCE_SCORES.get(assessment.independence_level, 0),
+    )
+
+
+@dataclass
+class ProgressStats:
+    """
+    Incremental progress statistics of one student.
+
+    Attributes:
+        count: Number of assessments (n)
+        completed: Assessments with COMPLETED status
+        successes: Completed assessments with HIGH/VERY_HIGH engagement
+        difficulty_issues: Assessments rated TOO_EASY or TOO_HARD
+        engagement_sum: Σy (engagement scores)
+        engagement_xy_sum: Σxy, x being the chronological index (0-based)
+        recent: Last RECENT_WINDOW assessments, oldest first
+    """
+
+    count: int = 0
+    completed: int = 0
+    successes: int = 0
+    difficulty_issues: int = 0
+    engagement_sum: int = 0
+    engagement_xy_sum: int = 0
+    recent: List[ProgressEntry] = field(default_factory=list)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[ProgressEntry]) -> "ProgressStats":
+        """Fold entries given in chronological order."""
+        stats = cls()
+        for entry in entries:
+            stats.append(entry)
+        return stats
+
+    def append(self, entry: ProgressEntry) -> None:
+        """Add the newest assessment (O(1))."""
+        self.engagement_xy_sum += self.count * entry.engagement
+        self.count += 1
+        self._count(entry, 1)
+        self.recent.append(entry)
+        del self.recent[:-RECENT_WINDOW]
+
+    def replace(self, index: int, old: ProgressEntry, new: ProgressEntry) -> None:
+        """
+        Replace the values of the assessment at chronological `index` (O(1)).
+
+        Args:
+            index: 0-based position of the assessment in the history
+            old: Values before the change
+            new: Values after the change
+        """
+        self.engagement_xy_sum += index * (new.engagement - old.engagement)
+        self._count(old, -1)
+        self._count(new, 1)
+        self.recent = [new if item.id is not None and item.id == new.id else item for item in self.recent]
+
+    def _count(self, entry: ProgressEntry, sign: int) -> None:
+        self.completed += sign * entry.completed
+        self.successes += sign * entry.success
+        self.difficulty_issues += sign * entry.difficulty_issue
+        self.engagement_sum += sign * entry.engagement
+
+    # ========== Derived values ==========
+
+    @property
+    def x_sum(self) -> int:
+        """Σx for x = 0..n-1."""
+        return self.count * (self.count - 1) // 2
+
+    @property
+    def x_sq_sum(self) -> int:
+        """Σx² for x = 0..n-1."""
+        return (self.count - 1) * self.count * (2 * self.count - 1) // 6
+
+    @property
+    def slope(self) -> float:
+        """Least-squares slope of engagement over the assessment index (0.0 if n < 2)."""
+        n = self.count
+        denominator = n * self.x_sq_sum - self.x_sum**2
+        if n < 2 or denominator == 0:
+            return 0.0
+        return (n * self.engagement_xy_sum - self.x_sum * self.engagement_sum) / denominator
+
+    @property
+    def completion_rate(self) -> float:
+        return self.completed / self.count if self.count else 0.0
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.count if self.count else 0.0
+
+    @property
+    def avg_engagement(self) -> float:
+        return self.engagement_sum / self.count if self.count else 0.0
+
+    @property
+    def recent_completed(self) -> int:
+        return sum(entry.completed for entry in self.recent)
+
+    @property
+    def avg_recent_independence(self) -> float:
+        if not self.recent:
+            return 0.0
+        return sum(entry.independence for entry in self.recent) / len(self.recent)
+
+    # ========== Serialization ==========
+
+    def recent_to_json(self) -> List[Dict[str, Any]]:
+        """Ring buffer as JSON-serializable dicts."""
+        return [entry._asdict() for entry in self.recent]
+
+    @staticmethod
+    def recent_from_json(items: Optional[List[Dict[str, Any]]]) -> List[ProgressEntry]:
+        """Ring buffer from recent_to_json() output."""
+        return [ProgressEntry(**item) for item in items or []]
@@ -0,0 +1,289 @@
+"""
+ML Model Registry - EduAutismo IA
+
+Versioned model loading for MLService.
+
+Layout (unchanged): ``<ML_MODEL_PATH>/<name>/<version>/``
+
+    model.pkl       joblib pickle (uncompressed, so it can be memory-mapped)
+    scaler.pkl      optional feature scaler
+    metadata.json   optional; ``feature_names``, ``checksums`` and ``engine``
+
+``checksums`` maps artifact file name to its SHA-256 hex digest, e.g.
+``{"model.pkl": "ab12...", "scaler.pkl": "cd34..."}``. Artifacts listed there
+are verified before unpickling; a mismatch raises ValidationError and the
+active version is left untouched.
+
+``engine`` selects the inference engine per version: "sklearn" (default)
+uses the unpickled estimator; "flat" compiles a RandomForestClassifier into
+ml_forest.FlatForestClassifier (same probabilities, lower small-batch latency).
+
+Artifacts are loaded with ``joblib.load(mmap_mode="r")``: NumPy arrays inside
+the pickle are mapped read-only from the page cache instead of being read
+into private memory, so worker processes share those pages. scikit-learn
+trees copy their node arrays on unpickle; for a RandomForest the mapping
+avoids the intermediate private copy, halving the memory each worker adds
+(see scripts/benchmark_model_memory.py), but the nodes stay per process.
+
+Each model name has an active version and the previously active one. Both
+are immutable ModelVersion snapshots and activation/rollback replace the
+active pointer in a single assignment, so readers never observe a half
+swapped model.
+
+Usage:
+    registry = ModelRegistry(Path(settings.ML_MODEL_PATH))
+    loaded = registry.activate("behavioral_classifier", "v2")
+    registry.rollback("behavioral_classifier")
+"""
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+from app.core.exceptions import ValidationError
+from app.services.ml_forest import FlatForestClassifier
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MODEL_FILE = "model.pkl"
+SCALER_FILE = "scaler.pkl"
+METADATA_FILE = "metadata.json"
+
+ENGINE_SKLEARN = "sklearn"
+ENGINE_FLAT = "flat"
+ENGINES = (ENGINE_SKLEARN, ENGINE_FLAT)
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_checksum(path: Path) -> str:
+    """SHA-256 hex digest of a file (streamed in 1 MB chunks)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class ModelVersion:
+    """
+    Immutable snapshot of a loaded model version.
+
+    Attributes:
+        name: Model name (directory under the registry root)
+        version: Version directory name ("" when nothing is loaded)
+        model: Estimator (None when nothing is loaded)
+        scaler: Optional feature scaler
+        feature_names: Model input columns, in order
+        metadata: Parsed metadata.json
+        checksum: Verified SHA-256 of model.pkl, if metadata provided one
+        engine: Inference engine (ENGINES)
+        loaded_at: Load time (UTC)
+    """
+
+    name: str
+    version: str = ""
+    model: Any = None
+    scaler: Any = None
+    feature_names: Tuple[str, ...] = ()
+    metadata: Mapping[str, Any] = field(default_factory=dict)
+    checksum: Optional[str] = None
+    engine: str = ENGINE_SKLEARN
+    loaded_at: Optional[datetime] = None
+    feature_index: Mapping[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "feature_names", tuple(self.feature_names))
+        object.__setattr__(self, "feature_index", {name: i for i, name in enumerate(self.feature_names)})
+
+
+class ModelRegistry:
+    """
+    Registry of versioned models with hot-swap and one-step rollback.
+
+    Args:
+        root: Registry root directory (settings.ML_MODEL_PATH)
+        mmap_mode: joblib mmap_mode for artifacts (None loads into private memory)
+    """
+
+    def __init__(self, root: Path, mmap_mode: Optional[str] = "r"):
+        self.root = Path(root)
+        self.mmap_mode = mmap_mode
+        self._active: Dict[str, ModelVersion] = {}
+        self._previous: Dict[str, ModelVersion] = {}
+        self._lock = threading.Lock()
+
+    # ========== Loading ==========
+
+    def load(self, name: str, version: str) -> ModelVersion:
+        """
+        Load and verify a model version without activating it.
+
+        Raises:
+            FileNotFoundError: If model.pkl does not exist
+            ValidationError: If a checksum does not match or the model is invalid
+        """
+        import joblib
+
+        model_dir = self.root / name / version
+        model_file = model_dir / MODEL_FILE
+        if not model_file.exists():
+            raise FileNotFoundError(f"Model file not found: {model_file}")
+
+        metadata: Dict[str, Any] = {}
+        metadata_file = model_dir / METADATA_FILE
+        if metadata_file.exists():
+            with open(metadata_file, "r") as f:
+                metadata = json.load(f)
+
+        engine = metadata.get("engine") or ENGINE_SKLEARN
+        if engine not in ENGINES:
+            raise ValidationError(f"Unknown inference engine '{engine}' for {name}/{version}")
+
+        checksums = self.verify_checksums(model_dir, metadata.get("checksums") or {})
+
+        model = joblib.load(model_file, mmap_mode=self.mmap_mode)
+        if not hasattr(model, "predict"):
+            raise ValidationError(f"Loaded model is not a valid classifier: {model_file}")
+
+        if engine == ENGINE_FLAT:
+            try:
+                model = FlatForestClassifier.from_sklearn(model)
+            except ValueError as e:
+                raise ValidationError(f"Cannot use flat engine for {name}/{version}: {e}")
+
+        scaler = None
+        scaler_file = model_dir / SCALER_FILE
+        if scaler_file.exists():
+            scaler = joblib.load(scaler_file, mmap_mode=self.mmap_mode)
+
+        loaded = ModelVersion(
+            name=name,
+            version=version,
+            model=model,
+            scaler=scaler,
+            feature_names=metadata.get("feature_names", []),
+            metadata=metadata,
+            checksum=checksums.get(MODEL_FILE),
+            engine=engine,
+            loaded_at=datetime.now(timezone.utc),
+        )
+
+        logger.info(
+            f"Loaded model {name}/{version}",
+            extra={
+                "features": len(loaded.feature_names),
+                "verified": sorted(checksums),
+                "mmap": self.mmap_mode,
+                "engine": engine,
+            },
+        )
+        return loaded
+
+    @staticmethod
+    def verify_checksums(model_dir: Path, expected: Mapping[str, str]) -> Dict[str, str]:
+        """
+        Check artifact SHA-256 digests against metadata.
+
+        Returns:
+            Verified {file name: digest}
+
+        Raises:
+            ValidationError: If a listed artifact is missing or its digest differs
+        """
+        verified = {}
+        for file_name, digest in expected.items():
+            path = model_dir / file_name
+            if not path.exists():
+                raise ValidationError(f"Checksummed artifact not found: {path}")
+
+            actual = file_checksum(path)
+            if actual != digest.lower():
+                raise ValidationError(f"Checksum mismatch for {path}: expected {digest}, got {actual}")
+            verified[file_name] = actual
+
+        return verified
+
+    @staticmethod
+    def write_metadata(model_dir: Path, feature_names: Sequence[str], **extra: Any) -> Dict[str, Any]:
+        """
+        Write metadata.json with feature names and checksums of the artifacts present.
+
+        Used by training jobs after dumping model.pkl (and scaler.pkl).
+        """
+        model_dir = Path(model_dir)
+        checksums = {
+            file_name: file_checksum(model_dir / file_name)
+            for file_name in (MODEL_FILE, SCALER_FILE)
+            if (model_dir / file_name).exists()
+        }
+        metadata = {**extra, "feature_names": list(feature_names), "checksums": checksums}
+        with open(model_dir / METADATA_FILE, "w") as f:
+            json.dump(metadata, f, indent=2, default=str)
+        return metadata
+
+    # ========== Activation ==========
+
+    def activate(self, name: str, version: str) -> ModelVersion:
+        """
+        Load a version and make it active; the current one is kept as previous.
+
+        Loading happens outside the lock, so serving continues on the current
+        version until the new one is fully loaded and verified.
+        """
+        loaded = self.load(name, version)
+
+        with self._lock:
+            current = self._active.get(name)
+            if current is not None:
+                self._previous[name] = current
+            self._active[name] = loaded
+
+        logger.info(
+            f"Activated model {name}/{version}",
+            extra={"previous": current.version if current else None},
+        )
+        return loaded
+
+    def rollback(self, name: str) -> ModelVersion:
+        """
+        Swap active and previous versions (no reload).
+
+        Raises:
+            ValidationError: If there is no previous version
+        """
+        with self._lock:
+            previous = self._previous.get(name)
+            if previous is None:
+                raise ValidationError(f"No previous version of model {name} to roll back to")
+            self._previous[name] = self._active[name]
+            self._active[name] = previous
+
+        logger.info(f"Rolled back model {name} to {previous.version}")
+        return previous
+
+    def get(self, name: str) -> Optional[ModelVersion]:
+        """Active version of a model (None if never activated)."""
+        return self._active.get(name)
+
+    def previous(self, name: str) -> Optional[ModelVersion]:
+        """Previously active version kept warm for rollback."""
+        return self._previous.get(name)
+
+    def versions(self) -> Dict[str, Dict[str, Optional[str]]]:
+        """Active and previous version per model name."""
+        return {
+            name: {
+                "active": active.version,
+                "previous": self._previous[name].version if name in self._previous else None,
+                "checksum": active.checksum,
+                "engine": active.engine,
+            }
+            for name, active in self._active.items()
+        }
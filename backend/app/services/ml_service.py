@@ -3,24 +3,46 @@ ML Service - EduAutismo IA
 
 Machine Learning service for behavioral classification and predictive analytics.
 Provides risk assessment, activity success prediction, and progress analysis.
+
+joblib and scikit-learn are imported lazily (on model load), so workers that
+never run ML do not pay their import time and memory. Inference maps feature
+dicts straight into NumPy rows; pandas is not used.
 """
 
-import json
+from dataclasses import replace
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence
+from uuid import UUID
 
-import joblib
 import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.core.exceptions import ValidationError
+from app.core.exceptions import StudentNotFoundError, ValidationError
 from app.models.assessment import Assessment
 from app.models.student import Student
-from app.utils.constants import CompletionStatus, DifficultyRating, EngagementLevel, TEALevel
+from app.services.ml_feature_cache import (
+    StudentFeatureCache,
+    load_watermark,
+    register_feature_cache_invalidation,
+    student_feature_cache,
+)
+from app.services.ml_features import (
+    DIFFICULTY_SCORES,
+    ENGAGEMENT_SCORES,
+    INDEPENDENCE_SCORES,
+    TEA_LEVEL_SCORES,
+    build_feature_matrix,
+)
+from app.services.ml_progress import ProgressStats, progress_entry
+from app.services.ml_registry import ModelRegistry, ModelVersion
+from app.services.progress_stats_service import ProgressStatsService
+from app.utils.constants import CompletionStatus, EngagementLevel
 from app.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from sklearn.ensemble import RandomForestClassifier
+
 logger = get_logger(__name__)
 
 
@@ -39,34 +61,87 @@ class MLService:
     RISK_LEVELS = ["baixo", "medio", "alto", "muito_alto"]
 
     # Independence levels
-    INDEPENDENCE_LEVELS = {
-        "full": 4,
-        "partial": 3,
-        "minimal": 2,
-        "dependent": 1,
-        None: 0,
-    }
-
-    def __init__(self):
-        """Initialize ML Service."""
-        self.behavioral_model: Optional[RandomForestClassifier] = None
-        self.success_predictor: Optional[RandomForestClassifier] = None
-        self.scaler: Optional[Any] = None
-        self.feature_names: List[str] = []
+    INDEPENDENCE_LEVELS = INDEPENDENCE_SCORES
+
+    # Registry model names
+    BEHAVIORAL_MODEL = "behavioral_classifier"
+    SUCCESS_MODEL = "success_predictor"
+
+    def __init__(self, feature_cache: Optional[StudentFeatureCache] = None):
+        """
+        Initialize ML Service.
+
+        Args:
+            feature_cache: Cache for per-student inputs (default: shared student_feature_cache)
+        """
+        self.feature_cache = feature_cache or student_feature_cache
         self.confidence_threshold = settings.CONFIDENCE_THRESHOLD
         self.model_path = Path(settings.ML_MODEL_PATH)
+        self.registry = ModelRegistry(self.model_path)
+
+        # Active model snapshots; replaced as a whole on load/rollback
+        self._behavioral = ModelVersion(name=self.BEHAVIORAL_MODEL)
+        self._success = ModelVersion(name=self.SUCCESS_MODEL)
 
         logger.info(
             "ML Service initialized",
             extra={"model_path": str(self.model_path), "confidence_threshold": self.confidence_threshold},
         )
 
+    # ========== Active Model ==========
+
+    @property
+    def behavioral_model(self) -> Optional["RandomForestClassifier"]:
+        """Active behavioral classifier (None uses rule-based classification)."""
+        return self._behavioral.model
+
+    @behavioral_model.setter
+    def behavioral_model(self, model: Optional["RandomForestClassifier"]) -> None:
+        self._behavioral = replace(self._behavioral, model=model)
+
+    @property
+    def scaler(self) -> Optional[Any]:
+        """Feature scaler of the active behavioral model."""
+        return self._behavioral.scaler
+
+    @scaler.setter
+    def scaler(self, scaler: Optional[Any]) -> None:
+        self._behavioral = replace(self._behavioral, scaler=scaler)
+
+    @property
+    def feature_names(self) -> List[str]:
+        """Input columns of the active behavioral model, in order."""
+        return list(self._behavioral.feature_names)
+
+    @feature_names.setter
+    def feature_names(self, names: Sequence[str]) -> None:
+        self._behavioral = replace(self._behavioral, feature_names=tuple(names))
+
+    @property
+    def _feature_index(self) -> Mapping[str, int]:
+        """Name -> column index map, precomputed with the model snapshot."""
+        return self._behavioral.feature_index
+
+    @property
+    def success_predictor(self) -> Optional["RandomForestClassifier"]:
+        """Active activity success predictor."""
+        return self._success.model
+
+    @success_predictor.setter
+    def success_predictor(self, model: Optional["RandomForestClassifier"]) -> None:
+        self._success = replace(self._success, model=model)
+
     # ========== Model Loading ==========
 
     def load_behavioral_model(self, version: str = "production") -> bool:
         """
         Load trained behavioral classification model.
 
+        Can be called at runtime to hot-swap versions: the new version is
+        loaded and verified (metadata checksums) first, then replaces the
+        active one in a single assignment. The replaced version stays in the
+        registry for rollback_behavioral_model.
+
         Args:
             version: Model version to load (default: production)
 
@@ -78,35 +153,11 @@ class MLService:
             ValidationError: If model validation fails
         """
         try:
-            model_dir = self.model_path / "behavioral_classifier" / version
-
-            # Load model
-            model_file = model_dir / "model.pkl"
-            if not model_file.exists():
-                raise FileNotFoundError(f"Model file not found: {model_file}")
-
-            self.behavioral_model = joblib.load(model_file)
-            logger.info(f"Loaded behavioral model from {model_file}")
-
-            # Load scaler
-            scaler_file = model_dir / "scaler.pkl"
-            if scaler_file.exists():
-                self.scaler = joblib.load(scaler_file)
-                logger.info(f"Loaded scaler from {scaler_file}")
-
-            # Load metadata
-            metadata_file = model_dir / "metadata.json"
-            if metadata_file.exists():
-                with open(metadata_file, "r") as f:
-                    metadata = json.load(f)
-                    self.feature_names = metadata.get("feature_names", [])
-                    logger.info(f"Loaded {len(self.feature_names)} feature names")
-
-            # Validate model
-            if not hasattr(self.behavioral_model, "predict"):
-                raise ValidationError("Loaded model is not a valid classifier")
-
-            logger.info(f"Behavioral model loaded successfully: version={version}")
+            self._behavioral = self.registry.activate(self.BEHAVIORAL_MODEL, version)
+            logger.info(
+                f"Behavioral model loaded successfully: version={version}",
+                extra={"features": len(self._behavioral.feature_names), "checksum": self._behavioral.checksum},
+            )
             return True
 
         except FileNotFoundError as e:
@@ -118,6 +169,20 @@ class MLService:
             logger.error(f"Error loading behavioral model: {e}")
             raise ValidationError(f"Failed to load model: {str(e)}")
 
+    def rollback_behavioral_model(self) -> str:
+        """
+        Switch back to the previously active behavioral model (kept loaded).
+
+        Returns:
+            Version now active
+
+        Raises:
+            ValidationError: If there is no previous version
+        """
+        self._behavioral = self.registry.rollback(self.BEHAVIORAL_MODEL)
+        logger.warning(f"Behavioral model rolled back to version={self._behavioral.version}")
+        return self._behavioral.version
+
     def load_success_predictor(self, version: str = "production") -> bool:
         """
         Load trained activity success prediction model.
@@ -129,22 +194,22 @@ class MLService:
             True if loaded successfully
         """
         try:
-            model_dir = self.model_path / "success_predictor" / version
-            model_file = model_dir / "model.pkl"
-
-            if not model_file.exists():
-                logger.warning(f"Success predictor not found: {model_file}")
-                return False
-
-            self.success_predictor = joblib.load(model_file)
-            logger.info(f"Loaded success predictor from {model_file}")
-
+            self._success = self.registry.activate(self.SUCCESS_MODEL, version)
+            logger.info(f"Loaded success predictor: version={version}")
             return True
 
+        except FileNotFoundError as e:
+            logger.warning(f"Success predictor not found: {e}")
+            return False
+
         except Exception as e:
             logger.error(f"Error loading success predictor: {e}")
             return False
 
+    def get_model_versions(self) -> Dict[str, Dict[str, Optional[str]]]:
+        """Active and previous version of each loaded model."""
+        return self.registry.versions()
+
     # ========== Feature Extraction ==========
 
     def extract_student_features(
@@ -166,13 +231,7 @@ class MLService:
         features["age"] = float(student.age)
 
         # TEA level encoding
-        tea_level_map = {
-            TEALevel.LEVEL_1: 1.0,
-            TEALevel.LEVEL_2: 2.0,
-            TEALevel.LEVEL_3: 3.0,
-            None: 0.0,
-        }
-        features["tea_level"] = tea_level_map.get(student.tea_level, 0.0)
+        features["tea_level"] = TEA_LEVEL_SCORES.get(student.tea_level, 0.0)
 
         # Learning profile features
         if student.learning_profile:
@@ -208,25 +267,11 @@ class MLService:
             features["completion_rate"] = completed / len(assessments)
 
             # Average engagement
-            engagement_map = {
-                EngagementLevel.NONE: 0,
-                EngagementLevel.LOW: 1,
-                EngagementLevel.MEDIUM: 2,
-                EngagementLevel.HIGH: 3,
-                EngagementLevel.VERY_HIGH: 4,
-            }
-            engagement_scores = [engagement_map.get(a.engagement_level, 0) for a in assessments]
+            engagement_scores = [ENGAGEMENT_SCORES.get(a.engagement_level, 0) for a in assessments]
             features["avg_engagement"] = np.mean(engagement_scores)
 
             # Difficulty appropriateness
-            difficulty_map = {
-                DifficultyRating.TOO_EASY: -2,
-                DifficultyRating.SLIGHTLY_EASY: -1,
-                DifficultyRating.APPROPRIATE: 0,
-                DifficultyRating.SLIGHTLY_HARD: 1,
-                DifficultyRating.TOO_HARD: 2,
-            }
-            difficulty_scores = [difficulty_map.get(a.difficulty_rating, 0) for a in assessments]
+            difficulty_scores = [DIFFICULTY_SCORES.get(a.difficulty_rating, 0) for a in assessments]
             features["avg_difficulty_rating"] = np.mean(difficulty_scores)
 
             # Independence level
@@ -304,6 +349,46 @@ class MLService:
 
         return features
 
+    # ========== Cached Student Inputs ==========
+
+    def get_student_features(self, db: Session, student_id: UUID) -> Dict[str, float]:
+        """
+        Student features, from the feature cache when still valid.
+
+        One watermark query per call; on a hit the assessment history is not
+        loaded and features are not re-extracted.
+
+        Raises:
+            StudentNotFoundError: If student not found
+        """
+        return dict(
+            self._cached_student_input(
+                db,
+                student_id,
+                "features",
+                lambda student, assessments: self.extract_student_features(student, assessments),
+            )
+        )
+
+    def _cached_student_input(self, db: Session, student_id: UUID, kind: str, compute) -> Any:
+        """Value of `kind` for the student's current watermark, computing it on a miss."""
+        watermark = load_watermark(db, student_id)
+        if watermark is None:
+            raise StudentNotFoundError(str(student_id))
+
+        value = self.feature_cache.get(student_id, watermark, kind)
+        if value is not None:
+            return value
+
+        student = db.query(Student).filter(Student.id == student_id).first()
+        if student is None:
+            raise StudentNotFoundError(str(student_id))
+        assessments = db.query(Assessment).filter(Assessment.student_id == student_id).all()
+
+        value = compute(student, assessments)
+        self.feature_cache.set(student_id, watermark, kind, value)
+        return value
+
     # ========== Predictions ==========
 
     def predict_risk_level(self, student: Student, assessments: Optional[List[Assessment]] = None) -> Dict[str, Any]:
@@ -320,57 +405,202 @@ class MLService:
         try:
             # Extract features
             features = self.extract_student_features(student, assessments)
-
-            # Use ML model if loaded
-            if self.behavioral_model:
-                return self._predict_with_model(features)
-            else:
-                # Fallback to rule-based classification
-                return self._predict_rule_based(features)
+            return self._predict_risk_from_features(features)
 
         except Exception as e:
             logger.error(f"Error predicting risk level: {e}")
             # Return safe default
             return {"risk_level": "medio", "confidence": 0.5, "probabilities": {}, "method": "default"}
 
-    def _predict_with_model(self, features: Dict[str, float]) -> Dict[str, Any]:
-        """Predict using trained ML model."""
-        # Convert to DataFrame
-        df = pd.DataFrame([features])
+    def predict_risk_level_for_student(self, db: Session, student_id: UUID) -> Dict[str, Any]:
+        """
+        Predict behavioral risk level by student id, using cached features.
 
-        # Ensure all required features are present
-        for feature in self.feature_names:
-            if feature not in df.columns:
-                df[feature] = 0.0
+        Repeated calls for an unchanged student skip loading the assessment
+        history and feature extraction (see get_student_features).
 
-        # Select and order features
-        X = df[self.feature_names]
+        Raises:
+            StudentNotFoundError: If student not found
+        """
+        return self.predict_risk_from_features(self.get_student_features(db, student_id))
 
-        # Scale if scaler available
-        if self.scaler:
-            X_scaled = self.scaler.transform(X)
-        else:
-            X_scaled = X.values
+    def predict_risk_from_features(self, features: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Predict behavioral risk level from precomputed student features.
 
-        # Predict
-        prediction_idx = self.behavioral_model.predict(X_scaled)[0]
-        probabilities = self.behavioral_model.predict_proba(X_scaled)[0]
+        Used by ml_executor workers, which receive features loaded in the
+        API process.
+        """
+        try:
+            return self._predict_risk_from_features(features)
+        except Exception as e:
+            logger.error(f"Error predicting risk level: {e}")
+            return {"risk_level": "medio", "confidence": 0.5, "probabilities": {}, "method": "default"}
 
-        # Get confidence (max probability)
-        confidence = float(np.max(probabilities))
+    def predict_risk_from_features_batch(self, features_list: Sequence[Dict[str, float]]) -> List[Dict[str, Any]]:
+        """Predict risk levels for many precomputed feature dicts (one model call)."""
+        active = self._behavioral
+        try:
+            if active.model:
+                return self._predict_batch_with_model(list(features_list), active)
+            return [self._predict_rule_based(features) for features in features_list]
+        except Exception as e:
+            logger.error(f"Error predicting risk level batch: {e}")
+            return [
+                {"risk_level": "medio", "confidence": 0.5, "probabilities": {}, "method": "default"}
+                for _ in features_list
+            ]
+
+    def _predict_risk_from_features(self, features: Dict[str, float]) -> Dict[str, Any]:
+        """Model prediction if loaded, rule-based otherwise."""
+        # One model snapshot for the whole prediction
+        active = self._behavioral
+        if active.model:
+            return self._predict_with_model(features, active)
+
+        # Fallback to rule-based classification
+        return self._predict_rule_based(features)
+
+    def predict_risk_level_batch(
+        self,
+        students: Sequence[Student],
+        assessments_by_student: Optional[Dict[UUID, List[Assessment]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Predict behavioral risk level for many students at once.
 
-        # Build probability distribution
-        prob_dist = {level: float(prob) for level, prob in zip(self.RISK_LEVELS, probabilities)}
+        With a loaded model, features come from the columnar engine
+        (ml_features.build_feature_matrix), the matrix is scaled once and
+        the model is called once, instead of paying pandas/sklearn overhead
+        per student.
 
-        result = {
-            "risk_level": self.RISK_LEVELS[prediction_idx],
-            "confidence": confidence,
-            "probabilities": prob_dist,
-            "method": "ml_model",
-        }
+        Args:
+            students: Students to score
+            assessments_by_student: Optional assessment history keyed by student id
+
+        Returns:
+            One result per student, in input order, with the same shape as
+            predict_risk_level
+        """
+        if not students:
+            return []
+
+        assessments_by_student = assessments_by_student or {}
+
+        active = self._behavioral
+        if active.model:
+            try:
+                X = build_feature_matrix(students, assessments_by_student, active.feature_names)
+                results = self._predict_matrix_with_model(X, active)
+                logger.info(f"Batch risk prediction completed for {len(results)} students")
+                return results
+            except Exception as e:
+                logger.warning(f"Vectorized risk prediction failed, scoring students individually: {e}")
+
+        return self._predict_risk_level_per_student(students, assessments_by_student, active)
+
+    def _predict_risk_level_per_student(
+        self,
+        students: Sequence[Student],
+        assessments_by_student: Dict[UUID, List[Assessment]],
+        active: Optional[ModelVersion] = None,
+    ) -> List[Dict[str, Any]]:
+        """Batch fallback: per-student feature dicts (rule-based or one model call)."""
+        default = {"risk_level": "medio", "confidence": 0.5, "probabilities": {}, "method": "default"}
+        active = active or self._behavioral
+
+        features_list: List[Optional[Dict[str, float]]] = []
+        for student in students:
+            try:
+                features_list.append(self.extract_student_features(student, assessments_by_student.get(student.id)))
+            except Exception as e:
+                logger.error(f"Error extracting features for student {getattr(student, 'id', None)}: {e}")
+                features_list.append(None)
+
+        valid = [features for features in features_list if features is not None]
+        try:
+            if active.model:
+                predictions = iter(self._predict_batch_with_model(valid, active))
+            else:
+                predictions = iter([self._predict_rule_based(features) for features in valid])
+        except Exception as e:
+            logger.error(f"Error predicting risk level batch: {e}")
+            return [dict(default) for _ in students]
+
+        results = [dict(default) if features is None else next(predictions) for features in features_list]
+
+        logger.info(f"Batch risk prediction completed for {len(results)} students")
+
+        return results
+
+    def _predict_batch_with_model(
+        self, features_list: List[Dict[str, float]], active: Optional[ModelVersion] = None
+    ) -> List[Dict[str, Any]]:
+        """Predict many feature dicts using trained ML model (one predict_proba call)."""
+        if not features_list:
+            return []
+
+        active = active or self._behavioral
+        X = np.zeros((len(features_list), len(active.feature_names)), dtype=np.float64)
+        for row, features in zip(X, features_list):
+            self._fill_feature_row(row, features, active.feature_index)
+        return self._predict_matrix_with_model(X, active)
+
+    def _fill_feature_row(
+        self, row: np.ndarray, features: Mapping[str, float], index: Optional[Mapping[str, int]] = None
+    ) -> None:
+        """
+        Write feature values into a preallocated row (feature_names order).
+
+        Uses the name -> index map built with the model snapshot; features the
+        model does not know are ignored and missing ones keep the row's value (0.0).
+        """
+        index = self._feature_index if index is None else index
+        for name, value in features.items():
+            column = index.get(name)
+            if column is not None:
+                row[column] = value
+
+    def _predict_matrix_with_model(self, X: np.ndarray, active: Optional[ModelVersion] = None) -> List[Dict[str, Any]]:
+        """
+        Scale feature matrix (feature_names order) once and predict all rows.
+
+        The label of each row is the class (model.classes_) of the argmax of its
+        class probabilities; a model trained without some risk levels has fewer
+        columns, so columns are never assumed to be in RISK_LEVELS order.
+        """
+        active = active or self._behavioral
+        if active.scaler:
+            X = active.scaler.transform(X)
+
+        probabilities = np.asarray(active.model.predict_proba(X))
+        levels = self._class_levels(active.model, probabilities.shape[1])
+        prediction_idx = probabilities.argmax(axis=1).tolist()
+        confidences = probabilities.max(axis=1).tolist()
+
+        return [
+            {
+                "risk_level": levels[idx],
+                "confidence": confidence,
+                "probabilities": dict(zip(levels, row)),
+                "method": "ml_model",
+            }
+            for idx, confidence, row in zip(prediction_idx, confidences, probabilities.tolist())
+        ]
+
+    def _class_levels(self, model: Any, n_columns: int) -> List[str]:
+        """Risk level of each predict_proba column (classes_ holds RISK_LEVELS indices or names)."""
+        classes = getattr(model, "classes_", None)
+        if not isinstance(classes, np.ndarray):
+            classes = np.arange(n_columns)
+        return [label if isinstance(label, str) else self.RISK_LEVELS[int(label)] for label in classes.tolist()]
+
+    def _predict_with_model(self, features: Dict[str, float], active: Optional[ModelVersion] = None) -> Dict[str, Any]:
+        """Predict using trained ML model."""
+        result = self._predict_batch_with_model([features], active)[0]
 
         logger.info(
-            f"ML prediction: {result['risk_level']} (confidence: {confidence:.2f})",
+            f"ML prediction: {result['risk_level']} (confidence: {result['confidence']:.2f})",
             extra={"prediction": result},
         )
 
@@ -382,6 +612,35 @@ class MLService:
 
         Uses heuristics based on assessment performance and student profile.
         """
+        risk_score = self.rule_based_risk_score(features)
+        risk_level = self.risk_level_from_score(risk_score)
+
+        # Calculate confidence based on data availability
+        data_points = len([v for v in features.values() if v != 0])
+        confidence = min(0.7, 0.4 + (data_points / 40))  # Max 0.7 for rule-based
+
+        result = {
+            "risk_level": risk_level,
+            "confidence": float(confidence),
+            "risk_score": float(risk_score),
+            "method": "rule_based",
+        }
+
+        logger.info(
+            f"Rule-based prediction: {risk_level} (score: {risk_score:.1f})",
+            extra={"prediction": result},
+        )
+
+        return result
+
+    @staticmethod
+    def rule_based_risk_score(features: Mapping[str, float]) -> float:
+        """
+        Heuristic risk score (0-100) used by the rule-based fallback.
+
+        Also the default training label of the behavioral classifier
+        (app/services/ml_training.py) while no outcome labels exist.
+        """
         # Calculate risk score (0-100)
         risk_score = 50.0  # Start at medium
 
@@ -423,35 +682,19 @@ class MLService:
             risk_score -= 5
 
         # Cap between 0 and 100
-        risk_score = max(0, min(100, risk_score))
+        return max(0, min(100, risk_score))
 
-        # Map to risk level
+    @staticmethod
+    def risk_level_from_score(risk_score: float) -> str:
+        """Map a 0-100 risk score to RISK_LEVELS (quartiles)."""
         if risk_score < 25:
-            risk_level = "baixo"
+            return "baixo"
         elif risk_score < 50:
-            risk_level = "medio"
+            return "medio"
         elif risk_score < 75:
-            risk_level = "alto"
+            return "alto"
         else:
-            risk_level = "muito_alto"
-
-        # Calculate confidence based on data availability
-        data_points = len([v for v in features.values() if v != 0])
-        confidence = min(0.7, 0.4 + (data_points / 40))  # Max 0.7 for rule-based
-
-        result = {
-            "risk_level": risk_level,
-            "confidence": float(confidence),
-            "risk_score": float(risk_score),
-            "method": "rule_based",
-        }
-
-        logger.info(
-            f"Rule-based prediction: {risk_level} (score: {risk_score:.1f})",
-            extra={"prediction": result},
-        )
-
-        return result
+            return "muito_alto"
 
     def predict_activity_success(
         self, student: Student, activity_data: Dict[str, Any], assessments: Optional[List[Assessment]] = None
@@ -470,37 +713,33 @@ class MLService:
         try:
             # Extract features
             student_features = self.extract_student_features(student, assessments)
-            activity_features = self.extract_activity_features(activity_data)
-
-            # Combine features
-            combined_features = {**student_features, **activity_features}
-
-            # Use ML model if available
-            if self.success_predictor:
-                # Convert to DataFrame
-                df = pd.DataFrame([combined_features])
-                X = df.values
+            return self._predict_activity_success_from_features(student_features, activity_data)
 
-                # Predict probability
-                success_prob = float(self.success_predictor.predict_proba(X)[0][1])
-
-            else:
-                # Rule-based estimation
-                success_prob = self._estimate_success_probability(student_features, activity_features)
-
-            # Generate recommendations
-            recommendations = self._generate_success_recommendations(combined_features, success_prob)
-
-            result = {
-                "success_probability": success_prob,
-                "confidence": "high" if success_prob > 0.7 or success_prob < 0.3 else "medium",
-                "recommendations": recommendations,
+        except Exception as e:
+            logger.error(f"Error predicting activity success: {e}")
+            return {
+                "success_probability": 0.5,
+                "confidence": "low",
+                "recommendations": ["Monitorar engajamento durante a atividade"],
             }
 
-            logger.info(f"Activity success prediction: {success_prob:.2f}", extra={"prediction": result})
+    def predict_activity_success_for_student(
+        self, db: Session, student_id: UUID, activity_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Predict likelihood of activity success by student id, using cached features.
 
-            return result
+        Raises:
+            StudentNotFoundError: If student not found
+        """
+        return self.predict_activity_success_from_features(self.get_student_features(db, student_id), activity_data)
 
+    def predict_activity_success_from_features(
+        self, student_features: Dict[str, float], activity_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Predict likelihood of activity success from precomputed student features."""
+        try:
+            return self._predict_activity_success_from_features(student_features, activity_data)
         except Exception as e:
             logger.error(f"Error predicting activity success: {e}")
             return {
@@ -509,6 +748,42 @@ class MLService:
                 "recommendations": ["Monitorar engajamento durante a atividade"],
             }
 
+    def _predict_activity_success_from_features(
+        self, student_features: Dict[str, float], activity_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Success probability and recommendations from student features and activity data."""
+        activity_features = self.extract_activity_features(activity_data)
+
+        # Combine features
+        combined_features = {**student_features, **activity_features}
+
+        # Use ML model if available
+        success_predictor = self.success_predictor
+        if success_predictor:
+            # Single row in feature insertion order
+            X = np.fromiter(combined_features.values(), dtype=np.float64, count=len(combined_features))
+            X = X.reshape(1, -1)
+
+            # Predict probability
+            success_prob = float(success_predictor.predict_proba(X)[0][1])
+
+        else:
+            # Rule-based estimation
+            success_prob = self._estimate_success_probability(student_features, activity_features)
+
+        # Generate recommendations
+        recommendations = self._generate_success_recommendations(combined_features, success_prob)
+
+        result = {
+            "success_probability": success_prob,
+            "confidence": "high" if success_prob > 0.7 or success_prob < 0.3 else "medium",
+            "recommendations": recommendations,
+        }
+
+        logger.info(f"Activity success prediction: {success_prob:.2f}", extra={"prediction": result})
+
+        return result
+
     def _estimate_success_probability(
         self, student_features: Dict[str, float], activity_features: Dict[str, float]
     ) -> float:
@@ -600,75 +875,83 @@ class MLService:
             Progress analysis with trends and insights
         """
         if not assessments:
-            return {
-                "status": "insufficient_data",
-                "message": "NÃ£o hÃ¡ avaliaÃ§Ãµes suficientes para anÃ¡lise",
-            }
+            return self._insufficient_progress_data()
 
-        # Sort by date
+        # Sort by date and fold into running statistics
         sorted_assessments = sorted(assessments, key=lambda a: a.created_at)
+        stats = ProgressStats.from_entries(map(progress_entry, sorted_assessments))
+
+        return self._progress_analysis(student.id, stats)
 
-        # Calculate metrics
-        total = len(sorted_assessments)
-        completed = sum(1 for a in sorted_assessments if a.completion_status == CompletionStatus.COMPLETED)
-
-        # Engagement trend
-        engagement_map = {
-            EngagementLevel.NONE: 0,
-            EngagementLevel.LOW: 1,
-            EngagementLevel.MEDIUM: 2,
-            EngagementLevel.HIGH: 3,
-            EngagementLevel.VERY_HIGH: 4,
+    def analyze_student_progress_for_student(
+        self, db: Session, student_id: UUID, time_window_days: int = 30
+    ) -> Dict[str, Any]:
+        """
+        Analyze student progress by student id from stored running statistics.
+
+        Reads one student_progress_stats row (O(1) in the history length).
+        Students without a row yet (no assessments, or history written
+        before the backfill) are computed from the assessment history.
+
+        Raises:
+            StudentNotFoundError: If student not found
+        """
+        stats = ProgressStatsService.load(db, student_id)
+        if stats is None:
+            if db.query(Student.id).filter(Student.id == student_id).first() is None:
+                raise StudentNotFoundError(str(student_id))
+            stats = ProgressStatsService.compute(db, student_id)
+
+        if not stats.count:
+            return self._insufficient_progress_data()
+
+        return self._progress_analysis(student_id, stats)
+
+    @staticmethod
+    def _insufficient_progress_data() -> Dict[str, Any]:
+        return {
+            "status": "insufficient_data",
+            "message": "NÃ£o hÃ¡ avaliaÃ§Ãµes suficientes para anÃ¡lise",
         }
-        engagement_scores = [engagement_map.get(a.engagement_level, 0) for a in sorted_assessments]
 
-        # Calculate trend (simple linear regression)
-        if len(engagement_scores) > 1:
-            x = np.arange(len(engagement_scores))
-            trend_slope = np.polyfit(x, engagement_scores, 1)[0]
+    def _progress_analysis(self, student_id: UUID, stats: ProgressStats) -> Dict[str, Any]:
+        """Progress analysis of a non-empty history from its running statistics."""
+        # Engagement trend (least-squares slope over the assessment index)
+        if stats.count > 1:
+            trend_slope = stats.slope
             engagement_trend = "improving" if trend_slope > 0.1 else "declining" if trend_slope < -0.1 else "stable"
         else:
             engagement_trend = "insufficient_data"
             trend_slope = 0
 
-        # Independence progression
-        recent_assessments = sorted_assessments[-5:] if len(sorted_assessments) >= 5 else sorted_assessments
-        independence_scores = [self.INDEPENDENCE_LEVELS.get(a.independence_level, 0) for a in recent_assessments]
-        avg_recent_independence = np.mean(independence_scores) if independence_scores else 0
-
-        # Success rate
-        success_count = sum(
-            1
-            for a in sorted_assessments
-            if a.completion_status == CompletionStatus.COMPLETED
-            and a.engagement_level in [EngagementLevel.HIGH, EngagementLevel.VERY_HIGH]
-        )
-
         analysis = {
-            "total_assessments": total,
-            "completion_rate": completed / total if total > 0 else 0,
-            "success_rate": success_count / total if total > 0 else 0,
-            "avg_engagement": float(np.mean(engagement_scores)),
+            "total_assessments": stats.count,
+            "completion_rate": stats.completion_rate,
+            "success_rate": stats.success_rate,
+            "avg_engagement": stats.avg_engagement,
             "engagement_trend": engagement_trend,
             "trend_slope": float(trend_slope),
-            "avg_recent_independence": float(avg_recent_independence),
-            "insights": self._generate_progress_insights(sorted_assessments),
+            "avg_recent_independence": stats.avg_recent_independence,
+            "insights": self._progress_insights(stats),
         }
 
-        logger.info(f"Progress analysis completed for student {student.id}", extra={"analysis": analysis})
+        logger.info(f"Progress analysis completed for student {student_id}", extra={"analysis": analysis})
 
         return analysis
 
     def _generate_progress_insights(self, assessments: List[Assessment]) -> List[str]:
-        """Generate insights from assessment history."""
+        """Generate insights from assessment history (in chronological order)."""
+        return self._progress_insights(ProgressStats.from_entries(map(progress_entry, assessments)))
+
+    def _progress_insights(self, stats: ProgressStats) -> List[str]:
+        """Generate insights from running progress statistics."""
         insights = []
 
-        if not assessments:
+        if not stats.count:
             return ["NÃ£o hÃ¡ dados suficientes para gerar insights"]
 
         # Check completion rate
-        completed = sum(1 for a in assessments if a.completion_status == CompletionStatus.COMPLETED)
-        completion_rate = completed / len(assessments)
+        completion_rate = stats.completion_rate
 
         if completion_rate > 0.8:
             insights.append("✓ Excelente taxa de conclusão de atividades")
@@ -676,17 +959,13 @@ class MLService:
             insights.append("⚠️ Baixa taxa de conclusão - considere ajustar dificuldade")
 
         # Check difficulty appropriateness
-        difficulty_issues = sum(
-            1 for a in assessments if a.difficulty_rating in [DifficultyRating.TOO_EASY, DifficultyRating.TOO_HARD]
-        )
-        if difficulty_issues > len(assessments) * 0.4:
+        if stats.difficulty_issues > stats.count * 0.4:
             insights.append("⚠️ Muitas atividades com dificuldade inadequada - revisar seleção")
 
         # Recent performance
-        recent = assessments[-5:] if len(assessments) >= 5 else assessments
-        recent_completed = sum(1 for a in recent if a.completion_status == CompletionStatus.COMPLETED)
+        recent_completed = stats.recent_completed
 
-        if recent_completed == len(recent):
+        if recent_completed == len(stats.recent):
             insights.append("✓ Todas as atividades recentes foram concluídas")
         elif recent_completed == 0:
             insights.append("⚠️ Nenhuma atividade recente foi concluída - necessário suporte adicional")
@@ -728,6 +1007,7 @@ def get_ml_service() -> MLService:
 
     if _ml_service is None:
         _ml_service = MLService()
+        register_feature_cache_invalidation()
 
         # Try to load models
         try:
@@ -0,0 +1,336 @@
+"""
+ML Training - EduAutismo IA
+
+Offline training of the behavioral risk classifier.
+
+Students are read in keyset-paginated chunks (plain columns, no ORM
+relationships) together with their assessments, and each chunk is turned
+into features by ml_features.build_feature_matrix, the same code that serves
+predictions. Rows go through a fixed-size reservoir sample, so memory is
+bounded by ``max_samples`` and ``chunk_size`` whatever the size of the
+students and assessments tables.
+
+Labels: until outcome labels are recorded, each student is labeled with the
+rule-based risk level (MLService.rule_based_risk_score), so the forest learns
+the heuristic from the same features; a {student_id: risk_level} mapping
+(e.g. reviewed by professionals) overrides it per student.
+
+Artifacts are written to ``<root>/behavioral_classifier/<version>/`` in the
+layout ModelRegistry.load expects: model.pkl and scaler.pkl (uncompressed
+joblib, memory-mappable) and metadata.json (feature_names, checksums,
+training time, metrics, parameters). The version directory is written to a
+temporary sibling and renamed, so a serving process never sees a partial
+version.
+
+Training is deterministic for a given database and ``random_state``.
+
+Usage:
+    result = train_behavioral_classifier(db, Path(settings.ML_MODEL_PATH), version="v2")
+"""
+
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import ValidationError
+from app.models.assessment import Assessment
+from app.models.student import Student
+from app.services.ml_features import FEATURE_NAMES, build_feature_matrix
+from app.services.ml_registry import MODEL_FILE, SCALER_FILE, ModelRegistry
+from app.services.ml_service import MLService
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+LABEL_RULE_BASED = "rule_based"
+LABEL_PROVIDED = "provided"
+
+# Student columns read by ml_features.student_feature_matrix
+_STUDENT_COLUMNS = (Student.id, Student.age, Student.tea_level, Student.interests, Student.learning_profile)
+
+# Assessment columns read by ml_features.AssessmentColumns
+_ASSESSMENT_COLUMNS = (
+    Assessment.student_id,
+    Assessment.completion_status,
+    Assessment.engagement_level,
+    Assessment.difficulty_rating,
+    Assessment.independence_level,
+    Assessment.created_at,
+)
+
+
+# ========== Feature Stream ==========
+
+
+def iter_feature_chunks(db: Session, chunk_size: int = 1000) -> Iterator[Tuple[List[UUID], np.ndarray]]:
+    """
+    Stream (student ids, feature matrix) chunks ordered by student id.
+
+    Each chunk issues two queries (students, then their assessments), so at
+    most ``chunk_size`` students and their assessments are held at a time.
+
+    Yields:
+        Student ids and float32 matrices of shape (len(ids), len(FEATURE_NAMES))
+    """
+    last_id = None
+    while True:
+        query = db.query(*_STUDENT_COLUMNS)
+        if last_id is not None:
+            query = query.filter(Student.id > last_id)
+        students = query.order_by(Student.id).limit(chunk_size).all()
+        if not students:
+            return
+
+        ids = [student.id for student in students]
+        assessments_by_student: Dict[UUID, List[Any]] = {}
+        for row in db.query(*_ASSESSMENT_COLUMNS).filter(Assessment.student_id.in_(ids)):
+            assessments_by_student.setdefault(row.student_id, []).append(row)
+
+        yield ids, build_feature_matrix(students, assessments_by_student)
+
+        last_id = ids[-1]
+
+
+def rule_based_labels(X: np.ndarray) -> np.ndarray:
+    """RISK_LEVELS index of the rule-based risk level of each FEATURE_NAMES row."""
+    labels = np.empty(len(X), dtype=np.int64)
+    # float32 -> nearest short decimal, so thresholds compare like the float64 serving features (0.8 > 0.8)
+    for i, row in enumerate(X.astype(np.float64).round(6).tolist()):
+        level = MLService.risk_level_from_score(MLService.rule_based_risk_score(dict(zip(FEATURE_NAMES, row))))
+        labels[i] = MLService.RISK_LEVELS.index(level)
+    return labels
+
+
+class ReservoirSample:
+    """
+    Uniform fixed-size sample of a stream of labeled rows (Algorithm R).
+
+    Args:
+        capacity: Maximum rows kept
+        n_features: Columns per row
+        seed: RNG seed (same stream and seed give the same sample)
+    """
+
+    def __init__(self, capacity: int, n_features: int, seed: int = 0):
+        self.capacity = capacity
+        self.seen = 0
+        self._X = np.empty((capacity, n_features), dtype=np.float32)
+        self._y = np.empty(capacity, dtype=np.int64)
+        self._rng = np.random.default_rng(seed)
+
+    def add(self, X: np.ndarray, y: np.ndarray) -> None:
+        """Offer a chunk of rows to the sample."""
+        n = len(X)
+        fill = min(max(self.capacity - self.seen, 0), n)
+        if fill:
+            self._X[self.seen : self.seen + fill] = X[:fill]
+            self._y[self.seen : self.seen + fill] = y[:fill]
+
+        if fill < n:
+            # Row t (0-based in the stream) replaces a random slot with probability capacity / (t + 1)
+            positions = np.arange(self.seen + fill, self.seen + n)
+            slots = self._rng.integers(0, positions + 1)
+            keep = slots < self.capacity
+            rows = np.arange(fill, n)[keep]
+            self._X[slots[keep]] = X[rows]
+            self._y[slots[keep]] = y[rows]
+
+        self.seen += n
+
+    @property
+    def X(self) -> np.ndarray:
+        return self._X[: min(self.seen, self.capacity)]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._y[: min(self.seen, self.capacity)]
+
+
+# ========== Training ==========
+
+
+@dataclass
+class TrainingResult:
+    """
+    Outcome of a training run.
+
+    Attributes:
+        model_dir: Version directory written
+        metadata: Contents of metadata.json
+        n_students: Students streamed
+        n_samples: Rows used (after reservoir sampling)
+    """
+
+    model_dir: Path
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    n_students: int = 0
+    n_samples: int = 0
+
+
+def _split(y: np.ndarray, holdout: float, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Train/holdout indices, stratified when every class can be represented in both."""
+    from sklearn.model_selection import train_test_split
+
+    indices = np.arange(len(y))
+    n_holdout = int(round(len(y) * holdout))
+    if n_holdout == 0:
+        return indices, indices[:0]
+
+    counts = np.bincount(y)
+    present = counts[counts > 0]
+    stratified = present.min() >= 2 and min(n_holdout, len(y) - n_holdout) >= len(present)
+
+    return train_test_split(indices, test_size=n_holdout, random_state=seed, stratify=y if stratified else None)
+
+
+def train_behavioral_classifier(
+    db: Session,
+    root: Path,
+    version: str = "production",
+    labels: Optional[Mapping[UUID, str]] = None,
+    chunk_size: int = 1000,
+    max_samples: int = 200_000,
+    n_estimators: int = 200,
+    max_depth: Optional[int] = None,
+    n_jobs: int = -1,
+    holdout: float = 0.2,
+    random_state: int = 42,
+    engine: Optional[str] = None,
+    overwrite: bool = False,
+) -> TrainingResult:
+    """
+    Train the behavioral risk classifier and write its registry version.
+
+    Args:
+        db: Database session (read only)
+        root: Registry root (settings.ML_MODEL_PATH)
+        version: Version directory to write
+        labels: Risk level per student id (overrides the rule-based label)
+        chunk_size: Students per streamed chunk
+        max_samples: Reservoir size (upper bound on rows held in memory)
+        n_estimators: Trees in the forest
+        max_depth: Maximum tree depth (None = unlimited)
+        n_jobs: Parallel jobs for fitting (-1 = all cores)
+        holdout: Fraction of the sample held out for metrics (0 = none)
+        random_state: Seed for sampling, split and forest
+        engine: Inference engine recorded in metadata ("flat" or "sklearn")
+        overwrite: Replace an existing version directory
+
+    Returns:
+        TrainingResult with the metadata written
+
+    Raises:
+        ValidationError: If the version exists, a label is unknown or the
+            training rows do not cover every risk level
+    """
+    import joblib
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import accuracy_score, f1_score
+    from sklearn.preprocessing import StandardScaler
+
+    model_dir = Path(root) / MLService.BEHAVIORAL_MODEL / version
+    if model_dir.exists() and not overwrite:
+        raise ValidationError(f"Model version already exists: {model_dir}")
+
+    label_index = {level: i for i, level in enumerate(MLService.RISK_LEVELS)}
+    labels = labels or {}
+    unknown = {level for level in labels.values() if level not in label_index}
+    if unknown:
+        raise ValidationError(f"Unknown risk levels in labels: {sorted(unknown)}")
+
+    started = time.perf_counter()
+    sample = ReservoirSample(max_samples, len(FEATURE_NAMES), seed=random_state)
+    provided = 0
+
+    for ids, X in iter_feature_chunks(db, chunk_size):
+        y = rule_based_labels(X)
+        for i, student_id in enumerate(ids):
+            level = labels.get(student_id)
+            if level is not None:
+                y[i] = label_index[level]
+                provided += 1
+        sample.add(X, y)
+
+    X, y = sample.X, sample.y
+    missing = [level for level, i in label_index.items() if not np.any(y == i)]
+    if missing:
+        raise ValidationError(f"Training data has no samples for risk levels {missing} ({len(y)} samples)")
+
+    if holdout > 0:
+        train_idx, test_idx = _split(y, holdout, random_state)
+    else:
+        train_idx, test_idx = np.arange(len(y)), np.arange(0)
+
+    missing = [level for level, i in label_index.items() if not np.any(y[train_idx] == i)]
+    if missing:
+        raise ValidationError(f"Training split has no samples for risk levels {missing}; lower holdout")
+
+    scaler = StandardScaler().fit(X[train_idx])
+    model = RandomForestClassifier(
+        n_estimators=n_estimators,
+        max_depth=max_depth,
+        n_jobs=n_jobs,
+        random_state=random_state,
+        class_weight="balanced",
+    )
+    model.fit(scaler.transform(X[train_idx]), y[train_idx])
+    fit_seconds = time.perf_counter() - started
+
+    metrics: Dict[str, Any] = {
+        "class_counts": {level: int(np.sum(y == i)) for level, i in label_index.items()},
+        "train_accuracy": float(accuracy_score(y[train_idx], model.predict(scaler.transform(X[train_idx])))),
+    }
+    if len(test_idx):
+        predicted = model.predict(scaler.transform(X[test_idx]))
+        metrics["holdout_accuracy"] = float(accuracy_score(y[test_idx], predicted))
+        metrics["holdout_f1_macro"] = float(f1_score(y[test_idx], predicted, average="macro", zero_division=0))
+        metrics["holdout_samples"] = int(len(test_idx))
+
+    # Write next to the target and rename, so readers never see a partial version
+    model_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=model_dir.parent))
+    try:
+        joblib.dump(model, staging / MODEL_FILE)
+        joblib.dump(scaler, staging / SCALER_FILE)
+        extra: Dict[str, Any] = {
+            "version": version,
+            "trained_at": datetime.now(timezone.utc).isoformat(),
+            "training_seconds": round(time.perf_counter() - started, 3),
+            "fit_seconds": round(fit_seconds, 3),
+            "n_students": sample.seen,
+            "n_samples": int(len(y)),
+            "labels": {LABEL_PROVIDED: provided, LABEL_RULE_BASED: sample.seen - provided},
+            "risk_levels": list(MLService.RISK_LEVELS),
+            "metrics": metrics,
+            "params": {
+                "n_estimators": n_estimators,
+                "max_depth": max_depth,
+                "max_samples": max_samples,
+                "holdout": holdout,
+                "random_state": random_state,
+            },
+        }
+        if engine:
+            extra["engine"] = engine
+        metadata = ModelRegistry.write_metadata(staging, FEATURE_NAMES, **extra)
+
+        if model_dir.exists():
+            shutil.rmtree(model_dir)
+        staging.rename(model_dir)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    logger.info(
+        f"Trained {MLService.BEHAVIORAL_MODEL}/{version}",
+        extra={"students": sample.seen, "samples": len(y), "metrics": metrics},
+    )
+    return TrainingResult(model_dir=model_dir, metadata=metadata, n_students=sample.seen, n_samples=int(len(y)))
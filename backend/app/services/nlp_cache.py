@@ -0,0 +1,199 @@
+"""
+NLP Response Cache - EduAutismo IA
+
+Prompt-hash cache of OpenAI chat completions used by NLPService.
+
+Prompts are built deterministically from normalized inputs (student profile
+fields, activity type, difficulty, duration, theme, subject, grade), so
+identical requests produce identical prompts. The cache key is a SHA-256 of:
+
+    (model, system prompt, user prompt, temperature class, max_tokens)
+
+Temperatures are grouped into classes (precise / balanced / creative), so a
+tweak inside a class keeps hitting the same entries.
+
+Two tiers:
+- in-process LRU (NLP_CACHE_MAX_SIZE entries, NLP_CACHE_TTL seconds)
+- Redis through cache_manager (prefix "nlp"), shared between workers; skipped
+  when Redis is not connected
+
+Only the completion text and its token usage are stored. Counters (hits,
+misses, saved tokens) are reported with every request through
+log_openai_request.
+
+Creative generations (temperature class "creative", e.g. activities) are not
+cached by default, so generating again gives a new variation; set
+NLP_CACHE_CREATIVE=True to cache them too. Callers can also pass
+use_cache=False to bypass the cache for any request.
+
+Usage:
+    cache = get_nlp_response_cache()
+    key = cache.make_key(model, system_prompt, prompt, temperature, max_tokens)
+    cached = await cache.get(key)
+"""
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from app.core.cache import LocalCache, cache_manager
+from app.core.config import settings
+from app.utils.constants import TEMPERATURE_BALANCED, TEMPERATURE_PRECISE
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_PREFIX = "nlp"
+
+TEMPERATURE_CLASS_PRECISE = "precise"
+TEMPERATURE_CLASS_BALANCED = "balanced"
+TEMPERATURE_CLASS_CREATIVE = "creative"
+
+
+def temperature_class(temperature: float) -> str:
+    """Group a sampling temperature into precise / balanced / creative."""
+    if temperature <= TEMPERATURE_PRECISE:
+        return TEMPERATURE_CLASS_PRECISE
+    if temperature <= TEMPERATURE_BALANCED:
+        return TEMPERATURE_CLASS_BALANCED
+    return TEMPERATURE_CLASS_CREATIVE
+
+
+@dataclass(frozen=True)
+class CachedCompletion:
+    """Completion text and the token usage of the call that produced it."""
+
+    content: str
+    prompt_tokens: int
+    completion_tokens: int
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+class NLPResponseCache:
+    """
+    Two-tier cache of chat completions keyed by prompt hash.
+
+    Args:
+        max_size: Maximum entries kept in process (LRU)
+        ttl: Entry lifetime in seconds (both tiers)
+        enabled: False turns get/set into no-ops
+        cache_creative: Whether creative-temperature requests are cached
+        shared: Also read/write Redis (cache_manager) when connected
+    """
+
+    def __init__(
+        self,
+        max_size: int = 512,
+        ttl: int = 3600,
+        enabled: bool = True,
+        cache_creative: bool = False,
+        shared: bool = True,
+    ):
+        self.ttl = ttl
+        self.enabled = enabled
+        self.cache_creative = cache_creative
+        self.shared = shared
+        self._local = LocalCache(max_size=max_size, ttl=ttl)
+
+        self.hits = 0
+        self.misses = 0
+        self.saved_prompt_tokens = 0
+        self.saved_completion_tokens = 0
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, user_prompt: str, temperature: float, max_tokens: int) -> str:
+        """SHA-256 of the request fields that determine the completion."""
+        payload = json.dumps(
+            [model, system_prompt, user_prompt, temperature_class(temperature), max_tokens],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def should_cache(self, temperature: float, use_cache: bool = True) -> bool:
+        """Whether a request with this temperature (and caller opt-out) goes through the cache."""
+        if not self.enabled or not use_cache:
+            return False
+        return self.cache_creative or temperature_class(temperature) != TEMPERATURE_CLASS_CREATIVE
+
+    async def get(self, key: str) -> Optional[CachedCompletion]:
+        """Cached completion (None on miss); counts the hit and the tokens it saves."""
+        value = self._local.get(key)
+        if value is None and self.shared and cache_manager.is_available:
+            value = await cache_manager.get(key, prefix=CACHE_PREFIX)
+            if value is not None:
+                self._local.set(key, value)
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        completion = CachedCompletion(**value)
+        self.hits += 1
+        self.saved_prompt_tokens += completion.prompt_tokens
+        self.saved_completion_tokens += completion.completion_tokens
+        return completion
+
+    async def set(self, key: str, completion: CachedCompletion) -> None:
+        """Store a completion in both tiers."""
+        value = asdict(completion)
+        self._local.set(key, value)
+        if self.shared and cache_manager.is_available:
+            await cache_manager.set(key, value, ttl=self.ttl, prefix=CACHE_PREFIX)
+
+    def clear(self) -> None:
+        """Drop in-process entries and reset counters (Redis entries expire by TTL)."""
+        self._local.clear()
+        self.hits = 0
+        self.misses = 0
+        self.saved_prompt_tokens = 0
+        self.saved_completion_tokens = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.saved_prompt_tokens + self.saved_completion_tokens
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters, hit rate and current in-process size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "saved_prompt_tokens": self.saved_prompt_tokens,
+            "saved_completion_tokens": self.saved_completion_tokens,
+            "size": len(self._local),
+        }
+
+
+# ========== Singleton Instance ==========
+
+_nlp_response_cache: Optional[NLPResponseCache] = None
+
+
+def get_nlp_response_cache() -> NLPResponseCache:
+    """
+    Get singleton instance of the NLP response cache.
+
+    Returns:
+        NLPResponseCache configured from settings
+    """
+    global _nlp_response_cache
+
+    if _nlp_response_cache is None:
+        _nlp_response_cache = NLPResponseCache(
+            max_size=settings.NLP_CACHE_MAX_SIZE,
+            ttl=settings.NLP_CACHE_TTL,
+            enabled=settings.NLP_CACHE_ENABLED,
+            cache_creative=settings.NLP_CACHE_CREATIVE,
+        )
+
+    return _nlp_response_cache
@@ -0,0 +1,323 @@
+"""
+NLP Circuit Breaker - EduAutismo IA
+
+Circuit breaker and request hedging for OpenAI chat calls.
+
+The breaker keeps a rolling window (``window_seconds``) of call outcomes and
+latencies:
+
+- closed: calls go through; with at least ``min_calls`` in the window, the
+  circuit opens when the failure rate reaches ``failure_rate`` or the share
+  of calls slower than ``slow_call_seconds`` reaches ``slow_call_rate``
+- open: calls are rejected at once with CircuitOpenError (no request is
+  sent, nobody waits for the client timeout) for ``open_seconds``
+- half_open: ``half_open_calls`` probe calls are let through; success closes
+  the circuit, a failed or slow probe opens it again
+
+Failures are service failures only: connection errors, timeouts and 5xx.
+Rate limits (429, retried by the rate limiter) and other 4xx responses
+describe the request, not the health of the service, and are not counted.
+
+Hedging (optional, ``hedge_quantile``): when a call has not answered after
+the given latency quantile of recent successful calls (e.g. p95), a second
+identical call is started and the first answer wins. It trades extra tokens
+for a shorter tail and is off by default (OPENAI_HEDGE_ENABLED).
+
+NLPService routes its chat calls through the breaker when it has one
+(get_nlp_service() attaches the shared instance); when the circuit is open,
+activity generation falls back to the deterministic template
+(app/services/activity_templates.py).
+
+Usage:
+    breaker = get_openai_circuit_breaker()
+    breaker.check()  # fail fast before queueing
+    response = await breaker.hedge(lambda: breaker.call(lambda: client.chat.completions.create(**kwargs)))
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from openai import APIConnectionError, APIStatusError
+
+from app.core.config import settings
+from app.core.exceptions import CircuitOpenError
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_service_failure(error: BaseException) -> bool:
+    """Whether an exception from a chat call counts against the service."""
+    if isinstance(error, APIStatusError):
+        return error.status_code >= 500
+    return isinstance(error, (APIConnectionError, asyncio.TimeoutError))
+
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker for async calls.
+
+    Args:
+        window_seconds: Length of the rolling window
+        min_calls: Calls in the window before the rates are evaluated
+        failure_rate: Failure share that opens the circuit
+        slow_call_seconds: Latency above which a call counts as slow
+        slow_call_rate: Slow-call share that opens the circuit
+        open_seconds: Time the circuit stays open before probing
+        half_open_calls: Probe calls allowed while half open
+        hedge_quantile: Latency quantile after which a hedged call starts (None = no hedging)
+        clock: Monotonic clock (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 60.0,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 20.0,
+        slow_call_rate: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1,
+        hedge_quantile: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.hedge_quantile = hedge_quantile
+        self._clock = clock
+
+        # (finished at, failed, latency seconds)
+        self._calls: Deque[Tuple[float, bool, float]] = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+
+        self.times_opened = 0
+        self.rejected = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    # ========== State ==========
+
+    @property
+    def state(self) -> str:
+        """Current state (an open circuit becomes half open after open_seconds)."""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+            logger.info("OpenAI circuit half open: probing")
+        return self._state
+
+    def retry_after(self) -> int:
+        """Seconds until the circuit lets a probe through."""
+        if self.state != OPEN:
+            return 1
+        return max(1, math.ceil(self.open_seconds - (self._clock() - self._opened_at)))
+
+    def _open(self, reason: str) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self.times_opened += 1
+        logger.warning(f"OpenAI circuit opened ({reason}) for {self.open_seconds:g}s")
+
+    def _close(self) -> None:
+        self._state = CLOSED
+        self._calls.clear()
+        logger.info("OpenAI circuit closed")
+
+    def _prune(self) -> None:
+        horizon = self._clock() - self.window_seconds
+        while self._calls and self._calls[0][0] < horizon:
+            self._calls.popleft()
+
+    def _admit(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._probes < self.half_open_calls:
+            self._probes += 1
+            return True
+        return False
+
+    def _record(self, failed: bool, latency: float) -> None:
+        slow = latency >= self.slow_call_seconds
+
+        if self._state == HALF_OPEN:
+            self._probes -= 1
+            if failed or slow:
+                self._open("probe failed" if failed else "probe slow")
+            else:
+                self._close()
+            return
+        if self._state == OPEN:
+            return  # finished after another call opened the circuit
+
+        self._calls.append((self._clock(), failed, latency))
+        self._prune()
+
+        total = len(self._calls)
+        if total < self.min_calls:
+            return
+        failures = sum(1 for _, call_failed, _ in self._calls if call_failed)
+        slow_calls = sum(1 for _, _, call_latency in self._calls if call_latency >= self.slow_call_seconds)
+        if failures / total >= self.failure_rate:
+            self._open(f"{failures}/{total} calls failed")
+        elif slow_calls / total >= self.slow_call_rate:
+            self._open(f"{slow_calls}/{total} calls slower than {self.slow_call_seconds:g}s")
+
+    # ========== Calls ==========
+
+    def check(self) -> None:
+        """
+        Fail fast while the circuit is open (does not take a half-open probe slot).
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if self.state == OPEN:
+            self.rejected += 1
+            raise CircuitOpenError(retry_after=self.retry_after())
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``func()`` if the circuit allows it, recording outcome and latency.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (func is not called)
+        """
+        if not self._admit():
+            self.rejected += 1
+            raise CircuitOpenError(retry_after=self.retry_after())
+
+        start = self._clock()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            if self._state == HALF_OPEN:
+                self._probes -= 1
+            raise
+        except Exception as e:
+            latency = self._clock() - start
+            if is_service_failure(e):
+                self._record(True, latency)
+            elif self._state == HALF_OPEN:
+                self._probes -= 1
+            raise
+
+        self._record(False, self._clock() - start)
+        return result
+
+    def latency_quantile(self, quantile: float) -> Optional[float]:
+        """Latency quantile of successful calls in the window (None with fewer than min_calls)."""
+        self._prune()
+        latencies = sorted(latency for _, failed, latency in self._calls if not failed)
+        if not latencies or len(latencies) < self.min_calls:
+            return None
+        return latencies[min(len(latencies) - 1, int(quantile * len(latencies)))]
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging (None = do not hedge)."""
+        if self.hedge_quantile is None or self.state != CLOSED:
+            return None
+        return self.latency_quantile(self.hedge_quantile)
+
+    async def hedge(self, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``func()``; if it is still pending after hedge_delay(), start a second
+        ``func()`` and return whichever succeeds first (the other is cancelled).
+
+        The error of the last attempt is raised if all attempts fail.
+        """
+        delay = self.hedge_delay()
+        if delay is None:
+            return await func()
+
+        tasks: List[asyncio.Task] = [asyncio.ensure_future(func())]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self.hedged += 1
+                tasks.append(asyncio.ensure_future(func()))
+
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if len(tasks) > 1 and task is tasks[1]:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """State, window rates and counters."""
+        state = self.state
+        self._prune()
+        total = len(self._calls)
+        failures = sum(1 for _, failed, _ in self._calls if failed)
+        slow_calls = sum(1 for _, _, latency in self._calls if latency >= self.slow_call_seconds)
+        p50 = self.latency_quantile(0.5)
+        p95 = self.latency_quantile(0.95)
+
+        return {
+            "state": state,
+            "retry_after_seconds": self.retry_after() if state == OPEN else 0,
+            "window_seconds": self.window_seconds,
+            "window_calls": total,
+            "failure_rate": round(failures / total, 3) if total else 0.0,
+            "slow_call_rate": round(slow_calls / total, 3) if total else 0.0,
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "hedging": self.hedge_quantile is not None,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+# ========== Singleton Instance ==========
+
+_openai_circuit_breaker: Optional[CircuitBreaker] = None
+
+
+def get_openai_circuit_breaker() -> CircuitBreaker:
+    """
+    Get singleton instance of the OpenAI circuit breaker.
+
+    Returns:
+        CircuitBreaker configured from settings
+    """
+    global _openai_circuit_breaker
+
+    if _openai_circuit_breaker is None:
+        _openai_circuit_breaker = CircuitBreaker(
+            window_seconds=settings.OPENAI_CIRCUIT_WINDOW_SECONDS,
+            min_calls=settings.OPENAI_CIRCUIT_MIN_CALLS,
+            failure_rate=settings.OPENAI_CIRCUIT_FAILURE_RATE,
+            slow_call_seconds=settings.OPENAI_CIRCUIT_SLOW_CALL_SECONDS,
+            slow_call_rate=settings.OPENAI_CIRCUIT_SLOW_CALL_RATE,
+            open_seconds=settings.OPENAI_CIRCUIT_OPEN_SECONDS,
+            hedge_quantile=settings.OPENAI_HEDGE_QUANTILE if settings.OPENAI_HEDGE_ENABLED else None,
+        )
+
+    return _openai_circuit_breaker
@@ -0,0 +1,428 @@
+"""
+NLP Prompts - EduAutismo IA
+
+Prompt assembly for NLPService.
+
+- Static parts (subject system prompts, output format and guideline blocks)
+  are built once at import; a subject system prompt is a dict lookup.
+- The student profile block is memoized per (profile values, fields), so
+  repeated generations for the same student reuse the rendered fragment.
+- Assessment history in progress analysis is capped to
+  MAX_PROMPT_TOKENS_ASSESSMENT_HISTORY estimated tokens: the most recent
+  assessments are listed in detail, the rest are summarized as counts.
+  Free-text fields (notes, progress summary) are truncated to
+  MAX_PROMPT_TOKENS_FREE_TEXT.
+
+Token counts are a local estimate (estimate_tokens), not a tokenizer call;
+it errs high for Portuguese text so budgets are not exceeded.
+
+Usage:
+    system_prompt = subject_system_prompt(Subject.MATEMATICA)
+    prompt = build_progress_prompt(student_profile, assessments, "último mês")
+"""
+
+import math
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.utils.constants import (
+    MAX_PROMPT_TOKENS_ASSESSMENT_HISTORY,
+    MAX_PROMPT_TOKENS_FREE_TEXT,
+    ActivityType,
+    DifficultyLevel,
+    GradeLevel,
+    PedagogicalActivityType,
+    Subject,
+    get_grade_level_display_name,
+    get_subject_display_name,
+)
+
+# Portuguese averages ~4 characters per token with OpenAI tokenizers; 3.5 errs high
+CHARS_PER_TOKEN = 3.5
+
+# Assessments listed in detail at most (newest first), regardless of budget
+MAX_DETAILED_ASSESSMENTS = 10
+
+# Recent activities listed in recommendations
+MAX_RECENT_ACTIVITIES = 5
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local estimate of the token count of ``text``."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut ``text`` to about ``max_tokens`` estimated tokens, at a word boundary."""
+    max_chars = int(max_tokens * CHARS_PER_TOKEN)
+    if len(text) <= max_chars:
+        return text
+    cut = text[: max_chars - 1].rsplit(" ", 1)[0]
+    return cut.rstrip(" ,.;:") + "…"
+
+
+# ============================================================================
+# Static Fragments
+# ============================================================================
+
+_SUBJECT_BASE_PROMPT = """Você é um especialista em educação especial e Transtorno do Espectro Autista (TEA),
+com profundo conhecimento em pedagogia inclusiva e adaptações curriculares."""
+
+_SUBJECT_CONTEXTS = {
+    Subject.MATEMATICA: """
+Especialização: Matemática para alunos com TEA
+- Use estratégias visuais e concretas (manipuláveis, blocos, desenhos)
+- Divida problemas complexos em passos menores
+- Incorpore interesses especiais em problemas matemáticos
+- Evite linguagem ambígua; seja literal e preciso
+- Use rotinas previsíveis na resolução de problemas""",
+    Subject.PORTUGUES: """
+Especialização: Português/Língua Portuguesa para alunos com TEA
+- Trabalhe compreensão literal antes de inferências
+- Use apoios visuais para gramática e estrutura textual
+- Considere dificuldades pragmáticas da linguagem
+- Adapte textos mantendo informações essenciais
+- Foque em comunicação funcional""",
+    Subject.LITERATURA: """
+Especialização: Literatura para alunos com TEA
+- Escolha textos com estrutura clara e previsível
+- Trabalhe compreensão literal antes de metáforas
+- Use organizadores gráficos para enredo e personagens
+- Conecte histórias a experiências concretas
+- Considere sensibilidades sensoriais ao escolher textos""",
+    Subject.CIENCIAS: """
+Especialização: Ciências para alunos com TEA
+- Enfatize observação e experimentação prática
+- Use classificação e categorização (pontos fortes TEA)
+- Aproveite interesses especiais (dinossauros, planetas, etc.)
+- Forneça procedimentos passo-a-passo para experimentos
+- Use diagramas e imagens reais""",
+    Subject.HISTORIA: """
+Especialização: História para alunos com TEA
+- Use linhas do tempo visuais e cronológicas
+- Conecte eventos históricos a experiências pessoais
+- Foque em fatos concretos antes de interpretações
+- Use mapas, imagens e fontes primárias
+- Organize informações em categorias claras""",
+    Subject.GEOGRAFIA: """
+Especialização: Geografia para alunos com TEA
+- Use mapas visuais e recursos espaciais
+- Aproveite pensamento sistemático para padrões geográficos
+- Conecte conceitos abstratos a exemplos concretos
+- Use imagens de satélite e fotografias reais
+- Organize por categorias (clima, relevo, etc.)""",
+    # Adicione mais disciplinas conforme necessário
+}
+
+
+def _default_subject_context(subject: Subject) -> str:
+    return (
+        f"\nEspecialização: {get_subject_display_name(subject)} para alunos com TEA\n"
+        "- Adapte o conteúdo considerando as características do TEA\n"
+        "- Use estratégias visuais e estruturadas\n"
+        "- Conecte com interesses do aluno\n"
+    )
+
+
+SUBJECT_SYSTEM_PROMPTS: Dict[Subject, str] = {
+    subject: _SUBJECT_BASE_PROMPT + _SUBJECT_CONTEXTS.get(subject, _default_subject_context(subject))
+    for subject in Subject
+}
+
+ACTIVITY_OUTPUT_FORMAT = """
+Retorne a atividade no seguinte formato JSON:
+{
+    "title": "Título da atividade",
+    "description": "Descrição detalhada",
+    "objectives": ["Objetivo 1", "Objetivo 2", ...],
+    "materials": ["Material 1", "Material 2", ...],
+    "instructions": ["Passo 1", "Passo 2", ...],
+    "duration_minutes": 30,
+    "adaptations": ["Adaptação 1", "Adaptação 2", ...],
+    "visual_supports": ["Suporte visual 1", "Suporte visual 2", ...],
+    "success_criteria": ["Critério 1", "Critério 2", ...]
+}
+
+IMPORTANTE:
+- A atividade deve ser clara, estruturada e motivadora
+- Incorpore os interesses do aluno sempre que possível
+- Inclua instruções visuais e suportes necessários
+- As adaptações devem considerar os desafios específicos
+- Os critérios de sucesso devem ser observáveis e mensuráveis
+"""
+
+PROGRESS_OUTPUT_FORMAT = """
+Retorne a análise no seguinte formato JSON:
+{
+    "summary": "Resumo geral do progresso",
+    "strengths": ["Ponto forte 1", "Ponto forte 2", ...],
+    "areas_for_improvement": ["Área 1", "Área 2", ...],
+    "patterns_observed": ["Padrão 1", "Padrão 2", ...],
+    "recommendations": ["Recomendação 1", "Recomendação 2", ...]
+}
+
+Seja específico, construtivo e baseado em evidências das avaliações fornecidas.
+"""
+
+RECOMMENDATIONS_OUTPUT_FORMAT = """
+Retorne as recomendações no seguinte formato JSON:
+{
+    "recommendations": [
+        {
+            "title": "Título da recomendação",
+            "description": "Descrição detalhada",
+            "rationale": "Justificativa baseada no perfil/progresso",
+            "priority": "high|medium|low",
+            "category": "activity|strategy|resource"
+        },
+        ...
+    ]
+}
+
+Gere 3-5 recomendações práticas e acionáveis, priorizando as mais relevantes.
+"""
+
+MULTIDISCIPLINARY_OUTPUT_FORMAT = """
+Retorne a atividade no seguinte formato JSON:
+{
+    "title": "Título da atividade",
+    "description": "Descrição detalhada do conteúdo e objetivo",
+    "objectives": ["Objetivo 1", "Objetivo 2", ...],
+    "materials": ["Material 1", "Material 2", ...],
+    "instructions": ["Passo 1", "Passo 2", ...],
+    "duration_minutes": 30,
+    "adaptations": ["Adaptação específica para TEA 1", "Adaptação 2", ...],
+    "visual_supports": ["Suporte visual 1", "Suporte visual 2", ...],
+    "success_criteria": ["Critério observável 1", "Critério 2", ...]
+}
+
+IMPORTANTE:
+- Conteúdo deve ser apropriado para a série/nível especificado
+- Incorpore estratégias específicas para TEA
+- Use interesses do aluno quando possível
+- Inclua adaptações considerando desafios sensoriais e cognitivos
+- Critérios de sucesso devem ser observáveis e mensuráveis
+- Se houver códigos BNCC, garanta alinhamento com as competências
+"""
+
+
+def subject_system_prompt(subject: Subject) -> str:
+    """System prompt tailored to the subject (precompiled)."""
+    return SUBJECT_SYSTEM_PROMPTS[subject]
+
+
+# ============================================================================
+# Student Profile Fragment
+# ============================================================================
+
+# field -> (label, default); list fields are joined with ", "
+_PROFILE_LINES = {
+    "name": ("Nome", "Aluno"),
+    "age": ("Idade", "não especificada"),
+    "grade": ("Série/Nível", None),
+    "diagnosis": ("Diagnóstico", "TEA"),
+    "interests": ("Interesses", "não especificados"),
+    "strengths": ("Pontos fortes", "a identificar"),
+    "challenges": ("Desafios", "a identificar"),
+}
+_LIST_FIELDS = ("interests", "strengths", "challenges")
+
+PROFILE_FIELDS_FULL = ("name", "age", "diagnosis", "interests", "strengths", "challenges")
+PROFILE_FIELDS_BASIC = ("name", "age", "diagnosis")
+PROFILE_FIELDS_INTERESTS = ("name", "age", "diagnosis", "interests")
+PROFILE_FIELDS_GRADE = ("name", "age", "grade", "diagnosis", "interests", "strengths", "challenges")
+
+
+def profile_fragment(
+    student_profile: Dict[str, Any], fields: Sequence[str] = PROFILE_FIELDS_FULL, grade: Optional[str] = None
+) -> str:
+    """
+    "PERFIL DO ALUNO" block for the given profile fields (memoized).
+
+    Args:
+        student_profile: Student information
+        fields: Profile fields to include, in order
+        grade: Grade display name (for the "grade" field)
+    """
+    values = []
+    for field in fields:
+        if field == "grade":
+            values.append(grade)
+        elif field in _LIST_FIELDS:
+            values.append(tuple(str(item) for item in student_profile.get(field) or ()))
+        else:
+            value = student_profile.get(field)
+            values.append(None if value is None else str(value))
+    return _render_profile(tuple(fields), tuple(values))
+
+
+@lru_cache(maxsize=2048)
+def _render_profile(fields: Tuple[str, ...], values: Tuple[Any, ...]) -> str:
+    lines = ["PERFIL DO ALUNO:"]
+    for field, value in zip(fields, values):
+        label, default = _PROFILE_LINES[field]
+        if field in _LIST_FIELDS:
+            value = ", ".join(value) if value else default
+        elif value is None:
+            value = default
+        if field == "age":
+            value = f"{value} anos"
+        lines.append(f"- {label}: {value}")
+    return "\n".join(lines) + "\n"
+
+
+# ============================================================================
+# Prompt Builders
+# ============================================================================
+
+
+def build_activity_prompt(
+    student_profile: Dict[str, Any],
+    activity_type: ActivityType,
+    difficulty: DifficultyLevel,
+    duration_minutes: int,
+    theme: Optional[str] = None,
+) -> str:
+    """Build prompt for activity generation."""
+    parts = [
+        "Gere uma atividade pedagógica personalizada com as seguintes características:\n\n",
+        profile_fragment(student_profile, PROFILE_FIELDS_FULL),
+        "\nREQUISITOS DA ATIVIDADE:\n",
+        f"- Tipo: {activity_type.value}\n",
+        f"- Nível de dificuldade: {difficulty.value}\n",
+        f"- Duração estimada: {duration_minutes} minutos\n",
+    ]
+    if theme:
+        parts.append(f"- Tema: {theme}\n")
+    parts.append(ACTIVITY_OUTPUT_FORMAT)
+    return "".join(parts)
+
+
+def build_progress_prompt(
+    student_profile: Dict[str, Any],
+    assessments: List[Dict[str, Any]],
+    time_period: Optional[str] = None,
+    token_budget: int = MAX_PROMPT_TOKENS_ASSESSMENT_HISTORY,
+) -> str:
+    """
+    Build prompt for progress analysis.
+
+    Assessments (newest first) are listed in detail while they fit in
+    ``token_budget`` (at most MAX_DETAILED_ASSESSMENTS); the rest are
+    summarized by completion status and engagement counts.
+    """
+    period_text = f" no período: {time_period}" if time_period else ""
+    parts = [
+        f"Analise o progresso do aluno{period_text}.\n\n",
+        profile_fragment(student_profile, PROFILE_FIELDS_BASIC),
+        f"\nAVALIAÇÕES ({len(assessments)} registros):\n",
+        assessment_history(assessments, token_budget),
+        PROGRESS_OUTPUT_FORMAT,
+    ]
+    return "".join(parts)
+
+
+def assessment_history(assessments: List[Dict[str, Any]], token_budget: int) -> str:
+    """Detailed entries for the newest assessments within the budget, summary of the rest."""
+    parts = []
+    used = 0
+    detailed = 0
+    for assessment in assessments[:MAX_DETAILED_ASSESSMENTS]:
+        notes = truncate_to_tokens(str(assessment.get("notes") or "Nenhuma"), MAX_PROMPT_TOKENS_FREE_TEXT)
+        entry = (
+            f"\nAvaliação {detailed + 1}:\n"
+            f"- Atividade: {assessment.get('activity_title', 'Não especificada')}\n"
+            f"- Status: {assessment.get('completion_status', 'N/A')}\n"
+            f"- Engajamento: {assessment.get('engagement_level', 'N/A')}\n"
+            f"- Dificuldade percebida: {assessment.get('difficulty_rating', 'N/A')}\n"
+            f"- Observações: {notes}\n"
+        )
+        cost = estimate_tokens(entry)
+        if detailed and used + cost > token_budget:
+            break
+        parts.append(entry)
+        used += cost
+        detailed += 1
+
+    remaining = assessments[detailed:]
+    if remaining:
+        parts.append(_summarize_assessments(remaining))
+    return "".join(parts)
+
+
+def _summarize_assessments(assessments: List[Dict[str, Any]]) -> str:
+    status = Counter(str(a.get("completion_status", "N/A")) for a in assessments)
+    engagement = Counter(str(a.get("engagement_level", "N/A")) for a in assessments)
+    return (
+        f"\nDemais {len(assessments)} avaliações (resumo):\n"
+        f"- Status: {_format_counts(status)}\n"
+        f"- Engajamento: {_format_counts(engagement)}\n"
+    )
+
+
+def _format_counts(counts: Counter) -> str:
+    return ", ".join(f"{value} ({count})" for value, count in counts.most_common())
+
+
+def build_recommendations_prompt(
+    student_profile: Dict[str, Any],
+    recent_activities: List[Dict[str, Any]],
+    progress_summary: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Build prompt for recommendations."""
+    parts = [
+        "Gere recomendações personalizadas para o aluno.\n\n",
+        profile_fragment(student_profile, PROFILE_FIELDS_INTERESTS),
+        "\nATIVIDADES RECENTES:\n",
+    ]
+    for activity in recent_activities[:MAX_RECENT_ACTIVITIES]:
+        parts.append(f"- {activity.get('title', 'Atividade')} ({activity.get('type', 'N/A')})\n")
+
+    if progress_summary:
+        summary = truncate_to_tokens(
+            str(progress_summary.get("summary", "Não disponível")), MAX_PROMPT_TOKENS_FREE_TEXT
+        )
+        parts.append(f"\nRESUMO DE PROGRESSO:\n{summary}\n")
+
+    parts.append(RECOMMENDATIONS_OUTPUT_FORMAT)
+    return "".join(parts)
+
+
+def build_multidisciplinary_prompt(
+    student_profile: Dict[str, Any],
+    subject: Subject,
+    grade_level: GradeLevel,
+    activity_type: ActivityType,
+    pedagogical_type: Optional[PedagogicalActivityType],
+    difficulty: DifficultyLevel,
+    duration_minutes: int,
+    theme: Optional[str],
+    bncc_competencies: Optional[List[str]],
+) -> str:
+    """Build prompt for multidisciplinary activity generation."""
+    subject_name = get_subject_display_name(subject)
+    grade_name = get_grade_level_display_name(grade_level)
+
+    parts = [
+        f"Gere uma atividade pedagógica de {subject_name} personalizada para aluno com TEA:\n\n",
+        profile_fragment(student_profile, PROFILE_FIELDS_GRADE, grade=grade_name),
+        "\nREQUISITOS DA ATIVIDADE:\n",
+        f"- Disciplina: {subject_name}\n",
+        f"- Série/Nível: {grade_name}\n",
+        f"- Tipo de domínio: {activity_type.value}\n",
+    ]
+    if pedagogical_type:
+        parts.append(f"- Formato pedagógico: {pedagogical_type.value}\n")
+    parts.append(f"- Nível de dificuldade: {difficulty.value}\n")
+    parts.append(f"- Duração estimada: {duration_minutes} minutos\n")
+    if theme:
+        parts.append(f"- Tema específico: {theme}\n")
+    if bncc_competencies:
+        parts.append(
+            "\nALINHAMENTO BNCC:\n"
+            "Alinhe a atividade com as seguintes competências da Base Nacional Comum Curricular:\n"
+            f"{', '.join(bncc_competencies)}\n"
+        )
+    parts.append(MULTIDISCIPLINARY_OUTPUT_FORMAT)
+    return "".join(parts)
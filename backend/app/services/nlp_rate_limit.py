@@ -0,0 +1,191 @@
+"""
+NLP Rate Limiter - EduAutismo IA
+
+Bounded concurrency and request pacing for OpenAI chat calls.
+
+- asyncio.Semaphore: at most ``max_concurrency`` requests in flight
+- token bucket: requests start at most ``requests_per_minute`` per minute
+  (default RATE_LIMIT_OPENAI_PER_MINUTE), with bursts of ``burst``
+- rate-limit errors (HTTP 429) are retried with full-jitter exponential
+  backoff, never shorter than the server's Retry-After; the semaphore slot is
+  released while backing off
+
+NLPService routes its chat calls through the limiter when it has one
+(get_nlp_service() attaches the shared instance), so batch fan-out and
+single requests share the same budget. Cache hits never reach the limiter.
+
+Usage:
+    limiter = get_openai_rate_limiter()
+    response = await limiter.call(lambda: client.chat.completions.create(**kwargs))
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from openai import RateLimitError
+
+from app.core.config import settings
+from app.utils.constants import RATE_LIMIT_OPENAI_PER_MINUTE
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """
+    Async token bucket: ``rate_per_minute`` tokens per minute, up to ``capacity``.
+
+    Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """
+        Take one token, waiting for it if the bucket is empty.
+
+        Returns:
+            Seconds waited
+        """
+        async with self._lock:
+            self._refill()
+            waited = 0.0
+            if self._tokens < 1:
+                waited = (1 - self._tokens) / self.rate
+                await asyncio.sleep(waited)
+                self._refill()
+            self._tokens -= 1
+            return waited
+
+
+class OpenAIRateLimiter:
+    """
+    Concurrency limit, pacing and rate-limit retries for OpenAI calls.
+
+    Args:
+        max_concurrency: Requests in flight at once
+        requests_per_minute: Request starts per minute (token bucket rate)
+        burst: Requests allowed back to back before pacing (default: max_concurrency)
+        max_retries: Retries of a call failing with RateLimitError
+        base_delay: Backoff base in seconds (attempt n waits up to base * 2**n)
+        max_delay: Backoff cap in seconds
+        rng: Random source for jitter
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        requests_per_minute: float = RATE_LIMIT_OPENAI_PER_MINUTE,
+        burst: Optional[int] = None,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        rng: Optional[random.Random] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._bucket = TokenBucket(requests_per_minute, capacity=burst or max_concurrency)
+
+        self.in_flight = 0
+        self.calls = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.paced_seconds = 0.0
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``func()`` within the limits, retrying rate-limit errors.
+
+        Args:
+            func: Zero-argument coroutine factory (called once per attempt)
+
+        Raises:
+            RateLimitError: If the call is still rate limited after max_retries
+        """
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                self.paced_seconds += await self._bucket.acquire()
+                self.in_flight += 1
+                self.calls += 1
+                try:
+                    return await func()
+                except RateLimitError as e:
+                    self.rate_limited += 1
+                    if attempt >= self.max_retries:
+                        logger.error(f"OpenAI rate limit: giving up after {attempt} retries")
+                        raise
+                    delay = self.backoff(attempt, e)
+                finally:
+                    self.in_flight -= 1
+
+            attempt += 1
+            self.retries += 1
+            logger.warning(f"OpenAI rate limited, retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def backoff(self, attempt: int, error: Optional[RateLimitError] = None) -> float:
+        """Full-jitter delay for a retry, at least the server's Retry-After."""
+        delay = self._rng.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        try:
+            return max(delay, min(float(retry_after), self.max_delay)) if retry_after else delay
+        except ValueError:
+            return delay
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Limits and counters."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "requests_per_minute": self.requests_per_minute,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "paced_seconds": round(self.paced_seconds, 3),
+        }
+
+
+# ========== Singleton Instance ==========
+
+_openai_rate_limiter: Optional[OpenAIRateLimiter] = None
+
+
+def get_openai_rate_limiter() -> OpenAIRateLimiter:
+    """
+    Get singleton instance of the OpenAI rate limiter.
+
+    Returns:
+        OpenAIRateLimiter configured from settings and RATE_LIMIT_OPENAI_PER_MINUTE
+    """
+    global _openai_rate_limiter
+
+    if _openai_rate_limiter is None:
+        _openai_rate_limiter = OpenAIRateLimiter(
+            max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+        )
+
+    return _openai_rate_limiter
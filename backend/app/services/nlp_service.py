@@ -7,18 +7,41 @@ Handles:
 - Progress analysis
 - Personalized recommendations
 - Content adaptation
+
+Completions go through a prompt-hash response cache (app/services/nlp_cache.py),
+so identical normalized requests are answered without calling the API. API
+calls go through the shared rate limiter (app/services/nlp_rate_limit.py):
+bounded concurrency, RATE_LIMIT_OPENAI_PER_MINUTE pacing and 429 retries.
+stream_activity streams the completion and yields fields as they are parsed
+(app/services/nlp_stream.py). A circuit breaker (app/services/nlp_circuit_breaker.py)
+rejects calls at once while OpenAI is failing or slow; activity generation then
+falls back to the deterministic template (app/services/activity_templates.py).
 """
 
+import asyncio
 import json
 import time
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
 
 from openai import AsyncOpenAI
 from openai import OpenAIError as OpenAIAPIError
 from pydantic import BaseModel
 
 from app.core.config import settings
-from app.core.exceptions import MissingConfigurationError, OpenAIError
+from app.core.exceptions import CircuitOpenError, MissingConfigurationError, OpenAIError
+from app.services.activity_templates import template_activity_fields
+from app.services.nlp_cache import CachedCompletion, NLPResponseCache, get_nlp_response_cache
+from app.services.nlp_circuit_breaker import CircuitBreaker, get_openai_circuit_breaker
+from app.services.nlp_prompts import (
+    build_activity_prompt,
+    build_multidisciplinary_prompt,
+    build_progress_prompt,
+    build_recommendations_prompt,
+    subject_system_prompt,
+)
+from app.services.nlp_rate_limit import OpenAIRateLimiter, get_openai_rate_limiter
+from app.services.nlp_stream import JSONObjectStreamParser
 from app.utils.constants import (
     DEFAULT_OPENAI_MODEL,
     MAX_TOKENS_ACTIVITY_GENERATION,
@@ -35,13 +58,13 @@ from app.utils.constants import (
     GradeLevel,
     PedagogicalActivityType,
     Subject,
-    get_grade_level_display_name,
-    get_subject_display_name,
 )
 from app.utils.logger import get_logger, log_openai_request
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
 
 # ============================================================================
 # Pydantic Models for Structured Output
@@ -62,6 +85,10 @@ class GeneratedActivity(BaseModel):
     success_criteria: List[str]
 
 
+class TemplateActivity(GeneratedActivity):
+    """Deterministic template activity, returned while the OpenAI circuit is open."""
+
+
 class ProgressAnalysis(BaseModel):
     """Structured progress analysis."""
 
@@ -82,6 +109,38 @@ class Recommendation(BaseModel):
     category: str  # activity, strategy, resource
 
 
+class ActivityGenerationRequest(BaseModel):
+    """Parameters of one activity in a batch generation."""
+
+    student_profile: Dict[str, Any]
+    activity_type: ActivityType
+    difficulty: DifficultyLevel
+    duration_minutes: int
+    theme: Optional[str] = None
+    use_cache: bool = True
+
+
+@dataclass
+class BatchGenerationResult:
+    """Outcome of one batch item: result on success, error on failure."""
+
+    index: int
+    result: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class ActivityStreamEvent:
+    """Event of a streamed generation: "field" (partial) or "activity" (final, validated)."""
+
+    event: str
+    data: Any
+
+
 # ============================================================================
 # NLP Service Class
 # ============================================================================
@@ -90,12 +149,32 @@ class Recommendation(BaseModel):
 class NLPService:
     """Service for OpenAI API interactions."""
 
-    def __init__(self):
-        """Initialize OpenAI client."""
-        if not settings.OPENAI_API_KEY:
-            raise MissingConfigurationError("OPENAI_API_KEY")
+    def __init__(
+        self,
+        client: Optional[AsyncOpenAI] = None,
+        response_cache: Optional[NLPResponseCache] = None,
+        rate_limiter: Optional[OpenAIRateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
+        """
+        Initialize OpenAI client.
 
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        Args:
+            client: Chat client to use instead of AsyncOpenAI (e.g. a local stub);
+                no API key is required when given
+            response_cache: Response cache (default: shared get_nlp_response_cache())
+            rate_limiter: Concurrency/pacing/retry limiter for chat calls (None = unlimited)
+            circuit_breaker: Breaker (and optional hedging) for chat calls (None = disabled)
+        """
+        if client is None:
+            if not settings.OPENAI_API_KEY:
+                raise MissingConfigurationError("OPENAI_API_KEY")
+            client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+
+        self.client = client
+        self.response_cache = response_cache if response_cache is not None else get_nlp_response_cache()
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
         self.default_model = DEFAULT_OPENAI_MODEL.value
         logger.info(f"NLPService initialized with model: {self.default_model}")
 
@@ -106,6 +185,7 @@ class NLPService:
         difficulty: DifficultyLevel,
         duration_minutes: int,
         theme: Optional[str] = None,
+        use_cache: bool = True,
     ) -> GeneratedActivity:
         """
         Generate personalized activity using AI.
@@ -116,6 +196,7 @@ class NLPService:
             difficulty: Difficulty level
             duration_minutes: Target duration
             theme: Optional theme/topic
+            use_cache: False forces a new generation (fresh variation)
 
         Returns:
             GeneratedActivity with all details
@@ -124,8 +205,6 @@ class NLPService:
             OpenAIError: If generation fails
         """
         try:
-            start_time = time.time()
-
             # Build prompt
             prompt = self._build_activity_prompt(
                 student_profile=student_profile,
@@ -137,38 +216,23 @@ class NLPService:
 
             logger.debug(f"Generating activity: type={activity_type}, difficulty={difficulty}, theme={theme}")
 
-            # Call OpenAI API with structured output
-            response = await self.client.chat.completions.create(
-                model=self.default_model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT_ACTIVITY_GENERATION},
-                    {"role": "user", "content": prompt},
-                ],
+            # Call OpenAI API with structured output (validated before caching)
+            activity = await self._complete(
+                system_prompt=SYSTEM_PROMPT_ACTIVITY_GENERATION,
+                prompt=prompt,
                 temperature=TEMPERATURE_CREATIVE,
                 max_tokens=MAX_TOKENS_ACTIVITY_GENERATION,
-                response_format={"type": "json_object"},
-            )
-
-            # Extract and parse response
-            content = response.choices[0].message.content
-            activity_data = json.loads(content)
-
-            # Log metrics
-            duration_ms = (time.time() - start_time) * 1000
-            log_openai_request(
-                logger=logger,
-                model=self.default_model,
-                prompt_tokens=response.usage.prompt_tokens,
-                completion_tokens=response.usage.completion_tokens,
-                duration_ms=duration_ms,
+                parse=lambda content: GeneratedActivity(**json.loads(content)),
+                use_cache=use_cache,
             )
-
-            # Validate and return structured output
-            activity = GeneratedActivity(**activity_data)
             logger.info(f"Activity generated successfully: {activity.title}")
 
             return activity
 
+        except CircuitOpenError:
+            logger.warning("OpenAI circuit open: using template activity")
+            return self._template_activity(student_profile, activity_type, difficulty, duration_minutes, theme)
+
         except OpenAIAPIError as e:
             logger.error(f"OpenAI API error: {e}")
             raise OpenAIError(message="Falha ao gerar atividade", original_error=e)
@@ -186,6 +250,7 @@ class NLPService:
         student_profile: Dict[str, Any],
         assessments: List[Dict[str, Any]],
         time_period: Optional[str] = None,
+        use_cache: bool = True,
     ) -> ProgressAnalysis:
         """
         Analyze student progress using AI.
@@ -194,6 +259,7 @@ class NLPService:
             student_profile: Student information
             assessments: List of assessment records
             time_period: Optional time period (e.g., "last month")
+            use_cache: False bypasses the response cache
 
         Returns:
             ProgressAnalysis with insights
@@ -202,8 +268,6 @@ class NLPService:
             OpenAIError: If analysis fails
         """
         try:
-            start_time = time.time()
-
             # Build prompt
             prompt = self._build_progress_prompt(
                 student_profile=student_profile,
@@ -214,37 +278,21 @@ class NLPService:
             logger.debug(f"Analyzing progress for student: {student_profile.get('name', 'Unknown')}")
 
             # Call OpenAI API
-            response = await self.client.chat.completions.create(
-                model=self.default_model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT_PROGRESS_ANALYSIS},
-                    {"role": "user", "content": prompt},
-                ],
+            analysis = await self._complete(
+                system_prompt=SYSTEM_PROMPT_PROGRESS_ANALYSIS,
+                prompt=prompt,
                 temperature=TEMPERATURE_PRECISE,
                 max_tokens=MAX_TOKENS_PROGRESS_ANALYSIS,
-                response_format={"type": "json_object"},
+                parse=lambda content: ProgressAnalysis(**json.loads(content)),
+                use_cache=use_cache,
             )
-
-            # Extract and parse response
-            content = response.choices[0].message.content
-            analysis_data = json.loads(content)
-
-            # Log metrics
-            duration_ms = (time.time() - start_time) * 1000
-            log_openai_request(
-                logger=logger,
-                model=self.default_model,
-                prompt_tokens=response.usage.prompt_tokens,
-                completion_tokens=response.usage.completion_tokens,
-                duration_ms=duration_ms,
-            )
-
-            # Validate and return structured output
-            analysis = ProgressAnalysis(**analysis_data)
             logger.info("Progress analysis completed successfully")
 
             return analysis
 
+        except CircuitOpenError:
+            raise
+
         except OpenAIAPIError as e:
             logger.error(f"OpenAI API error: {e}")
             raise OpenAIError(message="Falha ao analisar progresso", original_error=e)
@@ -262,6 +310,7 @@ class NLPService:
         student_profile: Dict[str, Any],
         recent_activities: List[Dict[str, Any]],
         progress_summary: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True,
     ) -> List[Recommendation]:
         """
         Generate personalized recommendations.
@@ -270,6 +319,7 @@ class NLPService:
             student_profile: Student information
             recent_activities: Recent activity history
             progress_summary: Optional progress analysis
+            use_cache: False bypasses the response cache
 
         Returns:
             List of Recommendation objects
@@ -278,8 +328,6 @@ class NLPService:
             OpenAIError: If generation fails
         """
         try:
-            start_time = time.time()
-
             # Build prompt
             prompt = self._build_recommendations_prompt(
                 student_profile=student_profile,
@@ -290,37 +338,23 @@ class NLPService:
             logger.debug(f"Generating recommendations for student: {student_profile.get('name', 'Unknown')}")
 
             # Call OpenAI API
-            response = await self.client.chat.completions.create(
-                model=self.default_model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT_RECOMMENDATIONS},
-                    {"role": "user", "content": prompt},
-                ],
+            recommendations = await self._complete(
+                system_prompt=SYSTEM_PROMPT_RECOMMENDATIONS,
+                prompt=prompt,
                 temperature=TEMPERATURE_BALANCED,
                 max_tokens=MAX_TOKENS_RECOMMENDATION,
-                response_format={"type": "json_object"},
-            )
-
-            # Extract and parse response
-            content = response.choices[0].message.content
-            recommendations_data = json.loads(content)
-
-            # Log metrics
-            duration_ms = (time.time() - start_time) * 1000
-            log_openai_request(
-                logger=logger,
-                model=self.default_model,
-                prompt_tokens=response.usage.prompt_tokens,
-                completion_tokens=response.usage.completion_tokens,
-                duration_ms=duration_ms,
+                parse=lambda content: [
+                    Recommendation(**rec) for rec in json.loads(content).get("recommendations", [])
+                ],
+                use_cache=use_cache,
             )
-
-            # Parse recommendations
-            recommendations = [Recommendation(**rec) for rec in recommendations_data.get("recommendations", [])]
             logger.info(f"Generated {len(recommendations)} recommendations")
 
             return recommendations
 
+        except CircuitOpenError:
+            raise
+
         except OpenAIAPIError as e:
             logger.error(f"OpenAI API error: {e}")
             raise OpenAIError(message="Falha ao gerar recomendações", original_error=e)
@@ -344,6 +378,7 @@ class NLPService:
         duration_minutes: int = 30,
         theme: Optional[str] = None,
         bncc_competencies: Optional[List[str]] = None,
+        use_cache: bool = True,
     ) -> GeneratedActivity:
         """
         Generate multidisciplinary activity with subject-specific context (MVP 3.0).
@@ -358,6 +393,7 @@ class NLPService:
             duration_minutes: Target duration
             theme: Optional theme/topic
             bncc_competencies: Optional BNCC codes to align with
+            use_cache: False forces a new generation (fresh variation)
 
         Returns:
             GeneratedActivity with subject-specific content
@@ -366,8 +402,6 @@ class NLPService:
             OpenAIError: If generation fails
         """
         try:
-            start_time = time.time()
-
             # Get subject-specific system prompt
             system_prompt = self._get_subject_system_prompt(subject)
 
@@ -390,33 +424,14 @@ class NLPService:
             )
 
             # Call OpenAI API with subject-specific context
-            response = await self.client.chat.completions.create(
-                model=self.default_model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt},
-                ],
+            activity = await self._complete(
+                system_prompt=system_prompt,
+                prompt=prompt,
                 temperature=TEMPERATURE_CREATIVE,
                 max_tokens=MAX_TOKENS_ACTIVITY_GENERATION,
-                response_format={"type": "json_object"},
-            )
-
-            # Extract and parse response
-            content = response.choices[0].message.content
-            activity_data = json.loads(content)
-
-            # Log metrics
-            duration_ms = (time.time() - start_time) * 1000
-            log_openai_request(
-                logger=logger,
-                model=self.default_model,
-                prompt_tokens=response.usage.prompt_tokens,
-                completion_tokens=response.usage.completion_tokens,
-                duration_ms=duration_ms,
+                parse=lambda content: GeneratedActivity(**json.loads(content)),
+                use_cache=use_cache,
             )
-
-            # Validate and return structured output
-            activity = GeneratedActivity(**activity_data)
             logger.info(
                 f"Multidisciplinary activity generated: {activity.title} "
                 f"({subject.value}, {grade_level.value})"
@@ -424,6 +439,9 @@ class NLPService:
 
             return activity
 
+        except CircuitOpenError:
+            raise
+
         except OpenAIAPIError as e:
             logger.error(f"OpenAI API error: {e}")
             raise OpenAIError(message="Falha ao gerar atividade multidisciplinar", original_error=e)
@@ -436,10 +454,290 @@ class NLPService:
             logger.error(f"Unexpected error generating multidisciplinary activity: {e}")
             raise OpenAIError(message="Erro inesperado ao gerar atividade", original_error=e)
 
+    async def generate_activities(
+        self, requests: Sequence[ActivityGenerationRequest]
+    ) -> AsyncIterator[BatchGenerationResult]:
+        """
+        Generate many activities concurrently, yielding results as they complete.
+
+        All generations start at once; the rate limiter (concurrency limit,
+        request pacing, 429 retries) bounds the calls actually in flight.
+        Failures are returned per item instead of aborting the batch. If the
+        consumer stops iterating, pending generations are cancelled.
+
+        Args:
+            requests: Generation parameters, one per activity
+
+        Yields:
+            BatchGenerationResult in completion order (index = position in requests)
+        """
+
+        async def run(index: int, request: ActivityGenerationRequest) -> BatchGenerationResult:
+            try:
+                activity = await self.generate_activity(
+                    student_profile=request.student_profile,
+                    activity_type=request.activity_type,
+                    difficulty=request.difficulty,
+                    duration_minutes=request.duration_minutes,
+                    theme=request.theme,
+                    use_cache=request.use_cache,
+                )
+                return BatchGenerationResult(index=index, result=activity)
+            except OpenAIError as e:
+                return BatchGenerationResult(index=index, error=e)
+
+        tasks = [asyncio.create_task(run(index, request)) for index, request in enumerate(requests)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def stream_activity(
+        self,
+        student_profile: Dict[str, Any],
+        activity_type: ActivityType,
+        difficulty: DifficultyLevel,
+        duration_minutes: int,
+        theme: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> AsyncIterator[ActivityStreamEvent]:
+        """
+        Generate an activity with a streamed completion, yielding fields as they arrive.
+
+        Same prompt and cache as generate_activity. The completion is requested
+        with stream=True and parsed incrementally: each top-level field is
+        yielded as soon as its value is complete (title and description come
+        first). The full GeneratedActivity is validated at the end and yielded
+        as the last event; only then is the completion cached.
+
+        Yields:
+            ActivityStreamEvent "field" ({"field": name, "value": value}) per
+            field, then one "activity" event with the GeneratedActivity
+
+        Raises:
+            OpenAIError: If generation fails or the streamed object is invalid
+        """
+        prompt = self._build_activity_prompt(
+            student_profile=student_profile,
+            activity_type=activity_type,
+            difficulty=difficulty,
+            duration_minutes=duration_minutes,
+            theme=theme,
+        )
+        system_prompt = SYSTEM_PROMPT_ACTIVITY_GENERATION
+        temperature = TEMPERATURE_CREATIVE
+        max_tokens = MAX_TOKENS_ACTIVITY_GENERATION
+
+        try:
+            start_time = time.time()
+            key, cached = await self._cache_lookup(system_prompt, prompt, temperature, max_tokens, use_cache)
+            if cached is not None:
+                data = json.loads(cached.content)
+                activity = GeneratedActivity(**data)
+                self._log_completion(cached.prompt_tokens, cached.completion_tokens, start_time, cached=True)
+                for name, value in data.items():
+                    yield ActivityStreamEvent("field", {"field": name, "value": value})
+                yield ActivityStreamEvent("activity", activity)
+                return
+
+            try:
+                stream = await self._chat_completion(
+                    model=self.default_model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    response_format={"type": "json_object"},
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
+            except CircuitOpenError:
+                logger.warning("OpenAI circuit open: streaming template activity")
+                activity = self._template_activity(student_profile, activity_type, difficulty, duration_minutes, theme)
+                for name, value in activity.model_dump().items():
+                    yield ActivityStreamEvent("field", {"field": name, "value": value})
+                yield ActivityStreamEvent("activity", activity)
+                return
+
+            parser = JSONObjectStreamParser()
+            usage = None
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    usage = chunk.usage
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                for name, value in parser.feed(chunk.choices[0].delta.content):
+                    yield ActivityStreamEvent("field", {"field": name, "value": value})
+
+            parser.close()
+            activity = GeneratedActivity(**json.loads(parser.text))
+
+            prompt_tokens = usage.prompt_tokens if usage is not None else 0
+            completion_tokens = usage.completion_tokens if usage is not None else 0
+            self._log_completion(prompt_tokens, completion_tokens, start_time)
+            if key is not None:
+                await self.response_cache.set(
+                    key,
+                    CachedCompletion(
+                        content=parser.text, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+                    ),
+                )
+
+            logger.info(f"Activity streamed successfully: {activity.title}")
+            yield ActivityStreamEvent("activity", activity)
+
+        except OpenAIAPIError as e:
+            logger.error(f"OpenAI API error: {e}")
+            raise OpenAIError(message="Falha ao gerar atividade", original_error=e)
+
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse streamed OpenAI response: {e}")
+            raise OpenAIError(message="Resposta inválida da IA")
+
+        except Exception as e:
+            logger.error(f"Unexpected error streaming activity: {e}")
+            raise OpenAIError(message="Erro inesperado ao gerar atividade", original_error=e)
+
+    # ========================================================================
+    # Helper Methods - Completion
+    # ========================================================================
+
+    async def _complete(
+        self,
+        system_prompt: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        parse: Callable[[str], T],
+        use_cache: bool = True,
+    ) -> T:
+        """
+        Run a JSON chat completion, using the response cache when allowed.
+
+        The completion is stored only after `parse` accepts it, so invalid
+        responses are never served from the cache.
+
+        Args:
+            system_prompt: System message
+            prompt: User message
+            temperature: Sampling temperature
+            max_tokens: Completion token limit
+            parse: Converts the completion text into the result
+            use_cache: False bypasses the cache (no lookup, no store)
+
+        Returns:
+            parse(completion text)
+        """
+        start_time = time.time()
+        key, cached = await self._cache_lookup(system_prompt, prompt, temperature, max_tokens, use_cache)
+        if cached is not None:
+            result = parse(cached.content)
+            self._log_completion(cached.prompt_tokens, cached.completion_tokens, start_time, cached=True)
+            return result
+
+        response = await self._chat_completion(
+            model=self.default_model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},
+        )
+
+        content = response.choices[0].message.content
+        result = parse(content)
+
+        self._log_completion(response.usage.prompt_tokens, response.usage.completion_tokens, start_time)
+
+        if key is not None:
+            await self.response_cache.set(
+                key,
+                CachedCompletion(
+                    content=content,
+                    prompt_tokens=response.usage.prompt_tokens,
+                    completion_tokens=response.usage.completion_tokens,
+                ),
+            )
+
+        return result
+
+    async def _cache_lookup(
+        self, system_prompt: str, prompt: str, temperature: float, max_tokens: int, use_cache: bool
+    ) -> Tuple[Optional[str], Optional[CachedCompletion]]:
+        """Cache key (None when the request bypasses the cache) and cached completion, if any."""
+        cache = self.response_cache
+        if not cache.should_cache(temperature, use_cache):
+            return None, None
+        key = cache.make_key(self.default_model, system_prompt, prompt, temperature, max_tokens)
+        return key, await cache.get(key)
+
+    def _log_completion(self, prompt_tokens: int, completion_tokens: int, start_time: float, cached: bool = False):
+        log_openai_request(
+            logger=logger,
+            model=self.default_model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            duration_ms=(time.time() - start_time) * 1000,
+            cached=cached,
+            cache_stats=self.response_cache.get_stats(),
+        )
+
+    async def _chat_completion(self, **kwargs: Any) -> Any:
+        """
+        Call chat.completions.create through the circuit breaker and rate limiter, when configured.
+
+        An open circuit fails at once, before waiting for the rate limiter.
+        Non-streamed calls are hedged when the breaker has hedging enabled.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        create = self.client.chat.completions.create
+        breaker = self.circuit_breaker
+
+        async def call() -> Any:
+            if breaker is None:
+                return await create(**kwargs)
+            return await breaker.call(lambda: create(**kwargs))
+
+        async def attempt() -> Any:
+            if self.rate_limiter is None:
+                return await call()
+            return await self.rate_limiter.call(call)
+
+        if breaker is None:
+            return await attempt()
+        breaker.check()
+        if kwargs.get("stream"):
+            return await attempt()
+        return await breaker.hedge(attempt)
+
+    def _template_activity(
+        self,
+        student_profile: Dict[str, Any],
+        activity_type: ActivityType,
+        difficulty: DifficultyLevel,
+        duration_minutes: int,
+        theme: Optional[str],
+    ) -> TemplateActivity:
+        """Fallback activity used while the OpenAI circuit is open."""
+        return TemplateActivity(
+            **template_activity_fields(student_profile, activity_type, difficulty, duration_minutes, theme)
+        )
+
     # ========================================================================
     # Helper Methods - Prompt Building
     # ========================================================================
 
+    # Prompt text lives in app/services/nlp_prompts.py (precompiled fragments,
+    # memoized profile block, token-budgeted assessment history).
+
     def _build_activity_prompt(
         self,
         student_profile: Dict[str, Any],
@@ -449,46 +747,7 @@ class NLPService:
         theme: Optional[str] = None,
     ) -> str:
         """Build prompt for activity generation."""
-        prompt = f"""Gere uma atividade pedagógica personalizada com as seguintes características:
-
-PERFIL DO ALUNO:
-- Nome: {student_profile.get('name', 'Aluno')}
-- Idade: {student_profile.get('age', 'não especificada')} anos
-- Diagnóstico: {student_profile.get('diagnosis', 'TEA')}
-- Interesses: {', '.join(student_profile.get('interests', ['não especificados']))}
-- Pontos fortes: {', '.join(student_profile.get('strengths', ['a identificar']))}
-- Desafios: {', '.join(student_profile.get('challenges', ['a identificar']))}
-
-REQUISITOS DA ATIVIDADE:
-- Tipo: {activity_type.value}
-- Nível de dificuldade: {difficulty.value}
-- Duração estimada: {duration_minutes} minutos
-"""
-        if theme:
-            prompt += f"- Tema: {theme}\n"
-
-        prompt += """
-Retorne a atividade no seguinte formato JSON:
-{
-    "title": "Título da atividade",
-    "description": "Descrição detalhada",
-    "objectives": ["Objetivo 1", "Objetivo 2", ...],
-    "materials": ["Material 1", "Material 2", ...],
-    "instructions": ["Passo 1", "Passo 2", ...],
-    "duration_minutes": 30,
-    "adaptations": ["Adaptação 1", "Adaptação 2", ...],
-    "visual_supports": ["Suporte visual 1", "Suporte visual 2", ...],
-    "success_criteria": ["Critério 1", "Critério 2", ...]
-}
-
-IMPORTANTE:
-- A atividade deve ser clara, estruturada e motivadora
-- Incorpore os interesses do aluno sempre que possível
-- Inclua instruções visuais e suportes necessários
-- As adaptações devem considerar os desafios específicos
-- Os critérios de sucesso devem ser observáveis e mensuráveis
-"""
-        return prompt
+        return build_activity_prompt(student_profile, activity_type, difficulty, duration_minutes, theme)
 
     def _build_progress_prompt(
         self,
@@ -496,42 +755,8 @@ IMPORTANTE:
         assessments: List[Dict[str, Any]],
         time_period: Optional[str] = None,
     ) -> str:
-        """Build prompt for progress analysis."""
-        period_text = f" no período: {time_period}" if time_period else ""
-
-        prompt = f"""Analise o progresso do aluno{period_text}.
-
-PERFIL DO ALUNO:
-- Nome: {student_profile.get('name', 'Aluno')}
-- Idade: {student_profile.get('age', 'não especificada')} anos
-- Diagnóstico: {student_profile.get('diagnosis', 'TEA')}
-
-AVALIAÇÕES ({len(assessments)} registros):
-"""
-        # Add assessment summaries
-        for i, assessment in enumerate(assessments[:10], 1):  # Limit to 10 most recent
-            prompt += f"""
-Avaliação {i}:
-- Atividade: {assessment.get('activity_title', 'Não especificada')}
-- Status: {assessment.get('completion_status', 'N/A')}
-- Engajamento: {assessment.get('engagement_level', 'N/A')}
-- Dificuldade percebida: {assessment.get('difficulty_rating', 'N/A')}
-- Observações: {assessment.get('notes', 'Nenhuma')}
-"""
-
-        prompt += """
-Retorne a análise no seguinte formato JSON:
-{
-    "summary": "Resumo geral do progresso",
-    "strengths": ["Ponto forte 1", "Ponto forte 2", ...],
-    "areas_for_improvement": ["Área 1", "Área 2", ...],
-    "patterns_observed": ["Padrão 1", "Padrão 2", ...],
-    "recommendations": ["Recomendação 1", "Recomendação 2", ...]
-}
-
-Seja específico, construtivo e baseado em evidências das avaliações fornecidas.
-"""
-        return prompt
+        """Build prompt for progress analysis (assessment history capped to a token budget)."""
+        return build_progress_prompt(student_profile, assessments, time_period)
 
     def _build_recommendations_prompt(
         self,
@@ -540,40 +765,7 @@ Seja específico, construtivo e baseado em evidências das avaliações fornecid
         progress_summary: Optional[Dict[str, Any]] = None,
     ) -> str:
         """Build prompt for recommendations."""
-        prompt = f"""Gere recomendações personalizadas para o aluno.
-
-PERFIL DO ALUNO:
-- Nome: {student_profile.get('name', 'Aluno')}
-- Idade: {student_profile.get('age', 'não especificada')} anos
-- Diagnóstico: {student_profile.get('diagnosis', 'TEA')}
-- Interesses: {', '.join(student_profile.get('interests', ['não especificados']))}
-
-ATIVIDADES RECENTES:
-"""
-        for i, activity in enumerate(recent_activities[:5], 1):
-            prompt += f"- {activity.get('title', 'Atividade')} ({activity.get('type', 'N/A')})\n"
-
-        if progress_summary:
-            prompt += f"\nRESUMO DE PROGRESSO:\n{progress_summary.get('summary', 'Não disponível')}\n"
-
-        prompt += """
-Retorne as recomendações no seguinte formato JSON:
-{
-    "recommendations": [
-        {
-            "title": "Título da recomendação",
-            "description": "Descrição detalhada",
-            "rationale": "Justificativa baseada no perfil/progresso",
-            "priority": "high|medium|low",
-            "category": "activity|strategy|resource"
-        },
-        ...
-    ]
-}
-
-Gere 3-5 recomendações práticas e acionáveis, priorizando as mais relevantes.
-"""
-        return prompt
+        return build_recommendations_prompt(student_profile, recent_activities, progress_summary)
 
     def _get_subject_system_prompt(self, subject: Subject) -> str:
         """
@@ -585,64 +777,7 @@ Gere 3-5 recomendações práticas e acionáveis, priorizando as mais relevantes
         Returns:
             System prompt tailored to the subject
         """
-        base_prompt = """Você é um especialista em educação especial e Transtorno do Espectro Autista (TEA),
-com profundo conhecimento em pedagogia inclusiva e adaptações curriculares."""
-
-        subject_contexts = {
-            Subject.MATEMATICA: """
-Especialização: Matemática para alunos com TEA
-- Use estratégias visuais e concretas (manipuláveis, blocos, desenhos)
-- Divida problemas complexos em passos menores
-- Incorpore interesses especiais em problemas matemáticos
-- Evite linguagem ambígua; seja literal e preciso
-- Use rotinas previsíveis na resolução de problemas""",
-            Subject.PORTUGUES: """
-Especialização: Português/Língua Portuguesa para alunos com TEA
-- Trabalhe compreensão literal antes de inferências
-- Use apoios visuais para gramática e estrutura textual
-- Considere dificuldades pragmáticas da linguagem
-- Adapte textos mantendo informações essenciais
-- Foque em comunicação funcional""",
-            Subject.LITERATURA: """
-Especialização: Literatura para alunos com TEA
-- Escolha textos com estrutura clara e previsível
-- Trabalhe compreensão literal antes de metáforas
-- Use organizadores gráficos para enredo e personagens
-- Conecte histórias a experiências concretas
-- Considere sensibilidades sensoriais ao escolher textos""",
-            Subject.CIENCIAS: """
-Especialização: Ciências para alunos com TEA
-- Enfatize observação e experimentação prática
-- Use classificação e categorização (pontos fortes TEA)
-- Aproveite interesses especiais (dinossauros, planetas, etc.)
-- Forneça procedimentos passo-a-passo para experimentos
-- Use diagramas e imagens reais""",
-            Subject.HISTORIA: """
-Especialização: História para alunos com TEA
-- Use linhas do tempo visuais e cronológicas
-- Conecte eventos históricos a experiências pessoais
-- Foque em fatos concretos antes de interpretações
-- Use mapas, imagens e fontes primárias
-- Organize informações em categorias claras""",
-            Subject.GEOGRAFIA: """
-Especialização: Geografia para alunos com TEA
-- Use mapas visuais e recursos espaciais
-- Aproveite pensamento sistemático para padrões geográficos
-- Conecte conceitos abstratos a exemplos concretos
-- Use imagens de satélite e fotografias reais
-- Organize por categorias (clima, relevo, etc.)""",
-            # Adicione mais disciplinas conforme necessário
-        }
-
-        specific_context = subject_contexts.get(
-            subject,
-            f"\nEspecialização: {get_subject_display_name(subject)} para alunos com TEA\n"
-            "- Adapte o conteúdo considerando as características do TEA\n"
-            "- Use estratégias visuais e estruturadas\n"
-            "- Conecte com interesses do aluno\n",
-        )
-
-        return base_prompt + specific_context
+        return subject_system_prompt(subject)
 
     def _build_multidisciplinary_prompt(
         self,
@@ -657,64 +792,17 @@ Especialização: Geografia para alunos com TEA
         bncc_competencies: Optional[List[str]],
     ) -> str:
         """Build prompt for multidisciplinary activity generation."""
-        subject_name = get_subject_display_name(subject)
-        grade_name = get_grade_level_display_name(grade_level)
-
-        prompt = f"""Gere uma atividade pedagógica de {subject_name} personalizada para aluno com TEA:
-
-PERFIL DO ALUNO:
-- Nome: {student_profile.get('name', 'Aluno')}
-- Idade: {student_profile.get('age', 'não especificada')} anos
-- Série/Nível: {grade_name}
-- Diagnóstico: {student_profile.get('diagnosis', 'TEA')}
-- Interesses: {', '.join(student_profile.get('interests', ['não especificados']))}
-- Pontos fortes: {', '.join(student_profile.get('strengths', ['a identificar']))}
-- Desafios: {', '.join(student_profile.get('challenges', ['a identificar']))}
-
-REQUISITOS DA ATIVIDADE:
-- Disciplina: {subject_name}
-- Série/Nível: {grade_name}
-- Tipo de domínio: {activity_type.value}
-"""
-        if pedagogical_type:
-            prompt += f"- Formato pedagógico: {pedagogical_type.value}\n"
-
-        prompt += f"""- Nível de dificuldade: {difficulty.value}
-- Duração estimada: {duration_minutes} minutos
-"""
-        if theme:
-            prompt += f"- Tema específico: {theme}\n"
-
-        if bncc_competencies:
-            prompt += f"""
-ALINHAMENTO BNCC:
-Alinhe a atividade com as seguintes competências da Base Nacional Comum Curricular:
-{', '.join(bncc_competencies)}
-"""
-
-        prompt += """
-Retorne a atividade no seguinte formato JSON:
-{
-    "title": "Título da atividade",
-    "description": "Descrição detalhada do conteúdo e objetivo",
-    "objectives": ["Objetivo 1", "Objetivo 2", ...],
-    "materials": ["Material 1", "Material 2", ...],
-    "instructions": ["Passo 1", "Passo 2", ...],
-    "duration_minutes": 30,
-    "adaptations": ["Adaptação específica para TEA 1", "Adaptação 2", ...],
-    "visual_supports": ["Suporte visual 1", "Suporte visual 2", ...],
-    "success_criteria": ["Critério observável 1", "Critério 2", ...]
-}
-
-IMPORTANTE:
-- Conteúdo deve ser apropriado para a série/nível especificado
-- Incorpore estratégias específicas para TEA
-- Use interesses do aluno quando possível
-- Inclua adaptações considerando desafios sensoriais e cognitivos
-- Critérios de sucesso devem ser observáveis e mensuráveis
-- Se houver códigos BNCC, garanta alinhamento com as competências
-"""
-        return prompt
+        return build_multidisciplinary_prompt(
+            student_profile=student_profile,
+            subject=subject,
+            grade_level=grade_level,
+            activity_type=activity_type,
+            pedagogical_type=pedagogical_type,
+            difficulty=difficulty,
+            duration_minutes=duration_minutes,
+            theme=theme,
+            bncc_competencies=bncc_competencies,
+        )
 
     # ========================================================================
     # Utility Methods
@@ -765,7 +853,9 @@ def get_nlp_service() -> NLPService:
     global _nlp_service
 
     if _nlp_service is None:
-        _nlp_service = NLPService()
+        _nlp_service = NLPService(
+            rate_limiter=get_openai_rate_limiter(), circuit_breaker=get_openai_circuit_breaker()
+        )
 
     return _nlp_service
 
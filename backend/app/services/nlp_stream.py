@@ -0,0 +1,135 @@
+"""
+NLP Stream Parsing - EduAutismo IA
+
+Incremental parser for JSON objects streamed by OpenAI (``stream=True``).
+
+Chat completions with ``response_format={"type": "json_object"}`` arrive as
+small text deltas. The parser consumes them as they come and returns each
+top-level field as soon as its value is complete, so the first fields of an
+activity (title, description) can be shown while the rest is generated.
+
+Only the top level is parsed incrementally; nested values (lists, objects)
+are returned whole once closed. Numbers and literals at the end of the buffer
+are held back until the next character shows they are complete.
+
+Usage:
+    parser = JSONObjectStreamParser()
+    async for delta in deltas:
+        for name, value in parser.feed(delta):
+            ...
+    parser.close()  # raises json.JSONDecodeError if the object is incomplete
+    data = json.loads(parser.text)
+"""
+
+import json
+from typing import Any, List, Tuple
+
+_WHITESPACE = " \t\n\r"
+_INCOMPLETE = object()
+
+
+class JSONObjectStreamParser:
+    """Streaming parser yielding the top-level (key, value) pairs of one JSON object."""
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._key = None
+        self._decoder = json.JSONDecoder()
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return self._buffer
+
+    @property
+    def complete(self) -> bool:
+        """Whether the closing brace of the object was read."""
+        return self._state == "end"
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add a chunk of the stream.
+
+        Args:
+            chunk: Next text delta
+
+        Returns:
+            Fields completed by this chunk, in document order
+
+        Raises:
+            json.JSONDecodeError: If the text is not a JSON object
+        """
+        self._buffer += chunk
+        fields = []
+
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos >= len(self._buffer):
+                break
+            char = self._buffer[self._pos]
+
+            if self._state == "start":
+                self._expect(char, "{")
+                self._state = "key"
+            elif self._state == "key":
+                if char == "}":
+                    self._pos += 1
+                    self._state = "end"
+                    continue
+                key = self._decode()
+                if key is _INCOMPLETE:
+                    break
+                if not isinstance(key, str):
+                    raise json.JSONDecodeError("Expecting property name", self._buffer, self._pos)
+                self._key = key
+                self._state = "colon"
+            elif self._state == "colon":
+                self._expect(char, ":")
+                self._state = "value"
+            elif self._state == "value":
+                value = self._decode()
+                if value is _INCOMPLETE:
+                    break
+                fields.append((self._key, value))
+                self._state = "comma"
+            elif self._state == "comma":
+                if char == "}":
+                    self._pos += 1
+                    self._state = "end"
+                else:
+                    self._expect(char, ",")
+                    self._state = "key"
+            else:
+                raise json.JSONDecodeError("Extra data", self._buffer, self._pos)
+
+        return fields
+
+    def close(self) -> None:
+        """
+        Mark the end of the stream.
+
+        Raises:
+            json.JSONDecodeError: If the object was not closed
+        """
+        if self._state != "end":
+            raise json.JSONDecodeError("Unterminated object", self._buffer, len(self._buffer))
+
+    def _expect(self, char: str, expected: str) -> None:
+        if char != expected:
+            raise json.JSONDecodeError(f"Expecting '{expected}'", self._buffer, self._pos)
+        self._pos += 1
+
+    def _decode(self) -> Any:
+        """Decode the value at the current position, or _INCOMPLETE if more input is needed."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            return _INCOMPLETE
+        if end == len(self._buffer) and not isinstance(value, (str, list, dict)):
+            # a number at the end of the buffer may continue in the next chunk ("3" -> "30")
+            return _INCOMPLETE
+        self._pos = end
+        return value
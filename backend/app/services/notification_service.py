@@ -16,6 +16,7 @@ from uuid import UUID
 from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
 
+from app.db.pagination import apply_keyset, build_keyset_page
 from app.models.intervention_plan import InterventionPlan
 from app.models.notification import Notification, NotificationPriority, NotificationType
 from app.schemas.notification import NotificationCreate, NotificationStats
@@ -89,22 +90,7 @@ class NotificationService:
         Returns:
             (lista de notificações, total)
         """
-        query = self.db.query(Notification).filter(Notification.user_id == user_id)
-
-        # Aplicar filtros
-        if unread_only:
-            query = query.filter(Notification.is_read == False)
-
-        if type_filter:
-            query = query.filter(Notification.type == type_filter)
-
-        if priority_filter:
-            query = query.filter(Notification.priority == priority_filter)
-
-        # Excluir notificações expiradas
-        query = query.filter(
-            or_(Notification.expires_at.is_(None), Notification.expires_at > datetime.utcnow())
-        )
+        query = self._build_user_notifications_query(user_id, unread_only, type_filter, priority_filter)
 
         # Total
         total = query.count()
@@ -131,6 +117,69 @@ class NotificationService:
 
         return notifications, total
 
+    def get_user_notifications_by_cursor(
+        self,
+        user_id: UUID,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        unread_only: bool = False,
+        type_filter: Optional[NotificationType] = None,
+        priority_filter: Optional[NotificationPriority] = None,
+        include_total: bool = False,
+    ) -> tuple[List[Notification], Optional[str], Optional[int]]:
+        """
+        Lista notificações do usuário com paginação keyset em (created_at, id).
+
+        Diferente de get_user_notifications, a ordenação é apenas cronológica
+        (mais recentes primeiro), o que permite paginar sem OFFSET.
+
+        Args:
+            user_id: ID do usuário
+            cursor: Cursor da página anterior (None para a primeira página)
+            limit: Limite de resultados
+            unread_only: Se True, retorna apenas não lidas
+            type_filter: Filtrar por tipo
+            priority_filter: Filtrar por prioridade
+            include_total: Se True, também executa COUNT (opcional por ser caro)
+
+        Returns:
+            (lista de notificações, próximo cursor, total ou None)
+        """
+        query = self._build_user_notifications_query(user_id, unread_only, type_filter, priority_filter)
+        total = query.count() if include_total else None
+
+        rows = apply_keyset(query, Notification.created_at, Notification.id, cursor, limit).all()
+        notifications, next_cursor = build_keyset_page(rows, "created_at", limit)
+
+        return notifications, next_cursor, total
+
+    def _build_user_notifications_query(
+        self,
+        user_id: UUID,
+        unread_only: bool = False,
+        type_filter: Optional[NotificationType] = None,
+        priority_filter: Optional[NotificationPriority] = None,
+    ):
+        """Query de notificações do usuário com filtros (sem ordenação/paginação)."""
+        query = self.db.query(Notification).filter(Notification.user_id == user_id)
+
+        # Aplicar filtros
+        if unread_only:
+            query = query.filter(Notification.is_read == False)
+
+        if type_filter:
+            query = query.filter(Notification.type == type_filter)
+
+        if priority_filter:
+            query = query.filter(Notification.priority == priority_filter)
+
+        # Excluir notificações expiradas
+        query = query.filter(
+            or_(Notification.expires_at.is_(None), Notification.expires_at > datetime.utcnow())
+        )
+
+        return query
+
     def mark_as_read(self, notification_id: UUID, user_id: UUID) -> Optional[Notification]:
         """
         Marca notificação como lida.
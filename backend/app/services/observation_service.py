@@ -12,6 +12,7 @@ from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
 
 from app.core.exceptions import ForbiddenException, NotFoundException, ValidationException
+from app.db.pagination import apply_keyset, build_keyset_page
 from app.models.observation import ObservationContext, ObservationType, ProfessionalObservation
 from app.models.professional import Professional
 from app.models.student import Student
@@ -189,6 +190,51 @@ class ObservationService:
         Returns:
             Tupla (lista de observações, total)
         """
+        query = self._build_list_query(filters, requesting_professional_id)
+
+        # Total de registros
+        total = query.count()
+
+        # Ordenação (mais recentes primeiro) e paginação
+        observations = query.order_by(ProfessionalObservation.observed_at.desc()).offset(skip).limit(limit).all()
+
+        return observations, total
+
+    def list_by_cursor(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[ObservationFilter] = None,
+        requesting_professional_id: Optional[UUID] = None,
+        include_total: bool = False,
+    ) -> tuple[List[ProfessionalObservation], Optional[str], Optional[int]]:
+        """
+        Lista observações com paginação keyset em (observed_at, id).
+
+        Args:
+            cursor: Cursor da página anterior (None para a primeira página)
+            limit: Número máximo de registros
+            filters: Filtros opcionais
+            requesting_professional_id: ID do profissional solicitante (para controle de acesso)
+            include_total: Se True, também executa COUNT (opcional por ser caro)
+
+        Returns:
+            Tupla (lista de observações, próximo cursor, total ou None)
+        """
+        query = self._build_list_query(filters, requesting_professional_id)
+        total = query.count() if include_total else None
+
+        rows = apply_keyset(query, ProfessionalObservation.observed_at, ProfessionalObservation.id, cursor, limit).all()
+        observations, next_cursor = build_keyset_page(rows, "observed_at", limit)
+
+        return observations, next_cursor, total
+
+    def _build_list_query(
+        self,
+        filters: Optional[ObservationFilter] = None,
+        requesting_professional_id: Optional[UUID] = None,
+    ):
+        """Query de listagem com controle de acesso e filtros (sem ordenação/paginação)."""
         query = self.db.query(ProfessionalObservation)
 
         # Controle de acesso para observações privadas
@@ -241,13 +287,7 @@ class ObservationService:
                 search_pattern = f"%{filters.search}%"
                 query = query.filter(ProfessionalObservation.content.ilike(search_pattern))
 
-        # Total de registros
-        total = query.count()
-
-        # Ordenação (mais recentes primeiro) e paginação
-        observations = query.order_by(ProfessionalObservation.observed_at.desc()).offset(skip).limit(limit).all()
-
-        return observations, total
+        return query
 
     def get_by_student(
         self,
@@ -0,0 +1,233 @@
+"""
+Progress Stats Service - EduAutismo IA
+
+Maintains student_progress_stats, the running progress statistics used by
+MLService.analyze_student_progress_for_student.
+
+AssessmentService calls this service inside the same transaction as the
+assessment write:
+- create: O(1) append when the assessment is the newest of the student
+- update: O(1) replace (one COUNT query locates the assessment's index)
+- delete, out-of-order create: the student's statistics are recomputed
+
+Assessments written without AssessmentService require a rebuild
+(scripts/rebuild_progress_stats.py).
+"""
+
+from datetime import datetime, timezone
+from itertools import groupby
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.models.assessment import Assessment
+from app.models.student_progress_stats import StudentProgressStats
+from app.services.ml_progress import ProgressEntry, ProgressStats, progress_entry
+
+# Assessment columns read when recomputing statistics
+_ENTRY_COLUMNS = (
+    Assessment.id,
+    Assessment.completion_status,
+    Assessment.engagement_level,
+    Assessment.difficulty_rating,
+    Assessment.independence_level,
+)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Naive UTC datetime (SQLite returns naive values, PostgreSQL aware ones)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class ProgressStatsService:
+    """Service for incremental student progress statistics (synchronous)."""
+
+    @staticmethod
+    def load(db: Session, student_id: UUID) -> Optional[ProgressStats]:
+        """
+        Read the stored statistics of a student (one query).
+
+        Returns:
+            ProgressStats, or None if no row exists
+        """
+        row = db.query(StudentProgressStats).filter(StudentProgressStats.student_id == student_id).first()
+        return None if row is None else ProgressStatsService._to_stats(row)
+
+    @staticmethod
+    def compute(db: Session, student_id: UUID) -> ProgressStats:
+        """Compute the statistics of a student from the assessment history."""
+        rows = (
+            db.query(*_ENTRY_COLUMNS)
+            .filter(Assessment.student_id == student_id)
+            .order_by(Assessment.created_at, Assessment.id)
+            .all()
+        )
+        return ProgressStats.from_entries(map(progress_entry, rows))
+
+    @staticmethod
+    def record_create(db: Session, assessment: Assessment) -> None:
+        """
+        Add a new (flushed) assessment to its student's statistics.
+
+        Appends in O(1) when the assessment is newer than every assessment
+        already counted; otherwise recomputes the student's statistics.
+        """
+        row = ProgressStatsService._lock_row(db, assessment.student_id)
+        created_at = _as_utc(assessment.created_at)
+
+        if row is None or row.last_assessment_at is None or created_at <= _as_utc(row.last_assessment_at):
+            ProgressStatsService.rebuild_student(db, assessment.student_id)
+            return
+
+        stats = ProgressStatsService._to_stats(row)
+        stats.append(progress_entry(assessment))
+        ProgressStatsService._store(row, stats, assessment.created_at)
+
+    @staticmethod
+    def record_update(db: Session, assessment: Assessment, previous: ProgressEntry) -> None:
+        """
+        Apply a change of a (flushed) assessment to its student's statistics.
+
+        Args:
+            db: Database session
+            assessment: Updated assessment
+            previous: progress_entry() of the assessment before the update
+        """
+        current = progress_entry(assessment)
+        if current == previous:
+            return
+
+        row = ProgressStatsService._lock_row(db, assessment.student_id)
+        if row is None:
+            ProgressStatsService.rebuild_student(db, assessment.student_id)
+            return
+
+        # Chronological index: assessments ordered before it by (created_at, id)
+        index = (
+            db.query(func.count(Assessment.id))
+            .filter(
+                Assessment.student_id == assessment.student_id,
+                or_(
+                    Assessment.created_at < assessment.created_at,
+                    and_(Assessment.created_at == assessment.created_at, Assessment.id < assessment.id),
+                ),
+            )
+            .scalar()
+        )
+
+        stats = ProgressStatsService._to_stats(row)
+        stats.replace(index, previous, current)
+        ProgressStatsService._store(row, stats, row.last_assessment_at)
+
+    @staticmethod
+    def record_delete(db: Session, student_id: UUID) -> None:
+        """Recompute a student's statistics after an assessment was deleted (and flushed)."""
+        ProgressStatsService.rebuild_student(db, student_id)
+
+    @staticmethod
+    def rebuild_student(db: Session, student_id: UUID) -> None:
+        """Recompute and store the statistics of one student (pending changes must be flushed)."""
+        rows = (
+            db.query(Assessment.created_at, *_ENTRY_COLUMNS)
+            .filter(Assessment.student_id == student_id)
+            .order_by(Assessment.created_at, Assessment.id)
+            .all()
+        )
+        ProgressStatsService._replace_student(db, student_id, rows)
+
+    @staticmethod
+    def rebuild(db: Session, student_id: Optional[UUID] = None, batch_size: int = 1000) -> int:
+        """
+        Recompute the statistics of all students (or one) and commit.
+
+        Used for the backfill after the migration and to fix statistics of
+        assessments written outside AssessmentService.
+
+        Args:
+            db: Database session
+            student_id: Restrict to one student (None = all)
+            batch_size: Assessment rows fetched per round trip
+
+        Returns:
+            Number of students written
+        """
+        stats_rows = db.query(StudentProgressStats)
+        assessments = db.query(Assessment.student_id, Assessment.created_at, *_ENTRY_COLUMNS)
+        if student_id is not None:
+            stats_rows = stats_rows.filter(StudentProgressStats.student_id == student_id)
+            assessments = assessments.filter(Assessment.student_id == student_id)
+
+        stats_rows.delete(synchronize_session=False)
+
+        rows = assessments.order_by(Assessment.student_id, Assessment.created_at, Assessment.id).yield_per(batch_size)
+
+        written = 0
+        for group_student_id, group in groupby(rows, key=lambda row: row.student_id):
+            group = list(group)
+            row = StudentProgressStats(student_id=group_student_id)
+            ProgressStatsService._store(
+                row, ProgressStats.from_entries(map(progress_entry, group)), group[-1].created_at
+            )
+            db.add(row)
+            written += 1
+            if written % batch_size == 0:
+                db.flush()
+
+        db.commit()
+        return written
+
+    # ========== Helpers ==========
+
+    @staticmethod
+    def _lock_row(db: Session, student_id: UUID) -> Optional[StudentProgressStats]:
+        """Stats row locked for update (serializes concurrent writes of one student)."""
+        return (
+            db.query(StudentProgressStats)
+            .filter(StudentProgressStats.student_id == student_id)
+            .with_for_update()
+            .first()
+        )
+
+    @staticmethod
+    def _replace_student(db: Session, student_id: UUID, rows: Iterable) -> None:
+        """Store statistics folded from chronologically ordered assessment rows."""
+        rows = list(rows)
+        row = ProgressStatsService._lock_row(db, student_id)
+
+        if not rows:
+            if row is not None:
+                db.delete(row)
+            return
+
+        if row is None:
+            row = StudentProgressStats(student_id=student_id)
+            db.add(row)
+
+        ProgressStatsService._store(row, ProgressStats.from_entries(map(progress_entry, rows)), rows[-1].created_at)
+
+    @staticmethod
+    def _to_stats(row: StudentProgressStats) -> ProgressStats:
+        return ProgressStats(
+            count=row.assessment_count,
+            completed=row.completed_count,
+            successes=row.success_count,
+            difficulty_issues=row.difficulty_issue_count,
+            engagement_sum=row.engagement_sum,
+            engagement_xy_sum=row.engagement_xy_sum,
+            recent=ProgressStats.recent_from_json(row.recent_assessments),
+        )
+
+    @staticmethod
+    def _store(row: StudentProgressStats, stats: ProgressStats, last_assessment_at: Optional[datetime]) -> None:
+        row.assessment_count = stats.count
+        row.completed_count = stats.completed
+        row.success_count = stats.successes
+        row.difficulty_issue_count = stats.difficulty_issues
+        row.engagement_sum = stats.engagement_sum
+        row.engagement_xy_sum = stats.engagement_xy_sum
+        row.recent_assessments = stats.recent_to_json()
+        row.last_assessment_at = last_assessment_at
@@ -4,20 +4,27 @@ Social Emotional Indicator Service - Lógica de negócios para indicadores socio
 Gerenciamento e análise de indicadores socioemocionais de estudantes.
 """
 
-from datetime import datetime, timedelta
-from typing import List, Optional
-from uuid import UUID
-
-from sqlalchemy import and_, func, or_
+from datetime import date, datetime, time, timedelta, timezone
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+import numpy as np
+from sqlalchemy import and_, case, func, insert, or_
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.core.exceptions import NotFoundException, ValidationException
+from app.db.pagination import apply_keyset, build_keyset_page
 from app.models.professional import Professional
 from app.models.socioemotional_indicator import (
+    INDICATOR_DISPLAY_NAMES,
+    POSITIVE_INDICATORS,
     IndicatorType,
     MeasurementContext,
     SocialEmotionalIndicator,
 )
+from app.models.socioemotional_rollup import SocialEmotionalDailyRollup
 from app.models.student import Student
 from app.schemas.socioemotional_indicator import (
     BulkIndicatorCreate,
@@ -30,6 +37,19 @@ from app.schemas.socioemotional_indicator import (
     SocialEmotionalProfile,
 )
 
+# Chave de um agregado diário: (student_id, indicator_type, dia)
+RollupKey = Tuple[UUID, IndicatorType, date]
+
+# Janela (dias) das tendências exibidas no perfil
+PROFILE_TREND_DAYS = 90
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Datetime UTC sem fuso, como a coluna measured_at (sem fuso) é gravada e lida."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
 
 class SocialEmotionalIndicatorService:
     """Service para operações com indicadores socioemocionais."""
@@ -67,11 +87,13 @@ class SocialEmotionalIndicatorService:
 
         # Criar indicador
         indicator = SocialEmotionalIndicator(
-            **indicator_data.model_dump(),
+            **indicator_data.model_dump(exclude={"measured_at"}),
+            measured_at=_as_utc(indicator_data.measured_at),
             professional_id=professional_id,
         )
 
         self.db.add(indicator)
+        self._add_to_rollup([(indicator.student_id, indicator.indicator_type, indicator.measured_at, indicator.score)])
         self.db.commit()
         self.db.refresh(indicator)
 
@@ -83,7 +105,12 @@ class SocialEmotionalIndicatorService:
         professional_id: UUID,
     ) -> BulkIndicatorResponse:
         """
-        Cria múltiplos indicadores de uma vez.
+        Cria múltiplos indicadores de uma vez, em uma única transação.
+
+        Estudante e profissional são validados uma vez; os itens válidos são
+        gravados com um único INSERT multi-linha (RETURNING id) e somados aos
+        agregados diários. Itens inválidos são reportados em `errors`, a menos
+        que `all_or_nothing` seja True - nesse caso nada é gravado.
 
         Args:
             bulk_data: Dados dos indicadores
@@ -91,19 +118,76 @@ class SocialEmotionalIndicatorService:
 
         Returns:
             BulkIndicatorResponse com resultado da operação
+
+        Raises:
+            NotFoundException: Se estudante ou profissional não existe (apenas com all_or_nothing)
+            ValidationException: Se algum item é inválido (apenas com all_or_nothing)
         """
-        created_ids = []
         errors = []
 
+        # Verificar estudante e profissional uma única vez
+        owner_error = None
+        if not self.db.query(Student.id).filter(Student.id == bulk_data.student_id).first():
+            owner_error = f"Estudante {bulk_data.student_id} não encontrado"
+        elif not self.db.query(Professional.id).filter(Professional.id == professional_id).first():
+            owner_error = f"Profissional {professional_id} não encontrado"
+
+        if owner_error:
+            if bulk_data.all_or_nothing:
+                raise NotFoundException(owner_error)
+            return BulkIndicatorResponse(
+                created_count=0,
+                failed_count=len(bulk_data.indicators),
+                created_ids=[],
+                errors=[f"Erro ao criar indicador: {owner_error}" for _ in bulk_data.indicators] or None,
+            )
+
+        # Validar itens
+        now = datetime.utcnow()
+        rows = []
         for indicator_dict in bulk_data.indicators:
             try:
                 indicator_data = SocialEmotionalIndicatorCreate(
                     student_id=bulk_data.student_id, measured_at=bulk_data.measured_at, **indicator_dict
                 )
-                indicator = self.create(indicator_data, professional_id)
-                created_ids.append(indicator.id)
             except Exception as e:
                 errors.append(f"Erro ao criar indicador: {str(e)}")
+                continue
+            rows.append(
+                {
+                    **indicator_data.model_dump(),
+                    "measured_at": _as_utc(indicator_data.measured_at),
+                    "id": uuid4(),
+                    "professional_id": professional_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+
+        if errors and bulk_data.all_or_nothing:
+            raise ValidationException(f"{len(errors)} indicador(es) inválido(s): " + "; ".join(errors))
+
+        created_ids = []
+        if rows:
+            try:
+                created_ids = list(
+                    self.db.scalars(
+                        insert(SocialEmotionalIndicator).returning(
+                            SocialEmotionalIndicator.id, sort_by_parameter_order=True
+                        ),
+                        rows,
+                    )
+                )
+                self._add_to_rollup(
+                    (row["student_id"], row["indicator_type"], row["measured_at"], row["score"]) for row in rows
+                )
+                self.db.commit()
+            except SQLAlchemyError as e:
+                self.db.rollback()
+                if bulk_data.all_or_nothing:
+                    raise
+                created_ids = []
+                errors.extend(f"Erro ao criar indicador: {str(e)}" for _ in rows)
 
         return BulkIndicatorResponse(
             created_count=len(created_ids),
@@ -159,11 +243,18 @@ class SocialEmotionalIndicatorService:
         if indicator.professional_id != professional_id:
             raise ValidationException("Apenas o profissional que criou o indicador pode editá-lo")
 
+        old_key = self._rollup_key(indicator)
+
         # Atualizar campos fornecidos
         update_dict = update_data.model_dump(exclude_unset=True)
+        if update_dict.get("measured_at") is not None:
+            update_dict["measured_at"] = _as_utc(update_dict["measured_at"])
         for field, value in update_dict.items():
             setattr(indicator, field, value)
 
+        # Score/data/tipo podem ter mudado: recalcular bucket antigo e novo
+        self.db.flush()
+        self._refresh_rollup({old_key, self._rollup_key(indicator)})
         self.db.commit()
         self.db.refresh(indicator)
 
@@ -190,7 +281,10 @@ class SocialEmotionalIndicatorService:
         if indicator.professional_id != professional_id:
             raise ValidationException("Apenas o profissional que criou o indicador pode removê-lo")
 
+        key = self._rollup_key(indicator)
         self.db.delete(indicator)
+        self.db.flush()
+        self._refresh_rollup({key})
         self.db.commit()
 
         return True
@@ -212,6 +306,47 @@ class SocialEmotionalIndicatorService:
         Returns:
             Tupla (lista de indicadores, total)
         """
+        query = self._build_list_query(filters)
+
+        # Total de registros
+        total = query.count()
+
+        # Ordenação (mais recentes primeiro) e paginação
+        indicators = query.order_by(SocialEmotionalIndicator.measured_at.desc()).offset(skip).limit(limit).all()
+
+        return indicators, total
+
+    def list_by_cursor(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: Optional[IndicatorFilter] = None,
+        include_total: bool = False,
+    ) -> tuple[List[SocialEmotionalIndicator], Optional[str], Optional[int]]:
+        """
+        Lista indicadores com paginação keyset em (measured_at, id).
+
+        Args:
+            cursor: Cursor da página anterior (None para a primeira página)
+            limit: Número máximo de registros
+            filters: Filtros opcionais
+            include_total: Se True, também executa COUNT (opcional por ser caro)
+
+        Returns:
+            Tupla (lista de indicadores, próximo cursor, total ou None)
+        """
+        query = self._build_list_query(filters)
+        total = query.count() if include_total else None
+
+        rows = apply_keyset(
+            query, SocialEmotionalIndicator.measured_at, SocialEmotionalIndicator.id, cursor, limit
+        ).all()
+        indicators, next_cursor = build_keyset_page(rows, "measured_at", limit)
+
+        return indicators, next_cursor, total
+
+    def _build_list_query(self, filters: Optional[IndicatorFilter] = None):
+        """Query de listagem com filtros aplicados (sem ordenação/paginação)."""
         query = self.db.query(SocialEmotionalIndicator)
 
         # Aplicar filtros
@@ -255,13 +390,7 @@ class SocialEmotionalIndicatorService:
                     )
                 )
 
-        # Total de registros
-        total = query.count()
-
-        # Ordenação (mais recentes primeiro) e paginação
-        indicators = query.order_by(SocialEmotionalIndicator.measured_at.desc()).offset(skip).limit(limit).all()
-
-        return indicators, total
+        return query
 
     def get_by_student(
         self,
@@ -293,9 +422,13 @@ class SocialEmotionalIndicatorService:
         # Data limite
         date_from = datetime.now() - timedelta(days=days)
 
-        # Buscar medições
-        measurements_query = (
-            self.db.query(SocialEmotionalIndicator)
+        # Buscar medições (apenas colunas necessárias)
+        rows = (
+            self.db.query(
+                SocialEmotionalIndicator.measured_at,
+                SocialEmotionalIndicator.score,
+                SocialEmotionalIndicator.context,
+            )
             .filter(
                 and_(
                     SocialEmotionalIndicator.student_id == student_id,
@@ -307,72 +440,53 @@ class SocialEmotionalIndicatorService:
             .all()
         )
 
-        if not measurements_query:
+        if not rows:
             raise NotFoundException(f"Nenhuma medição encontrada para {indicator_type} nos últimos {days} dias")
 
-        # Preparar dados das medições
-        measurements = [
-            {
-                "date": m.measured_at.isoformat(),
-                "score": m.score,
-                "context": str(m.context),
-            }
-            for m in measurements_query
-        ]
-
-        # Calcular média
-        scores = [m.score for m in measurements_query]
-        average_score = sum(scores) / len(scores)
+        scores = [row.score for row in rows]
+        cumulative = [0]
+        for score in scores:
+            cumulative.append(cumulative[-1] + score)
 
-        # Determinar direção da tendência
-        if len(scores) >= 2:
-            first_half_avg = sum(scores[: len(scores) // 2]) / (len(scores) // 2)
-            second_half_avg = sum(scores[len(scores) // 2 :]) / (len(scores) - len(scores) // 2)
-
-            if second_half_avg > first_half_avg + 1:
-                trend_direction = "improving"
-            elif second_half_avg < first_half_avg - 1:
-                trend_direction = "declining"
-            else:
-                trend_direction = "stable"
-        else:
-            trend_direction = "stable"
-
-        # Criar indicador base para pegar display_name
-        sample_indicator = measurements_query[0]
-
-        return IndicatorTrend(
-            indicator_type=indicator_type,
-            indicator_display_name=sample_indicator.indicator_display_name,
-            measurements=measurements,
-            average_score=average_score,
-            trend_direction=trend_direction,
-            latest_score=scores[-1],
-            earliest_score=scores[0],
-            measurement_count=len(measurements),
-        )
+        return self._build_trend(indicator_type, rows, cumulative, 0, len(rows))
 
     def get_profile(self, student_id: UUID) -> SocialEmotionalProfile:
         """
         Gera perfil socioemocional completo de um estudante.
 
+        O resumo (contagem, média, última medição, preocupantes) vem dos
+        agregados diários, ordenados por tipo e dia; as tendências usam apenas
+        as medições dos últimos 90 dias. O custo depende do número de dias com
+        medição e do tamanho da janela, não do histórico completo.
+
         Args:
             student_id: ID do estudante
 
         Returns:
             SocialEmotionalProfile com análise completa
         """
-        # Verificar se estudante existe
-        student = self.db.query(Student).filter(Student.id == student_id).first()
+        # Verificar se estudante existe (sem carregar relacionamentos selectin)
+        student = self.db.query(Student.id, Student.name).filter(Student.id == student_id).first()
         if not student:
             raise NotFoundException(f"Estudante {student_id} não encontrado")
 
-        # Buscar todos os indicadores do estudante
-        all_indicators = (
-            self.db.query(SocialEmotionalIndicator).filter(SocialEmotionalIndicator.student_id == student_id).all()
+        # Agregados diários do estudante, agrupados por tipo e em ordem cronológica
+        buckets = (
+            self.db.query(
+                SocialEmotionalDailyRollup.indicator_type,
+                SocialEmotionalDailyRollup.measurement_count,
+                SocialEmotionalDailyRollup.score_sum,
+                SocialEmotionalDailyRollup.min_score,
+                SocialEmotionalDailyRollup.max_score,
+                SocialEmotionalDailyRollup.latest_score,
+                SocialEmotionalDailyRollup.latest_measured_at,
+            )
+            .filter(SocialEmotionalDailyRollup.student_id == student_id)
+            .order_by(SocialEmotionalDailyRollup.indicator_type, SocialEmotionalDailyRollup.day)
+            .all()
         )
 
-        if not all_indicators:
+        if not buckets:
             # Retornar perfil vazio se não há medições
             return SocialEmotionalProfile(
                 student_id=student_id,
@@ -386,63 +500,70 @@ class SocialEmotionalIndicatorService:
                 trends=[],
             )
 
-        # Total de medições
-        total_measurements = len(all_indicators)
-
-        # Última medição
-        last_measured_at = max(ind.measured_at for ind in all_indicators)
+        # Fronteiras dos grupos (buckets já agrupados por tipo)
+        type_codes = {indicator_type: code for code, indicator_type in enumerate(IndicatorType)}
+        codes = np.fromiter((type_codes[b.indicator_type] for b in buckets), dtype=np.int64, count=len(buckets))
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1))
+        ends = np.append(starts[1:], len(buckets))
+
+        def column(name: str) -> np.ndarray:
+            return np.fromiter((getattr(b, name) for b in buckets), dtype=np.int64, count=len(buckets))
+
+        # Estatísticas por tipo em uma passada
+        counts = np.add.reduceat(column("measurement_count"), starts)
+        sums = np.add.reduceat(column("score_sum"), starts)
+        mins = np.minimum.reduceat(column("min_score"), starts)
+        maxs = np.maximum.reduceat(column("max_score"), starts)
+        latest_scores = column("latest_score")[ends - 1]
+
+        summaries = {
+            buckets[start].indicator_type: stats
+            for start, *stats in zip(
+                starts.tolist(), counts.tolist(), sums.tolist(), mins.tolist(), maxs.tolist(), latest_scores.tolist()
+            )
+        }
+        trend_windows = self._profile_trend_windows(student_id)
 
-        # Resumo por tipo de indicador
         indicators_summary = {}
-        for indicator_type in IndicatorType:
-            type_indicators = [ind for ind in all_indicators if ind.indicator_type == indicator_type]
-            if type_indicators:
-                scores = [ind.score for ind in type_indicators]
-                indicators_summary[str(indicator_type)] = {
-                    "count": len(type_indicators),
-                    "average_score": sum(scores) / len(scores),
-                    "latest_score": type_indicators[-1].score,
-                    "is_concerning": type_indicators[-1].is_concerning,
-                }
-
-        # Indicadores preocupantes
-        concerning_indicators = [ind.indicator_display_name for ind in all_indicators if ind.is_concerning]
-        concerning_indicators = list(set(concerning_indicators))  # Remover duplicatas
-
-        # Pontos fortes (scores altos consistentes em indicadores positivos)
+        concerning_indicators = []
         strengths = []
-        for indicator_type in IndicatorType:
-            if str(indicator_type) in indicators_summary:
-                summary = indicators_summary[str(indicator_type)]
-                if summary["average_score"] >= 7:
-                    # Criar indicador temporário para pegar display_name
-                    temp_ind = SocialEmotionalIndicator(indicator_type=indicator_type)
-                    strengths.append(temp_ind.indicator_display_name)
-
-        # Áreas para desenvolvimento (scores baixos)
         areas_for_development = []
-        for indicator_type in IndicatorType:
-            if str(indicator_type) in indicators_summary:
-                summary = indicators_summary[str(indicator_type)]
-                if summary["average_score"] <= 4:
-                    temp_ind = SocialEmotionalIndicator(indicator_type=indicator_type)
-                    areas_for_development.append(temp_ind.indicator_display_name)
-
-        # Tendências (últimos 90 dias)
         trends = []
+
         for indicator_type in IndicatorType:
-            try:
-                trend = self.get_trend(student_id, indicator_type, days=90)
-                trends.append(trend)
-            except NotFoundException:
-                # Sem dados para este indicador
-                pass
+            if indicator_type not in summaries:
+                continue
+
+            count, total, min_score, max_score, latest = summaries[indicator_type]
+            average_score = total / count
+            display_name = INDICATOR_DISPLAY_NAMES.get(indicator_type, str(indicator_type))
+            positive = indicator_type in POSITIVE_INDICATORS
+
+            indicators_summary[str(indicator_type)] = {
+                "count": count,
+                "average_score": average_score,
+                "latest_score": latest,
+                "is_concerning": latest <= 4 if positive else latest >= 7,
+            }
+
+            # Preocupante se qualquer medição do tipo é preocupante
+            if (min_score <= 4) if positive else (max_score >= 7):
+                concerning_indicators.append(display_name)
+
+            # Pontos fortes (scores altos) e áreas para desenvolvimento (scores baixos)
+            if average_score >= 7:
+                strengths.append(display_name)
+            if average_score <= 4:
+                areas_for_development.append(display_name)
+
+            if indicator_type in trend_windows:
+                trends.append(self._build_trend(indicator_type, *trend_windows[indicator_type]))
 
         return SocialEmotionalProfile(
             student_id=student_id,
             student_name=getattr(student, "name", None),
-            total_measurements=total_measurements,
-            last_measured_at=last_measured_at,
+            total_measurements=int(counts.sum()),
+            last_measured_at=max(bucket.latest_measured_at for bucket in buckets),
             indicators_summary=indicators_summary,
             concerning_indicators=concerning_indicators,
             strengths=strengths,
@@ -450,6 +571,96 @@ class SocialEmotionalIndicatorService:
             trends=trends,
         )
 
+    def _profile_trend_windows(self, student_id: UUID) -> Dict[IndicatorType, tuple]:
+        """
+        Medições dos últimos PROFILE_TREND_DAYS dias, por tipo, prontas para _build_trend.
+
+        Returns:
+            Dict tipo -> (rows, cumulative, start, end)
+        """
+        trend_from = datetime.now() - timedelta(days=PROFILE_TREND_DAYS)
+        rows = (
+            self.db.query(
+                SocialEmotionalIndicator.indicator_type,
+                SocialEmotionalIndicator.measured_at,
+                SocialEmotionalIndicator.score,
+                SocialEmotionalIndicator.context,
+            )
+            .filter(
+                and_(
+                    SocialEmotionalIndicator.student_id == student_id,
+                    SocialEmotionalIndicator.measured_at >= trend_from,
+                )
+            )
+            .order_by(
+                SocialEmotionalIndicator.indicator_type,
+                SocialEmotionalIndicator.measured_at,
+                SocialEmotionalIndicator.id,
+            )
+            .all()
+        )
+
+        cumulative = np.concatenate(([0], np.cumsum([row.score for row in rows], dtype=np.int64))).tolist()
+        windows = {}
+        start = 0
+        for indicator_type, group in groupby(rows, key=lambda row: row.indicator_type):
+            end = start + sum(1 for _ in group)
+            windows[indicator_type] = (rows, cumulative, start, end)
+            start = end
+        return windows
+
+    @staticmethod
+    def _build_trend(
+        indicator_type: IndicatorType,
+        rows: List,
+        cumulative: List[int],
+        start: int,
+        end: int,
+    ) -> IndicatorTrend:
+        """
+        Monta IndicatorTrend para as medições rows[start:end] (em ordem cronológica).
+
+        Args:
+            indicator_type: Tipo de indicador
+            rows: Linhas com measured_at, score e context
+            cumulative: Soma acumulada dos scores (cumulative[i] = soma de rows[:i])
+            start: Índice inicial da janela
+            end: Índice final (exclusivo) da janela
+        """
+        count = end - start
+        half = start + count // 2
+
+        # Direção da tendência: média da segunda metade vs primeira metade
+        trend_direction = "stable"
+        if count >= 2:
+            first_half_avg = (cumulative[half] - cumulative[start]) / (half - start)
+            second_half_avg = (cumulative[end] - cumulative[half]) / (end - half)
+
+            if second_half_avg > first_half_avg + 1:
+                trend_direction = "improving"
+            elif second_half_avg < first_half_avg - 1:
+                trend_direction = "declining"
+
+        window = rows[start:end]
+
+        return IndicatorTrend(
+            indicator_type=indicator_type,
+            indicator_display_name=INDICATOR_DISPLAY_NAMES.get(indicator_type, str(indicator_type)),
+            measurements=[
+                {
+                    "date": row.measured_at.isoformat(),
+                    "score": row.score,
+                    "context": str(row.context),
+                }
+                for row in window
+            ],
+            average_score=(cumulative[end] - cumulative[start]) / count,
+            trend_direction=trend_direction,
+            latest_score=window[-1].score,
+            earliest_score=window[0].score,
+            measurement_count=count,
+        )
+
     def compare_periods(
         self,
         student_id: UUID,
@@ -473,40 +684,15 @@ class SocialEmotionalIndicatorService:
         Returns:
             IndicatorComparison com análise comparativa
         """
-        # Período 1
-        period1_indicators = (
-            self.db.query(SocialEmotionalIndicator)
-            .filter(
-                and_(
-                    SocialEmotionalIndicator.student_id == student_id,
-                    SocialEmotionalIndicator.indicator_type == indicator_type,
-                    SocialEmotionalIndicator.measured_at >= period1_start,
-                    SocialEmotionalIndicator.measured_at <= period1_end,
-                )
-            )
-            .all()
-        )
+        period1_count, period1_sum = self._period_totals(student_id, indicator_type, period1_start, period1_end)
+        period2_count, period2_sum = self._period_totals(student_id, indicator_type, period2_start, period2_end)
 
-        # Período 2
-        period2_indicators = (
-            self.db.query(SocialEmotionalIndicator)
-            .filter(
-                and_(
-                    SocialEmotionalIndicator.student_id == student_id,
-                    SocialEmotionalIndicator.indicator_type == indicator_type,
-                    SocialEmotionalIndicator.measured_at >= period2_start,
-                    SocialEmotionalIndicator.measured_at <= period2_end,
-                )
-            )
-            .all()
-        )
-
-        if not period1_indicators or not period2_indicators:
+        if not period1_count or not period2_count:
             raise NotFoundException("Dados insuficientes para comparação entre períodos")
 
         # Médias
-        period1_avg = sum(ind.score for ind in period1_indicators) / len(period1_indicators)
-        period2_avg = sum(ind.score for ind in period2_indicators) / len(period2_indicators)
+        period1_avg = period1_sum / period1_count
+        period2_avg = period2_sum / period2_count
 
         # Mudança percentual
         change_percentage = ((period2_avg - period1_avg) / period1_avg) * 100
@@ -535,3 +721,276 @@ class SocialEmotionalIndicatorService:
             change_direction=change_direction,
             statistical_significance=statistical_significance,
         )
+
+    def _period_totals(
+        self,
+        student_id: UUID,
+        indicator_type: IndicatorType,
+        start: datetime,
+        end: datetime,
+    ) -> Tuple[int, int]:
+        """
+        Contagem e soma dos scores medidos em [start, end].
+
+        Dias inteiramente contidos no período são lidos dos agregados diários;
+        apenas as bordas (dias parciais) consultam as medições.
+        """
+        first_day = start.date() if start.time() == time.min else start.date() + timedelta(days=1)
+        last_day = end.date() - timedelta(days=1)
+
+        if first_day > last_day:
+            # Período menor que um dia inteiro: apenas medições
+            return self._measurement_totals(
+                student_id, indicator_type, SocialEmotionalIndicator.measured_at.between(start, end)
+            )
+
+        full_from = datetime.combine(first_day, time.min)
+        full_to = datetime.combine(last_day + timedelta(days=1), time.min)
+
+        rollup_count, rollup_sum = (
+            self.db.query(
+                func.coalesce(func.sum(SocialEmotionalDailyRollup.measurement_count), 0),
+                func.coalesce(func.sum(SocialEmotionalDailyRollup.score_sum), 0),
+            )
+            .filter(
+                and_(
+                    SocialEmotionalDailyRollup.student_id == student_id,
+                    SocialEmotionalDailyRollup.indicator_type == indicator_type,
+                    SocialEmotionalDailyRollup.day >= first_day,
+                    SocialEmotionalDailyRollup.day <= last_day,
+                )
+            )
+            .one()
+        )
+        edge_count, edge_sum = self._measurement_totals(
+            student_id,
+            indicator_type,
+            or_(
+                and_(SocialEmotionalIndicator.measured_at >= start, SocialEmotionalIndicator.measured_at < full_from),
+                and_(SocialEmotionalIndicator.measured_at >= full_to, SocialEmotionalIndicator.measured_at <= end),
+            ),
+        )
+        return rollup_count + edge_count, rollup_sum + edge_sum
+
+    def _measurement_totals(self, student_id: UUID, indicator_type: IndicatorType, condition) -> Tuple[int, int]:
+        """Contagem e soma dos scores das medições que atendem à condição."""
+        count, total = (
+            self.db.query(
+                func.count(SocialEmotionalIndicator.id),
+                func.coalesce(func.sum(SocialEmotionalIndicator.score), 0),
+            )
+            .filter(
+                and_(
+                    SocialEmotionalIndicator.student_id == student_id,
+                    SocialEmotionalIndicator.indicator_type == indicator_type,
+                    condition,
+                )
+            )
+            .one()
+        )
+        return count, total
+
+    # ========================================================================
+    # Agregados diários (socioemotional_daily_rollups)
+    # ========================================================================
+
+    @staticmethod
+    def _rollup_key(indicator: SocialEmotionalIndicator) -> RollupKey:
+        """Bucket diário ao qual a medição pertence."""
+        return (indicator.student_id, indicator.indicator_type, _as_utc(indicator.measured_at).date())
+
+    @staticmethod
+    def _bucket_values(key: RollupKey, measurements: List[Tuple[datetime, int]]) -> dict:
+        """
+        Valores de um agregado diário.
+
+        Args:
+            key: Bucket (student_id, indicator_type, dia)
+            measurements: Pares (measured_at, score) em ordem cronológica
+        """
+        student_id, indicator_type, day = key
+        scores = [score for _, score in measurements]
+        now = datetime.utcnow()
+        return {
+            "id": uuid4(),
+            "student_id": student_id,
+            "indicator_type": indicator_type,
+            "day": day,
+            "measurement_count": len(scores),
+            "score_sum": sum(scores),
+            "score_sum_sq": sum(score * score for score in scores),
+            "min_score": min(scores),
+            "max_score": max(scores),
+            "first_score": measurements[0][1],
+            "first_measured_at": measurements[0][0],
+            "latest_score": measurements[-1][1],
+            "latest_measured_at": measurements[-1][0],
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    def _add_to_rollup(self, new_measurements: Iterable[Tuple[UUID, IndicatorType, datetime, int]]) -> None:
+        """
+        Soma novas medições aos agregados diários, sem reler medições anteriores.
+
+        As medições são pré-agregadas por bucket e gravadas com um único
+        INSERT ... ON CONFLICT DO UPDATE (na mesma transação da escrita).
+
+        Args:
+            new_measurements: Tuplas (student_id, indicator_type, measured_at, score)
+        """
+        measurements: Dict[RollupKey, List[Tuple[datetime, int]]] = {}
+        for student_id, indicator_type, measured_at, score in new_measurements:
+            # Coluna measured_at é sem fuso (UTC): bucket pelo dia UTC, como é gravado
+            measured_at = _as_utc(measured_at)
+            key = (student_id, indicator_type, measured_at.date())
+            measurements.setdefault(key, []).append((measured_at, score))
+
+        if not measurements:
+            return
+
+        values = [
+            self._bucket_values(key, sorted(items, key=lambda item: item[0])) for key, items in measurements.items()
+        ]
+        statement = self._rollup_upsert(values)
+        if statement is None:
+            self.db.flush()
+            self._refresh_rollup(measurements.keys())
+        else:
+            self.db.execute(statement)
+
+    def _rollup_upsert(self, values: List[dict]):
+        """
+        INSERT ... ON CONFLICT que acumula `values` nos agregados existentes.
+
+        Returns:
+            Statement, ou None se o banco não suporta ON CONFLICT
+        """
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+            greatest, least = func.greatest, func.least
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+            # min/max com 2+ argumentos são funções escalares no SQLite
+            greatest, least = func.max, func.min
+        else:
+            return None
+
+        table = SocialEmotionalDailyRollup.__table__
+        statement = dialect_insert(table).values(values)
+        new = statement.excluded
+
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.student_id, table.c.indicator_type, table.c.day],
+            set_={
+                "measurement_count": table.c.measurement_count + new.measurement_count,
+                "score_sum": table.c.score_sum + new.score_sum,
+                "score_sum_sq": table.c.score_sum_sq + new.score_sum_sq,
+                "min_score": least(table.c.min_score, new.min_score),
+                "max_score": greatest(table.c.max_score, new.max_score),
+                "first_score": case(
+                    (new.first_measured_at < table.c.first_measured_at, new.first_score),
+                    else_=table.c.first_score,
+                ),
+                "first_measured_at": least(table.c.first_measured_at, new.first_measured_at),
+                "latest_score": case(
+                    (new.latest_measured_at >= table.c.latest_measured_at, new.latest_score),
+                    else_=table.c.latest_score,
+                ),
+                "latest_measured_at": greatest(table.c.latest_measured_at, new.latest_measured_at),
+                "updated_at": new.updated_at,
+            },
+        )
+
+    def _refresh_rollup(self, keys: Iterable[RollupKey]) -> None:
+        """
+        Recalcula agregados a partir das medições do dia.
+
+        Usado quando medições são alteradas ou removidas (min/max e
+        primeira/última medição não podem ser subtraídos). Alterações
+        pendentes precisam ter sido enviadas com flush().
+        """
+        for key in set(keys):
+            student_id, indicator_type, day = key
+            day_start = datetime.combine(day, time.min)
+
+            rows = (
+                self.db.query(SocialEmotionalIndicator.measured_at, SocialEmotionalIndicator.score)
+                .filter(
+                    and_(
+                        SocialEmotionalIndicator.student_id == student_id,
+                        SocialEmotionalIndicator.indicator_type == indicator_type,
+                        SocialEmotionalIndicator.measured_at >= day_start,
+                        SocialEmotionalIndicator.measured_at < day_start + timedelta(days=1),
+                    )
+                )
+                .order_by(SocialEmotionalIndicator.measured_at, SocialEmotionalIndicator.id)
+                .all()
+            )
+
+            self.db.query(SocialEmotionalDailyRollup).filter(
+                and_(
+                    SocialEmotionalDailyRollup.student_id == student_id,
+                    SocialEmotionalDailyRollup.indicator_type == indicator_type,
+                    SocialEmotionalDailyRollup.day == day,
+                )
+            ).delete(synchronize_session=False)
+
+            if rows:
+                self.db.execute(
+                    insert(SocialEmotionalDailyRollup.__table__),
+                    [self._bucket_values(key, [(row.measured_at, row.score) for row in rows])],
+                )
+
+    def rebuild_rollups(self, student_id: Optional[UUID] = None, batch_size: int = 1000) -> int:
+        """
+        Reconstrói os agregados diários a partir das medições.
+
+        Usado no backfill após a migration e para corrigir agregados de
+        medições gravadas fora deste service.
+
+        Args:
+            student_id: Restringe a um estudante (None = todos)
+            batch_size: Linhas lidas/gravadas por lote
+
+        Returns:
+            Número de agregados gravados
+        """
+        rollups = self.db.query(SocialEmotionalDailyRollup)
+        measurements = self.db.query(
+            SocialEmotionalIndicator.student_id,
+            SocialEmotionalIndicator.indicator_type,
+            SocialEmotionalIndicator.measured_at,
+            SocialEmotionalIndicator.score,
+        )
+        if student_id is not None:
+            rollups = rollups.filter(SocialEmotionalDailyRollup.student_id == student_id)
+            measurements = measurements.filter(SocialEmotionalIndicator.student_id == student_id)
+
+        rollups.delete(synchronize_session=False)
+
+        rows = measurements.order_by(
+            SocialEmotionalIndicator.student_id,
+            SocialEmotionalIndicator.indicator_type,
+            SocialEmotionalIndicator.measured_at,
+            SocialEmotionalIndicator.id,
+        ).yield_per(batch_size)
+
+        written = 0
+        batch = []
+        for key, group in groupby(rows, key=lambda row: (row.student_id, row.indicator_type, row.measured_at.date())):
+            batch.append(self._bucket_values(key, [(row.measured_at, row.score) for row in group]))
+            if len(batch) >= batch_size:
+                self.db.execute(insert(SocialEmotionalDailyRollup.__table__), batch)
+                written += len(batch)
+                batch = []
+
+        if batch:
+            self.db.execute(insert(SocialEmotionalDailyRollup.__table__), batch)
+            written += len(batch)
+
+        self.db.commit()
+        return written
@@ -249,6 +249,10 @@ MAX_TOKENS_ACTIVITY_GENERATION = 2000
 MAX_TOKENS_PROGRESS_ANALYSIS = 1500
 MAX_TOKENS_RECOMMENDATION = 1000
 
+# Prompt budgets (estimated tokens)
+MAX_PROMPT_TOKENS_ASSESSMENT_HISTORY = 800  # Assessment history in progress analysis
+MAX_PROMPT_TOKENS_FREE_TEXT = 150  # Each free-text field (notes, progress summary)
+
 # Temperature settings
 TEMPERATURE_CREATIVE = 0.9  # For creative content generation
 TEMPERATURE_BALANCED = 0.7  # For general responses
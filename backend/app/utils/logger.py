@@ -315,6 +315,8 @@ def log_openai_request(
     completion_tokens: int,
     duration_ms: float,
     request_id: Optional[str] = None,
+    cached: bool = False,
+    cache_stats: Optional[Dict[str, Any]] = None,
 ) -> None:
     """
     Log OpenAI API request.
@@ -326,6 +328,8 @@ def log_openai_request(
         completion_tokens: Number of completion tokens
         duration_ms: Request duration in milliseconds
         request_id: Request ID (optional)
+        cached: Served from the response cache (tokens are the ones saved)
+        cache_stats: Response cache counters (NLPResponseCache.get_stats)
     """
     extra_data = {
         "model": model,
@@ -333,13 +337,19 @@ def log_openai_request(
         "completion_tokens": completion_tokens,
         "total_tokens": prompt_tokens + completion_tokens,
         "duration_ms": round(duration_ms, 2),
+        "cached": cached,
     }
 
     if request_id:
         extra_data["request_id"] = request_id
 
+    if cache_stats is not None:
+        extra_data["cache_hit_rate"] = cache_stats["hit_rate"]
+        extra_data["cache_saved_tokens"] = cache_stats["saved_prompt_tokens"] + cache_stats["saved_completion_tokens"]
+
+    source = f"{model} (cache hit)" if cached else model
     logger.info(
-        f"OpenAI Request: {model} - {prompt_tokens + completion_tokens} tokens - {duration_ms:.2f}ms",
+        f"OpenAI Request: {source} - {prompt_tokens + completion_tokens} tokens - {duration_ms:.2f}ms",
         extra={"extra": extra_data},
     )
 
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos codecs do cache em payloads reais de pending-review.
+
+Gera planos pendentes de revisão (SQLite em memória), obtém páginas de
+InterventionPlanService.get_pending_review_plans, serializa como o
+CachedInterventionPlanService e compara, para cada codec, o tamanho do
+payload e o tempo de encode/decode.
+
+"json (legado)" é o formato anterior: json.dumps(default=str) sobre os itens
+convertidos manualmente para tipos JSON.
+
+Uso:
+    python scripts/benchmark_cache_codec.py
+    python scripts/benchmark_cache_codec.py --page-sizes 50 200 1000 --repeat 200
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from benchmark_pending_review import create_owners, create_session, seed
+
+from app.core.cache_codec import LZ4_AVAILABLE, MSGPACK_AVAILABLE, CacheCodec
+from app.services.intervention_plan_service_cached import CachedInterventionPlanService
+
+
+def timed(func, repeat: int) -> float:
+    """Mediana (µs) de `repeat` execuções."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(timings)
+
+
+def build_codecs(threshold: int) -> dict:
+    """Codecs a comparar (apenas os disponíveis no ambiente)."""
+    codecs = {"json (header)": CacheCodec(format="json")}
+    if MSGPACK_AVAILABLE:
+        codecs["msgpack"] = CacheCodec(format="msgpack", compression="none")
+        codecs["msgpack+zlib"] = CacheCodec(format="msgpack", compression="zlib", compress_threshold=threshold)
+        if LZ4_AVAILABLE:
+            codecs["msgpack+lz4"] = CacheCodec(format="msgpack", compression="lz4", compress_threshold=threshold)
+    return codecs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de codecs do cache (pending-review)")
+    parser.add_argument("--plans", type=int, default=5_000, help="Planos pendentes gerados")
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--repeat", type=int, default=100, help="Repetições por medição")
+    parser.add_argument("--threshold", type=int, default=1024, help="Limiar de compressão (bytes)")
+    args = parser.parse_args()
+
+    if not MSGPACK_AVAILABLE:
+        print("⚠️  msgpack não instalado - apenas JSON será medido")
+
+    session = create_session("sqlite:///:memory:")
+    student_id, professional_id = create_owners(session)
+    seed(session, args.plans, 0, student_id, professional_id)
+    service = CachedInterventionPlanService(session)
+    codecs = build_codecs(args.threshold)
+
+    print(f"{'itens':>6} | {'codec':<14} | {'bytes':>9} | {'encode (µs)':>11} | {'decode (µs)':>11}")
+    print("-" * 64)
+
+    for page_size in args.page_sizes:
+        result = service.get_pending_review_plans(limit=page_size)
+        payload = service._serialize_pending_review_result(result)
+        legacy_payload = {**payload, "items": [item.model_dump(mode="json") for item in result["items"]]}
+
+        legacy = json.dumps(legacy_payload, default=str)
+        rows = [
+            (
+                "json (legado)",
+                len(legacy.encode()),
+                timed(lambda: json.dumps(legacy_payload, default=str), args.repeat),
+                timed(lambda: json.loads(legacy), args.repeat),
+            )
+        ]
+
+        for name, codec in codecs.items():
+            encoded = codec.encode(payload)
+            rows.append(
+                (
+                    name,
+                    len(encoded),
+                    timed(lambda: codec.encode(payload), args.repeat),
+                    timed(lambda: codec.decode(encoded), args.repeat),
+                )
+            )
+
+        for name, size, encode_us, decode_us in rows:
+            print(f"{len(result['items']):>6} | {name:<14} | {size:>9} | {encode_us:>11.1f} | {decode_us:>11.1f}")
+        print("-" * 64)
+
+
+if __name__ == "__main__":
+    main()
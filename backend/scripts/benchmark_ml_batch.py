@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark da predição de risco em lote (MLService.predict_risk_level_batch).
+
+Treina um RandomForest + StandardScaler sintéticos com as features de
+extract_student_features e compara, para N estudantes:
+
+- legado: um DataFrame de 1 linha + predict + predict_proba por estudante
+  (implementação anterior de _predict_with_model)
+- por estudante: predict_risk_level em loop
+- lote: predict_risk_level_batch (uma matriz, um predict_proba)
+
+Os caminhos por estudante são medidos em uma amostra (--sample) e
+extrapolados linearmente para N. Também compara a extração de features
+(dicts por estudante vs ml_features.build_feature_matrix).
+
+Uso:
+    python scripts/benchmark_ml_batch.py
+    python scripts/benchmark_ml_batch.py --sizes 1000 10000 --estimators 100
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from app.services.ml_features import build_feature_matrix
+from app.services.ml_service import MLService
+from app.utils.constants import CompletionStatus, DifficultyRating, EngagementLevel, TEALevel
+
+
+def build_students(count: int, rng: np.random.Generator):
+    """Estudantes e históricos sintéticos (objetos simples com os atributos usados)."""
+    levels = [TEALevel.LEVEL_1, TEALevel.LEVEL_2, TEALevel.LEVEL_3, None]
+    statuses = list(CompletionStatus)
+    engagement = list(EngagementLevel)
+    difficulty = list(DifficultyRating)
+    independence = ["full", "partial", "minimal", "dependent"]
+    now = datetime.now()
+
+    students, assessments_by_student = [], {}
+    for i in range(count):
+        student = SimpleNamespace(
+            id=uuid4(),
+            age=int(rng.integers(4, 18)),
+            tea_level=levels[i % len(levels)],
+            interests=["interesse"] * int(rng.integers(0, 5)),
+            learning_profile={"visual": int(rng.integers(1, 10)), "attention_span": int(rng.integers(1, 10))},
+        )
+        students.append(student)
+        assessments_by_student[student.id] = [
+            SimpleNamespace(
+                completion_status=statuses[int(rng.integers(0, len(statuses)))],
+                engagement_level=engagement[int(rng.integers(0, len(engagement)))],
+                difficulty_rating=difficulty[int(rng.integers(0, len(difficulty)))],
+                independence_level=independence[int(rng.integers(0, len(independence)))],
+                created_at=now - timedelta(days=j),
+            )
+            for j in range(int(rng.integers(0, 10)))
+        ]
+    return students, assessments_by_student
+
+
+def train_service(estimators: int, rng: np.random.Generator) -> MLService:
+    """MLService com modelo e scaler treinados em dados sintéticos."""
+    service = MLService()
+    probe = SimpleNamespace(id=uuid4(), age=10, tea_level=None, interests=[], learning_profile=None)
+    service.feature_names = sorted(service.extract_student_features(probe, None))
+
+    X = rng.normal(size=(2000, len(service.feature_names)))
+    y = rng.integers(0, len(service.RISK_LEVELS), size=2000)
+    service.scaler = StandardScaler().fit(X)
+    service.behavioral_model = RandomForestClassifier(n_estimators=estimators, random_state=0, n_jobs=1).fit(
+        service.scaler.transform(X), y
+    )
+    return service
+
+
+def legacy_predict(service: MLService, student, assessments) -> dict:
+    """Implementação anterior de _predict_with_model (DataFrame + predict + predict_proba)."""
+    features = service.extract_student_features(student, assessments)
+    df = pd.DataFrame([features])
+    for feature in service.feature_names:
+        if feature not in df.columns:
+            df[feature] = 0.0
+    X_scaled = service.scaler.transform(df[service.feature_names].values)
+    prediction_idx = service.behavioral_model.predict(X_scaled)[0]
+    probabilities = service.behavioral_model.predict_proba(X_scaled)[0]
+    return {
+        "risk_level": service.RISK_LEVELS[prediction_idx],
+        "confidence": float(np.max(probabilities)),
+        "probabilities": {level: float(prob) for level, prob in zip(service.RISK_LEVELS, probabilities)},
+        "method": "ml_model",
+    }
+
+
+def per_student_seconds(func, students, assessments_by_student) -> float:
+    """Tempo médio (s) por estudante."""
+    start = time.perf_counter()
+    for student in students:
+        func(student, assessments_by_student.get(student.id))
+    return (time.perf_counter() - start) / len(students)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de predição de risco em lote")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--sample", type=int, default=200, help="Estudantes medidos nos caminhos por estudante")
+    parser.add_argument("--estimators", type=int, default=100, help="Árvores do RandomForest")
+    args = parser.parse_args()
+
+    # Logs INFO por predição distorceriam a medição
+    logging.disable(logging.INFO)
+
+    rng = np.random.default_rng(42)
+    service = train_service(args.estimators, rng)
+    students, assessments_by_student = build_students(max(args.sizes), rng)
+
+    sample = students[: args.sample]
+    legacy_s = per_student_seconds(lambda s, a: legacy_predict(service, s, a), sample, assessments_by_student)
+    single_s = per_student_seconds(service.predict_risk_level, sample, assessments_by_student)
+
+    print(f"{'estudantes':>10} | {'legado (s)*':>11} | {'por estudante (s)*':>18} | {'lote (s)':>9} | {'ganho':>7}")
+    print("-" * 70)
+
+    for size in args.sizes:
+        subset = students[:size]
+        start = time.perf_counter()
+        service.predict_risk_level_batch(subset, assessments_by_student)
+        batch_s = time.perf_counter() - start
+
+        print(
+            f"{size:>10} | {legacy_s * size:>11.2f} | {single_s * size:>18.2f} | {batch_s:>9.3f} | "
+            f"{legacy_s * size / batch_s:>6.0f}x"
+        )
+
+    print(f"\n* extrapolado de {len(sample)} estudantes; ganho = legado / lote")
+
+    print(f"\n{'estudantes':>10} | {'features dict (s)':>17} | {'features colunar (s)':>20} | {'ganho':>7}")
+    print("-" * 65)
+    for size in args.sizes:
+        subset = students[:size]
+        start = time.perf_counter()
+        for student in subset:
+            service.extract_student_features(student, assessments_by_student.get(student.id))
+        dict_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        build_feature_matrix(subset, assessments_by_student, service.feature_names)
+        columnar_s = time.perf_counter() - start
+
+        print(f"{size:>10} | {dict_s:>17.3f} | {columnar_s:>20.3f} | {dict_s / columnar_s:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
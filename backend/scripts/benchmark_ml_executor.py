@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark do executor de ML (processos) contra inferência no event loop.
+
+Treina um RandomForest sintético, grava-o como versão "production" do
+ModelRegistry num diretório temporário e dispara rajadas de predições de
+risco enquanto uma corrotina "de I/O" (como /health) mede o atraso do event
+loop a cada 5 ms. Modos:
+
+- loop: predição chamada direto na corrotina (bloqueia o event loop)
+- threads: run_in_threadpool (o GIL ainda é disputado com o loop)
+- processos: MLExecutor com N workers (modelo carregado em cada processo)
+
+Reporta vazão de predições e p50/p99 do atraso do loop.
+
+Uso:
+    python scripts/benchmark_ml_executor.py
+    python scripts/benchmark_ml_executor.py --workers 4 --requests 400 --estimators 300
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+import numpy as np
+
+
+def train(root: Path, estimators: int) -> None:
+    """Grava o modelo sintético como versão production do registry."""
+    import joblib
+    from sklearn.ensemble import RandomForestClassifier
+
+    from app.services.ml_features import FEATURE_NAMES
+    from app.services.ml_registry import ModelRegistry
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(5_000, len(FEATURE_NAMES)))
+    y = rng.integers(0, 4, size=5_000)
+    model = RandomForestClassifier(n_estimators=estimators, random_state=0).fit(X, y)
+
+    model_dir = root / "behavioral_classifier" / "production"
+    model_dir.mkdir(parents=True)
+    joblib.dump(model, model_dir / "model.pkl")
+    ModelRegistry.write_metadata(model_dir, FEATURE_NAMES)
+
+
+async def probe(stop: asyncio.Event, delays: list) -> None:
+    """Corrotina de I/O: mede quanto o event loop atrasa um sleep de 5 ms."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.005)
+        delays.append((time.perf_counter() - start - 0.005) * 1000)
+
+
+async def run_mode(name: str, predict, requests: int, concurrency: int) -> None:
+    """Dispara `requests` predições com `concurrency` em voo e reporta."""
+    from app.services.ml_features import FEATURE_NAMES
+
+    rng = np.random.default_rng(1)
+    features = [dict(zip(FEATURE_NAMES, row.tolist())) for row in rng.normal(size=(requests, len(FEATURE_NAMES)))]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(item):
+        async with semaphore:
+            return await predict(item)
+
+    stop, delays = asyncio.Event(), []
+    probe_task = asyncio.create_task(probe(stop, delays))
+    start = time.perf_counter()
+    await asyncio.gather(*(one(item) for item in features))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe_task
+
+    delays.sort()
+    p99 = delays[int((len(delays) - 1) * 0.99)] if delays else 0.0
+    p50 = statistics.median(delays) if delays else 0.0
+    print(f"{name:<16} | {requests / elapsed:>9.0f} | {p50:>14.2f} | {p99:>14.2f}")
+
+
+async def main_async(args) -> None:
+    from fastapi.concurrency import run_in_threadpool
+
+    from app.services.ml_executor import MLExecutor
+    from app.services.ml_service import MLService
+
+    service = MLService()
+    service.load_behavioral_model()
+
+    async def in_loop(features):
+        return service.predict_risk_from_features(features)
+
+    async def in_threads(features):
+        return await run_in_threadpool(service.predict_risk_from_features, features)
+
+    executor = MLExecutor(max_workers=args.workers, max_pending=args.concurrency, task_timeout=60.0)
+    await executor.warm_up()
+
+    print(f"{'modo':<16} | {'pred/s':>9} | {'atraso p50 (ms)':>14} | {'atraso p99 (ms)':>14}")
+    print("-" * 64)
+    try:
+        await run_mode("loop", in_loop, args.requests, args.concurrency)
+        await run_mode("threads", in_threads, args.requests, args.concurrency)
+        await run_mode(f"processos ({args.workers})", executor.predict_risk, args.requests, args.concurrency)
+    finally:
+        executor.shutdown()
+
+    print("\nMétricas do executor:", executor.get_stats()["operations"]["predict_risk"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do executor de ML em processos")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Processos do pool")
+    parser.add_argument("--requests", type=int, default=300, help="Predições por modo")
+    parser.add_argument("--concurrency", type=int, default=16, help="Predições simultâneas")
+    parser.add_argument("--estimators", type=int, default=200, help="Árvores do RandomForest")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        train(Path(tmp), args.estimators)
+        # Lido pelo MLService deste processo e dos workers (spawn herda o ambiente)
+        os.environ["ML_MODEL_PATH"] = tmp
+        from app.core.config import settings
+
+        settings.ML_MODEL_PATH = tmp
+        asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark do motor de floresta plana (ml_forest.FlatForestClassifier).
+
+Treina um RandomForest sintético com as features de ml_features e mede a
+latência mediana de predict_proba para lotes de 1 a N linhas:
+
+- sklearn: RandomForestClassifier.predict_proba (n_jobs=None)
+- flat: FlatForestClassifier sem floresta de origem (sempre o motor plano)
+- flat+sklearn: FlatForestClassifier padrão (lotes acima de large_batch_rows
+  vão para o sklearn)
+
+Também verifica que as probabilidades são idênticas (bit a bit) e mede a
+predição online de MLService (_predict_with_model, 1 estudante) com cada motor.
+
+Uso:
+    python scripts/benchmark_ml_forest.py
+    python scripts/benchmark_ml_forest.py --estimators 300 --max-depth 12 --sizes 1 8 64 512
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import logging
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from app.services.ml_features import FEATURE_NAMES
+from app.services.ml_forest import FlatForestClassifier
+from app.services.ml_service import MLService
+
+
+def timed(func, repeat: int) -> float:
+    """Mediana (ms) de `repeat` execuções."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark do motor de floresta plana")
+    parser.add_argument("--estimators", type=int, default=100, help="Árvores do RandomForest")
+    parser.add_argument("--max-depth", type=int, default=None, help="Profundidade máxima (padrão: sem limite)")
+    parser.add_argument("--samples", type=int, default=5_000, help="Amostras de treino")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 8, 32, 128, 512, 2048])
+    parser.add_argument("--repeat", type=int, default=50, help="Repetições por medição")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(args.samples, len(FEATURE_NAMES)))
+    y = rng.integers(0, 4, size=args.samples)
+    forest = RandomForestClassifier(n_estimators=args.estimators, max_depth=args.max_depth, random_state=0).fit(X, y)
+
+    start = time.perf_counter()
+    routed = FlatForestClassifier.from_sklearn(forest)
+    export_ms = (time.perf_counter() - start) * 1000
+    flat = FlatForestClassifier.from_sklearn(forest, keep_source=False)
+
+    X_test = rng.normal(size=(max(args.sizes), len(FEATURE_NAMES))) * 2
+    identical = np.array_equal(flat.predict_proba(X_test), forest.predict_proba(X_test))
+
+    print(
+        f"{args.estimators} árvores, {len(flat.is_leaf)} nós, {len(FEATURE_NAMES)} features, "
+        f"exportação {export_ms:.0f} ms, probabilidades idênticas: {identical}\n"
+    )
+    print(f"{'linhas':>7} | {'sklearn (ms)':>12} | {'flat (ms)':>10} | {'flat+sklearn (ms)':>17} | {'speedup':>7}")
+    print("-" * 66)
+
+    for size in args.sizes:
+        batch = X_test[:size]
+        sklearn_ms = timed(lambda: forest.predict_proba(batch), args.repeat)
+        flat_ms = timed(lambda: flat.predict_proba(batch), args.repeat)
+        routed_ms = timed(lambda: routed.predict_proba(batch), args.repeat)
+        print(
+            f"{size:>7} | {sklearn_ms:>12.3f} | {flat_ms:>10.3f} | {routed_ms:>17.3f} | {sklearn_ms / routed_ms:>6.1f}x"
+        )
+
+    print("\nMLService._predict_with_model (1 estudante):")
+    features = dict(zip(FEATURE_NAMES, X_test[0].tolist()))
+    for name, model in (("sklearn", forest), ("flat", routed)):
+        service = MLService()
+        service.feature_names = FEATURE_NAMES
+        service.behavioral_model = model
+        print(f"  {name:<8} {timed(lambda: service._predict_with_model(features), args.repeat):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
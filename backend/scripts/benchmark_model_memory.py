@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória por worker ao carregar o modelo comportamental.
+
+Treina um RandomForest sintético, grava-o como versão do ModelRegistry
+(model.pkl + scaler.pkl + metadata.json com checksums) e inicia N processos
+(como N workers uvicorn). Cada processo carrega o modelo pelo registry e
+reporta, a partir de /proc/self/smaps_rollup (apenas Linux):
+
+- pico: aumento do RSS máximo (VmHWM) durante o carregamento
+- privado: memória privada (Private_Clean + Private_Dirty) adicionada
+- pss: Pss adicionado (páginas compartilhadas divididas entre processos)
+
+Compara mmap_mode=None (joblib.load lê tudo para memória privada) com
+mmap_mode="r" (arrays mapeados do page cache).
+
+Observação: as árvores do scikit-learn copiam os nós para memória própria
+ao serem desserializadas, então no RandomForest o mmap elimina a cópia
+intermediária (pico) mas não torna os nós compartilhados.
+
+Uso:
+    python scripts/benchmark_model_memory.py
+    python scripts/benchmark_model_memory.py --workers 8 --estimators 300
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+import numpy as np
+
+from app.services.ml_features import FEATURE_NAMES
+
+MODEL_NAME = "behavioral_classifier"
+VERSION = "benchmark"
+
+
+def memory_snapshot() -> dict:
+    """Campos relevantes (MB) de smaps_rollup e status do processo atual."""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Pss:", "Private_Clean:", "Private_Dirty:"):
+                values[parts[0][:-1]] = int(parts[1]) / 1024
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                values["VmHWM"] = int(line.split()[1]) / 1024
+    values["Private"] = values["Private_Clean"] + values["Private_Dirty"]
+    return values
+
+
+def worker(root: str, mmap_mode, ready, results, release):
+    """Carrega o modelo e aguarda os demais workers antes de medir."""
+    import sklearn.ensemble  # noqa: F401 - import fora da medição
+
+    from app.services.ml_registry import ModelRegistry
+
+    before = memory_snapshot()
+    loaded = ModelRegistry(Path(root), mmap_mode=mmap_mode).load(MODEL_NAME, VERSION)
+    ready.wait()  # todos carregados: páginas compartilhadas já mapeadas por todos
+    after = memory_snapshot()
+    results.put({key: after[key] - before[key] for key in ("VmHWM", "Private", "Pss")})
+    release.wait()
+    del loaded
+
+
+def train(root: Path, estimators: int, samples: int):
+    """Grava uma versão do modelo sintético no formato do registry."""
+    import joblib
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    from app.services.ml_registry import ModelRegistry
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(samples, len(FEATURE_NAMES)))
+    y = rng.integers(0, 4, size=samples)
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=estimators, random_state=0, n_jobs=-1).fit(scaler.transform(X), y)
+
+    model_dir = root / MODEL_NAME / VERSION
+    model_dir.mkdir(parents=True)
+    joblib.dump(model, model_dir / "model.pkl")
+    joblib.dump(scaler, model_dir / "scaler.pkl")
+    ModelRegistry.write_metadata(model_dir, FEATURE_NAMES)
+    return (model_dir / "model.pkl").stat().st_size / 1024 / 1024
+
+
+def run(root: Path, workers: int, mmap_mode) -> list:
+    """Inicia N workers (spawn) e coleta as medições."""
+    context = multiprocessing.get_context("spawn")
+    ready, release = context.Barrier(workers), context.Barrier(workers + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(str(root), mmap_mode, ready, results, release)) for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    measurements = [results.get() for _ in processes]
+    release.wait()
+    for process in processes:
+        process.join()
+    return measurements
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memória por worker (ModelRegistry)")
+    parser.add_argument("--workers", type=int, default=4, help="Processos simulando workers uvicorn")
+    parser.add_argument("--estimators", type=int, default=200, help="Árvores do RandomForest")
+    parser.add_argument("--samples", type=int, default=20_000, help="Amostras de treino")
+    args = parser.parse_args()
+
+    if not Path("/proc/self/smaps_rollup").exists():
+        print("⚠️  /proc/self/smaps_rollup indisponível - benchmark suportado apenas no Linux")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        size_mb = train(root, args.estimators, args.samples)
+        print(f"model.pkl: {size_mb:.1f} MB, {args.estimators} árvores, {args.workers} workers\n")
+
+        print(
+            f"{'mmap_mode':<10} | {'pico (MB)':>10} | {'privado (MB)':>12} | {'pss (MB)':>9} | {'total pss (MB)':>14}"
+        )
+        print("-" * 68)
+        for mmap_mode in (None, "r"):
+            measurements = run(root, args.workers, mmap_mode)
+            peak = np.mean([m["VmHWM"] for m in measurements])
+            private = np.mean([m["Private"] for m in measurements])
+            pss = np.mean([m["Pss"] for m in measurements])
+            total = sum(m["Pss"] for m in measurements)
+            print(f"{str(mmap_mode):<10} | {peak:>10.1f} | {private:>12.1f} | {pss:>9.1f} | {total:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
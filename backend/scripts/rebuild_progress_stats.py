@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Reconstrói as estatísticas incrementais de progresso dos estudantes.
+
+Necessário uma vez após a migration d5e6f7a8b9c0 (backfill) e sempre que
+avaliações forem gravadas sem passar pelo AssessmentService (importações
+diretas no banco, por exemplo).
+
+Uso:
+    python scripts/rebuild_progress_stats.py
+    python scripts/rebuild_progress_stats.py --student-id <uuid>
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+from uuid import UUID
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.services.progress_stats_service import ProgressStatsService
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Reconstrói estatísticas de progresso dos estudantes")
+    parser.add_argument("--student-id", type=UUID, default=None, help="Apenas um estudante")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Linhas por lote")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+
+    try:
+        start = time.perf_counter()
+        written = ProgressStatsService.rebuild(db, args.student_id, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"✅ Estatísticas de {written} estudantes gravadas em {elapsed:.1f}s")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ ERRO: {type(e).__name__}: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
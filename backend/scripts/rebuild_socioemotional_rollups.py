@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Reconstrói os agregados diários de indicadores socioemocionais.
+
+Necessário uma vez após a migration c4d5e6f7a8b9 (backfill) e sempre que
+medições forem gravadas sem passar pelo SocialEmotionalIndicatorService
+(importações diretas no banco, por exemplo).
+
+Uso:
+    python scripts/rebuild_socioemotional_rollups.py
+    python scripts/rebuild_socioemotional_rollups.py --student-id <uuid>
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+from uuid import UUID
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.services.socioemotional_indicator_service import SocialEmotionalIndicatorService
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Reconstrói agregados diários de indicadores socioemocionais")
+    parser.add_argument("--student-id", type=UUID, default=None, help="Apenas um estudante")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Linhas por lote")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+
+    try:
+        start = time.perf_counter()
+        written = SocialEmotionalIndicatorService(db).rebuild_rollups(args.student_id, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"✅ {written} agregados diários gravados em {elapsed:.1f}s")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ ERRO: {type(e).__name__}: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Treina o classificador de risco comportamental (behavioral_classifier).
+
+Lê estudantes e avaliações do banco em lotes (memória limitada por
+--chunk-size e --max-samples, independente do tamanho das tabelas), gera as
+features com o mesmo código usado nas predições (app/services/ml_features.py)
+e grava model.pkl, scaler.pkl e metadata.json em
+<ML_MODEL_PATH>/behavioral_classifier/<versão>/, o layout lido por
+MLService.load_behavioral_model.
+
+Sem --labels, cada estudante recebe o nível de risco da regra heurística
+(MLService.rule_based_risk_score). O CSV de --labels (colunas student_id e
+risk_level: baixo, medio, alto, muito_alto) substitui esse rótulo.
+
+Roda offline, em CPU. Mesma base + mesma --seed = mesmo modelo.
+
+Uso:
+    python scripts/train_behavioral_classifier.py
+    python scripts/train_behavioral_classifier.py --version v2 --labels rotulos.csv
+    python scripts/train_behavioral_classifier.py --database-url sqlite:///./fixture.db --output /tmp/modelos
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import csv
+import json
+from typing import Dict
+from uuid import UUID
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.services.ml_registry import ENGINES
+from app.services.ml_training import train_behavioral_classifier
+
+
+def load_labels(path: Path) -> Dict[UUID, str]:
+    """Lê o CSV de rótulos (student_id, risk_level)."""
+    with open(path, newline="") as f:
+        return {UUID(row["student_id"]): row["risk_level"].strip() for row in csv.DictReader(f)}
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Treina o classificador de risco comportamental")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL, help="Banco de origem (padrão: DATABASE_URL)")
+    parser.add_argument("--output", type=Path, default=Path(settings.ML_MODEL_PATH), help="Raiz do registry")
+    parser.add_argument("--version", default="production", help="Versão gravada (diretório)")
+    parser.add_argument("--labels", type=Path, default=None, help="CSV com student_id,risk_level")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Estudantes por lote")
+    parser.add_argument("--max-samples", type=int, default=200_000, help="Máximo de amostras em memória")
+    parser.add_argument("--estimators", type=int, default=200, help="Árvores do RandomForest")
+    parser.add_argument("--max-depth", type=int, default=None, help="Profundidade máxima das árvores")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Processos de treino (-1 = todos os núcleos)")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fração separada para métricas")
+    parser.add_argument("--seed", type=int, default=42, help="Semente (amostragem, divisão e floresta)")
+    parser.add_argument("--engine", choices=ENGINES, default=None, help="Motor de inferência gravado no metadata")
+    parser.add_argument("--overwrite", action="store_true", help="Substitui a versão se já existir")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+
+    try:
+        result = train_behavioral_classifier(
+            db,
+            args.output,
+            version=args.version,
+            labels=load_labels(args.labels) if args.labels else None,
+            chunk_size=args.chunk_size,
+            max_samples=args.max_samples,
+            n_estimators=args.estimators,
+            max_depth=args.max_depth,
+            n_jobs=args.n_jobs,
+            holdout=args.holdout,
+            random_state=args.seed,
+            engine=args.engine,
+            overwrite=args.overwrite,
+        )
+        print(f"✅ Modelo gravado em {result.model_dir}")
+        print(f"   Estudantes: {result.n_students} | amostras: {result.n_samples}")
+        print(f"   Treino: {result.metadata['training_seconds']:.1f}s")
+        print(f"   Métricas: {json.dumps(result.metadata['metrics'], ensure_ascii=False)}")
+    except Exception as e:
+        print(f"❌ ERRO: {type(e).__name__}: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,9 @@ and configuration for all test modules.
 """
 
 import os
-from typing import Generator
+from datetime import date
+from typing import Generator, Tuple
+from uuid import UUID, uuid4
 
 import pytest
 from fastapi.testclient import TestClient
@@ -17,8 +19,10 @@ from sqlalchemy.pool import StaticPool
 from app.core.database import get_db
 from app.core.security import get_password_hash
 from app.db.base import Base  # Use the correct Base
+from app.models.activity import Activity
 from app.models.student import Student
-from app.models.user import User
+from app.models.user import User, UserRole
+from app.utils.constants import ActivityType, DifficultyLevel
 
 # Test database URL - use separate test database
 # Use 'postgres' hostname when running inside Docker, 'localhost' otherwise
@@ -60,11 +64,13 @@ def engine():
     from app.models.observation import ProfessionalObservation
     from app.models.professional import Professional
     from app.models.socioemotional_indicator import SocialEmotionalIndicator
+    from app.models.socioemotional_rollup import SocialEmotionalDailyRollup
     from app.models.student import Student
+    from app.models.student_progress_stats import StudentProgressStats
     from app.models.user import User
 
     # noqa on unused imports
-    _ = (User, Student, Activity, Assessment, Professional, ProfessionalObservation, InterventionPlan, SocialEmotionalIndicator)
+    _ = (User, Student, Activity, Assessment, Professional, ProfessionalObservation, InterventionPlan, SocialEmotionalIndicator, SocialEmotionalDailyRollup, StudentProgressStats)
 
     # Drop all tables and recreate for fresh test environment
     Base.metadata.drop_all(bind=engine)
@@ -77,6 +83,14 @@ def engine():
     engine.dispose()
 
 
+@pytest.fixture(autouse=True)
+def clear_nlp_response_cache():
+    """Start every test with an empty NLP response cache (shared singleton)."""
+    from app.services.nlp_cache import get_nlp_response_cache
+
+    get_nlp_response_cache().clear()
+
+
 @pytest.fixture(scope="function")
 def db_session(engine) -> Generator[Session, None, None]:
     """Create database session for test."""
@@ -91,13 +105,17 @@ def db_session(engine) -> Generator[Session, None, None]:
         from app.models.observation import ProfessionalObservation
         from app.models.professional import Professional
         from app.models.socioemotional_indicator import SocialEmotionalIndicator
+        from app.models.socioemotional_rollup import SocialEmotionalDailyRollup
         from app.models.student import Student
+        from app.models.student_progress_stats import StudentProgressStats
         from app.models.user import User
 
         # Delete in order to respect foreign key constraints
         session.query(Assessment).delete()
+        session.query(StudentProgressStats).delete()
         session.query(Activity).delete()
         session.query(SocialEmotionalIndicator).delete()
+        session.query(SocialEmotionalDailyRollup).delete()
         session.query(ProfessionalObservation).delete()
         # Delete intervention plan professionals association first
         session.execute(InterventionPlan.__table__.delete())
@@ -151,6 +169,46 @@ def test_user(db_session) -> User:
     return user
 
 
+@pytest.fixture
+def owners(db_session) -> Tuple[UUID, UUID, UUID]:
+    """Create teacher, student and activity directly in the database; returns their ids."""
+    teacher = User(
+        email=f"teacher.{uuid4().hex[:8]}@example.com",
+        hashed_password="$2b$12$hashedpassword",
+        full_name="Professor Teste",
+        role=UserRole.TEACHER,
+        is_active=True,
+    )
+    db_session.add(teacher)
+    db_session.commit()
+
+    student = Student(
+        name="Aluno Teste",
+        date_of_birth=date(2015, 1, 1),
+        age=10,
+        diagnosis="Autismo Nível 1",
+        teacher_id=teacher.id,
+        interests=["blocos"],
+    )
+    db_session.add(student)
+    db_session.commit()
+
+    activity = Activity(
+        student_id=student.id,
+        title="Atividade",
+        description="Descrição",
+        activity_type=ActivityType.COGNITIVE,
+        difficulty=DifficultyLevel.EASY,
+        duration_minutes=30,
+        objectives=["Objetivo"],
+        materials=["Material"],
+        instructions=["Instrução"],
+    )
+    db_session.add(activity)
+    db_session.commit()
+    return teacher.id, student.id, activity.id
+
+
 @pytest.fixture
 def auth_headers(client, test_user) -> dict:
     """Get authentication headers with valid token."""
@@ -98,3 +98,199 @@ class TestActivitiesAPI:
             data = response.json()
             assert data["activity_type"] == activity_type
             assert data["generated_by_ai"] is True
+
+
+class TestStreamingGeneration:
+    """Test POST /activities/generate/stream (Server-Sent Events)."""
+
+    ACTIVITY = {
+        "title": "Atividade com Dinossauros",
+        "description": "Contagem com dinossauros de brinquedo",
+        "objectives": ["Contar até 10"],
+        "materials": ["Dinossauros de brinquedo"],
+        "instructions": ["Conte os dinossauros"],
+        "duration_minutes": 30,
+        "adaptations": ["Apoio visual"],
+        "visual_supports": ["Cartões numerados"],
+        "success_criteria": ["Contar corretamente"],
+    }
+
+    @staticmethod
+    def streaming_service(content):
+        """NLPService whose client streams `content` in small chunks."""
+        from types import SimpleNamespace
+
+        from app.services.nlp_cache import NLPResponseCache
+        from app.services.nlp_service import NLPService
+
+        async def stream():
+            for i in range(0, len(content), 5):
+                delta = SimpleNamespace(content=content[i : i + 5])
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+
+        async def create(**kwargs):
+            return stream()
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        return NLPService(client=client, response_cache=NLPResponseCache(enabled=False, shared=False))
+
+    @staticmethod
+    def parse_events(body):
+        import json
+
+        events = []
+        for block in body.strip().split("\n\n"):
+            lines = dict(line.split(": ", 1) for line in block.splitlines())
+            events.append((lines["event"], json.loads(lines["data"])))
+        return events
+
+    def post(self, client, auth_headers, student_id):
+        return client.post(
+            "/api/v1/activities/generate/stream",
+            headers=auth_headers,
+            json={
+                "student_id": student_id,
+                "activity_type": "cognitive",
+                "difficulty": "easy",
+                "duration_minutes": 30,
+                "theme": "dinossauros",
+            },
+        )
+
+    def test_stream_fields_then_persisted_activity(self, client, auth_headers, test_student, db_session):
+        """Fields arrive as events; the final event is the saved activity."""
+        import json
+        from unittest.mock import patch
+        from uuid import UUID
+
+        from app.models.activity import Activity
+
+        service = self.streaming_service(json.dumps(self.ACTIVITY))
+        with patch("app.api.routes.activities.get_nlp_service", return_value=service):
+            response = self.post(client, auth_headers, test_student["id"])
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+
+        events = self.parse_events(response.text)
+        assert events[0] == ("field", {"field": "title", "value": self.ACTIVITY["title"]})
+        assert events[1] == ("field", {"field": "description", "value": self.ACTIVITY["description"]})
+        assert [name for name, _ in events] == ["field"] * len(self.ACTIVITY) + ["activity"]
+
+        activity = events[-1][1]
+        assert activity["title"] == self.ACTIVITY["title"]
+        assert activity["student_id"] == test_student["id"]
+        assert activity["generated_by_ai"] is True
+
+        saved = db_session.get(Activity, UUID(activity["id"]))
+        assert saved.objectives == self.ACTIVITY["objectives"]
+
+    def test_stream_invalid_activity_sends_error_event(self, client, auth_headers, test_student, db_session):
+        """An invalid completion ends the stream with an error event and saves nothing."""
+        import json
+        from unittest.mock import patch
+
+        from app.models.activity import Activity
+
+        service = self.streaming_service(json.dumps({"title": "Incompleta"}))
+        with patch("app.api.routes.activities.get_nlp_service", return_value=service):
+            response = self.post(client, auth_headers, test_student["id"])
+
+        events = self.parse_events(response.text)
+        assert events[0] == ("field", {"field": "title", "value": "Incompleta"})
+        assert events[-1][0] == "error"
+        assert db_session.query(Activity).count() == 0
+
+    def test_stream_nonexistent_student(self, client, auth_headers):
+        """Student checks happen before the stream starts."""
+        import uuid
+
+        response = self.post(client, auth_headers, str(uuid.uuid4()))
+        assert response.status_code == 404
+
+
+class TestActivityJobs:
+    """Test POST /activities/jobs and GET /activities/jobs/{job_id}."""
+
+    @staticmethod
+    def job_queue(engine, **kwargs):
+        """ActivityJobQueue with a stub NLP service, persisting to the test database."""
+        from types import SimpleNamespace
+
+        from sqlalchemy.orm import sessionmaker
+
+        from app.services.activity_jobs import ActivityJobQueue, InMemoryJobStore
+        from app.services.nlp_service import GeneratedActivity
+
+        async def generate_activity(**kwargs):
+            return GeneratedActivity(**TestStreamingGeneration.ACTIVITY)
+
+        nlp = SimpleNamespace(default_model="gpt-4o-mini", generate_activity=generate_activity)
+        return ActivityJobQueue(
+            store=InMemoryJobStore(),
+            session_factory=sessionmaker(autocommit=False, autoflush=False, bind=engine),
+            nlp_service=nlp,
+            **kwargs,
+        )
+
+    def post(self, client, auth_headers, student_id):
+        return client.post(
+            "/api/v1/activities/jobs",
+            headers=auth_headers,
+            json={
+                "student_id": student_id,
+                "activity_type": "cognitive",
+                "difficulty": "easy",
+                "duration_minutes": 30,
+                "theme": "dinossauros",
+            },
+        )
+
+    def test_job_accepted_then_succeeds(self, client, auth_headers, test_student, engine, db_session):
+        """The POST returns 202 at once; polling returns the persisted activity id."""
+        import time
+        from unittest.mock import patch
+        from uuid import UUID
+
+        from app.models.activity import Activity
+
+        queue = self.job_queue(engine)
+        with patch("app.api.routes.activities.get_activity_job_queue", return_value=queue):
+            response = self.post(client, auth_headers, test_student["id"])
+            assert response.status_code == 202
+            job_id = response.json()["job_id"]
+            assert response.json()["status"] == "queued"
+
+            for _ in range(100):
+                job = client.get(f"/api/v1/activities/jobs/{job_id}", headers=auth_headers).json()
+                if job["status"] in ("succeeded", "failed"):
+                    break
+                time.sleep(0.02)
+
+        assert job["status"] == "succeeded"
+        assert job["student_id"] == test_student["id"]
+        saved = db_session.get(Activity, UUID(job["activity_id"]))
+        assert saved.title == TestStreamingGeneration.ACTIVITY["title"]
+
+    def test_unknown_job_not_found(self, client, auth_headers, engine):
+        from unittest.mock import patch
+
+        with patch("app.api.routes.activities.get_activity_job_queue", return_value=self.job_queue(engine)):
+            response = client.get("/api/v1/activities/jobs/unknown", headers=auth_headers)
+        assert response.status_code == 404
+
+    def test_queue_full_returns_503_with_retry_after(self, client, auth_headers, test_student, engine):
+        from unittest.mock import patch
+
+        queue = self.job_queue(engine, max_pending=0)
+        with patch("app.api.routes.activities.get_activity_job_queue", return_value=queue):
+            response = self.post(client, auth_headers, test_student["id"])
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+
+    def test_job_nonexistent_student(self, client, auth_headers):
+        import uuid
+
+        response = self.post(client, auth_headers, str(uuid.uuid4()))
+        assert response.status_code == 404
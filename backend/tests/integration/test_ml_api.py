@@ -0,0 +1,90 @@
+"""
+Integration tests for ML prediction API.
+"""
+
+import pytest
+
+from app.api.routes import ml as ml_routes
+from app.services.ml_executor import MLExecutor
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    """Inline ML executor (no child processes) used by the routes."""
+    executor = MLExecutor(max_workers=0, max_pending=4)
+    monkeypatch.setattr(ml_routes, "get_ml_executor", lambda: executor)
+    yield executor
+    executor.shutdown()
+
+
+class TestMLAPI:
+    """Test class for ML prediction endpoints."""
+
+    def test_predict_risk(self, client, auth_headers, test_student, executor):
+        """Risk prediction is scored through the executor."""
+        response = client.get(f"/api/v1/ml/students/{test_student['id']}/risk", headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["risk_level"] in ("baixo", "medio", "alto", "muito_alto")
+        assert executor.get_stats()["operations"]["predict_risk"]["completed"] == 1
+
+    def test_predict_activity_success(self, client, auth_headers, test_student, executor):
+        """Activity success prediction validates the activity and returns recommendations."""
+        response = client.post(
+            f"/api/v1/ml/students/{test_student['id']}/activity-success",
+            headers=auth_headers,
+            json={"difficulty": 8, "duration_minutes": 45, "activity_type": "social"},
+        )
+
+        assert response.status_code == 200
+        assert 0.0 <= response.json()["success_probability"] <= 1.0
+
+        invalid = client.post(
+            f"/api/v1/ml/students/{test_student['id']}/activity-success",
+            headers=auth_headers,
+            json={"difficulty": 11},
+        )
+        assert invalid.status_code == 422
+
+    def test_queue_full_returns_503(self, client, auth_headers, test_student, executor):
+        """A full ML queue answers 503 with Retry-After."""
+        executor.max_pending = 0
+
+        response = client.get(f"/api/v1/ml/students/{test_student['id']}/risk", headers=auth_headers)
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    def test_unknown_student_returns_404(self, client, auth_headers, executor):
+        """Unknown student answers 404 before anything is queued."""
+        response = client.get("/api/v1/ml/students/00000000-0000-0000-0000-000000000000/risk", headers=auth_headers)
+
+        assert response.status_code == 404
+        assert executor.get_stats()["operations"] == {}
+
+    def test_progress(self, client, auth_headers, test_student, test_activity):
+        """Progress analysis reads the incremental statistics."""
+        client.post(
+            "/api/v1/assessments/",
+            headers=auth_headers,
+            json={
+                "activity_id": test_activity["id"],
+                "student_id": test_student["id"],
+                "completion_status": "completed",
+                "engagement_level": "high",
+                "difficulty_rating": "appropriate",
+            },
+        )
+
+        response = client.get(f"/api/v1/ml/students/{test_student['id']}/progress", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["total_assessments"] == 1
+
+    def test_health_reports_executor(self, client):
+        """Detailed health check includes ML queue depth."""
+        response = client.get("/api/v1/health/detailed")
+
+        assert response.status_code == 200
+        assert "pending" in response.json()["components"]["ml_executor"]
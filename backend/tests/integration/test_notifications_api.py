@@ -285,6 +285,16 @@ class TestNotificationsAPIValidation:
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+    def test_list_notifications_invalid_cursor(self, client, auth_headers):
+        """Testa cursor malformado no modo cursor."""
+        response = client.get(
+            "/api/v1/notifications/?pagination=cursor&cursor=zzz",
+            headers=auth_headers
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert "Cursor" in response.json()["detail"]
+
     def test_mark_as_read_invalid_uuid(self, client, auth_headers):
         """Testa UUID inválido."""
         response = client.patch(
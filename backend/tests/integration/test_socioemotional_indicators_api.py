@@ -149,6 +149,42 @@ class TestIndicatorBulkCreate:
         assert data["failed_count"] == 0
         assert len(data["created_ids"]) == 3
 
+    def test_bulk_create_all_or_nothing_rejects_invalid_item(
+        self, client, indicator_headers, test_student, psychologist
+    ):
+        """Test that all_or_nothing mode creates nothing when one item is invalid."""
+        bulk_data = {
+            "student_id": test_student["id"],
+            "measured_at": datetime.now().isoformat(),
+            "all_or_nothing": True,
+            "indicators": [
+                {
+                    "indicator_type": IndicatorType.EMOTIONAL_REGULATION.value,
+                    "context": MeasurementContext.CLASSROOM.value,
+                    "score": 6,
+                },
+                {
+                    "indicator_type": IndicatorType.SOCIAL_INTERACTION.value,
+                    "context": MeasurementContext.CLASSROOM.value,
+                    "score": 11,
+                },
+            ],
+        }
+
+        response = client.post(
+            "/api/v1/socioemotional-indicators/bulk",
+            json=bulk_data,
+            headers=indicator_headers,
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        list_response = client.get(
+            f"/api/v1/socioemotional-indicators/?student_id={test_student['id']}",
+            headers=indicator_headers,
+        )
+        assert list_response.json()["total"] == 0
+
 
 class TestIndicatorGet:
     """Tests for GET /api/v1/socioemotional-indicators/{indicator_id}"""
@@ -0,0 +1,233 @@
+"""
+Unit tests for queued activity generation.
+
+Tests the job stores and ActivityJobQueue against a stub NLP service, with
+activities persisted through a session factory bound to the test database.
+"""
+
+import asyncio
+import json
+from uuid import UUID
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.exceptions import OpenAIError, ServiceOverloadedError
+from app.models.activity import Activity
+from app.models.student import Student
+from app.schemas.activity import ActivityGenerate
+from app.services.activity_jobs import ActivityJobQueue, GenerationJob, InMemoryJobStore, JobStatus, RedisJobStore
+from app.services.nlp_service import GeneratedActivity
+from app.utils.constants import ActivityType, DifficultyLevel
+
+ACTIVITY = GeneratedActivity(
+    title="Atividade de Contagem",
+    description="Contagem com blocos",
+    objectives=["Contar até 10"],
+    materials=["Blocos"],
+    instructions=["Conte os blocos"],
+    duration_minutes=30,
+    adaptations=["Apoio visual"],
+    visual_supports=["Cartões"],
+    success_criteria=["Contar corretamente"],
+)
+
+
+class StubNLPService:
+    """NLPService stand-in: returns ACTIVITY (or raises) after an optional gate."""
+
+    default_model = "gpt-4o-mini"
+
+    def __init__(self, error=None, gate=None):
+        self.error = error
+        self.gate = gate
+        self.calls = []
+
+    async def generate_activity(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return ACTIVITY
+
+
+class FlakyJobStore(InMemoryJobStore):
+    """InMemoryJobStore whose first save() of a running job raises (e.g. Redis briefly unavailable)."""
+
+    def __init__(self):
+        super().__init__()
+        self.failures = 1
+
+    async def save(self, job):
+        if self.failures and job.status == JobStatus.RUNNING:
+            self.failures -= 1
+            raise ConnectionError("store unavailable")
+        await super().save(job)
+
+
+class FakeRedis:
+    """Minimal redis.asyncio stand-in (get/set with expiry)."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = (value, ex)
+
+    async def get(self, key):
+        entry = self.data.get(key)
+        return entry[0] if entry else None
+
+
+def make_queue(engine, nlp_service, store=None, **kwargs):
+    return ActivityJobQueue(
+        store=store or InMemoryJobStore(),
+        session_factory=sessionmaker(autocommit=False, autoflush=False, bind=engine),
+        nlp_service=nlp_service,
+        **kwargs,
+    )
+
+
+def activity_request(student_id):
+    return ActivityGenerate(
+        student_id=student_id,
+        activity_type=ActivityType.COGNITIVE,
+        difficulty=DifficultyLevel.EASY,
+        duration_minutes=30,
+        theme="blocos",
+    )
+
+
+async def wait_done(queue, job_id):
+    for _ in range(200):
+        job = await queue.get(job_id)
+        if job.done:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+class TestJobStores:
+    """Test job state persistence."""
+
+    def test_job_round_trip(self):
+        job = GenerationJob(id="abc", teacher_id="t", student_id="s", params={"theme": "x"}, student_profile={})
+        data = job.to_dict()
+
+        assert data["status"] == "queued"
+        assert GenerationJob.from_dict(json.loads(json.dumps(data))) == job
+
+    async def test_in_memory_store_returns_copies(self):
+        store = InMemoryJobStore()
+        job = GenerationJob(id="abc", teacher_id="t", student_id="s", params={}, student_profile={})
+        await store.save(job)
+
+        job.status = JobStatus.RUNNING
+        assert (await store.get("abc")).status == JobStatus.QUEUED
+        assert await store.get("missing") is None
+
+    async def test_redis_store_sets_ttl(self):
+        redis = FakeRedis()
+        store = RedisJobStore(redis, ttl=60)
+        job = GenerationJob(id="abc", teacher_id="t", student_id="s", params={}, student_profile={})
+        await store.save(job)
+
+        assert redis.data["eduautismo:activity_job:abc"][1] == 60
+        assert await store.get("abc") == job
+
+
+class TestActivityJobQueue:
+    """Test ActivityJobQueue."""
+
+    async def test_job_succeeds_and_persists_activity(self, engine, db_session, owners):
+        teacher_id, student_id, _ = owners
+        nlp = StubNLPService(gate=asyncio.Event())
+        queue = make_queue(engine, nlp)
+
+        job = await queue.submit(
+            activity_request(student_id), db_session.get(Student, student_id).to_profile_dict(), teacher_id
+        )
+        assert job.status == JobStatus.QUEUED
+
+        await asyncio.sleep(0.01)
+        assert (await queue.get(job.id)).status == JobStatus.RUNNING
+
+        nlp.gate.set()
+        job = await wait_done(queue, job.id)
+        await queue.shutdown()
+
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.started_at <= job.finished_at
+        assert nlp.calls[0]["activity_type"] == ActivityType.COGNITIVE
+
+        activity = db_session.get(Activity, UUID(job.activity_id))
+        assert activity.title == ACTIVITY.title
+        assert activity.created_by_id == teacher_id
+        assert activity.generation_metadata["job_id"] == job.id
+
+    async def test_generation_error_marks_job_failed(self, engine, db_session, owners):
+        teacher_id, student_id, _ = owners
+        queue = make_queue(engine, StubNLPService(error=OpenAIError("Limite de requisições excedido")))
+
+        job = await queue.submit(
+            activity_request(student_id), db_session.get(Student, student_id).to_profile_dict(), teacher_id
+        )
+        job = await wait_done(queue, job.id)
+        await queue.shutdown()
+
+        assert job.status == JobStatus.FAILED
+        assert job.error == "Erro no serviço OpenAI: Limite de requisições excedido"
+        assert db_session.query(Activity).count() == 1  # only the owners fixture activity
+        assert queue.get_stats()["failed"] == 1
+
+    async def test_rejects_when_too_many_pending(self, engine, owners):
+        teacher_id, student_id, _ = owners
+        nlp = StubNLPService(gate=asyncio.Event())
+        queue = make_queue(engine, nlp, workers=1, max_pending=2)
+        request = activity_request(student_id)
+
+        for _ in range(2):
+            await queue.submit(request, {}, teacher_id)
+        with pytest.raises(ServiceOverloadedError) as exc_info:
+            await queue.submit(request, {}, teacher_id)
+
+        assert exc_info.value.details["retry_after"] == 5
+        assert queue.get_stats()["rejected"] == 1
+
+        nlp.gate.set()
+        await asyncio.wait_for(queue._queue.join(), timeout=2)
+        await queue.shutdown()
+        assert queue.get_stats()["succeeded"] == 2
+
+    async def test_worker_survives_store_errors(self, engine, owners):
+        """A job store failure is logged and the worker keeps serving the queue."""
+        teacher_id, student_id, _ = owners
+        store = FlakyJobStore()
+        queue = make_queue(engine, StubNLPService(), store=store, workers=1)
+        request = activity_request(student_id)
+
+        await queue.submit(request, {}, teacher_id)
+        await asyncio.wait_for(queue._queue.join(), timeout=2)
+        job = await queue.submit(request, {}, teacher_id)
+        job = await wait_done(queue, job.id)
+        await queue.shutdown()
+
+        assert job.status == JobStatus.SUCCEEDED
+        assert store.failures == 0
+        assert queue.get_stats()["pending"] == 0
+
+    async def test_finished_workers_are_replaced(self, engine, owners):
+        teacher_id, student_id, _ = owners
+        queue = make_queue(engine, StubNLPService(), workers=2)
+        job = await queue.submit(activity_request(student_id), {}, teacher_id)
+        await wait_done(queue, job.id)
+
+        queue._tasks[0].cancel()
+        await asyncio.sleep(0)
+        job = await queue.submit(activity_request(student_id), {}, teacher_id)
+        await wait_done(queue, job.id)
+
+        assert len(queue._tasks) == 2
+        assert all(not task.done() for task in queue._tasks)
+        await queue.shutdown()
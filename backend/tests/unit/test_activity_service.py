@@ -14,6 +14,7 @@ from app.models.activity import Activity
 from app.models.student import Student
 from app.schemas.activity import ActivityCreate, ActivityGenerate, ActivityUpdate
 from app.services.activity_service import ActivityService
+from app.services.nlp_service import BatchGenerationResult
 from app.utils.constants import ActivityType, DifficultyLevel
 
 
@@ -191,6 +192,66 @@ class TestActivityServiceGenerateActivity:
             # Verify rollback was called
             db_session.rollback.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_generate_activities_batch_persists_successes(
+        self, activity_data, teacher_id, mock_student, mock_generated_activity
+    ):
+        """Test batch generation: successes are saved, failures returned per item."""
+        # Arrange
+        db_session = AsyncMock()
+
+        mock_result = Mock()
+        mock_result.scalars.return_value.all.return_value = [mock_student]
+        db_session.execute.return_value = mock_result
+
+        async def generate_activities(requests):
+            assert len(requests) == 2
+            yield BatchGenerationResult(index=1, error=OpenAIError("AI service unavailable"))
+            yield BatchGenerationResult(index=0, result=mock_generated_activity)
+
+        with patch("app.services.activity_service.get_nlp_service") as mock_get_nlp:
+            mock_nlp_service = Mock()
+            mock_nlp_service.generate_activities = generate_activities
+            mock_nlp_service.default_model = "gpt-4"
+            mock_get_nlp.return_value = mock_nlp_service
+
+            # Act
+            outcomes = [
+                outcome
+                async for outcome in ActivityService.generate_activities_batch(
+                    db=db_session, items=[activity_data, activity_data], teacher_id=teacher_id
+                )
+            ]
+
+        # Assert
+        assert [outcome.index for outcome in outcomes] == [1, 0]
+        assert isinstance(outcomes[0].error, OpenAIError)
+        assert outcomes[1].result.title == "Atividade de Adição"
+        assert outcomes[1].result.created_by_id == teacher_id
+        db_session.execute.assert_called_once()
+        db_session.add.assert_called_once()
+        db_session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_generate_activities_batch_checks_permission_first(self, activity_data, mock_student):
+        """Test that batch generation checks every student before calling the AI."""
+        # Arrange
+        db_session = AsyncMock()
+
+        mock_result = Mock()
+        mock_result.scalars.return_value.all.return_value = [mock_student]
+        db_session.execute.return_value = mock_result
+
+        with patch("app.services.activity_service.get_nlp_service") as mock_get_nlp:
+            # Act & Assert
+            with pytest.raises(PermissionDeniedError):
+                async for _ in ActivityService.generate_activities_batch(
+                    db=db_session, items=[activity_data], teacher_id=uuid4()
+                ):
+                    pass
+
+            mock_get_nlp.assert_not_called()
+
 
 class TestActivityServiceCreateActivity:
     """Tests for ActivityService.create_activity method."""
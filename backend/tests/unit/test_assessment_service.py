@@ -24,6 +24,13 @@ from app.services.assessment_service import AssessmentService
 from app.utils.constants import CompletionStatus, DifficultyRating, EngagementLevel
 
 
+@pytest.fixture(autouse=True)
+def progress_stats():
+    """Progress statistics maintenance (runs queries of its own on the real session)."""
+    with patch("app.services.assessment_service.ProgressStatsService") as service:
+        yield service
+
+
 class TestAssessmentServiceCreate:
     """Tests for AssessmentService.create_assessment method."""
 
@@ -8,10 +8,13 @@ Autor: Claude Code
 Data: 2025-11-24
 """
 
+import asyncio
+import json
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from app.core.cache import CacheManager, cached
+from app.core.cache import CacheManager, LocalCache, cached, cached_batch
 
 
 @pytest.fixture
@@ -339,9 +342,8 @@ class TestCacheManagerEdgeCases:
         serialized = cache_manager._serialize(data)
         deserialized = cache_manager._deserialize(serialized)
 
-        # Datetime deve ser convertido para string
-        assert isinstance(deserialized["timestamp"], str)
-        assert "2025-11-24" in deserialized["timestamp"]
+        # Datetime deve ser preservado pelo codec msgpack
+        assert deserialized["timestamp"] == data["timestamp"]
 
     @pytest.mark.asyncio
     async def test_empty_pattern_delete(self, cache_manager, mock_redis):
@@ -358,3 +360,397 @@ class TestCacheManagerEdgeCases:
 
         assert result == 0
         mock_redis.delete.assert_not_called()
+
+
+class TestCacheTags:
+    """Testes de invalidação por tags."""
+
+    @pytest.fixture
+    def pipeline(self, mock_redis):
+        """Pipeline Redis (comandos síncronos, execute assíncrono)."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[2])
+        mock_redis.pipeline = MagicMock(return_value=pipe)
+        return pipe
+
+    @pytest.mark.asyncio
+    async def test_set_with_tags_registers_key_in_tag_sets(self, cache_manager, mock_redis, pipeline):
+        """Testa que set com tags adiciona a chave ao conjunto de cada tag."""
+        cache_manager.redis = mock_redis
+
+        result = await cache_manager.set("key", {"a": 1}, ttl=600, tags=["plan:1", "student:2"])
+
+        assert result is True
+        pipeline.setex.assert_called_once_with("eduautismo:key", 600, cache_manager._serialize({"a": 1}))
+        pipeline.sadd.assert_any_call("eduautismo:tag:plan:1", "eduautismo:key")
+        pipeline.sadd.assert_any_call("eduautismo:tag:student:2", "eduautismo:key")
+        pipeline.expire.assert_any_call("eduautismo:tag:plan:1", 600, gt=True)
+        mock_redis.setex.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_deletes_only_tagged_keys(self, cache_manager, mock_redis, pipeline):
+        """Testa que invalidate_tags remove as chaves das tags sem SCAN."""
+        cache_manager.redis = mock_redis
+        mock_redis.sunion = AsyncMock(return_value={"eduautismo:a", "eduautismo:b"})
+
+        result = await cache_manager.invalidate_tags(["plan:1", "student:2"])
+
+        assert result == 2
+        mock_redis.sunion.assert_called_once_with("eduautismo:tag:plan:1", "eduautismo:tag:student:2")
+        pipeline.delete.assert_called_once()
+        assert pipeline.srem.call_count == 2
+        mock_redis.scan_iter.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_without_members(self, cache_manager, mock_redis, pipeline):
+        """Testa invalidate_tags quando nenhuma chave está marcada."""
+        cache_manager.redis = mock_redis
+        mock_redis.sunion = AsyncMock(return_value=set())
+
+        result = await cache_manager.invalidate_tags(["plan:1"])
+
+        assert result == 0
+        pipeline.execute.assert_not_called()
+
+    def test_invalidate_tags_nowait_when_disabled(self, cache_manager):
+        """Testa que invalidate_tags_nowait não faz nada sem loop conectado."""
+        cache_manager.enabled = False
+
+        cache_manager.invalidate_tags_nowait(["plan:1"])
+
+    @pytest.mark.asyncio
+    async def test_flush_invalidations_awaits_tasks_scheduled_on_loop(self, cache_manager):
+        """Testa que invalidações agendadas no próprio loop podem ser aguardadas."""
+        cache_manager._loop = asyncio.get_running_loop()
+        done = []
+
+        async def invalidate(tags, prefix):
+            await asyncio.sleep(0.01)
+            done.append(tags)
+
+        with patch.object(cache_manager, "invalidate_tags", side_effect=invalidate):
+            cache_manager.invalidate_tags_nowait(["plan:1"])
+            assert done == []
+
+            await cache_manager.flush_invalidations()
+
+        assert done == [["plan:1"]]
+        assert not cache_manager._pending_invalidations
+
+
+class TestLocalCache:
+    """Testes do cache L1 em processo."""
+
+    def test_lru_eviction(self):
+        """Testa que a entrada menos usada é removida quando cheio."""
+        local = LocalCache(max_size=2, ttl=60)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")  # "a" passa a ser a mais recente
+        local.set("c", 3)
+
+        assert local.get("a") == 1
+        assert local.get("b") is None
+        assert local.get("c") == 3
+
+    def test_entry_ttl(self):
+        """Testa expiração por entrada (limitada pelo TTL do L1)."""
+        local = LocalCache(max_size=10, ttl=60)
+
+        with patch("app.core.cache.time.monotonic", return_value=1000.0):
+            local.set("short", "x", ttl=5)
+            local.set("long", "y", ttl=3600)
+
+        with patch("app.core.cache.time.monotonic", return_value=1010.0):
+            assert local.get("short") is None
+            assert local.get("long") == "y"
+
+        with patch("app.core.cache.time.monotonic", return_value=1061.0):
+            assert local.get("long") is None
+
+    def test_delete_pattern(self):
+        """Testa remoção por padrão glob."""
+        local = LocalCache()
+        local.set("p:pending_review:1", 1)
+        local.set("p:pending_review:2", 2)
+        local.set("p:plan:1", 3)
+
+        assert local.delete_pattern("p:pending_review:*") == 2
+        assert len(local) == 1
+
+
+class TestTwoTierCache:
+    """Testes do CacheManager com L1 na frente do Redis."""
+
+    @pytest.fixture
+    def two_tier(self, cache_manager, mock_redis):
+        cache_manager.redis = mock_redis
+        cache_manager.local = LocalCache(max_size=10, ttl=60)
+        return cache_manager
+
+    @pytest.mark.asyncio
+    async def test_second_get_is_served_from_l1(self, two_tier, mock_redis):
+        """Testa que um hit no Redis popula o L1."""
+        mock_redis.get.return_value = '{"a": 1}'
+
+        first = await two_tier.get("key")
+        second = await two_tier.get("key")
+
+        assert first == second == {"a": 1}
+        mock_redis.get.assert_called_once()
+        assert two_tier.get_stats()["l1_hits"] == 1
+        assert two_tier.get_stats()["l2_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_set_populates_l1_and_publishes_invalidation(self, two_tier, mock_redis):
+        """Testa que set grava no L1 e avisa os demais workers."""
+        await two_tier.set("key", {"a": 1}, ttl=300)
+
+        assert two_tier.local.get("eduautismo:key") == {"a": 1}
+        channel, message = mock_redis.publish.call_args[0]
+        assert channel == CacheManager.INVALIDATION_CHANNEL
+        assert json.loads(message)["keys"] == ["eduautismo:key"]
+
+    @pytest.mark.asyncio
+    async def test_delete_evicts_l1(self, two_tier):
+        """Testa que delete remove do L1."""
+        two_tier.local.set("eduautismo:key", 1)
+
+        await two_tier.delete("key")
+
+        assert two_tier.local.get("eduautismo:key") is None
+
+    def test_remote_invalidation_message(self, two_tier):
+        """Testa que mensagens de outros workers removem chaves do L1."""
+        two_tier.local.set("eduautismo:a", 1)
+        two_tier.local.set("eduautismo:p:1", 2)
+
+        two_tier._apply_invalidation(json.dumps({"origin": "other", "keys": ["eduautismo:a"]}))
+        two_tier._apply_invalidation(json.dumps({"origin": "other", "pattern": "eduautismo:p:*"}))
+
+        assert len(two_tier.local) == 0
+
+    def test_own_invalidation_message_is_ignored(self, two_tier):
+        """Testa que o worker ignora as próprias mensagens."""
+        two_tier.local.set("eduautismo:a", 1)
+
+        two_tier._apply_invalidation(json.dumps({"origin": two_tier.instance_id, "keys": ["eduautismo:a"]}))
+
+        assert two_tier.local.get("eduautismo:a") == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_decorator_exposes_tier_stats(self, two_tier, mock_redis):
+        """Testa contadores de hit/miss por nível no decorator."""
+        mock_redis.get.return_value = None
+
+        @cached(ttl=300, key_prefix="test")
+        async def expensive_function(x):
+            return x * 2
+
+        with patch("app.core.cache.cache_manager", two_tier):
+            await expensive_function(1)  # miss, grava L1 + Redis
+            await expensive_function(1)  # hit no L1
+
+        assert expensive_function.cache_stats["l1_hits"] == 1
+        assert expensive_function.cache_stats["l2_hits"] == 0
+        assert expensive_function.cache_stats["misses"] == 1
+
+
+class TestCachedSingleFlight:
+    """Testes de coalescência de requisições e stale-while-revalidate."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_run_function_once(self, cache_manager, mock_redis):
+        """Testa que chamadas concorrentes pela mesma chave executam a função uma vez."""
+        import asyncio
+
+        cache_manager.redis = mock_redis
+        cache_manager.local = None
+        mock_redis.get.return_value = None
+        mock_redis.set.return_value = True
+        call_count = 0
+
+        @cached(ttl=300, key_prefix="test")
+        async def slow_query(x):
+            nonlocal call_count
+            call_count += 1
+            await asyncio.sleep(0.01)
+            return x * 2
+
+        with patch("app.core.cache.cache_manager", cache_manager):
+            results = await asyncio.gather(*(slow_query(21) for _ in range(10)))
+
+        assert results == [42] * 10
+        assert call_count == 1
+        assert slow_query.cache_stats["coalesced"] == 9
+        mock_redis.setex.assert_called_once()
+        mock_redis.eval.assert_called_once()  # lock liberado
+
+    @pytest.mark.asyncio
+    async def test_failure_propagates_to_all_waiters(self, cache_manager, mock_redis):
+        """Testa que exceção do líder é repassada aos que aguardam."""
+        import asyncio
+
+        cache_manager.redis = mock_redis
+        cache_manager.local = None
+        mock_redis.get.return_value = None
+        mock_redis.set.return_value = True
+
+        @cached(ttl=300, key_prefix="test")
+        async def failing_query():
+            await asyncio.sleep(0.01)
+            raise ValueError("db down")
+
+        with patch("app.core.cache.cache_manager", cache_manager):
+            results = await asyncio.gather(failing_query(), failing_query(), return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_when_lock_is_taken(self, cache_manager, mock_redis):
+        """Testa que valor expirado é servido enquanto outro worker recalcula."""
+        cache_manager.redis = mock_redis
+        cache_manager.local = None
+        mock_redis.get.return_value = json.dumps({"value": "old", "fresh_until": 0})
+        mock_redis.set.return_value = None  # lock pertence a outro worker
+        call_count = 0
+
+        @cached(ttl=300, key_prefix="test", stale_ttl=60)
+        async def query():
+            nonlocal call_count
+            call_count += 1
+            return "new"
+
+        with patch("app.core.cache.cache_manager", cache_manager):
+            result = await query()
+
+        assert result == "old"
+        assert call_count == 0
+        assert query.cache_stats["stale_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_value_refreshed_by_lock_holder(self, cache_manager, mock_redis):
+        """Testa que quem obtém o lock recalcula e grava com a janela de stale."""
+        cache_manager.redis = mock_redis
+        cache_manager.local = None
+        mock_redis.get.return_value = json.dumps({"value": "old", "fresh_until": 0})
+        mock_redis.set.return_value = True
+
+        @cached(ttl=300, key_prefix="test", stale_ttl=60)
+        async def query():
+            return "new"
+
+        with patch("app.core.cache.cache_manager", cache_manager):
+            result = await query()
+
+        assert result == "new"
+        key, ttl, payload = mock_redis.setex.call_args[0]
+        assert ttl == 360
+        assert cache_manager._deserialize(payload)["value"] == "new"
+
+
+class TestBatchOperations:
+    """Testes de get_many / set_many / delete_many e @cached_batch."""
+
+    @pytest.fixture
+    def pipeline(self, mock_redis):
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[])
+        mock_redis.pipeline = MagicMock(return_value=pipe)
+        return pipe
+
+    @pytest.mark.asyncio
+    async def test_get_many_uses_single_mget(self, cache_manager, mock_redis):
+        """Testa que get_many busca todas as chaves com um MGET."""
+        cache_manager.redis = mock_redis
+        cache_manager.local = None
+        mock_redis.mget = AsyncMock(return_value=[cache_manager._serialize(1), None, cache_manager._serialize(3)])
+
+        result = await cache_manager.get_many(["a", "b", "c"])
+
+        assert result == {"a": 1, "c": 3}
+        mock_redis.mget.assert_called_once_with(["eduautismo:a", "eduautismo:b", "eduautismo:c"])
+        mock_redis.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_many_skips_l1_hits(self, cache_manager, mock_redis):
+        """Testa que chaves presentes no L1 não vão ao Redis."""
+        cache_manager.redis = mock_redis
+        cache_manager.local = LocalCache()
+        cache_manager.local.set("eduautismo:a", 1)
+        mock_redis.mget = AsyncMock(return_value=[None])
+
+        result = await cache_manager.get_many(["a", "b"])
+
+        assert result == {"a": 1}
+        mock_redis.mget.assert_called_once_with(["eduautismo:b"])
+
+    @pytest.mark.asyncio
+    async def test_set_many_pipeline_with_per_key_ttl(self, cache_manager, mock_redis, pipeline):
+        """Testa que set_many grava em um pipeline com TTL por chave."""
+        cache_manager.redis = mock_redis
+        cache_manager.local = None
+
+        result = await cache_manager.set_many({"a": 1, "b": 2}, ttl=300, ttls={"b": 60})
+
+        assert result is True
+        pipeline.setex.assert_any_call("eduautismo:a", 300, cache_manager._serialize(1))
+        pipeline.setex.assert_any_call("eduautismo:b", 60, cache_manager._serialize(2))
+        pipeline.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_delete_many(self, cache_manager, mock_redis):
+        """Testa remoção de várias chaves com um DEL."""
+        cache_manager.redis = mock_redis
+        cache_manager.local = None
+        mock_redis.delete.return_value = 2
+
+        result = await cache_manager.delete_many(["a", "b"])
+
+        assert result == 2
+        mock_redis.delete.assert_called_once_with("eduautismo:a", "eduautismo:b")
+
+    @pytest.mark.asyncio
+    async def test_cached_batch_computes_only_misses(self, cache_manager, mock_redis, pipeline):
+        """Testa que @cached_batch calcula apenas os ids ausentes do cache."""
+        cache_manager.redis = mock_redis
+        cache_manager.local = None
+        mock_redis.mget = AsyncMock(return_value=[cache_manager._serialize("cached-1"), None, None])
+        received = []
+
+        @cached_batch(ttl=300, key_prefix="test", ids_param="student_ids")
+        async def get_profiles(db, student_ids):
+            received.append(list(student_ids))
+            return {student_id: f"computed-{student_id}" for student_id in student_ids}
+
+        with patch("app.core.cache.cache_manager", cache_manager):
+            result = await get_profiles("db", [1, 2, 3])
+
+        assert result == {1: "cached-1", 2: "computed-2", 3: "computed-3"}
+        assert received == [[2, 3]]
+        assert get_profiles.cache_stats == {"hits": 1, "misses": 2}
+        mock_redis.mget.assert_called_once_with(
+            ["test:get_profiles:1", "test:get_profiles:2", "test:get_profiles:3"]
+        )
+        assert pipeline.setex.call_count == 2
+        pipeline.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_cached_batch_all_hits_skips_function(self, cache_manager, mock_redis):
+        """Testa que a função não é chamada quando todos os ids estão no cache."""
+        cache_manager.redis = mock_redis
+        cache_manager.local = None
+        mock_redis.mget = AsyncMock(return_value=[cache_manager._serialize("a"), cache_manager._serialize("b")])
+        call_count = 0
+
+        @cached_batch(ttl=300, key_prefix="test", key_builder=lambda plan_id: f"row:{plan_id}")
+        async def get_rows(ids):
+            nonlocal call_count
+            call_count += 1
+            return {}
+
+        with patch("app.core.cache.cache_manager", cache_manager):
+            result = await get_rows(["x", "y"])
+
+        assert result == {"x": "a", "y": "b"}
+        assert call_count == 0
@@ -0,0 +1,110 @@
+"""
+Testes Unitários - Codecs do Cache
+==================================
+
+Testa round-trip de tipos, compressão, cabeçalho de formato e leitura de
+entradas JSON legadas.
+"""
+
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.core.cache_codec import (
+    HEADER_JSON,
+    HEADER_MSGPACK,
+    HEADER_MSGPACK_LZ4,
+    HEADER_MSGPACK_ZLIB,
+    LZ4_AVAILABLE,
+    MSGPACK_AVAILABLE,
+    CacheCodec,
+)
+from app.models.intervention_plan import ReviewFrequency
+
+requires_msgpack = pytest.mark.skipif(not MSGPACK_AVAILABLE, reason="msgpack não instalado")
+
+
+@requires_msgpack
+class TestMsgpackCodec:
+    """Testes do codec msgpack."""
+
+    def test_roundtrip_preserves_types(self):
+        """UUID, date, datetime (com e sem timezone) e Decimal são preservados."""
+        codec = CacheCodec(format="msgpack", compression="none")
+        value = {
+            "id": uuid4(),
+            "day": date(2025, 1, 2),
+            "naive": datetime(2025, 1, 2, 3, 4, 5, 678),
+            "aware": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            "amount": Decimal("10.50"),
+            "items": [1, "a", None, True, 1.5],
+        }
+
+        data = codec.encode(value)
+
+        assert data[0] == HEADER_MSGPACK
+        assert codec.decode(data) == value
+
+    def test_enum_encoded_as_value(self):
+        """Enums são gravados pelo valor."""
+        codec = CacheCodec(format="msgpack", compression="none")
+
+        assert codec.decode(codec.encode({"freq": ReviewFrequency.WEEKLY})) == {"freq": "weekly"}
+
+    def test_compression_above_threshold(self):
+        """Payloads acima do limiar são comprimidos com zlib."""
+        codec = CacheCodec(format="msgpack", compression="zlib", compress_threshold=100)
+        small = {"a": 1}
+        large = {"items": ["texto repetido"] * 100}
+
+        assert codec.encode(small)[0] == HEADER_MSGPACK
+        encoded = codec.encode(large)
+        assert encoded[0] == HEADER_MSGPACK_ZLIB
+        assert codec.decode(encoded) == large
+
+    @pytest.mark.skipif(not LZ4_AVAILABLE, reason="lz4 não instalado")
+    def test_lz4_compression(self):
+        """Compressão lz4 também é identificada pelo cabeçalho."""
+        codec = CacheCodec(format="msgpack", compression="lz4", compress_threshold=10)
+        value = {"items": list(range(100))}
+
+        encoded = codec.encode(value)
+
+        assert encoded[0] == HEADER_MSGPACK_LZ4
+        assert codec.decode(encoded) == value
+
+    def test_decodes_entries_from_any_codec(self):
+        """Um codec lê entradas gravadas com qualquer outra configuração."""
+        value = {"items": list(range(500))}
+        reader = CacheCodec(format="msgpack", compression="none")
+
+        for writer in (
+            CacheCodec(format="json"),
+            CacheCodec(format="msgpack", compression="none"),
+            CacheCodec(format="msgpack", compression="zlib", compress_threshold=0),
+        ):
+            assert reader.decode(writer.encode(value)) == value
+
+
+class TestLegacyAndJson:
+    """Testes de compatibilidade com entradas JSON."""
+
+    @pytest.mark.parametrize("legacy", ['{"a": 1}', "[1, 2]", '"texto"', "5", "null", b'{"a": 1}'])
+    def test_legacy_json_without_header(self, legacy):
+        """Entradas antigas (JSON puro, str ou bytes) continuam legíveis."""
+        codec = CacheCodec()
+
+        assert codec.decode(legacy) == json.loads(legacy)
+
+    def test_json_codec_stringifies_special_types(self):
+        """Codec JSON mantém o comportamento anterior (default=str)."""
+        codec = CacheCodec(format="json")
+        item_id = uuid4()
+
+        data = codec.encode({"id": item_id})
+
+        assert data[0] == HEADER_JSON
+        assert codec.decode(data) == {"id": str(item_id)}
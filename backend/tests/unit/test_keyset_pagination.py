@@ -0,0 +1,150 @@
+"""
+Testes unitários para paginação keyset (cursor).
+
+Verifica codificação do cursor e que percorrer todas as páginas retorna
+cada registro exatamente uma vez, em ordem (timestamp, id) decrescente.
+"""
+
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError as PydanticValidationError
+
+from app.core.exceptions import ValidationError
+from app.db.pagination import decode_cursor, encode_cursor
+from app.models.professional import Professional, ProfessionalRole
+from app.models.socioemotional_indicator import IndicatorType, MeasurementContext, SocialEmotionalIndicator
+from app.models.student import Student
+from app.models.user import User, UserRole
+from app.schemas.common import CursorPaginatedResponse, PaginatedResponse
+from app.services.socioemotional_indicator_service import SocialEmotionalIndicatorService
+
+
+@pytest.fixture
+def indicators(db_session):
+    """Cria indicadores com timestamps repetidos para testar o desempate por id."""
+    teacher = User(
+        email=f"teacher.{uuid4().hex[:8]}@example.com",
+        hashed_password="$2b$12$hashedpassword",
+        full_name="Professor Teste",
+        role=UserRole.TEACHER,
+        is_active=True,
+    )
+    db_session.add(teacher)
+    db_session.commit()
+
+    student = Student(
+        name="Aluno Teste",
+        date_of_birth=date(2015, 1, 1),
+        age=10,
+        diagnosis="Autismo Nível 1",
+        teacher_id=teacher.id,
+    )
+    professional = Professional(
+        name="Prof Teste",
+        email=f"prof.{uuid4().hex[:8]}@example.com",
+        role=ProfessionalRole.PSYCHOLOGIST,
+        organization="Clínica Teste",
+    )
+    db_session.add_all([student, professional])
+    db_session.commit()
+
+    base = datetime(2025, 1, 1, 10, 0, 0)
+    rows = [
+        SocialEmotionalIndicator(
+            student_id=student.id,
+            professional_id=professional.id,
+            indicator_type=IndicatorType.SOCIAL_INTERACTION,
+            context=MeasurementContext.CLASSROOM,
+            score=5,
+            # Grupos de 3 registros com o mesmo measured_at
+            measured_at=base + timedelta(hours=i // 3),
+        )
+        for i in range(23)
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+    return rows
+
+
+class TestCursorEncoding:
+    """Testes de encode/decode do cursor."""
+
+    def test_roundtrip(self):
+        """Cursor codificado deve ser decodificado para os mesmos valores."""
+        moment = datetime(2025, 3, 4, 5, 6, 7, 123456)
+        item_id = uuid4()
+
+        cursor = encode_cursor(moment, item_id)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (moment, item_id)
+
+    @pytest.mark.parametrize("cursor", ["invalido", "!!!", encode_cursor(datetime(2025, 1, 1), uuid4())[:-4]])
+    def test_invalid_cursor_raises_validation_error(self, cursor):
+        """Cursor malformado deve gerar ValidationError (422)."""
+        with pytest.raises(ValidationError):
+            decode_cursor(cursor)
+
+
+class TestListByCursor:
+    """Testes de list_by_cursor em SocialEmotionalIndicatorService."""
+
+    def test_walks_all_pages_without_gaps_or_duplicates(self, db_session, indicators):
+        """Percorrer as páginas deve retornar todos os registros uma única vez."""
+        service = SocialEmotionalIndicatorService(db_session)
+        expected, total = service.list(skip=0, limit=100)
+
+        seen = []
+        cursor = None
+        while True:
+            page, cursor, _ = service.list_by_cursor(cursor=cursor, limit=5)
+            seen.extend(page)
+            if cursor is None:
+                break
+
+        ids = [i.id for i in seen]
+        assert total == len(indicators)
+        assert len(ids) == len(set(ids))
+        assert set(ids) == {i.id for i in expected}
+        assert [(i.measured_at, i.id) for i in seen] == sorted(((i.measured_at, i.id) for i in seen), reverse=True)
+
+    def test_last_page_has_no_cursor(self, db_session, indicators):
+        """Página que contém o último registro não retorna next_cursor."""
+        service = SocialEmotionalIndicatorService(db_session)
+
+        page, next_cursor, total = service.list_by_cursor(limit=len(indicators), include_total=True)
+
+        assert len(page) == len(indicators)
+        assert next_cursor is None
+        assert total == len(indicators)
+
+    def test_total_is_skipped_by_default(self, db_session, indicators):
+        """COUNT só é executado quando include_total=True."""
+        service = SocialEmotionalIndicatorService(db_session)
+
+        _, next_cursor, total = service.list_by_cursor(limit=5)
+
+        assert total is None
+        assert next_cursor is not None
+
+
+class TestCursorPaginatedResponse:
+    """Testes de CursorPaginatedResponse.create."""
+
+    def test_has_more_follows_next_cursor(self):
+        """has_more deve refletir a existência de next_cursor."""
+        response = CursorPaginatedResponse[int].create([1, 2], "abc", limit=2)
+        last = CursorPaginatedResponse[int].create([3], None, limit=2, total=3)
+
+        assert response.has_more is True
+        assert response.next_cursor == "abc"
+        assert response.total is None
+        assert last.has_more is False
+        assert last.total == 3
+
+    def test_offset_response_still_requires_total(self):
+        """PaginatedResponse (modo offset) continua exigindo total e skip."""
+        with pytest.raises(PydanticValidationError):
+            PaginatedResponse[int](items=[1], limit=2, has_more=False)
@@ -0,0 +1,120 @@
+"""
+Unit tests for the ML process-pool executor.
+
+Tests backpressure, timeouts, metrics and that pool workers return the same
+predictions as the in-process MLService.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.exceptions import ServiceOverloadedError, TaskTimeoutError
+from app.services.ml_executor import MLExecutor, TaskMetrics
+from app.services.ml_features import FEATURE_NAMES
+from app.services.ml_service import MLService
+
+FEATURES = {name: 1.0 for name in FEATURE_NAMES}
+ACTIVITY = {"difficulty": 7, "duration_minutes": 45, "activity_type": "social"}
+
+
+@pytest.fixture
+def inline_executor():
+    """Executor running tasks in a thread of the test process."""
+    executor = MLExecutor(max_workers=0, max_pending=2, task_timeout=5.0)
+    yield executor
+    executor.shutdown()
+
+
+class TestInlineExecutor:
+    """Test the executor contract without child processes."""
+
+    async def test_predictions_match_service(self, inline_executor):
+        """Results equal the MLService feature-level methods."""
+        service = MLService()
+
+        assert await inline_executor.predict_risk(FEATURES) == service.predict_risk_from_features(FEATURES)
+        assert (
+            await inline_executor.predict_risk_batch([FEATURES, FEATURES])
+            == [service.predict_risk_from_features(FEATURES)] * 2
+        )
+        success = await inline_executor.predict_activity_success(FEATURES, ACTIVITY)
+        assert success == service.predict_activity_success_from_features(FEATURES, ACTIVITY)
+
+        stats = inline_executor.get_stats()
+        assert stats["pending"] == 0
+        assert stats["operations"]["predict_risk"]["completed"] == 1
+        assert stats["operations"]["predict_activity_success"]["run_ms"]["max"] > 0
+
+    async def test_queue_full_rejects(self, inline_executor):
+        """Submissions beyond max_pending raise ServiceOverloadedError (503)."""
+        running = [asyncio.ensure_future(inline_executor.run("sleep", time.sleep, 0.2)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServiceOverloadedError) as exc_info:
+            await inline_executor.run("sleep", time.sleep, 0.2)
+
+        assert exc_info.value.status_code == 503
+        await asyncio.gather(*running)
+        assert inline_executor.get_stats()["operations"]["sleep"]["rejected"] == 1
+        assert inline_executor.pending == 0
+
+    async def test_timeout_keeps_slot_until_task_ends(self):
+        """A timed-out task still counts against max_pending until it finishes."""
+        executor = MLExecutor(max_workers=0, max_pending=1, task_timeout=0.05)
+        try:
+            with pytest.raises(TaskTimeoutError):
+                await executor.run("sleep", time.sleep, 0.3)
+            assert executor.pending == 1
+            with pytest.raises(ServiceOverloadedError):
+                await executor.run("sleep", time.sleep, 0)
+
+            await asyncio.sleep(0.4)
+            assert executor.pending == 0
+            assert executor.get_stats()["operations"]["sleep"]["timeouts"] == 1
+        finally:
+            executor.shutdown()
+
+    async def test_broken_pool_reset_only_once(self, inline_executor):
+        """A late report about an already replaced pool leaves the new pool running."""
+        failed = inline_executor._get_pool()
+        inline_executor._reset_broken_pool(failed)
+        replacement = inline_executor._get_pool()
+
+        inline_executor._reset_broken_pool(failed)
+
+        assert replacement is not failed
+        assert inline_executor._pool is replacement
+        assert await inline_executor.predict_risk(FEATURES) == MLService().predict_risk_from_features(FEATURES)
+
+
+class TestProcessPool:
+    """Test scoring in a child process."""
+
+    async def test_worker_matches_in_process(self):
+        """A spawned worker (own MLService, models loaded at start) returns the same results."""
+        executor = MLExecutor(max_workers=1, max_pending=4, task_timeout=60.0)
+        try:
+            pids = await executor.warm_up()
+            assert len(pids) == 1
+
+            results = await asyncio.gather(*(executor.predict_risk(FEATURES) for _ in range(3)))
+            assert results == [MLService().predict_risk_from_features(FEATURES)] * 3
+            assert executor.get_stats()["operations"]["predict_risk"]["completed"] == 3
+        finally:
+            executor.shutdown()
+
+
+class TestTaskMetrics:
+    """Test latency percentiles."""
+
+    def test_percentiles(self):
+        """p50/p95/p99/max over the sample window."""
+        metrics = TaskMetrics(window=100)
+        for value in range(1, 201):
+            metrics.record(wait_ms=0.0, run_ms=float(value))
+
+        snapshot = metrics.snapshot()
+        assert snapshot["completed"] == 200
+        assert snapshot["run_ms"] == {"p50": 150.0, "p95": 195.0, "p99": 199.0, "max": 200.0}
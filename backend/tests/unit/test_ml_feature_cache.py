@@ -0,0 +1,186 @@
+"""
+Unit tests for the ML feature cache.
+
+Tests watermark validation, event-driven invalidation from AssessmentService
+and the cached MLService entry points.
+"""
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+
+from app.core.events import AssessmentChanged, event_bus
+from app.core.exceptions import StudentNotFoundError
+from app.models.student import Student
+from app.schemas.assessment import AssessmentCreate, AssessmentUpdate
+from app.services.assessment_service import AssessmentService
+from app.services.ml_feature_cache import (
+    StudentFeatureCache,
+    invalidate_on_assessment_change,
+    load_watermark,
+    register_feature_cache_invalidation,
+)
+from app.services.ml_service import MLService
+from app.utils.constants import CompletionStatus, DifficultyRating, EngagementLevel
+
+
+@pytest.fixture
+def service():
+    """ML service with a private feature cache subscribed to assessment events."""
+    cache = StudentFeatureCache()
+
+    def on_change(changed: AssessmentChanged):
+        cache.invalidate(changed.student_id)
+
+    event_bus.subscribe(AssessmentChanged, on_change)
+    yield MLService(feature_cache=cache)
+    event_bus.unsubscribe(AssessmentChanged, on_change)
+
+
+def create_assessment(db_session, owners, status=CompletionStatus.COMPLETED, engagement=EngagementLevel.HIGH):
+    """Create assessment through AssessmentService."""
+    teacher_id, student_id, activity_id = owners
+    data = AssessmentCreate(
+        activity_id=activity_id,
+        student_id=student_id,
+        completion_status=status,
+        engagement_level=engagement,
+        difficulty_rating=DifficultyRating.APPROPRIATE,
+    )
+    return AssessmentService.create_assessment(db_session, data, teacher_id)
+
+
+@pytest.fixture
+def statements(db_session):
+    """SQL statements executed on the test engine."""
+    executed = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", on_execute)
+    yield executed
+    event.remove(engine, "before_cursor_execute", on_execute)
+
+
+class TestWatermark:
+    """Test watermark loading."""
+
+    def test_watermark_tracks_count_and_updates(self, db_session, owners):
+        """Watermark changes with every assessment write."""
+        _, student_id, _ = owners
+        empty = load_watermark(db_session, student_id)
+        assert empty[1:] == (None, 0)
+
+        create_assessment(db_session, owners)
+        created = load_watermark(db_session, student_id)
+        assert created[2] == 1
+        assert created != empty
+
+        assert load_watermark(db_session, uuid4()) is None
+
+
+class TestCachedFeatures:
+    """Test cached MLService entry points."""
+
+    def test_hit_skips_history_load(self, db_session, owners, service, statements):
+        """Second call runs only the watermark query."""
+        _, student_id, _ = owners
+        create_assessment(db_session, owners)
+
+        first = service.get_student_features(db_session, student_id)
+        statements.clear()
+        second = service.get_student_features(db_session, student_id)
+
+        assert second == first
+        assert len(statements) == 1
+        assert service.feature_cache.get_stats()["hits"] == 1
+
+    def test_features_match_direct_extraction(self, db_session, owners, service):
+        """Cached features equal extract_student_features on the loaded history."""
+        _, student_id, _ = owners
+        create_assessment(db_session, owners)
+        create_assessment(db_session, owners, CompletionStatus.ABANDONED, EngagementLevel.LOW)
+
+        student = db_session.get(Student, student_id)
+        expected = service.extract_student_features(student, list(student.assessments))
+
+        assert service.get_student_features(db_session, student_id) == expected
+
+    def test_assessment_writes_invalidate(self, db_session, owners, service):
+        """create/update/delete through AssessmentService drop the cached entry."""
+        teacher_id, student_id, _ = owners
+        assessment = create_assessment(db_session, owners)
+        service.get_student_features(db_session, student_id)
+        assert service.feature_cache.get_stats()["size"] == 1
+
+        AssessmentService.update_assessment(
+            db_session, assessment.id, AssessmentUpdate(engagement_level=EngagementLevel.NONE), teacher_id
+        )
+        assert service.feature_cache.get_stats()["size"] == 0
+        assert service.get_student_features(db_session, student_id)["avg_engagement"] == 0.0
+
+        create_assessment(db_session, owners)
+        assert service.feature_cache.get_stats()["size"] == 0
+        assert service.get_student_features(db_session, student_id)["completion_rate"] == 1.0
+
+        AssessmentService.delete_assessment(db_session, assessment.id, teacher_id)
+        assert service.feature_cache.get_stats()["size"] == 0
+        assert service.get_student_features(db_session, student_id)["avg_engagement"] == 3.0
+
+    def test_stale_entry_not_returned_without_event(self, db_session, owners, service):
+        """A write not seen by this process (no event) is caught by the watermark."""
+        _, student_id, _ = owners
+        service.get_student_features(db_session, student_id)
+
+        # Direct ORM write: no AssessmentChanged event is published
+        student = db_session.get(Student, student_id)
+        student.interests = ["jogos", "música", "desenho"]
+        db_session.commit()
+
+        assert service.get_student_features(db_session, student_id)["interest_count"] == 3.0
+
+    def test_predictions_use_cache(self, db_session, owners, service):
+        """Risk, activity success and progress results match the uncached methods."""
+        _, student_id, _ = owners
+        for _ in range(3):
+            create_assessment(db_session, owners)
+        student = db_session.get(Student, student_id)
+        assessments = list(student.assessments)
+        activity_data = {"difficulty": "easy", "duration_minutes": 20}
+
+        risk = service.predict_risk_level_for_student(db_session, student_id)
+        success = service.predict_activity_success_for_student(db_session, student_id, activity_data)
+        progress = service.analyze_student_progress_for_student(db_session, student_id)
+
+        assert risk == service.predict_risk_level(student, assessments)
+        assert success == service.predict_activity_success(student, activity_data, assessments)
+        assert progress == service.analyze_student_progress(student, assessments)
+
+        # Progress reads student_progress_stats and does not go through the cache
+        assert service.feature_cache.get_stats()["hits"] == 1
+
+    def test_unknown_student_raises(self, db_session, service):
+        """Unknown student raises StudentNotFoundError."""
+        with pytest.raises(StudentNotFoundError):
+            service.predict_risk_level_for_student(db_session, uuid4())
+
+
+class TestInvalidationHandler:
+    """Test the shared cache event handler."""
+
+    def test_register_is_idempotent_and_handler_invalidates(self):
+        """Handler drops the entry for the event's student."""
+        from app.services.ml_feature_cache import student_feature_cache
+
+        register_feature_cache_invalidation()
+        register_feature_cache_invalidation()
+        assert event_bus._handlers[AssessmentChanged].count(invalidate_on_assessment_change) == 1
+
+        student_id = uuid4()
+        student_feature_cache.set(student_id, (None, None, 0), "features", {"age": 1.0})
+        invalidate_on_assessment_change(AssessmentChanged("update", uuid4(), student_id))
+
+        assert student_feature_cache.get(student_id, (None, None, 0), "features") is None
@@ -0,0 +1,100 @@
+"""
+Unit tests for the columnar ML feature engine.
+
+Compares build_feature_matrix with the per-student reference
+implementation (MLService.extract_student_features).
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.models.assessment import Assessment
+from app.models.student import Student
+from app.services.ml_features import (
+    ASSESSMENT_FEATURE_DEFAULTS,
+    FEATURE_NAMES,
+    AssessmentColumns,
+    assessment_feature_matrix,
+    build_feature_matrix,
+)
+from app.services.ml_service import MLService
+from app.utils.constants import CompletionStatus, DifficultyRating, EngagementLevel, TEALevel
+
+
+@pytest.fixture
+def students_and_assessments():
+    """Students with varied profiles and histories (ties, >5 assessments, none)."""
+    rng = np.random.default_rng(3)
+    levels = [TEALevel.LEVEL_1, TEALevel.LEVEL_2, TEALevel.LEVEL_3, None]
+    independence = ["full", "partial", "minimal", "dependent", None, "unknown"]
+    base = datetime(2025, 1, 1)
+
+    students, assessments_by_student = [], {}
+    for i in range(60):
+        student = Mock(spec=Student)
+        student.id = uuid4()
+        student.age = int(rng.integers(4, 18))
+        student.tea_level = levels[i % len(levels)]
+        student.interests = ["x"] * int(rng.integers(0, 4))
+        if i % 4 == 0:
+            student.learning_profile = None
+        elif i % 4 == 1:
+            student.learning_profile = {}
+        else:
+            student.learning_profile = {"visual": int(rng.integers(1, 10)), "social_skills": int(rng.integers(1, 10))}
+        students.append(student)
+
+        history = []
+        for _ in range(int(rng.integers(0, 12))):
+            assessment = Mock(spec=Assessment)
+            assessment.completion_status = list(CompletionStatus)[int(rng.integers(0, len(CompletionStatus)))]
+            assessment.engagement_level = list(EngagementLevel)[int(rng.integers(0, len(EngagementLevel)))]
+            assessment.difficulty_rating = list(DifficultyRating)[int(rng.integers(0, len(DifficultyRating)))]
+            assessment.independence_level = independence[int(rng.integers(0, len(independence)))]
+            # Few distinct days: many ties in created_at
+            assessment.created_at = base + timedelta(days=int(rng.integers(0, 4)))
+            history.append(assessment)
+        if history:
+            assessments_by_student[student.id] = history
+
+    return students, assessments_by_student
+
+
+class TestBuildFeatureMatrix:
+    """Tests for build_feature_matrix."""
+
+    def test_matches_per_student_extraction(self, students_and_assessments):
+        """Every cell should equal the dict-based reference features."""
+        students, assessments_by_student = students_and_assessments
+        service = MLService()
+
+        X = build_feature_matrix(students, assessments_by_student)
+
+        assert X.dtype == np.float32
+        assert X.shape == (len(students), len(FEATURE_NAMES))
+        for row, student in zip(X, students):
+            expected = service.extract_student_features(student, assessments_by_student.get(student.id))
+            assert list(expected) == list(FEATURE_NAMES)
+            np.testing.assert_allclose(row, [expected[name] for name in FEATURE_NAMES], rtol=1e-6)
+
+    def test_aligns_to_feature_names(self, students_and_assessments):
+        """Columns follow feature_names; unknown names are zero."""
+        students, assessments_by_student = students_and_assessments
+        full = build_feature_matrix(students, assessments_by_student)
+
+        X = build_feature_matrix(students, assessments_by_student, ["success_rate", "unknown", "age"])
+
+        np.testing.assert_array_equal(X[:, 0], full[:, FEATURE_NAMES.index("success_rate")])
+        assert not X[:, 1].any()
+        np.testing.assert_array_equal(X[:, 2], full[:, FEATURE_NAMES.index("age")])
+
+    def test_empty_inputs(self):
+        """No students or no assessments produce empty matrix / defaults."""
+        assert build_feature_matrix([]).shape == (0, len(FEATURE_NAMES))
+
+        defaults = assessment_feature_matrix(AssessmentColumns.from_assessments([None, []]), 2)
+        np.testing.assert_array_equal(defaults, np.tile(ASSESSMENT_FEATURE_DEFAULTS, (2, 1)).astype(np.float32))
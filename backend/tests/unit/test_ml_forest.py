@@ -0,0 +1,143 @@
+"""
+Unit tests for the flat RandomForest inference engine.
+
+Probabilities must be bit-for-bit equal to RandomForestClassifier.predict_proba.
+"""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from app.services.ml_forest import FlatForestClassifier
+
+
+@pytest.fixture(scope="module")
+def data():
+    """Training and scoring data with the MLService feature count."""
+    rng = np.random.default_rng(42)
+    X = rng.normal(size=(600, 19))
+    y = rng.integers(0, 4, size=600)
+    X_test = np.vstack([rng.normal(size=(300, 19)) * 3, X[:50]])
+    return X, y, X_test
+
+
+class TestEquivalence:
+    """Test bit-for-bit equivalence with scikit-learn."""
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"n_estimators": 20},
+            {"n_estimators": 15, "max_depth": 4},
+            {"n_estimators": 10, "min_samples_leaf": 5, "class_weight": "balanced"},
+            {"n_estimators": 10, "max_features": None, "bootstrap": False},
+        ],
+    )
+    def test_predict_proba_is_identical(self, data, params):
+        """Flat probabilities equal sklearn's exactly, for single rows and batches."""
+        X, y, X_test = data
+        forest = RandomForestClassifier(random_state=0, **params).fit(X, y)
+        engine = FlatForestClassifier.from_sklearn(forest, keep_source=False)
+
+        assert np.array_equal(engine.predict_proba(X_test), forest.predict_proba(X_test))
+        assert np.array_equal(engine.predict_proba(X_test[:1]), forest.predict_proba(X_test[:1]))
+        assert np.array_equal(engine.predict(X_test), forest.predict(X_test))
+
+    def test_thresholds_exact_at_float32_boundaries(self, data):
+        """Inputs equal to (or one float32 step around) a split threshold route like sklearn."""
+        X, y, _ = data
+        forest = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+        engine = FlatForestClassifier.from_sklearn(forest, keep_source=False)
+
+        tree = forest.estimators_[0].tree_
+        split = np.flatnonzero(tree.children_left >= 0)[:20]
+        rows = np.tile(X[:1], (len(split) * 3, 1))
+        for i, node in enumerate(split):
+            value = np.float32(tree.threshold[node])
+            for j, candidate in enumerate((np.nextafter(value, -np.inf), value, np.nextafter(value, np.inf))):
+                rows[i * 3 + j, tree.feature[node]] = candidate
+
+        assert np.array_equal(engine.predict_proba(rows), forest.predict_proba(rows))
+
+    def test_missing_values_follow_sklearn_routing(self, data):
+        """NaN inputs follow the missing_go_to_left routing learned by sklearn."""
+        X, y, X_test = data
+        rng = np.random.default_rng(1)
+        X = X.copy()
+        X[rng.random(X.shape) < 0.1] = np.nan
+        X_test = X_test.copy()
+        X_test[rng.random(X_test.shape) < 0.1] = np.nan
+        forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+
+        engine = FlatForestClassifier.from_sklearn(forest, keep_source=False)
+
+        assert np.array_equal(engine.predict_proba(X_test), forest.predict_proba(X_test))
+
+    def test_classes_and_importances(self, data):
+        """Estimator attributes used by MLService are preserved."""
+        X, y, _ = data
+        forest = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y + 10)
+
+        engine = FlatForestClassifier.from_sklearn(forest)
+
+        assert engine.classes_.tolist() == [10, 11, 12, 13]
+        assert engine.n_features_in_ == 19
+        assert np.array_equal(engine.feature_importances_, forest.feature_importances_)
+        assert set(engine.predict(X[:20])) <= {10, 11, 12, 13}
+
+
+class TestBatchRouting:
+    """Test large batch delegation and input validation."""
+
+    def test_large_batch_uses_source_forest(self, data):
+        """Batches above large_batch_rows go to the kept source forest."""
+        X, y, X_test = data
+        forest = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+        engine = FlatForestClassifier.from_sklearn(forest, large_batch_rows=10)
+        engine.source = MagicMock(wraps=forest)
+
+        engine.predict_proba(X_test[:10])
+        engine.source.predict_proba.assert_not_called()
+
+        assert np.array_equal(engine.predict_proba(X_test[:11]), forest.predict_proba(X_test[:11]))
+        engine.source.predict_proba.assert_called_once()
+
+    def test_parallel_source_forest_predicts_sequentially(self, data):
+        """A forest fitted with n_jobs=-1 still matches the flat engine on large batches."""
+        X, y, X_test = data
+        forest = RandomForestClassifier(n_estimators=20, n_jobs=-1, random_state=0).fit(X, y)
+        engine = FlatForestClassifier.from_sklearn(forest, large_batch_rows=10)
+
+        assert engine.source.n_jobs == 1
+        assert forest.n_jobs == -1
+        assert engine.source.estimators_ is forest.estimators_
+        flat = FlatForestClassifier.from_sklearn(forest, keep_source=False)
+        assert np.array_equal(engine.predict_proba(X_test), flat.predict_proba(X_test))
+
+    def test_one_dimensional_input_is_single_row(self, data):
+        """A 1D vector is scored as one row."""
+        X, y, _ = data
+        forest = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+        engine = FlatForestClassifier.from_sklearn(forest)
+
+        assert np.array_equal(engine.predict_proba(X[0]), forest.predict_proba(X[:1]))
+
+    def test_wrong_feature_count_raises(self, data):
+        """Inputs must match the forest's feature count."""
+        X, y, _ = data
+        engine = FlatForestClassifier.from_sklearn(RandomForestClassifier(n_estimators=3).fit(X, y))
+
+        with pytest.raises(ValueError, match="expected"):
+            engine.predict_proba(X[:2, :5])
+
+    def test_rejects_non_forest(self, data):
+        """Only fitted forest classifiers can be exported."""
+        X, y, _ = data
+
+        with pytest.raises(ValueError):
+            FlatForestClassifier.from_sklearn(DecisionTreeClassifier().fit(X, y))
+        with pytest.raises(ValueError):
+            FlatForestClassifier.from_sklearn(RandomForestClassifier())
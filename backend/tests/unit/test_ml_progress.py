@@ -0,0 +1,232 @@
+"""
+Unit tests for incremental progress statistics.
+
+Tests ProgressStats against the full-history computation, the maintenance of
+student_progress_stats by AssessmentService and the O(1) MLService entry point.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+
+from app.core.exceptions import StudentNotFoundError
+from app.models.assessment import Assessment
+from app.models.student import Student
+from app.models.student_progress_stats import StudentProgressStats
+from app.schemas.assessment import AssessmentCreate, AssessmentUpdate
+from app.services.assessment_service import AssessmentService
+from app.services.ml_features import ENGAGEMENT_SCORES
+from app.services.ml_progress import ProgressStats, progress_entry
+from app.services.ml_service import MLService
+from app.services.progress_stats_service import ProgressStatsService
+from app.utils.constants import CompletionStatus, DifficultyRating, EngagementLevel
+
+ENGAGEMENTS = list(EngagementLevel)
+STATUSES = list(CompletionStatus)
+RATINGS = list(DifficultyRating)
+INDEPENDENCE = ["full", "partial", "minimal", "dependent", None]
+
+
+def random_assessments(rng, count):
+    """Assessment-like objects with random values, in chronological order."""
+    start = datetime(2025, 1, 1)
+    return [
+        SimpleNamespace(
+            id=uuid4(),
+            completion_status=STATUSES[rng.integers(len(STATUSES))],
+            engagement_level=ENGAGEMENTS[rng.integers(len(ENGAGEMENTS))],
+            difficulty_rating=RATINGS[rng.integers(len(RATINGS))],
+            independence_level=INDEPENDENCE[rng.integers(len(INDEPENDENCE))],
+            created_at=start + timedelta(hours=i),
+        )
+        for i in range(count)
+    ]
+
+
+class TestProgressStats:
+    """Test ProgressStats against full-history computations."""
+
+    @pytest.mark.parametrize("count", [2, 3, 7, 50, 400])
+    def test_slope_matches_polyfit(self, count):
+        """Closed-form slope equals np.polyfit over the engagement scores."""
+        rng = np.random.default_rng(count)
+        assessments = random_assessments(rng, count)
+        scores = [ENGAGEMENT_SCORES[a.engagement_level] for a in assessments]
+
+        stats = ProgressStats.from_entries(map(progress_entry, assessments))
+
+        assert stats.slope == pytest.approx(np.polyfit(np.arange(count), scores, 1)[0], abs=1e-12)
+        assert stats.x_sum == sum(range(count))
+        assert stats.x_sq_sum == sum(x * x for x in range(count))
+        assert stats.avg_engagement == float(np.mean(scores))
+
+    def test_counters_and_ring_buffer(self):
+        """Counters cover the whole history; the ring buffer keeps the last 5."""
+        rng = np.random.default_rng(0)
+        assessments = random_assessments(rng, 12)
+
+        stats = ProgressStats.from_entries(map(progress_entry, assessments))
+
+        completed = [a for a in assessments if a.completion_status == CompletionStatus.COMPLETED]
+        assert stats.count == 12
+        assert stats.completed == len(completed)
+        assert stats.successes == sum(
+            a.engagement_level in (EngagementLevel.HIGH, EngagementLevel.VERY_HIGH) for a in completed
+        )
+        assert [entry.id for entry in stats.recent] == [str(a.id) for a in assessments[-5:]]
+
+    def test_replace_equals_recompute(self):
+        """Replacing one assessment gives the same stats as folding the changed history."""
+        rng = np.random.default_rng(1)
+        assessments = random_assessments(rng, 9)
+        stats = ProgressStats.from_entries(map(progress_entry, assessments))
+
+        for index in (0, 4, 8):
+            previous = progress_entry(assessments[index])
+            assessments[index].engagement_level = EngagementLevel.VERY_HIGH
+            assessments[index].completion_status = CompletionStatus.COMPLETED
+            assessments[index].independence_level = "full"
+            stats.replace(index, previous, progress_entry(assessments[index]))
+
+        assert stats == ProgressStats.from_entries(map(progress_entry, assessments))
+
+    def test_json_round_trip(self):
+        """Ring buffer survives the JSON column."""
+        stats = ProgressStats.from_entries(map(progress_entry, random_assessments(np.random.default_rng(2), 7)))
+        assert ProgressStats.recent_from_json(stats.recent_to_json()) == stats.recent
+
+
+def create_assessment(db_session, owners, engagement, status=CompletionStatus.COMPLETED):
+    """Create assessment through AssessmentService."""
+    teacher_id, student_id, activity_id = owners
+    data = AssessmentCreate(
+        activity_id=activity_id,
+        student_id=student_id,
+        completion_status=status,
+        engagement_level=engagement,
+        difficulty_rating=DifficultyRating.TOO_HARD,
+        independence_level="partial",
+    )
+    return AssessmentService.create_assessment(db_session, data, teacher_id)
+
+
+def expected_analysis(db_session, student_id):
+    """Full-history analysis of the student's current assessments."""
+    student = db_session.get(Student, student_id)
+    db_session.refresh(student)
+    return MLService().analyze_student_progress(student, list(student.assessments))
+
+
+class TestStoredProgressStats:
+    """Test student_progress_stats maintenance and the stored-stats analysis."""
+
+    def test_writes_keep_stats_equal_to_history(self, db_session, owners):
+        """create/update/delete leave the stored stats equal to a recompute."""
+        teacher_id, student_id, _ = owners
+        assessments = [
+            create_assessment(db_session, owners, engagement)
+            for engagement in (EngagementLevel.LOW, EngagementLevel.MEDIUM, EngagementLevel.HIGH, EngagementLevel.NONE)
+        ]
+        assert ProgressStatsService.load(db_session, student_id) == ProgressStatsService.compute(db_session, student_id)
+
+        AssessmentService.update_assessment(
+            db_session,
+            assessments[1].id,
+            AssessmentUpdate(engagement_level=EngagementLevel.VERY_HIGH, completion_status=CompletionStatus.ABANDONED),
+            teacher_id,
+        )
+        assert ProgressStatsService.load(db_session, student_id) == ProgressStatsService.compute(db_session, student_id)
+
+        AssessmentService.delete_assessment(db_session, assessments[0].id, teacher_id)
+        stats = ProgressStatsService.load(db_session, student_id)
+        assert stats == ProgressStatsService.compute(db_session, student_id)
+        assert stats.count == 3
+
+    def test_out_of_order_create_recomputes(self, db_session, owners):
+        """A create not newer than the last counted assessment recomputes the student."""
+        _, student_id, _ = owners
+        create_assessment(db_session, owners, EngagementLevel.LOW)
+        create_assessment(db_session, owners, EngagementLevel.HIGH)
+
+        # Pretend a newer assessment was already counted
+        row = db_session.query(StudentProgressStats).filter(StudentProgressStats.student_id == student_id).one()
+        row.last_assessment_at = datetime.utcnow() + timedelta(days=1)
+        row.engagement_xy_sum = -1
+        db_session.commit()
+
+        latest = create_assessment(db_session, owners, EngagementLevel.MEDIUM)
+        stats = ProgressStatsService.load(db_session, student_id)
+        assert stats == ProgressStatsService.compute(db_session, student_id)
+        assert stats.count == 3
+        db_session.refresh(row)
+        assert row.last_assessment_at == latest.created_at
+
+    def test_analysis_matches_full_history_in_one_query(self, db_session, owners):
+        """Stored-stats analysis equals analyze_student_progress and runs one query."""
+        _, student_id, _ = owners
+        for engagement in (EngagementLevel.LOW, EngagementLevel.MEDIUM, EngagementLevel.MEDIUM, EngagementLevel.HIGH):
+            create_assessment(db_session, owners, engagement)
+        create_assessment(db_session, owners, EngagementLevel.VERY_HIGH, CompletionStatus.ABANDONED)
+        create_assessment(db_session, owners, EngagementLevel.HIGH)
+
+        expected = expected_analysis(db_session, student_id)
+
+        executed = []
+        engine = db_session.get_bind()
+
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            executed.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            analysis = MLService().analyze_student_progress_for_student(db_session, student_id)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert len(executed) == 1
+        assert analysis.pop("trend_slope") == pytest.approx(expected.pop("trend_slope"), abs=1e-12)
+        assert analysis == expected
+        assert analysis["engagement_trend"] == "improving"
+
+    def test_missing_row_falls_back_to_history(self, db_session, owners):
+        """Students without a stats row are analyzed from their assessments."""
+        _, student_id, _ = owners
+        assert MLService().analyze_student_progress_for_student(db_session, student_id)["status"] == "insufficient_data"
+
+        create_assessment(db_session, owners, EngagementLevel.HIGH)
+        create_assessment(db_session, owners, EngagementLevel.LOW)
+        db_session.query(StudentProgressStats).delete()
+        db_session.commit()
+
+        analysis = MLService().analyze_student_progress_for_student(db_session, student_id)
+        assert analysis["total_assessments"] == 2
+        assert analysis["engagement_trend"] == "declining"
+
+    def test_unknown_student_raises(self, db_session):
+        """Unknown student raises StudentNotFoundError."""
+        with pytest.raises(StudentNotFoundError):
+            MLService().analyze_student_progress_for_student(db_session, uuid4())
+
+    def test_rebuild_backfills_rows(self, db_session, owners):
+        """rebuild() recreates stats for assessments written outside the service."""
+        _, student_id, activity_id = owners
+        create_assessment(db_session, owners, EngagementLevel.HIGH)
+        db_session.add(
+            Assessment(
+                activity_id=activity_id,
+                student_id=student_id,
+                completion_status=CompletionStatus.IN_PROGRESS,
+                engagement_level=EngagementLevel.LOW,
+                difficulty_rating=DifficultyRating.APPROPRIATE,
+            )
+        )
+        db_session.commit()
+
+        assert ProgressStatsService.load(db_session, student_id).count == 1
+        assert ProgressStatsService.rebuild(db_session) == 1
+        assert ProgressStatsService.load(db_session, student_id) == ProgressStatsService.compute(db_session, student_id)
+        assert ProgressStatsService.load(db_session, student_id).count == 2
@@ -0,0 +1,204 @@
+"""
+Unit tests for the ML model registry.
+
+Tests checksum verification, memory-mapped loading, hot-swap and rollback.
+"""
+
+import json
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from app.core.exceptions import ValidationError
+from app.services.ml_forest import FlatForestClassifier
+from app.services.ml_registry import ModelRegistry, file_checksum
+from app.services.ml_service import MLService
+
+FEATURES = ["age", "tea_level", "completion_rate"]
+
+
+def write_version(root, version, n_estimators=5, checksums=True, name="behavioral_classifier", **metadata):
+    """Train a tiny model and write it as a registry version."""
+    model_dir = root / name / version
+    model_dir.mkdir(parents=True)
+    rng = np.random.default_rng(n_estimators)
+    X = rng.normal(size=(80, len(FEATURES)))
+    y = np.arange(80) % 4
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=n_estimators, random_state=0).fit(scaler.transform(X), y)
+    joblib.dump(model, model_dir / "model.pkl")
+    joblib.dump(scaler, model_dir / "scaler.pkl")
+
+    if checksums:
+        ModelRegistry.write_metadata(model_dir, FEATURES, version=version, **metadata)
+    else:
+        (model_dir / "metadata.json").write_text(json.dumps({"feature_names": FEATURES}))
+    return model_dir
+
+
+class TestLoading:
+    """Test loading and verification."""
+
+    def test_load_verifies_checksums_and_memory_maps_arrays(self, tmp_path):
+        """Checksummed artifacts load, and their NumPy arrays are memory-mapped."""
+        model_dir = write_version(tmp_path, "v1")
+        registry = ModelRegistry(tmp_path)
+
+        loaded = registry.load("behavioral_classifier", "v1")
+
+        assert loaded.version == "v1"
+        assert loaded.checksum == file_checksum(model_dir / "model.pkl")
+        assert loaded.feature_names == tuple(FEATURES)
+        assert loaded.feature_index == {"age": 0, "tea_level": 1, "completion_rate": 2}
+        assert isinstance(loaded.scaler.mean_, np.memmap)
+        assert registry.get("behavioral_classifier") is None
+
+    def test_load_without_mmap(self, tmp_path):
+        """mmap_mode=None reads arrays into private memory."""
+        write_version(tmp_path, "v1")
+
+        loaded = ModelRegistry(tmp_path, mmap_mode=None).load("behavioral_classifier", "v1")
+
+        assert not isinstance(loaded.scaler.mean_, np.memmap)
+
+    def test_checksum_mismatch_raises(self, tmp_path):
+        """A tampered artifact is rejected before unpickling."""
+        model_dir = write_version(tmp_path, "v1")
+        with open(model_dir / "model.pkl", "ab") as f:
+            f.write(b"tampered")
+
+        with pytest.raises(ValidationError, match="Checksum mismatch"):
+            ModelRegistry(tmp_path).load("behavioral_classifier", "v1")
+
+    def test_missing_checksummed_artifact_raises(self, tmp_path):
+        """An artifact listed in checksums must exist."""
+        model_dir = write_version(tmp_path, "v1")
+        (model_dir / "scaler.pkl").unlink()
+
+        with pytest.raises(ValidationError, match="not found"):
+            ModelRegistry(tmp_path).load("behavioral_classifier", "v1")
+
+    def test_metadata_without_checksums_loads_unverified(self, tmp_path):
+        """Legacy metadata (no checksums) still loads."""
+        write_version(tmp_path, "v1", checksums=False)
+
+        loaded = ModelRegistry(tmp_path).load("behavioral_classifier", "v1")
+
+        assert loaded.checksum is None
+        assert loaded.feature_names == tuple(FEATURES)
+
+    def test_flat_engine_selected_by_metadata(self, tmp_path):
+        """engine="flat" compiles the forest; probabilities match the sklearn version."""
+        write_version(tmp_path, "sk")
+        write_version(tmp_path, "flat", engine="flat")
+        registry = ModelRegistry(tmp_path)
+        X = np.random.default_rng(3).normal(size=(20, len(FEATURES)))
+
+        sklearn_version = registry.load("behavioral_classifier", "sk")
+        flat_version = registry.load("behavioral_classifier", "flat")
+
+        assert sklearn_version.engine == "sklearn"
+        assert flat_version.engine == "flat"
+        assert isinstance(flat_version.model, FlatForestClassifier)
+        assert np.array_equal(flat_version.model.predict_proba(X), sklearn_version.model.predict_proba(X))
+
+    def test_unknown_engine_raises(self, tmp_path):
+        """Unknown engine names are rejected."""
+        write_version(tmp_path, "v1", engine="gpu")
+
+        with pytest.raises(ValidationError, match="Unknown inference engine"):
+            ModelRegistry(tmp_path).load("behavioral_classifier", "v1")
+
+    def test_missing_model_raises_file_not_found(self, tmp_path):
+        """Missing model.pkl raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            ModelRegistry(tmp_path).load("behavioral_classifier", "v1")
+
+
+class TestActivation:
+    """Test hot-swap and rollback."""
+
+    def test_activate_keeps_previous_and_rollback_swaps(self, tmp_path):
+        """Activating v2 keeps v1 warm; rollback swaps them without reloading."""
+        write_version(tmp_path, "v1", n_estimators=3)
+        write_version(tmp_path, "v2", n_estimators=7)
+        registry = ModelRegistry(tmp_path)
+
+        v1 = registry.activate("behavioral_classifier", "v1")
+        v2 = registry.activate("behavioral_classifier", "v2")
+
+        assert registry.get("behavioral_classifier") is v2
+        assert registry.previous("behavioral_classifier") is v1
+
+        assert registry.rollback("behavioral_classifier") is v1
+        assert registry.get("behavioral_classifier") is v1
+        assert registry.previous("behavioral_classifier") is v2
+        assert registry.versions() == {
+            "behavioral_classifier": {"active": "v1", "previous": "v2", "checksum": v1.checksum, "engine": "sklearn"}
+        }
+
+    def test_failed_activation_keeps_active_version(self, tmp_path):
+        """A version that fails verification never replaces the active one."""
+        write_version(tmp_path, "v1")
+        bad_dir = write_version(tmp_path, "v2")
+        (bad_dir / "model.pkl").write_bytes(b"corrupted")
+        registry = ModelRegistry(tmp_path)
+        v1 = registry.activate("behavioral_classifier", "v1")
+
+        with pytest.raises(ValidationError):
+            registry.activate("behavioral_classifier", "v2")
+
+        assert registry.get("behavioral_classifier") is v1
+        assert registry.previous("behavioral_classifier") is None
+
+    def test_rollback_without_previous_raises(self, tmp_path):
+        """Rollback needs a previous version."""
+        write_version(tmp_path, "v1")
+        registry = ModelRegistry(tmp_path)
+        registry.activate("behavioral_classifier", "v1")
+
+        with pytest.raises(ValidationError, match="No previous version"):
+            registry.rollback("behavioral_classifier")
+
+
+class TestMLServiceHotSwap:
+    """Test MLService model swapping through the registry."""
+
+    def test_hot_swap_and_rollback(self, tmp_path):
+        """Service predictions follow the active version."""
+        write_version(tmp_path, "v1", n_estimators=3)
+        write_version(tmp_path, "v2", n_estimators=7)
+        service = MLService()
+        service.registry = ModelRegistry(tmp_path)
+        features = {"age": 8.0, "tea_level": 2.0, "completion_rate": 0.4}
+
+        assert service.load_behavioral_model("v1") is True
+        first = service._predict_with_model(features)
+        v1_model = service.behavioral_model
+
+        assert service.load_behavioral_model("v2") is True
+        assert len(service.behavioral_model.estimators_) == 7
+        assert service.get_model_versions()["behavioral_classifier"]["previous"] == "v1"
+
+        assert service.rollback_behavioral_model() == "v1"
+        assert service.behavioral_model is v1_model
+        assert service._predict_with_model(features) == first
+
+    def test_corrupted_version_raises_and_keeps_serving(self, tmp_path):
+        """A checksum failure surfaces as ValidationError and leaves the active model in place."""
+        write_version(tmp_path, "v1")
+        bad_dir = write_version(tmp_path, "v2")
+        with open(bad_dir / "scaler.pkl", "ab") as f:
+            f.write(b"x")
+        service = MLService()
+        service.registry = ModelRegistry(tmp_path)
+        service.load_behavioral_model("v1")
+
+        with pytest.raises(ValidationError):
+            service.load_behavioral_model("v2")
+
+        assert service.get_model_versions()["behavioral_classifier"]["active"] == "v1"
+        assert service.behavioral_model is not None
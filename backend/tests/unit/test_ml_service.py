@@ -4,6 +4,9 @@ Unit tests for ML Service.
 Tests behavioral classification, feature extraction, and predictions.
 """
 
+import json
+import subprocess
+import sys
 from datetime import datetime
 from unittest.mock import MagicMock, Mock
 from uuid import uuid4
@@ -13,6 +16,7 @@ import pytest
 
 from app.models.assessment import Assessment
 from app.models.student import Student
+from app.services.ml_registry import ModelRegistry
 from app.services.ml_service import MLService, get_ml_service
 from app.utils.constants import CompletionStatus, DifficultyRating, EngagementLevel, TEALevel
 
@@ -268,6 +272,141 @@ class TestRiskPrediction:
         assert "probabilities" in result
 
 
+class TestBatchRiskPrediction:
+    """Test batch behavioral risk prediction."""
+
+    @pytest.fixture
+    def ml_service(self):
+        """Create ML service instance."""
+        return MLService()
+
+    @pytest.fixture
+    def students_and_assessments(self):
+        """Create students with varied profiles and assessment histories."""
+        rng = np.random.default_rng(7)
+        levels = [TEALevel.LEVEL_1, TEALevel.LEVEL_2, TEALevel.LEVEL_3, None]
+        statuses = [CompletionStatus.COMPLETED, CompletionStatus.ABANDONED]
+        engagement = list(EngagementLevel)
+
+        students, assessments_by_student = [], {}
+        for i in range(40):
+            student = Mock(spec=Student)
+            student.id = uuid4()
+            student.age = int(rng.integers(4, 16))
+            student.tea_level = levels[i % len(levels)]
+            student.interests = ["jogos"] * int(rng.integers(0, 4))
+            student.learning_profile = None if i % 5 == 0 else {"visual": int(rng.integers(1, 10))}
+            students.append(student)
+
+            history = []
+            for _ in range(int(rng.integers(0, 6))):
+                assessment = Mock(spec=Assessment)
+                assessment.completion_status = statuses[int(rng.integers(0, 2))]
+                assessment.engagement_level = engagement[int(rng.integers(0, len(engagement)))]
+                assessment.difficulty_rating = DifficultyRating.APPROPRIATE
+                assessment.independence_level = "partial"
+                assessment.created_at = datetime.now()
+                history.append(assessment)
+            if history:
+                assessments_by_student[student.id] = history
+
+        return students, assessments_by_student
+
+    def test_batch_with_trained_model_matches_single_predictions(self, ml_service, students_and_assessments):
+        """Batch results should equal per-student predictions with a real model and scaler."""
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.preprocessing import StandardScaler
+
+        students, assessments_by_student = students_and_assessments
+        ml_service.feature_names = ["age", "tea_level", "completion_rate", "avg_engagement", "learning_visual"]
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(200, len(ml_service.feature_names)))
+        y = rng.integers(0, 4, size=200)
+        ml_service.scaler = StandardScaler().fit(X)
+        ml_service.behavioral_model = RandomForestClassifier(n_estimators=10, random_state=0).fit(
+            ml_service.scaler.transform(X), y
+        )
+
+        batch = ml_service.predict_risk_level_batch(students, assessments_by_student)
+        single = [ml_service.predict_risk_level(s, assessments_by_student.get(s.id)) for s in students]
+
+        assert len(batch) == len(students)
+        for batch_result, single_result in zip(batch, single):
+            assert batch_result["risk_level"] == single_result["risk_level"]
+            assert batch_result["method"] == "ml_model"
+            assert batch_result["confidence"] == pytest.approx(single_result["confidence"])
+            assert batch_result["probabilities"] == pytest.approx(single_result["probabilities"])
+
+    def test_batch_calls_model_once(self, ml_service, students_and_assessments):
+        """Model should be called once for the whole batch, label from argmax."""
+        students, assessments_by_student = students_and_assessments
+        probabilities = np.tile([0.1, 0.2, 0.6, 0.1], (len(students), 1))
+        probabilities[0] = [0.7, 0.2, 0.08, 0.02]
+        mock_model = MagicMock()
+        mock_model.predict_proba = MagicMock(return_value=probabilities)
+        ml_service.behavioral_model = mock_model
+        ml_service.feature_names = ["age", "tea_level", "missing_feature"]
+
+        results = ml_service.predict_risk_level_batch(students, assessments_by_student)
+
+        mock_model.predict_proba.assert_called_once()
+        X = mock_model.predict_proba.call_args[0][0]
+        assert X.shape == (len(students), 3)
+        assert X[0, 0] == students[0].age
+        assert not X[:, 2].any()
+        mock_model.predict.assert_not_called()
+        assert results[0]["risk_level"] == "baixo"
+        assert results[0]["confidence"] == 0.7
+        assert {r["risk_level"] for r in results[1:]} == {"alto"}
+
+    def test_model_missing_classes_labels_by_classes(self, ml_service):
+        """A model trained on a subset of risk levels maps columns through classes_."""
+        from sklearn.ensemble import RandomForestClassifier
+
+        from app.services.ml_forest import FlatForestClassifier
+
+        ml_service.feature_names = ["age", "completion_rate"]
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(100, 2))
+        y = np.where(X[:, 0] > 0, 3, 1)  # only "medio" (1) and "muito_alto" (3)
+        forest = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+        features_list = [{"age": float(a), "completion_rate": float(c)} for a, c in X[:20]]
+        expected = [ml_service.RISK_LEVELS[label] for label in forest.predict(X[:20])]
+
+        for model in (forest, FlatForestClassifier.from_sklearn(forest)):
+            ml_service.behavioral_model = model
+            results = ml_service._predict_batch_with_model(features_list)
+
+            assert [r["risk_level"] for r in results] == expected
+            assert "muito_alto" in expected and "medio" in expected
+            for result in results:
+                assert set(result["probabilities"]) == {"medio", "muito_alto"}
+
+    def test_batch_rule_based_matches_single(self, ml_service, students_and_assessments):
+        """Without a model, batch should return the rule-based per-student results."""
+        students, assessments_by_student = students_and_assessments
+
+        batch = ml_service.predict_risk_level_batch(students, assessments_by_student)
+        single = [ml_service.predict_risk_level(s, assessments_by_student.get(s.id)) for s in students]
+
+        assert batch == single
+
+    def test_batch_model_failure_returns_defaults(self, ml_service, students_and_assessments):
+        """Model errors should not propagate; every student gets the safe default."""
+        students, _ = students_and_assessments
+        mock_model = MagicMock()
+        mock_model.predict_proba = MagicMock(side_effect=RuntimeError("boom"))
+        ml_service.behavioral_model = mock_model
+
+        results = ml_service.predict_risk_level_batch(students[:3])
+
+        assert [r["method"] for r in results] == ["default"] * 3
+
+    def test_batch_empty(self, ml_service):
+        """Empty input returns empty list."""
+        assert ml_service.predict_risk_level_batch([]) == []
+
+
 class TestActivitySuccessPrediction:
     """Test activity success prediction."""
 
@@ -609,3 +748,34 @@ class TestModelLoading:
 
         assert result["method"] == "rule_based"
         assert result["risk_level"] in ml_service.RISK_LEVELS
+
+    def test_load_behavioral_model_builds_feature_index(self, ml_service, tmp_path):
+        """Loading a model should precompute the feature name -> column map used at inference."""
+        import joblib
+        from sklearn.ensemble import RandomForestClassifier
+
+        model_dir = tmp_path / "behavioral_classifier" / "production"
+        model_dir.mkdir(parents=True)
+        names = ["completion_rate", "age", "tea_level"]
+        rng = np.random.default_rng(0)
+        model = RandomForestClassifier(n_estimators=5, random_state=0).fit(rng.normal(size=(40, 3)), np.arange(40) % 4)
+        joblib.dump(model, model_dir / "model.pkl")
+        (model_dir / "metadata.json").write_text(json.dumps({"feature_names": names}))
+        ml_service.registry = ModelRegistry(tmp_path)
+
+        assert ml_service.load_behavioral_model() is True
+        assert ml_service._feature_index == {"completion_rate": 0, "age": 1, "tea_level": 2}
+
+        row = np.zeros(3)
+        ml_service._fill_feature_row(row, {"age": 9.0, "unknown": 1.0, "completion_rate": 0.25})
+        assert row.tolist() == [0.25, 9.0, 0.0]
+
+    def test_import_does_not_load_pandas_or_sklearn(self):
+        """Importing the service must not import pandas, scikit-learn or joblib."""
+        code = (
+            "import sys; import app.services.ml_service; "
+            "print(sorted(m for m in ('pandas', 'sklearn', 'joblib') if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip().splitlines()[-1] == "[]"
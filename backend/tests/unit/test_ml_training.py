@@ -0,0 +1,238 @@
+"""
+Unit tests for offline training of the behavioral classifier.
+
+Tests the chunked feature stream, reservoir sampling, the written registry
+version and that MLService serves the trained model.
+"""
+
+import json
+from datetime import date
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.core.exceptions import ValidationError
+from app.models.activity import Activity
+from app.models.assessment import Assessment
+from app.models.student import Student
+from app.models.user import User, UserRole
+from app.services.ml_features import FEATURE_NAMES
+from app.services.ml_registry import ModelRegistry, file_checksum
+from app.services.ml_service import MLService
+from app.services.ml_training import (
+    ReservoirSample,
+    iter_feature_chunks,
+    rule_based_labels,
+    train_behavioral_classifier,
+)
+from app.utils.constants import (
+    ActivityType,
+    CompletionStatus,
+    DifficultyLevel,
+    DifficultyRating,
+    EngagementLevel,
+    TEALevel,
+)
+
+# (tea_level, assessments as (status, engagement, independence)) giving each rule-based risk level
+PROFILES = {
+    "baixo": (None, [(CompletionStatus.COMPLETED, EngagementLevel.VERY_HIGH, "full")] * 3),
+    "medio": (TEALevel.LEVEL_1, []),
+    "alto": (None, []),
+    "muito_alto": (TEALevel.LEVEL_3, [(CompletionStatus.ABANDONED, EngagementLevel.NONE, "dependent")] * 3),
+}
+
+
+@pytest.fixture
+def students(db_session):
+    """Four students per risk level, with assessments."""
+    teacher = User(
+        email=f"teacher.{uuid4().hex[:8]}@example.com",
+        hashed_password="$2b$12$hashedpassword",
+        full_name="Professor Teste",
+        role=UserRole.TEACHER,
+        is_active=True,
+    )
+    db_session.add(teacher)
+    db_session.commit()
+
+    created = {}
+    for level, (tea_level, assessments) in PROFILES.items():
+        for i in range(4):
+            student = Student(
+                name=f"Aluno {level} {i}",
+                date_of_birth=date(2015, 1, 1),
+                age=8 + i,
+                diagnosis="TEA",
+                tea_level=tea_level,
+                interests=["música"] * i,
+                teacher_id=teacher.id,
+            )
+            db_session.add(student)
+            db_session.flush()
+            activity = Activity(
+                student_id=student.id,
+                title="Atividade",
+                description="Descrição",
+                activity_type=ActivityType.COGNITIVE,
+                difficulty=DifficultyLevel.EASY,
+                duration_minutes=30,
+                objectives=["Objetivo"],
+                materials=["Material"],
+                instructions=["Instrução"],
+            )
+            db_session.add(activity)
+            db_session.flush()
+            for status, engagement, independence in assessments:
+                db_session.add(
+                    Assessment(
+                        activity_id=activity.id,
+                        student_id=student.id,
+                        completion_status=status,
+                        engagement_level=engagement,
+                        difficulty_rating=DifficultyRating.APPROPRIATE,
+                        independence_level=independence,
+                    )
+                )
+            created[student.id] = level
+    db_session.commit()
+    return created
+
+
+class TestFeatureStream:
+    """Test chunked feature extraction and labels."""
+
+    def test_chunks_match_extract_student_features(self, db_session, students):
+        """Streamed rows equal MLService.extract_student_features for every student."""
+        service = MLService()
+        seen = []
+        for ids, X in iter_feature_chunks(db_session, chunk_size=5):
+            assert len(ids) <= 5
+            for student_id, row in zip(ids, X):
+                student = db_session.get(Student, student_id)
+                expected = service.extract_student_features(student, list(student.assessments))
+                assert row.tolist() == pytest.approx([expected[name] for name in FEATURE_NAMES], abs=1e-6)
+            seen.extend(ids)
+
+        assert sorted(seen) == sorted(students)
+        assert seen == sorted(seen)
+
+    def test_rule_based_labels(self, db_session, students):
+        """Labels equal the rule-based fallback prediction of each student."""
+        for ids, X in iter_feature_chunks(db_session, chunk_size=100):
+            labels = rule_based_labels(X)
+            assert [MLService.RISK_LEVELS[label] for label in labels] == [students[i] for i in ids]
+
+
+class TestReservoirSample:
+    """Test the bounded sample."""
+
+    def test_keeps_everything_below_capacity(self):
+        """A stream smaller than the capacity is kept in order."""
+        sample = ReservoirSample(10, 2)
+        sample.add(np.arange(12, dtype=np.float32).reshape(6, 2), np.arange(6))
+        assert sample.y.tolist() == list(range(6))
+        assert sample.X.shape == (6, 2)
+
+    def test_bounded_uniform_and_deterministic(self):
+        """Sample size stays at capacity, rows are roughly uniform and the seed fixes the sample."""
+
+        def run(seed):
+            sample = ReservoirSample(1000, 1, seed=seed)
+            for start in range(0, 20_000, 700):
+                values = np.arange(start, min(start + 700, 20_000))
+                sample.add(values.reshape(-1, 1).astype(np.float32), values)
+            return sample
+
+        sample = run(0)
+        assert sample.seen == 20_000
+        assert len(sample.y) == 1000
+        assert np.all(sample.X[:, 0] == sample.y)
+        assert len(np.unique(sample.y)) == 1000
+        assert 8_000 < sample.y.mean() < 12_000
+        assert np.array_equal(run(0).y, sample.y)
+
+
+class TestTrainBehavioralClassifier:
+    """Test the training run and its artifacts."""
+
+    def test_writes_registry_version_served_by_ml_service(self, db_session, students, tmp_path):
+        """model.pkl, scaler.pkl and metadata.json load in MLService and predict with the model."""
+        result = train_behavioral_classifier(
+            db_session, tmp_path, version="v1", chunk_size=3, n_estimators=20, n_jobs=2, holdout=0.25
+        )
+
+        model_dir = tmp_path / "behavioral_classifier" / "v1"
+        assert result.model_dir == model_dir
+        assert sorted(p.name for p in model_dir.iterdir()) == ["metadata.json", "model.pkl", "scaler.pkl"]
+        assert [p.name for p in (tmp_path / "behavioral_classifier").iterdir()] == ["v1"]
+
+        metadata = json.loads((model_dir / "metadata.json").read_text())
+        assert metadata["feature_names"] == list(FEATURE_NAMES)
+        assert metadata["checksums"]["model.pkl"] == file_checksum(model_dir / "model.pkl")
+        assert metadata["n_students"] == 16
+        assert metadata["labels"] == {"provided": 0, "rule_based": 16}
+        assert metadata["metrics"]["class_counts"] == {level: 4 for level in MLService.RISK_LEVELS}
+        assert metadata["metrics"]["holdout_samples"] == 4
+        assert 0.0 <= metadata["metrics"]["holdout_accuracy"] <= 1.0
+        assert metadata["training_seconds"] > 0
+
+        service = MLService()
+        service.registry = ModelRegistry(tmp_path)
+        assert service.load_behavioral_model("v1") is True
+
+        student_id = next(i for i, level in students.items() if level == "muito_alto")
+        prediction = service.predict_risk_level_for_student(db_session, student_id)
+        assert prediction["method"] == "ml_model"
+        assert prediction["risk_level"] == "muito_alto"
+
+    def test_reproducible(self, db_session, students, tmp_path):
+        """Same data and seed give the same model file."""
+        first = train_behavioral_classifier(db_session, tmp_path, version="a", n_estimators=10, n_jobs=1)
+        second = train_behavioral_classifier(db_session, tmp_path, version="b", chunk_size=7, n_estimators=10, n_jobs=2)
+        assert first.metadata["metrics"] == second.metadata["metrics"]
+
+        service = MLService()
+        service.registry = ModelRegistry(tmp_path)
+        X = np.random.default_rng(0).normal(size=(50, len(FEATURE_NAMES)))
+        service.load_behavioral_model("a")
+        expected = service.behavioral_model.predict_proba(X)
+        service.load_behavioral_model("b")
+        assert np.array_equal(service.behavioral_model.predict_proba(X), expected)
+
+    def test_provided_labels_override_rule_based(self, db_session, students, tmp_path):
+        """Labels mapping replaces the rule-based label of those students."""
+        labels = {student_id: "baixo" for student_id, level in students.items() if level == "alto"}
+        labels.update({next(i for i, level in students.items() if level == "baixo"): "alto"})
+
+        result = train_behavioral_classifier(db_session, tmp_path, labels=labels, n_estimators=5, holdout=0)
+
+        assert result.metadata["labels"] == {"provided": 5, "rule_based": 11}
+        assert result.metadata["metrics"]["class_counts"] == {"baixo": 7, "medio": 4, "alto": 1, "muito_alto": 4}
+        assert "holdout_accuracy" not in result.metadata["metrics"]
+
+    def test_max_samples_bounds_training_rows(self, db_session, students, tmp_path):
+        """Only max_samples rows are used, all students are still streamed."""
+        result = train_behavioral_classifier(
+            db_session, tmp_path, chunk_size=4, max_samples=12, n_estimators=5, holdout=0, random_state=3
+        )
+        assert result.n_students == 16
+        assert result.n_samples == 12
+
+    def test_missing_risk_level_raises(self, db_session, students, tmp_path):
+        """Training data must cover every risk level (predict_proba columns map to RISK_LEVELS)."""
+        labels = {student_id: "alto" for student_id, level in students.items() if level == "baixo"}
+        with pytest.raises(ValidationError, match="baixo"):
+            train_behavioral_classifier(db_session, tmp_path, labels=labels, n_estimators=5)
+        assert not (tmp_path / "behavioral_classifier" / "production").exists()
+
+    def test_existing_version_and_unknown_labels_raise(self, db_session, students, tmp_path):
+        """Existing versions need overwrite; unknown label values are rejected."""
+        train_behavioral_classifier(db_session, tmp_path, n_estimators=5)
+        with pytest.raises(ValidationError, match="already exists"):
+            train_behavioral_classifier(db_session, tmp_path, n_estimators=5)
+        train_behavioral_classifier(db_session, tmp_path, n_estimators=5, overwrite=True)
+
+        with pytest.raises(ValidationError, match="Unknown risk levels"):
+            train_behavioral_classifier(db_session, tmp_path, version="v2", labels={uuid4(): "critico"})
@@ -0,0 +1,245 @@
+"""
+Unit tests for the NLP response cache.
+
+Tests key derivation, TTL/size limits, the shared (Redis) tier and
+NLPService generations served from the cache, using a local stub client.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.core.exceptions import OpenAIError
+from app.services.nlp_cache import CachedCompletion, NLPResponseCache, temperature_class
+from app.services.nlp_service import NLPService
+from app.utils.constants import (
+    TEMPERATURE_BALANCED,
+    TEMPERATURE_CREATIVE,
+    TEMPERATURE_PRECISE,
+    ActivityType,
+    DifficultyLevel,
+)
+
+ACTIVITY = {
+    "title": "Atividade de Adição",
+    "description": "Pratique soma",
+    "objectives": ["Aprender soma"],
+    "materials": ["Lápis"],
+    "instructions": ["Faça os exercícios"],
+    "duration_minutes": 30,
+    "adaptations": ["Usar imagens"],
+    "visual_supports": ["Cartões"],
+    "success_criteria": ["Completar 80%"],
+}
+
+ANALYSIS = {
+    "summary": "Progresso positivo",
+    "strengths": ["Boa concentração"],
+    "areas_for_improvement": ["Habilidades sociais"],
+    "patterns_observed": ["Melhor pela manhã"],
+    "recommendations": ["Continuar atividades visuais"],
+}
+
+PROFILE = {"name": "João", "age": 10, "tea_level": "level_1", "interests": ["jogos"]}
+
+
+class StubChatClient:
+    """Local stand-in for AsyncOpenAI: returns queued contents and records calls."""
+
+    def __init__(self, *contents):
+        self.contents = list(contents)
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        content = self.contents.pop(0) if len(self.contents) > 1 else self.contents[0]
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=120, completion_tokens=300),
+        )
+
+
+class FakeSharedCache:
+    """cache_manager stand-in (Redis tier)."""
+
+    is_available = True
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key, prefix="eduautismo"):
+        return self.data.get((prefix, key))
+
+    async def set(self, key, value, ttl=None, prefix="eduautismo"):
+        self.data[(prefix, key)] = value
+        return True
+
+
+def make_service(*contents, **cache_options):
+    cache_options.setdefault("shared", False)
+    cache_options.setdefault("cache_creative", True)
+    return NLPService(client=StubChatClient(*contents), response_cache=NLPResponseCache(**cache_options))
+
+
+async def generate(service, theme="Animais", **kwargs):
+    return await service.generate_activity(
+        student_profile=PROFILE,
+        activity_type=ActivityType.COGNITIVE,
+        difficulty=DifficultyLevel.MEDIUM,
+        duration_minutes=30,
+        theme=theme,
+        **kwargs,
+    )
+
+
+class TestKeys:
+    """Test key derivation."""
+
+    def test_temperature_classes(self):
+        assert temperature_class(TEMPERATURE_PRECISE) == "precise"
+        assert temperature_class(0.5) == "balanced"
+        assert temperature_class(TEMPERATURE_BALANCED) == "balanced"
+        assert temperature_class(TEMPERATURE_CREATIVE) == "creative"
+        assert temperature_class(0.8) == "creative"
+
+    def test_key_fields(self):
+        """Model, prompts, temperature class and max_tokens change the key; temperatures in a class do not."""
+        key = NLPResponseCache.make_key("gpt-4o-mini", "system", "user", 0.9, 100)
+        assert key == NLPResponseCache.make_key("gpt-4o-mini", "system", "user", 0.8, 100)
+        assert len(key) == 64
+        for other in (
+            ("gpt-4o", "system", "user", 0.9, 100),
+            ("gpt-4o-mini", "system 2", "user", 0.9, 100),
+            ("gpt-4o-mini", "system", "user 2", 0.9, 100),
+            ("gpt-4o-mini", "system", "user", 0.3, 100),
+            ("gpt-4o-mini", "system", "user", 0.9, 200),
+        ):
+            assert NLPResponseCache.make_key(*other) != key
+
+
+class TestNLPResponseCache:
+    """Test limits and tiers."""
+
+    async def test_ttl_and_size_limits(self):
+        cache = NLPResponseCache(max_size=2, ttl=60, shared=False)
+        completion = CachedCompletion(content="{}", prompt_tokens=1, completion_tokens=2)
+
+        with patch("app.core.cache.time.monotonic", return_value=1000.0):
+            for key in ("a", "b", "c"):
+                await cache.set(key, completion)
+            assert await cache.get("a") is None  # evicted (LRU)
+            assert await cache.get("c") == completion
+
+        with patch("app.core.cache.time.monotonic", return_value=1061.0):
+            assert await cache.get("c") is None  # expired
+
+        assert cache.get_stats() == {
+            "hits": 1,
+            "misses": 2,
+            "hit_rate": 0.3333,
+            "saved_prompt_tokens": 1,
+            "saved_completion_tokens": 2,
+            "size": 1,
+        }
+
+    async def test_shared_tier_serves_other_processes(self):
+        """An entry written by one cache is found by another through Redis."""
+        shared = FakeSharedCache()
+        completion = CachedCompletion(content="{}", prompt_tokens=5, completion_tokens=7)
+        with patch("app.services.nlp_cache.cache_manager", shared):
+            await NLPResponseCache().set("k", completion)
+            other = NLPResponseCache()
+            assert await other.get("k") == completion
+
+        assert list(shared.data) == [("nlp", "k")]
+        assert other.get_stats()["size"] == 1
+
+    async def test_disabled(self):
+        cache = NLPResponseCache(enabled=False, shared=False)
+        assert not cache.should_cache(TEMPERATURE_PRECISE)
+
+
+class TestNLPServiceCaching:
+    """Test NLPService with a stub client."""
+
+    async def test_identical_request_served_from_cache(self):
+        """Second identical generation skips the API and reports hit rate and saved tokens."""
+        service = make_service(json.dumps(ACTIVITY))
+
+        with patch("app.services.nlp_service.log_openai_request") as log:
+            first = await generate(service)
+            second = await generate(service)
+
+        assert second == first
+        assert len(service.client.calls) == 1
+        assert service.response_cache.get_stats()["hits"] == 1
+        assert service.response_cache.saved_tokens == 420
+
+        miss, hit = (call.kwargs for call in log.call_args_list)
+        assert miss.get("cached", False) is False
+        assert hit["cached"] is True
+        assert hit["prompt_tokens"] == 120
+        assert hit["cache_stats"]["hit_rate"] == 0.5
+        assert hit["cache_stats"]["saved_completion_tokens"] == 300
+
+    async def test_different_prompt_misses(self):
+        service = make_service(json.dumps(ACTIVITY))
+        await generate(service, theme="Animais")
+        await generate(service, theme="Espaço")
+        assert len(service.client.calls) == 2
+
+    async def test_use_cache_false_opts_out(self):
+        """Creative requests can ask for a fresh variation; nothing is stored."""
+        service = make_service(json.dumps(ACTIVITY))
+        await generate(service, use_cache=False)
+        await generate(service, use_cache=False)
+        await generate(service)
+        assert len(service.client.calls) == 3
+        assert service.response_cache.get_stats()["hits"] == 0
+
+    async def test_creative_requests_not_cached_when_configured(self):
+        """cache_creative=False (the default) bypasses creative generations but keeps precise ones cached."""
+        assert NLPResponseCache(shared=False).cache_creative is False
+        service = make_service(json.dumps(ACTIVITY), json.dumps(ACTIVITY), json.dumps(ANALYSIS), cache_creative=False)
+
+        await generate(service)
+        await generate(service)
+        await service.analyze_progress(student_profile=PROFILE, assessments=[])
+        await service.analyze_progress(student_profile=PROFILE, assessments=[])
+
+        assert len(service.client.calls) == 3
+        assert service.response_cache.hits == 1
+
+    async def test_invalid_response_not_cached(self):
+        """A completion that fails validation is not stored."""
+        service = make_service("Invalid JSON {{{", json.dumps(ACTIVITY))
+
+        with pytest.raises(OpenAIError):
+            await generate(service)
+        activity = await generate(service)
+
+        assert activity.title == ACTIVITY["title"]
+        assert len(service.client.calls) == 2
+
+    async def test_recommendations_cached(self):
+        content = json.dumps(
+            {
+                "recommendations": [
+                    {
+                        "title": "Atividade Visual",
+                        "description": "Usar mais recursos visuais",
+                        "rationale": "Aluno aprende melhor com imagens",
+                        "priority": "high",
+                        "category": "strategy",
+                    }
+                ]
+            }
+        )
+        service = make_service(content)
+        first = await service.generate_recommendations(student_profile=PROFILE, recent_activities=[])
+        second = await service.generate_recommendations(student_profile=PROFILE, recent_activities=[])
+        assert first == second
+        assert len(service.client.calls) == 1
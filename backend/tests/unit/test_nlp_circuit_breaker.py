@@ -0,0 +1,255 @@
+"""
+Unit tests for the OpenAI circuit breaker.
+
+Tests the rolling error-rate and latency windows, half-open probing, hedging
+and the template fallback of NLPService while the circuit is open.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from uuid import uuid4
+
+import httpx
+import pytest
+from openai import APIStatusError, APITimeoutError
+
+from app.core.exceptions import CircuitOpenError
+from app.schemas.activity import ActivityGenerate
+from app.services.activity_service import ActivityService
+from app.services.activity_templates import TEMPLATE_MODEL
+from app.services.nlp_cache import NLPResponseCache
+from app.services.nlp_circuit_breaker import CircuitBreaker
+from app.services.nlp_service import NLPService, TemplateActivity
+from app.utils.constants import ActivityType, DifficultyLevel
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+PROFILE = {"name": "João", "diagnosis": "TEA nível 1", "age": 10}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def server_error(status_code=500):
+    return APIStatusError("error", response=httpx.Response(status_code, request=REQUEST), body=None)
+
+
+def make_breaker(clock, **kwargs):
+    options = dict(window_seconds=60, min_calls=4, failure_rate=0.5, slow_call_seconds=5, open_seconds=30)
+    options.update(kwargs)
+    return CircuitBreaker(clock=clock, **options)
+
+
+async def succeed():
+    return "ok"
+
+
+def failing(error):
+    async def func():
+        raise error
+
+    return func
+
+
+async def run(breaker, func):
+    try:
+        return await breaker.call(func)
+    except Exception as e:
+        return e
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions."""
+
+    async def test_opens_on_failure_rate_and_rejects(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+
+        for _ in range(2):
+            await run(breaker, succeed)
+        for _ in range(2):
+            await run(breaker, failing(APITimeoutError(REQUEST)))
+
+        assert breaker.state == "open"
+        calls = []
+
+        async def tracked():
+            calls.append(1)
+
+        with pytest.raises(CircuitOpenError) as exc_info:
+            await breaker.call(tracked)
+        assert calls == []
+        assert exc_info.value.details["retry_after"] == 30
+        assert breaker.get_stats()["rejected"] == 1
+
+    async def test_opens_on_slow_calls(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock, slow_call_rate=0.75)
+
+        async def slow():
+            clock.now += 6
+
+        for _ in range(3):
+            await breaker.call(slow)
+        assert breaker.state == "closed"
+        await breaker.call(slow)
+        assert breaker.state == "open"
+
+    async def test_client_errors_not_counted(self):
+        """429/4xx describe the request, not the service."""
+        breaker = make_breaker(FakeClock())
+        for _ in range(6):
+            await run(breaker, failing(server_error(429)))
+            await run(breaker, failing(server_error(400)))
+
+        assert breaker.state == "closed"
+        assert breaker.get_stats()["window_calls"] == 0
+
+    async def test_old_failures_leave_the_window(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(3):
+            await run(breaker, failing(server_error()))
+        clock.now += 61
+        await run(breaker, failing(server_error()))
+
+        assert breaker.state == "closed"
+        assert breaker.get_stats()["window_calls"] == 1
+
+    async def test_half_open_probe_closes_or_reopens(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            await run(breaker, failing(server_error(503)))
+
+        clock.now += 30
+        assert breaker.state == "half_open"
+        assert isinstance(await run(breaker, failing(server_error())), APIStatusError)
+        assert breaker.state == "open"
+        assert breaker.times_opened == 2
+
+        clock.now += 30
+        assert await breaker.call(succeed) == "ok"
+        assert breaker.state == "closed"
+
+
+class TestHedging:
+    """Test hedged calls."""
+
+    async def test_slow_call_hedged_and_second_wins(self):
+        breaker = CircuitBreaker(min_calls=1, hedge_quantile=0.95)
+        breaker._calls.append((breaker._clock(), False, 0.01))
+        started = []
+
+        async def call():
+            started.append(1)
+            await asyncio.sleep(1 if len(started) == 1 else 0)
+            return len(started)
+
+        assert await breaker.hedge(call) == 2
+        assert breaker.hedged == 1
+        assert breaker.hedge_wins == 1
+
+    async def test_no_hedging_without_latency_history(self):
+        breaker = CircuitBreaker(min_calls=5, hedge_quantile=0.95)
+        assert breaker.hedge_delay() is None
+        assert await breaker.hedge(succeed) == "ok"
+        assert breaker.hedged == 0
+
+
+class TestTemplateFallback:
+    """Test NLPService while the circuit is open."""
+
+    @staticmethod
+    def open_service():
+        calls = []
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+
+        breaker = CircuitBreaker()
+        breaker._open("test")
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        service = NLPService(
+            client=client, response_cache=NLPResponseCache(shared=False, cache_creative=True), circuit_breaker=breaker
+        )
+        return service, calls
+
+    async def test_generate_activity_returns_template(self):
+        service, calls = self.open_service()
+        activity = await service.generate_activity(PROFILE, ActivityType.COGNITIVE, DifficultyLevel.EASY, 30, "cores")
+
+        assert isinstance(activity, TemplateActivity)
+        assert activity.title == "Atividade Cognitiva - cores"
+        assert "João" in activity.description
+        assert calls == []
+
+    async def test_stream_activity_streams_template(self):
+        service, calls = self.open_service()
+        events = [
+            event async for event in service.stream_activity(PROFILE, ActivityType.SOCIAL, DifficultyLevel.MEDIUM, 20)
+        ]
+
+        assert events[0].data == {"field": "title", "value": "Atividade Social"}
+        assert isinstance(events[-1].data, TemplateActivity)
+        assert calls == []
+
+    async def test_analysis_fails_fast(self):
+        service, calls = self.open_service()
+        with pytest.raises(CircuitOpenError):
+            await service.analyze_progress(PROFILE, [{"notes": "ok"}])
+        assert calls == []
+
+    async def test_cached_completion_served_while_open(self):
+        service, calls = self.open_service()
+        service.circuit_breaker = None
+        generated = {
+            "title": "Da IA",
+            "description": "d",
+            "objectives": [],
+            "materials": [],
+            "instructions": [],
+            "duration_minutes": 30,
+            "adaptations": [],
+            "visual_supports": [],
+            "success_criteria": [],
+        }
+
+        async def create(**kwargs):
+            message = SimpleNamespace(content=json.dumps(generated))
+            usage = SimpleNamespace(prompt_tokens=1, completion_tokens=1)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+        service.client.chat.completions.create = create
+        await service.generate_activity(PROFILE, ActivityType.COGNITIVE, DifficultyLevel.EASY, 30)
+
+        breaker = CircuitBreaker()
+        breaker._open("test")
+        service.circuit_breaker = breaker
+        activity = await service.generate_activity(PROFILE, ActivityType.COGNITIVE, DifficultyLevel.EASY, 30)
+        assert activity.title == "Da IA"
+
+    def test_template_activity_metadata(self):
+        activity_data = ActivityGenerate(
+            student_id=uuid4(), activity_type=ActivityType.MOTOR, difficulty=DifficultyLevel.HARD, duration_minutes=30
+        )
+        generated = TemplateActivity(
+            title="t",
+            description="d",
+            objectives=[],
+            materials=[],
+            instructions=[],
+            duration_minutes=30,
+            adaptations=[],
+            visual_supports=[],
+            success_criteria=[],
+        )
+        activity = ActivityService.build_generated_activity(activity_data, generated, PROFILE, "gpt-4o-mini", uuid4())
+
+        assert activity.generation_metadata["model"] == TEMPLATE_MODEL
+        assert activity.generation_metadata["fallback"] == "circuit_open"
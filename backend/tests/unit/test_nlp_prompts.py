@@ -0,0 +1,129 @@
+"""
+Unit tests for NLP prompt assembly.
+
+Tests precompiled subject prompts, the memoized profile fragment and the
+token budget applied to assessment history.
+"""
+
+from app.services.nlp_prompts import (
+    MAX_DETAILED_ASSESSMENTS,
+    PROFILE_FIELDS_GRADE,
+    _render_profile,
+    build_activity_prompt,
+    build_progress_prompt,
+    build_recommendations_prompt,
+    estimate_tokens,
+    profile_fragment,
+    subject_system_prompt,
+    truncate_to_tokens,
+)
+from app.utils.constants import MAX_PROMPT_TOKENS_ASSESSMENT_HISTORY, ActivityType, DifficultyLevel, Subject
+
+PROFILE = {
+    "name": "João",
+    "age": 10,
+    "diagnosis": "TEA nível 1",
+    "interests": ["dinossauros", "lego"],
+    "strengths": ["memória visual"],
+}
+
+
+def assessments(count, notes="Participou bem"):
+    return [
+        {
+            "activity_title": f"Atividade {i}",
+            "completion_status": "completed" if i % 3 else "abandoned",
+            "engagement_level": "high" if i % 2 else "low",
+            "difficulty_rating": "appropriate",
+            "notes": notes,
+        }
+        for i in range(count)
+    ]
+
+
+class TestEstimates:
+    """Test the local token estimate."""
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("a" * 35) == 10
+        assert estimate_tokens("a" * 36) == 11
+
+    def test_truncate_to_tokens(self):
+        text = "palavra " * 100
+        truncated = truncate_to_tokens(text, 10)
+        assert truncated.endswith("…")
+        assert estimate_tokens(truncated) <= 10
+        assert truncate_to_tokens("curto", 10) == "curto"
+
+
+class TestFragments:
+    """Test precompiled and memoized fragments."""
+
+    def test_subject_system_prompts_precompiled(self):
+        """Every subject has a prompt, built once (same object on every call)."""
+        for subject in Subject:
+            assert subject_system_prompt(subject) is subject_system_prompt(subject)
+        assert "Matemática para alunos com TEA" in subject_system_prompt(Subject.MATEMATICA)
+        assert subject_system_prompt(Subject.ARTE).startswith("Você é um especialista em educação especial")
+
+    def test_profile_fragment_memoized(self):
+        _render_profile.cache_clear()
+        first = profile_fragment(PROFILE)
+        second = profile_fragment(dict(PROFILE))
+
+        assert second is first
+        assert _render_profile.cache_info().hits == 1
+        assert "- Interesses: dinossauros, lego\n" in first
+        assert "- Desafios: a identificar\n" in first
+
+        changed = profile_fragment(dict(PROFILE, interests=["música"]))
+        assert "- Interesses: música\n" in changed
+
+    def test_profile_fragment_with_grade(self):
+        fragment = profile_fragment(PROFILE, PROFILE_FIELDS_GRADE, grade="3º ano")
+        lines = fragment.splitlines()
+        assert lines[2:4] == ["- Idade: 10 anos", "- Série/Nível: 3º ano"]
+
+    def test_activity_prompt(self):
+        prompt = build_activity_prompt(PROFILE, ActivityType.COGNITIVE, DifficultyLevel.EASY, 30, theme="Números")
+        assert "- Nome: João\n" in prompt
+        assert "- Tipo: cognitive\n" in prompt
+        assert "- Tema: Números\n" in prompt
+        assert prompt.rstrip().endswith("Os critérios de sucesso devem ser observáveis e mensuráveis")
+
+
+class TestAssessmentHistoryBudget:
+    """Test the token budget of progress prompts."""
+
+    def test_short_history_listed_in_full(self):
+        prompt = build_progress_prompt(PROFILE, assessments(3), "último mês")
+        assert "Analise o progresso do aluno no período: último mês." in prompt
+        assert "AVALIAÇÕES (3 registros)" in prompt
+        assert "Avaliação 3:" in prompt
+        assert "resumo" not in prompt
+
+    def test_long_history_capped_and_summarized(self):
+        """Prompt size stays bounded however long the history is."""
+        sizes = [estimate_tokens(build_progress_prompt(PROFILE, assessments(n, "obs " * 300))) for n in (20, 200)]
+        assert abs(sizes[0] - sizes[1]) <= 5  # only the record counts differ
+
+        prompt = build_progress_prompt(PROFILE, assessments(200, "obs " * 300))
+        history = prompt.split("AVALIAÇÕES (200 registros):")[1].split("Retorne a análise")[0]
+        detailed = history.count("\nAvaliação ")
+
+        assert 1 <= detailed < MAX_DETAILED_ASSESSMENTS
+        assert estimate_tokens(history.split("\nDemais")[0]) <= MAX_PROMPT_TOKENS_ASSESSMENT_HISTORY
+        assert f"Demais {200 - detailed} avaliações (resumo):" in history
+        assert "completed (" in history and "abandoned (" in history
+
+    def test_detailed_entries_capped_by_count(self):
+        prompt = build_progress_prompt(PROFILE, assessments(15))
+        assert f"Avaliação {MAX_DETAILED_ASSESSMENTS}:" in prompt
+        assert f"Avaliação {MAX_DETAILED_ASSESSMENTS + 1}:" not in prompt
+        assert "Demais 5 avaliações (resumo):" in prompt
+
+    def test_recommendations_summary_truncated(self):
+        prompt = build_recommendations_prompt(PROFILE, [{"title": "Atividade 1"}], {"summary": "progresso " * 500})
+        assert len(prompt) < 2500
+        assert "progresso progresso" in prompt
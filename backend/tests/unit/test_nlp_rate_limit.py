@@ -0,0 +1,196 @@
+"""
+Unit tests for the OpenAI rate limiter and batch activity generation.
+
+Tests bounded concurrency, token-bucket pacing, 429 retries with backoff and
+NLPService.generate_activities against a local stub client with injected
+latency.
+"""
+
+import asyncio
+import json
+import random
+import time
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from app.core.exceptions import OpenAIError
+from app.services.nlp_cache import NLPResponseCache
+from app.services.nlp_rate_limit import OpenAIRateLimiter, TokenBucket
+from app.services.nlp_service import ActivityGenerationRequest, NLPService
+from app.utils.constants import ActivityType, DifficultyLevel
+
+ACTIVITY = {
+    "title": "Atividade de Adição",
+    "description": "Pratique soma",
+    "objectives": ["Aprender soma"],
+    "materials": ["Lápis"],
+    "instructions": ["Faça os exercícios"],
+    "duration_minutes": 30,
+    "adaptations": ["Usar imagens"],
+    "visual_supports": ["Cartões"],
+    "success_criteria": ["Completar 80%"],
+}
+
+
+def rate_limit_error(retry_after="0"):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, request=request, headers={"retry-after": retry_after})
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+class SlowChatClient:
+    """AsyncOpenAI stand-in with per-theme latency and failures; tracks concurrency."""
+
+    def __init__(self, latency=None, failures=None):
+        self.latency = latency or {}
+        self.failures = failures or {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        prompt = kwargs["messages"][1]["content"]
+        theme = next((t for t in self.latency.keys() | self.failures.keys() if t in prompt), None)
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency.get(theme, 0.01))
+            if self.failures.get(theme):
+                self.failures[theme] -= 1
+                raise rate_limit_error()
+        finally:
+            self.in_flight -= 1
+        content = dict(ACTIVITY, title=f"Atividade {theme}")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(content)))],
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=200),
+        )
+
+
+def make_service(client, **limiter_options):
+    limiter_options.setdefault("requests_per_minute", 60_000)
+    limiter_options.setdefault("base_delay", 0.001)
+    return NLPService(
+        client=client,
+        response_cache=NLPResponseCache(enabled=False, shared=False),
+        rate_limiter=OpenAIRateLimiter(rng=random.Random(0), **limiter_options),
+    )
+
+
+def requests_for(*themes):
+    return [
+        ActivityGenerationRequest(
+            student_profile={"name": "João", "age": 10},
+            activity_type=ActivityType.COGNITIVE,
+            difficulty=DifficultyLevel.MEDIUM,
+            duration_minutes=30,
+            theme=theme,
+        )
+        for theme in themes
+    ]
+
+
+async def collect(service, requests):
+    return [outcome async for outcome in service.generate_activities(requests)]
+
+
+class TestOpenAIRateLimiter:
+    """Test limits, pacing and retries."""
+
+    async def test_token_bucket_paces_after_burst(self):
+        """600/min with burst 2: two immediate starts, then one every 0.1s."""
+        bucket = TokenBucket(600, capacity=2)
+        start = time.monotonic()
+        waits = [await bucket.acquire() for _ in range(4)]
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == pytest.approx(0.1, abs=0.02)
+        assert time.monotonic() - start >= 0.18
+
+    async def test_retries_rate_limit_then_gives_up(self):
+        limiter = OpenAIRateLimiter(max_retries=2, requests_per_minute=60_000, base_delay=0.001)
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise rate_limit_error()
+            return "ok"
+
+        assert await limiter.call(flaky) == "ok"
+        assert limiter.get_stats()["retries"] == 2
+
+        async def always_limited():
+            raise rate_limit_error()
+
+        with pytest.raises(openai.RateLimitError):
+            await limiter.call(always_limited)
+        assert limiter.rate_limited == 5
+        assert limiter.in_flight == 0
+
+    def test_backoff_full_jitter_honors_retry_after(self):
+        limiter = OpenAIRateLimiter(base_delay=1.0, max_delay=8.0, rng=random.Random(1))
+        delays = [limiter.backoff(attempt) for attempt in range(6)]
+        assert all(0 <= delay <= min(8.0, 2**attempt) for attempt, delay in enumerate(delays))
+        assert limiter.backoff(0, rate_limit_error("5")) >= 5.0
+        assert limiter.backoff(0, rate_limit_error("600")) == 8.0
+        assert limiter.backoff(0, rate_limit_error("soon")) <= 1.0
+
+
+class TestBatchGeneration:
+    """Test NLPService.generate_activities with a slow stub client."""
+
+    async def test_concurrency_bounded_and_faster_than_sequential(self):
+        client = SlowChatClient(latency={f"T{i}": 0.05 for i in range(12)})
+        service = make_service(client, max_concurrency=4)
+
+        start = time.monotonic()
+        outcomes = await collect(service, requests_for(*(f"T{i}" for i in range(12))))
+        elapsed = time.monotonic() - start
+
+        assert client.max_in_flight == 4
+        assert sorted(o.index for o in outcomes) == list(range(12))
+        assert all(o.ok for o in outcomes)
+        assert elapsed < 12 * 0.05 / 2
+
+    async def test_results_in_completion_order(self):
+        """A slow first item does not hold back faster ones."""
+        client = SlowChatClient(latency={"Lento": 0.2, "Médio": 0.08, "Rápido": 0.01})
+        outcomes = await collect(make_service(client), requests_for("Lento", "Médio", "Rápido"))
+        assert [o.index for o in outcomes] == [2, 1, 0]
+        assert outcomes[0].result.title == "Atividade Rápido"
+
+    async def test_rate_limited_item_retried(self):
+        client = SlowChatClient(failures={"Animais": 2})
+        service = make_service(client)
+        outcomes = await collect(service, requests_for("Animais", "Espaço"))
+        assert all(o.ok for o in outcomes)
+        assert client.calls == 4
+        assert service.rate_limiter.retries == 2
+
+    async def test_failure_captured_per_item(self):
+        """An item that exhausts retries fails alone; the rest of the batch succeeds."""
+        client = SlowChatClient(failures={"Animais": 10})
+        outcomes = await collect(make_service(client, max_retries=1), requests_for("Animais", "Espaço", "Música"))
+
+        failed = [o for o in outcomes if not o.ok]
+        assert [o.index for o in failed] == [0]
+        assert isinstance(failed[0].error, OpenAIError)
+        assert "Rate limit reached" in failed[0].error.details["original_error"]
+        assert sorted(o.index for o in outcomes if o.ok) == [1, 2]
+
+    async def test_pending_generations_cancelled_when_consumer_stops(self):
+        client = SlowChatClient(latency={"Rápido": 0.01, "Lento": 0.5})
+        service = make_service(client)
+
+        stream = service.generate_activities(requests_for("Rápido", "Lento", "Lento"))
+        first = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0)
+
+        assert first.index == 0
+        assert client.in_flight == 0
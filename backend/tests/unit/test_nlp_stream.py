@@ -0,0 +1,152 @@
+"""
+Unit tests for streamed activity generation.
+
+Tests the incremental JSON parser and NLPService.stream_activity against a
+local stub client that streams the completion in small chunks.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.exceptions import OpenAIError
+from app.services.nlp_cache import NLPResponseCache
+from app.services.nlp_service import GeneratedActivity, NLPService
+from app.services.nlp_stream import JSONObjectStreamParser
+from app.utils.constants import ActivityType, DifficultyLevel
+
+ACTIVITY = {
+    "title": "Atividade de Adição",
+    "description": 'Pratique soma com "cartões" e {chaves}',
+    "objectives": ["Aprender soma"],
+    "materials": ["Lápis"],
+    "instructions": ["Faça os exercícios", "Confira"],
+    "duration_minutes": 30,
+    "adaptations": ["Usar imagens"],
+    "visual_supports": ["Cartões"],
+    "success_criteria": ["Completar 80%"],
+}
+
+
+def chunked(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class StreamingChatClient:
+    """AsyncOpenAI stand-in: streams the content in chunks, usage in a final chunk."""
+
+    def __init__(self, content, chunk_size=3):
+        self.content = content
+        self.chunk_size = chunk_size
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        return self._stream()
+
+    async def _stream(self):
+        for piece in chunked(self.content, self.chunk_size):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))], usage=None)
+        yield SimpleNamespace(choices=[], usage=SimpleNamespace(prompt_tokens=120, completion_tokens=300))
+
+
+def make_service(content, chunk_size=3):
+    return NLPService(
+        client=StreamingChatClient(content, chunk_size),
+        response_cache=NLPResponseCache(shared=False, cache_creative=True),
+    )
+
+
+async def collect(service):
+    return [
+        event
+        async for event in service.stream_activity(
+            student_profile={"name": "João", "age": 10},
+            activity_type=ActivityType.COGNITIVE,
+            difficulty=DifficultyLevel.MEDIUM,
+            duration_minutes=30,
+            theme="Animais",
+        )
+    ]
+
+
+class TestJSONObjectStreamParser:
+    """Test incremental parsing."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 1000])
+    def test_fields_complete_in_order_for_any_chunking(self, chunk_size):
+        text = json.dumps(ACTIVITY, ensure_ascii=False, indent=2)
+        parser = JSONObjectStreamParser()
+        fields = [field for piece in chunked(text, chunk_size) for field in parser.feed(piece)]
+        parser.close()
+
+        assert fields == list(ACTIVITY.items())
+        assert parser.complete
+        assert json.loads(parser.text) == ACTIVITY
+
+    def test_field_emitted_as_soon_as_value_closes(self):
+        parser = JSONObjectStreamParser()
+        assert parser.feed('{"title": "Ativ') == []
+        assert parser.feed('idade", "description": "Pra') == [("title", "Atividade")]
+        assert parser.feed('tique", "objectives": ["a",') == [("description", "Pratique")]
+        assert parser.feed(' "b"], "duration_minutes": 3') == [("objectives", ["a", "b"])]
+        assert parser.feed("0") == []  # number may continue
+        assert parser.feed("}") == [("duration_minutes", 30)]
+
+    @pytest.mark.parametrize("text", ['["not", "an object"]', '{"a": 1 "b": 2}', '{"a": 1} x'])
+    def test_invalid_json_raises(self, text):
+        parser = JSONObjectStreamParser()
+        with pytest.raises(json.JSONDecodeError):
+            parser.feed(text)
+
+    def test_unterminated_object_raises_on_close(self):
+        parser = JSONObjectStreamParser()
+        assert parser.feed('{"title": "Atividade", "description": "Prat') == [("title", "Atividade")]
+        with pytest.raises(json.JSONDecodeError):
+            parser.close()
+
+
+class TestStreamActivity:
+    """Test NLPService.stream_activity."""
+
+    async def test_streams_fields_then_validated_activity(self):
+        service = make_service(json.dumps(ACTIVITY))
+        events = await collect(service)
+
+        fields = [event.data for event in events if event.event == "field"]
+        assert fields[:2] == [
+            {"field": "title", "value": ACTIVITY["title"]},
+            {"field": "description", "value": ACTIVITY["description"]},
+        ]
+        assert len(fields) == len(ACTIVITY)
+        assert events[-1].event == "activity"
+        assert events[-1].data == GeneratedActivity(**ACTIVITY)
+
+        call = service.client.calls[0]
+        assert call["stream"] is True
+        assert call["stream_options"] == {"include_usage": True}
+
+    async def test_streamed_completion_cached(self):
+        """A second identical request replays the cached completion without calling the API."""
+        service = make_service(json.dumps(ACTIVITY))
+        first = await collect(service)
+        second = await collect(service)
+
+        assert [(e.event, e.data) for e in second] == [(e.event, e.data) for e in first]
+        assert len(service.client.calls) == 1
+        assert service.response_cache.saved_tokens == 420
+
+    async def test_invalid_activity_raises_and_is_not_cached(self):
+        """Fields already streamed do not make an incomplete activity valid."""
+        service = make_service(json.dumps({"title": "Só o título"}))
+
+        with pytest.raises(OpenAIError):
+            await collect(service)
+        assert service.response_cache.get_stats()["size"] == 0
+
+    async def test_truncated_stream_raises(self):
+        service = make_service(json.dumps(ACTIVITY)[:-20])
+        with pytest.raises(OpenAIError, match="Resposta inválida"):
+            await collect(service)
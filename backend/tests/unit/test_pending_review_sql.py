@@ -0,0 +1,170 @@
+"""
+Testes unitários para o modo SQL de get_pending_review_plans.
+
+Garante que prioridade, contagens e paginação calculadas no banco produzem
+exatamente o mesmo resultado que o cálculo em memória.
+"""
+
+from datetime import date, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.models.intervention_plan import InterventionPlan, PlanStatus, ReviewFrequency
+from app.models.professional import Professional, ProfessionalRole
+from app.models.student import Student
+from app.models.user import User, UserRole
+from app.services.intervention_plan_service import InterventionPlanService
+
+
+@pytest.fixture
+def student(db_session):
+    """Cria estudante (com professor) para testes."""
+    teacher = User(
+        email=f"teacher.{uuid4().hex[:8]}@example.com",
+        hashed_password="$2b$12$hashedpassword",
+        full_name="Professor Teste",
+        role=UserRole.TEACHER,
+        is_active=True,
+    )
+    db_session.add(teacher)
+    db_session.commit()
+
+    student = Student(
+        name="Aluno Teste",
+        date_of_birth=date(2015, 1, 1),
+        age=10,
+        diagnosis="Autismo Nível 1",
+        teacher_id=teacher.id,
+    )
+    db_session.add(student)
+    db_session.commit()
+    db_session.refresh(student)
+    return student
+
+
+@pytest.fixture
+def professionals(db_session):
+    """Cria dois profissionais para testes."""
+    profs = [
+        Professional(
+            name=f"Prof {i}",
+            email=f"prof.{i}.{uuid4().hex[:8]}@example.com",
+            role=ProfessionalRole.PSYCHOLOGIST,
+            organization="Clínica Teste",
+        )
+        for i in range(2)
+    ]
+    db_session.add_all(profs)
+    db_session.commit()
+    return profs
+
+
+@pytest.fixture
+def pending_plans(db_session, student, professionals):
+    """Cria planos ativos cobrindo todas as frequências e faixas de atraso."""
+    today = date.today()
+    # Revisões com mais de 999 dias ainda ficam depois dos nunca revisados
+    offsets = [None, 0, 1, 2, 6, 7, 13, 14, 15, 29, 30, 59, 60, 89, 90, 179, 180, 400, 1000, 1200]
+    plans = []
+
+    for i, frequency in enumerate(ReviewFrequency):
+        for j, offset in enumerate(offsets):
+            plan = InterventionPlan(
+                student_id=student.id,
+                created_by_id=professionals[(i + j) % 2].id,
+                title=f"Plano {frequency.value} {offset}",
+                objective="Objetivo",
+                strategies=[],
+                target_behaviors=[],
+                success_criteria=[],
+                start_date=today - timedelta(days=400),
+                end_date=today + timedelta(days=30),
+                review_frequency=frequency,
+                status=PlanStatus.ACTIVE,
+                needs_review=True,
+                last_reviewed_at=None if offset is None else today - timedelta(days=offset),
+            )
+            plans.append(plan)
+
+    # Plano inativo não deve aparecer
+    plans.append(
+        InterventionPlan(
+            student_id=student.id,
+            created_by_id=professionals[0].id,
+            title="Plano concluído",
+            objective="Objetivo",
+            strategies=[],
+            target_behaviors=[],
+            success_criteria=[],
+            start_date=today - timedelta(days=90),
+            end_date=today + timedelta(days=30),
+            review_frequency=ReviewFrequency.WEEKLY,
+            status=PlanStatus.COMPLETED,
+            needs_review=True,
+        )
+    )
+
+    db_session.add_all(plans)
+    db_session.commit()
+    return plans
+
+
+def _as_comparable(result: dict) -> dict:
+    return {**result, "items": [item.model_dump() for item in result["items"]]}
+
+
+class TestPendingReviewSqlMode:
+    """Modo SQL deve ser idêntico ao modo em memória."""
+
+    @pytest.mark.parametrize("priority_filter", [None, "high", "medium", "low"])
+    @pytest.mark.parametrize("skip,limit", [(0, 200), (0, 10), (10, 25), (80, 50)])
+    def test_matches_in_memory(self, db_session, pending_plans, priority_filter, skip, limit):
+        service = InterventionPlanService(db_session)
+
+        kwargs = dict(skip=skip, limit=limit, priority_filter=priority_filter)
+        sql_result = service.get_pending_review_plans(**kwargs, use_sql=True)
+        memory_result = service.get_pending_review_plans(**kwargs, use_sql=False)
+
+        assert _as_comparable(sql_result) == _as_comparable(memory_result)
+
+    def test_matches_in_memory_with_professional_filter(self, db_session, pending_plans, professionals):
+        service = InterventionPlanService(db_session)
+
+        sql_result = service.get_pending_review_plans(professional_id=professionals[1].id, use_sql=True)
+        memory_result = service.get_pending_review_plans(professional_id=professionals[1].id, use_sql=False)
+
+        assert sql_result["total"] == len(pending_plans) // 2
+        assert _as_comparable(sql_result) == _as_comparable(memory_result)
+
+    def test_counts_and_ordering(self, db_session, pending_plans):
+        service = InterventionPlanService(db_session)
+
+        result = service.get_pending_review_plans(limit=200)
+
+        assert result["total"] == len(pending_plans) - 1
+        assert result["high_priority"] + result["medium_priority"] + result["low_priority"] == result["total"]
+
+        priorities = [item.priority for item in result["items"]]
+        assert priorities == sorted(priorities, key=["high", "medium", "low"].index)
+        # Nunca revisados primeiro
+        first = result["items"][: len(ReviewFrequency)]
+        assert all(item.last_reviewed_at is None for item in first)
+
+    def test_never_reviewed_before_very_old_reviews(self, db_session, pending_plans):
+        """Planos nunca revisados vêm antes de revisões com mais de 999 dias nos dois modos."""
+        service = InterventionPlanService(db_session)
+
+        for use_sql in (True, False):
+            items = service.get_pending_review_plans(limit=200, use_sql=use_sql)["items"]
+            days = [item.days_since_review for item in items]
+            assert days[: len(ReviewFrequency)] == [None] * len(ReviewFrequency)
+            assert days[len(ReviewFrequency)] == 1200
+
+    def test_unknown_priority_filter_returns_empty(self, db_session, pending_plans):
+        service = InterventionPlanService(db_session)
+
+        result = service.get_pending_review_plans(priority_filter="invalid")
+
+        assert result["items"] == []
+        assert result["total"] == 0
@@ -0,0 +1,234 @@
+"""
+Testes unitários para invalidação de cache orientada a eventos.
+
+Verifica que as escritas em InterventionPlanService publicam
+InterventionPlanChanged com plano, estudante e profissionais afetados, e que
+o cache de pending_review invalida apenas as tags dependentes.
+"""
+
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.core.events import EventBus, InterventionPlanChanged, event_bus
+from app.models.intervention_plan import PlanStatus, ReviewFrequency
+from app.models.professional import Professional, ProfessionalRole
+from app.models.student import Student
+from app.models.user import User, UserRole
+from app.schemas.intervention_plan import InterventionPlanCreate, InterventionPlanUpdate, ProgressNoteCreate
+from app.services.intervention_plan_service import InterventionPlanService
+from app.services.intervention_plan_service_cached import (
+    CachedInterventionPlanService,
+    invalidate_on_plan_change,
+    plan_change_tags,
+)
+
+
+@pytest.fixture
+def events():
+    """Coleta eventos publicados durante o teste."""
+    received = []
+    event_bus.subscribe(InterventionPlanChanged, received.append)
+    yield received
+    event_bus.unsubscribe(InterventionPlanChanged, received.append)
+
+
+@pytest.fixture
+def student(db_session):
+    """Cria estudante (com professor) para testes."""
+    teacher = User(
+        email=f"teacher.{uuid4().hex[:8]}@example.com",
+        hashed_password="$2b$12$hashedpassword",
+        full_name="Professor Teste",
+        role=UserRole.TEACHER,
+        is_active=True,
+    )
+    db_session.add(teacher)
+    db_session.commit()
+
+    student = Student(
+        name="Aluno Teste",
+        date_of_birth=date(2015, 1, 1),
+        age=10,
+        diagnosis="Autismo Nível 1",
+        teacher_id=teacher.id,
+    )
+    db_session.add(student)
+    db_session.commit()
+    return student
+
+
+@pytest.fixture
+def professionals(db_session):
+    """Cria três profissionais para testes."""
+    profs = [
+        Professional(
+            name=f"Prof {i}",
+            email=f"prof.{i}.{uuid4().hex[:8]}@example.com",
+            role=ProfessionalRole.PSYCHOLOGIST,
+            organization="Clínica Teste",
+        )
+        for i in range(3)
+    ]
+    db_session.add_all(profs)
+    db_session.commit()
+    return profs
+
+
+@pytest.fixture
+def plan(db_session, student, professionals):
+    """Cria plano com o primeiro profissional como criador e o segundo envolvido."""
+    service = InterventionPlanService(db_session)
+    return service.create(
+        InterventionPlanCreate(
+            student_id=student.id,
+            title="Plano de Teste",
+            objective="Melhorar comunicação social",
+            strategies=[{"name": "Estratégia", "description": "Descrição"}],
+            target_behaviors=["Contato visual"],
+            success_criteria={"contato_visual": "Manter contato visual por 5 segundos"},
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=90),
+            review_frequency=ReviewFrequency.WEEKLY,
+            professionals_involved_ids=[professionals[1].id],
+        ),
+        created_by_id=professionals[0].id,
+    )
+
+
+class TestEventBus:
+    """Testes do barramento de eventos."""
+
+    def test_handler_errors_are_not_propagated(self):
+        """Falha em um handler não deve afetar os demais nem quem publicou."""
+        bus = EventBus()
+        received = []
+
+        def failing(event):
+            raise RuntimeError("boom")
+
+        bus.subscribe(InterventionPlanChanged, failing)
+        bus.subscribe(InterventionPlanChanged, received.append)
+        event = InterventionPlanChanged(action="update", plan_id=uuid4(), student_id=uuid4())
+
+        bus.publish(event)
+
+        assert received == [event]
+
+    def test_subscribe_is_idempotent(self):
+        """Registrar o mesmo handler duas vezes não duplica entregas."""
+        bus = EventBus()
+        received = []
+        bus.subscribe(InterventionPlanChanged, received.append)
+        bus.subscribe(InterventionPlanChanged, received.append)
+
+        bus.publish(InterventionPlanChanged(action="update", plan_id=uuid4(), student_id=uuid4()))
+
+        assert len(received) == 1
+
+
+class TestPlanChangeEvents:
+    """Testes de publicação de eventos pelas escritas do service."""
+
+    def test_create_publishes_affected_ids(self, events, plan, student, professionals):
+        """Criação publica plano, estudante, criador e envolvidos."""
+        assert events[-1].action == "create"
+        assert events[-1].plan_id == plan.id
+        assert events[-1].student_id == student.id
+        assert events[-1].professional_ids == {professionals[0].id, professionals[1].id}
+
+    def test_mutations_publish_events(self, db_session, events, plan, professionals):
+        """Cada escrita publica um evento com a ação correspondente."""
+        service = InterventionPlanService(db_session)
+        creator = professionals[0].id
+
+        service.update(plan.id, InterventionPlanUpdate(title="Novo título"), creator)
+        service.add_progress_note(plan.id, ProgressNoteCreate(note="Progresso consistente na semana"), creator)
+        service.change_status(plan.id, PlanStatus.ACTIVE, creator)
+        service.add_professional(plan.id, professionals[2].id, creator)
+
+        actions = [e.action for e in events if e.action != "needs_review"]
+        assert actions == ["create", "update", "progress_note", "status", "add_professional"]
+        assert professionals[2].id in events[-1].professional_ids
+
+    def test_remove_professional_includes_removed_id(self, db_session, events, plan, professionals):
+        """Profissional removido continua entre os afetados."""
+        service = InterventionPlanService(db_session)
+
+        service.remove_professional(plan.id, professionals[1].id, professionals[0].id)
+
+        assert events[-1].action == "remove_professional"
+        assert professionals[1].id in events[-1].professional_ids
+
+    def test_delete_publishes_event(self, db_session, events, plan, professionals):
+        """Remoção publica evento com os dados capturados antes do delete."""
+        service = InterventionPlanService(db_session)
+        plan_id = plan.id
+
+        service.delete(plan_id, professionals[0].id)
+
+        assert events[-1].action == "delete"
+        assert events[-1].plan_id == plan_id
+        assert events[-1].professional_ids == {professionals[0].id, professionals[1].id}
+
+
+class TestPendingReviewCacheTags:
+    """Testes das tags usadas pelo cache de pending_review."""
+
+    def test_plan_change_tags(self):
+        """Alteração invalida plano, estudante, profissionais e listagem global."""
+        prof = uuid4()
+        event = InterventionPlanChanged(
+            action="update", plan_id=uuid4(), student_id=uuid4(), professional_ids=frozenset({prof})
+        )
+
+        tags = plan_change_tags(event)
+
+        assert "pending_review:global" in tags
+        assert f"plan:{event.plan_id}" in tags
+        assert f"student:{event.student_id}" in tags
+        assert f"professional:{prof}" in tags
+        # Entradas filtradas por outros profissionais não são afetadas
+        assert "pending_review" not in tags
+
+    def test_pending_review_entry_tags(self):
+        """Entradas filtradas dependem só do profissional; sem filtro, de todos os planos."""
+        prof = uuid4()
+
+        assert CachedInterventionPlanService._pending_review_tags(prof) == ["pending_review", f"professional:{prof}"]
+        assert CachedInterventionPlanService._pending_review_tags(None) == ["pending_review", "pending_review:global"]
+
+    def test_handler_invalidates_tags(self):
+        """Handler encaminha as tags ao cache_manager no prefixo de planos."""
+        event = InterventionPlanChanged(action="status", plan_id=uuid4(), student_id=uuid4())
+
+        with patch("app.services.intervention_plan_service_cached.cache_manager") as manager:
+            invalidate_on_plan_change(event)
+
+        manager.invalidate_tags_nowait.assert_called_once_with(plan_change_tags(event), prefix="intervention_plans")
+
+    @pytest.mark.asyncio
+    async def test_cached_result_is_serializable_and_tagged(self, db_session, plan, professionals):
+        """Resultado de pending_review é serializado e gravado com tags."""
+        service = CachedInterventionPlanService(db_session)
+
+        with patch("app.services.intervention_plan_service_cached.cache_manager") as manager:
+            manager.flush_invalidations = AsyncMock()
+            manager.get = AsyncMock(return_value=None)
+            manager.set = AsyncMock(return_value=True)
+            await service.get_pending_review_plans_cached(professional_id=professionals[0].id)
+
+        manager.flush_invalidations.assert_awaited_once()
+        _, kwargs = manager.set.call_args
+        assert kwargs["tags"] == ["pending_review", f"professional:{professionals[0].id}"]
+        assert 0 < kwargs["ttl"] <= CachedInterventionPlanService.PENDING_REVIEW_CACHE_TTL
+
+    def test_pending_review_ttl_ends_with_the_day(self):
+        """days_since_review muda à meia-noite: o TTL não passa do fim do dia."""
+        ttl = CachedInterventionPlanService._pending_review_ttl
+
+        assert ttl(datetime(2025, 3, 10, 8, 0)) == CachedInterventionPlanService.PENDING_REVIEW_CACHE_TTL
+        assert ttl(datetime(2025, 3, 10, 23, 30)) == 30 * 60
+        assert ttl(datetime(2025, 3, 10, 23, 59, 59, 900000)) == 1
@@ -0,0 +1,131 @@
+"""
+Testes unitários para a criação em massa de indicadores socioemocionais.
+
+Verifica que create_bulk grava tudo em uma transação (um INSERT para as
+medições e um para os agregados), mantém os erros por item e respeita o
+modo all_or_nothing.
+"""
+
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+
+from app.core.exceptions import NotFoundException, ValidationException
+from app.models.professional import Professional, ProfessionalRole
+from app.models.socioemotional_indicator import IndicatorType, MeasurementContext, SocialEmotionalIndicator
+from app.models.socioemotional_rollup import SocialEmotionalDailyRollup
+from app.schemas.socioemotional_indicator import BulkIndicatorCreate
+from app.services.socioemotional_indicator_service import SocialEmotionalIndicatorService
+
+MEASURED_AT = datetime(2025, 3, 10, 9, 30)
+
+
+@pytest.fixture
+def student_professional(db_session, owners):
+    """Estudante (fixture owners) e profissional para testes."""
+    professional = Professional(
+        name="Prof Teste",
+        email=f"prof.{uuid4().hex[:8]}@example.com",
+        role=ProfessionalRole.PSYCHOLOGIST,
+        organization="Clínica Teste",
+    )
+    db_session.add(professional)
+    db_session.commit()
+    return owners[1], professional.id
+
+
+def item(score, indicator_type=IndicatorType.EMOTIONAL_REGULATION):
+    return {"indicator_type": indicator_type.value, "context": MeasurementContext.CLASSROOM.value, "score": score}
+
+
+def bulk(student_id, items, all_or_nothing=False):
+    return BulkIndicatorCreate(
+        student_id=student_id, measured_at=MEASURED_AT, indicators=items, all_or_nothing=all_or_nothing
+    )
+
+
+class TestCreateBulk:
+    """Testes de SocialEmotionalIndicatorService.create_bulk."""
+
+    def test_inserts_all_rows_in_one_statement(self, db_session, student_professional):
+        """Medições e agregados devem ser gravados com um INSERT cada, em um único commit."""
+        student_id, professional_id = student_professional
+        service = SocialEmotionalIndicatorService(db_session)
+        items = [item(score % 10 + 1, indicator_type) for score, indicator_type in enumerate(list(IndicatorType) * 3)]
+        inserts, commits = [], []
+
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("INSERT"):
+                inserts.append(statement)
+
+        def on_commit(session):
+            commits.append(session)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", on_execute)
+        event.listen(db_session, "after_commit", on_commit)
+        try:
+            result = service.create_bulk(bulk(student_id, items), professional_id)
+        finally:
+            event.remove(engine, "before_cursor_execute", on_execute)
+            event.remove(db_session, "after_commit", on_commit)
+
+        assert result.created_count == len(items)
+        assert result.failed_count == 0
+        assert result.errors is None
+        assert len(inserts) == 2
+        assert len(commits) == 1
+
+        stored = {row.id for row in db_session.query(SocialEmotionalIndicator.id)}
+        assert set(result.created_ids) == stored
+        assert db_session.query(SocialEmotionalDailyRollup).count() == len(IndicatorType)
+        assert sum(r.measurement_count for r in db_session.query(SocialEmotionalDailyRollup)) == len(items)
+
+    def test_created_ids_follow_item_order(self, db_session, student_professional):
+        """IDs retornados seguem a ordem dos itens enviados."""
+        student_id, professional_id = student_professional
+        service = SocialEmotionalIndicatorService(db_session)
+
+        result = service.create_bulk(bulk(student_id, [item(score) for score in range(1, 11)]), professional_id)
+
+        scores = [db_session.get(SocialEmotionalIndicator, created_id).score for created_id in result.created_ids]
+        assert scores == list(range(1, 11))
+
+    def test_partial_mode_reports_invalid_items(self, db_session, student_professional):
+        """Itens inválidos são reportados; os válidos são criados."""
+        student_id, professional_id = student_professional
+        service = SocialEmotionalIndicatorService(db_session)
+
+        result = service.create_bulk(bulk(student_id, [item(5), item(11), {"score": 3}, item(7)]), professional_id)
+
+        assert result.created_count == 2
+        assert result.failed_count == 2
+        assert all(error.startswith("Erro ao criar indicador") for error in result.errors)
+        assert db_session.query(SocialEmotionalIndicator).count() == 2
+
+    def test_all_or_nothing_rejects_whole_batch(self, db_session, student_professional):
+        """Com all_or_nothing, um item inválido impede a gravação de todos."""
+        student_id, professional_id = student_professional
+        service = SocialEmotionalIndicatorService(db_session)
+
+        with pytest.raises(ValidationException):
+            service.create_bulk(bulk(student_id, [item(5), item(0), item(7)], all_or_nothing=True), professional_id)
+
+        assert db_session.query(SocialEmotionalIndicator).count() == 0
+        assert db_session.query(SocialEmotionalDailyRollup).count() == 0
+
+    def test_missing_student(self, db_session, student_professional):
+        """Estudante inexistente: erro por item no modo parcial, 404 no modo all_or_nothing."""
+        _, professional_id = student_professional
+        service = SocialEmotionalIndicatorService(db_session)
+
+        result = service.create_bulk(bulk(uuid4(), [item(5), item(6)]), professional_id)
+
+        assert result.created_count == 0
+        assert result.failed_count == 2
+        assert "não encontrado" in result.errors[0]
+
+        with pytest.raises(NotFoundException):
+            service.create_bulk(bulk(uuid4(), [item(5)], all_or_nothing=True), professional_id)
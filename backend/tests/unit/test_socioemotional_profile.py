@@ -0,0 +1,183 @@
+"""
+Testes unitários para o cálculo do perfil socioemocional em passada única.
+
+Compara get_profile (agregados diários + janela de 90 dias) com uma
+implementação de referência equivalente à anterior (uma query por tipo de
+indicador), sobre medições dentro e fora da janela das tendências.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.core.exceptions import NotFoundException
+from app.models.professional import Professional, ProfessionalRole
+from app.models.socioemotional_indicator import IndicatorType, MeasurementContext, SocialEmotionalIndicator
+from app.models.student import Student
+from app.models.user import User, UserRole
+from app.services.socioemotional_indicator_service import SocialEmotionalIndicatorService
+
+
+@pytest.fixture
+def student(db_session):
+    """Cria estudante (com professor) para testes."""
+    teacher = User(
+        email=f"teacher.{uuid4().hex[:8]}@example.com",
+        hashed_password="$2b$12$hashedpassword",
+        full_name="Professor Teste",
+        role=UserRole.TEACHER,
+        is_active=True,
+    )
+    db_session.add(teacher)
+    db_session.commit()
+
+    student = Student(
+        name="Aluno Teste",
+        date_of_birth=date(2015, 1, 1),
+        age=10,
+        diagnosis="Autismo Nível 1",
+        teacher_id=teacher.id,
+    )
+    db_session.add(student)
+    db_session.commit()
+    return student
+
+
+@pytest.fixture
+def indicators(db_session, student):
+    """Cria medições aleatórias (determinísticas) para vários tipos, em ordem cronológica."""
+    professional = Professional(
+        name="Prof Teste",
+        email=f"prof.{uuid4().hex[:8]}@example.com",
+        role=ProfessionalRole.PSYCHOLOGIST,
+        organization="Clínica Teste",
+    )
+    db_session.add(professional)
+    db_session.commit()
+
+    rng = random.Random(42)
+    now = datetime.now()
+    rows = []
+    # Tipos sem medições e tipos com apenas medições antigas (fora da janela de 90 dias)
+    for indicator_type in list(IndicatorType)[:9]:
+        offsets = sorted((rng.randint(0, 200) for _ in range(rng.randint(1, 15))), reverse=True)
+        if indicator_type == IndicatorType.SENSORY_PROCESSING:
+            offsets = [150, 120]
+        for offset in offsets:
+            rows.append(
+                SocialEmotionalIndicator(
+                    student_id=student.id,
+                    professional_id=professional.id,
+                    indicator_type=indicator_type,
+                    context=rng.choice(list(MeasurementContext)),
+                    score=rng.randint(1, 10),
+                    measured_at=now - timedelta(days=offset, minutes=rng.randint(0, 600)),
+                )
+            )
+    db_session.add_all(rows)
+    db_session.commit()
+    # Medições gravadas fora do service: reconstruir agregados diários
+    SocialEmotionalIndicatorService(db_session).rebuild_rollups(student.id)
+    return rows
+
+
+def reference_profile(service, student_id, indicators):
+    """Perfil calculado como antes: varreduras por tipo + get_trend por tipo."""
+    summary = {}
+    strengths, areas = [], []
+    for indicator_type in IndicatorType:
+        type_indicators = sorted(
+            (ind for ind in indicators if ind.indicator_type == indicator_type), key=lambda ind: ind.measured_at
+        )
+        if not type_indicators:
+            continue
+        scores = [ind.score for ind in type_indicators]
+        summary[str(indicator_type)] = {
+            "count": len(scores),
+            "average_score": sum(scores) / len(scores),
+            "latest_score": type_indicators[-1].score,
+            "is_concerning": type_indicators[-1].is_concerning,
+        }
+        if summary[str(indicator_type)]["average_score"] >= 7:
+            strengths.append(type_indicators[0].indicator_display_name)
+        if summary[str(indicator_type)]["average_score"] <= 4:
+            areas.append(type_indicators[0].indicator_display_name)
+
+    trends = []
+    for indicator_type in IndicatorType:
+        try:
+            trends.append(service.get_trend(student_id, indicator_type, days=90))
+        except NotFoundException:
+            pass
+
+    return {
+        "total_measurements": len(indicators),
+        "last_measured_at": max(ind.measured_at for ind in indicators),
+        "indicators_summary": summary,
+        "concerning_indicators": {ind.indicator_display_name for ind in indicators if ind.is_concerning},
+        "strengths": strengths,
+        "areas_for_development": areas,
+        "trends": trends,
+    }
+
+
+class TestSinglePassProfile:
+    """Testes de get_profile."""
+
+    def test_matches_reference_implementation(self, db_session, student, indicators):
+        """Perfil em passada única deve ser idêntico ao cálculo por tipo."""
+        service = SocialEmotionalIndicatorService(db_session)
+
+        profile = service.get_profile(student.id)
+        expected = reference_profile(service, student.id, indicators)
+
+        assert profile.total_measurements == expected["total_measurements"]
+        assert profile.last_measured_at == expected["last_measured_at"]
+        assert profile.indicators_summary == expected["indicators_summary"]
+        assert set(profile.concerning_indicators) == expected["concerning_indicators"]
+        assert len(profile.concerning_indicators) == len(expected["concerning_indicators"])
+        assert profile.strengths == expected["strengths"]
+        assert profile.areas_for_development == expected["areas_for_development"]
+        assert profile.trends == expected["trends"]
+
+    def test_old_only_type_has_summary_but_no_trend(self, db_session, student, indicators):
+        """Tipo apenas com medições antigas aparece no resumo, mas não nas tendências."""
+        service = SocialEmotionalIndicatorService(db_session)
+
+        profile = service.get_profile(student.id)
+
+        assert str(IndicatorType.SENSORY_PROCESSING) in profile.indicators_summary
+        assert IndicatorType.SENSORY_PROCESSING not in {t.indicator_type for t in profile.trends}
+
+    def test_profile_uses_three_queries(self, db_session, student, indicators):
+        """Perfil deve usar uma query para o estudante, uma para os agregados e uma para a janela."""
+        from sqlalchemy import event
+
+        service = SocialEmotionalIndicatorService(db_session)
+        student_id = student.id
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            db_session.expire_all()
+            service.get_profile(student_id)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+        assert len(statements) == 3
+
+    def test_empty_profile(self, db_session, student):
+        """Estudante sem medições retorna perfil vazio."""
+        service = SocialEmotionalIndicatorService(db_session)
+
+        profile = service.get_profile(student.id)
+
+        assert profile.total_measurements == 0
+        assert profile.trends == []
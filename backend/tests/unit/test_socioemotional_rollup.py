@@ -0,0 +1,251 @@
+"""
+Testes unitários para os agregados diários de indicadores socioemocionais.
+
+Verifica que create/update/delete mantêm os agregados idênticos a uma
+reconstrução a partir das medições e que compare_periods (dias inteiros
+pelos agregados, bordas pelas medições) equivale ao cálculo direto.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.core.exceptions import NotFoundException
+from app.models.professional import Professional, ProfessionalRole
+from app.models.socioemotional_indicator import IndicatorType, MeasurementContext
+from app.models.socioemotional_rollup import SocialEmotionalDailyRollup
+from app.schemas.socioemotional_indicator import (
+    BulkIndicatorCreate,
+    SocialEmotionalIndicatorCreate,
+    SocialEmotionalIndicatorUpdate,
+)
+from app.services.socioemotional_indicator_service import SocialEmotionalIndicatorService
+
+BASE = datetime(2025, 3, 10, 8, 0, 0)
+MIDNIGHT = datetime(2025, 3, 10)
+
+
+@pytest.fixture
+def student_professional(db_session, owners):
+    """Estudante (fixture owners) e profissional para testes."""
+    professional = Professional(
+        name="Prof Teste",
+        email=f"prof.{uuid4().hex[:8]}@example.com",
+        role=ProfessionalRole.PSYCHOLOGIST,
+        organization="Clínica Teste",
+    )
+    db_session.add(professional)
+    db_session.commit()
+    return owners[1], professional.id
+
+
+def create(service, student_professional, score, measured_at, indicator_type=IndicatorType.EMOTIONAL_REGULATION):
+    """Cria medição pelo service."""
+    student_id, professional_id = student_professional
+    data = SocialEmotionalIndicatorCreate(
+        student_id=student_id,
+        indicator_type=indicator_type,
+        context=MeasurementContext.CLASSROOM,
+        score=score,
+        measured_at=measured_at,
+    )
+    return service.create(data, professional_id)
+
+
+def snapshot(db_session):
+    """Agregados como tuplas comparáveis (sem id e timestamps)."""
+    rows = db_session.query(SocialEmotionalDailyRollup).all()
+    return sorted(
+        (
+            str(r.student_id),
+            r.indicator_type.value,
+            r.day,
+            r.measurement_count,
+            r.score_sum,
+            r.score_sum_sq,
+            r.min_score,
+            r.max_score,
+            r.first_score,
+            r.first_measured_at,
+            r.latest_score,
+            r.latest_measured_at,
+        )
+        for r in rows
+    )
+
+
+def assert_matches_rebuild(db_session, service):
+    """Agregados mantidos incrementalmente devem ser iguais aos reconstruídos."""
+    db_session.expire_all()
+    maintained = snapshot(db_session)
+    service.rebuild_rollups()
+    db_session.expire_all()
+    assert maintained == snapshot(db_session)
+    return maintained
+
+
+class TestRollupMaintenance:
+    """Testes de manutenção dos agregados em create/update/delete."""
+
+    def test_create_accumulates_into_daily_buckets(self, db_session, student_professional):
+        """Medições do mesmo dia acumulam no mesmo bucket, fora de ordem inclusive."""
+        service = SocialEmotionalIndicatorService(db_session)
+        create(service, student_professional, 5, BASE + timedelta(hours=3))
+        create(service, student_professional, 2, BASE + timedelta(hours=1))
+        create(service, student_professional, 9, BASE + timedelta(hours=5))
+        create(service, student_professional, 7, BASE + timedelta(days=1))
+        create(service, student_professional, 4, BASE, indicator_type=IndicatorType.ANXIETY_LEVEL)
+
+        rows = assert_matches_rebuild(db_session, service)
+
+        assert len(rows) == 3
+        bucket = next(r for r in rows if r[1] == "emotional_regulation" and r[2] == BASE.date())
+        assert bucket[3:] == (
+            3,
+            16,
+            25 + 4 + 81,
+            2,
+            9,
+            2,
+            BASE + timedelta(hours=1),
+            9,
+            BASE + timedelta(hours=5),
+        )
+
+    def test_update_moves_measurement_between_buckets(self, db_session, student_professional):
+        """Alterar data e score recalcula o bucket antigo e o novo."""
+        service = SocialEmotionalIndicatorService(db_session)
+        _, professional_id = student_professional
+        first = create(service, student_professional, 3, BASE)
+        create(service, student_professional, 6, BASE + timedelta(hours=2))
+
+        service.update(
+            first.id,
+            SocialEmotionalIndicatorUpdate(score=8, measured_at=BASE + timedelta(days=2)),
+            professional_id,
+        )
+
+        rows = assert_matches_rebuild(db_session, service)
+        assert [(r[2], r[3], r[4]) for r in rows] == [
+            (BASE.date(), 1, 6),
+            ((BASE + timedelta(days=2)).date(), 1, 8),
+        ]
+
+    def test_delete_removes_empty_bucket(self, db_session, student_professional):
+        """Remover a única medição do dia remove o agregado."""
+        service = SocialEmotionalIndicatorService(db_session)
+        _, professional_id = student_professional
+        only = create(service, student_professional, 3, BASE)
+        create(service, student_professional, 6, BASE + timedelta(days=1))
+        create(service, student_professional, 1, BASE + timedelta(days=1, hours=1))
+
+        service.delete(only.id, professional_id)
+
+        rows = assert_matches_rebuild(db_session, service)
+        assert [(r[2], r[3], r[6]) for r in rows] == [((BASE + timedelta(days=1)).date(), 2, 1)]
+
+    def test_aware_measured_at_bucketed_by_utc_day(self, db_session, student_professional):
+        """Horário com fuso (23:30-03:00) é gravado e agregado no dia UTC seguinte."""
+        service = SocialEmotionalIndicatorService(db_session)
+        student_id, professional_id = student_professional
+        brasilia = timezone(timedelta(hours=-3))
+        late_evening = datetime(2025, 1, 17, 23, 30, tzinfo=brasilia)
+        utc = datetime(2025, 1, 18, 2, 30)
+
+        single = create(service, student_professional, 4, late_evening)
+        result = service.create_bulk(
+            BulkIndicatorCreate(
+                student_id=student_id,
+                measured_at=late_evening + timedelta(minutes=10),
+                indicators=[
+                    {
+                        "indicator_type": IndicatorType.EMOTIONAL_REGULATION.value,
+                        "context": MeasurementContext.CLASSROOM.value,
+                        "score": 6,
+                    }
+                ],
+            ),
+            professional_id,
+        )
+
+        db_session.expire_all()
+        assert single.measured_at == utc
+        rows = assert_matches_rebuild(db_session, service)
+        assert [(r[2], r[3], r[9], r[11]) for r in rows] == [
+            (date(2025, 1, 18), 2, utc, utc + timedelta(minutes=10)),
+        ]
+
+        service.update(
+            single.id,
+            SocialEmotionalIndicatorUpdate(measured_at=datetime(2025, 1, 18, 22, 0, tzinfo=brasilia)),
+            professional_id,
+        )
+        service.delete(result.created_ids[0], professional_id)
+
+        rows = assert_matches_rebuild(db_session, service)
+        assert [(r[2], r[3], r[9]) for r in rows] == [(date(2025, 1, 19), 1, datetime(2025, 1, 19, 1, 0))]
+
+
+class TestComparePeriodsFromRollup:
+    """Testes de compare_periods sobre os agregados."""
+
+    @pytest.fixture
+    def measurements(self, db_session, student_professional):
+        """Medições em 10 dias, várias por dia."""
+        service = SocialEmotionalIndicatorService(db_session)
+        created = []
+        for day in range(10):
+            for hour, score in ((1, 2 + day % 5), (12, 5), (23, 9 - day % 4)):
+                created.append(create(service, student_professional, score, BASE + timedelta(days=day, hours=hour)))
+        return created
+
+    @staticmethod
+    def direct_average(measurements, start, end):
+        scores = [m.score for m in measurements if start <= m.measured_at <= end]
+        return sum(scores) / len(scores)
+
+    @pytest.mark.parametrize(
+        "period1, period2",
+        [
+            # Bordas parciais + dias inteiros
+            (
+                (BASE + timedelta(hours=5), BASE + timedelta(days=3, hours=2)),
+                (BASE + timedelta(days=4), BASE + timedelta(days=9, hours=20)),
+            ),
+            # Períodos menores que um dia
+            (
+                (BASE, BASE + timedelta(hours=12)),
+                (BASE + timedelta(days=5, hours=12), BASE + timedelta(days=5, hours=23)),
+            ),
+            # Limites exatamente à meia-noite (fim inclusivo)
+            (
+                (MIDNIGHT, MIDNIGHT + timedelta(days=3)),
+                (BASE + timedelta(days=3), BASE + timedelta(days=10)),
+            ),
+        ],
+    )
+    def test_matches_direct_average(self, db_session, student_professional, measurements, period1, period2):
+        """Médias devem ser iguais às calculadas diretamente sobre as medições."""
+        service = SocialEmotionalIndicatorService(db_session)
+        student_id, _ = student_professional
+
+        comparison = service.compare_periods(student_id, IndicatorType.EMOTIONAL_REGULATION, *period1, *period2)
+
+        assert comparison.period1_average == pytest.approx(self.direct_average(measurements, *period1))
+        assert comparison.period2_average == pytest.approx(self.direct_average(measurements, *period2))
+
+    def test_empty_period_raises(self, db_session, student_professional, measurements):
+        """Período sem medições gera NotFoundException."""
+        service = SocialEmotionalIndicatorService(db_session)
+        student_id, _ = student_professional
+
+        with pytest.raises(NotFoundException):
+            service.compare_periods(
+                student_id,
+                IndicatorType.EMOTIONAL_REGULATION,
+                BASE - timedelta(days=30),
+                BASE - timedelta(days=20),
+                BASE,
+                BASE + timedelta(days=2),
+            )